@@ -0,0 +1,132 @@
+"""Benchmark linting a dbt project with the compiled model cache.
+
+Generates a dbt project with a chain of models which refer to each other
+and call a macro, using a local DuckDB profile (so it needs `dbt-duckdb`
+but no database server). It then times `sqlfluff lint` over the models
+without the cache, with an empty cache, and with the cache populated by
+the previous run. Finally it changes one model and times a run which
+should only compile the models depending on it. Each run is a separate
+process, as in CI, so this includes loading dbt and the manifest.
+
+Usage: python benchmarks/dbt_compiled_cache.py [models]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+DBT_PROJECT = """
+name: 'bench'
+version: '1.0.0'
+config-version: 2
+profile: 'bench'
+models:
+  bench:
+    materialized: view
+"""
+
+PROFILES = """
+bench:
+  target: dev
+  outputs:
+    dev:
+      type: duckdb
+      path: "{path}"
+"""
+
+SQLFLUFF_CONFIG = """
+[sqlfluff]
+dialect = duckdb
+templater = dbt
+
+[sqlfluff:templater:dbt]
+project_dir = .
+profiles_dir = .
+{cache}
+"""
+
+MACRO = """
+{% macro cents_to_dollars(column_name) -%}
+    ({{ column_name }} / 100)::numeric(16, 2)
+{%- endmacro %}
+"""
+
+FIRST_MODEL = """
+select 1 as id, 100 as amount
+"""
+
+MODEL = """
+select
+    id,
+    {{{{ cents_to_dollars('amount') }}}} as amount_dollars,
+    amount
+from {{{{ ref('model_{prev}') }}}}
+"""
+
+
+def _write(path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def _make_project(root: str, num_models: int) -> None:
+    _write(os.path.join(root, "dbt_project.yml"), DBT_PROJECT)
+    _write(
+        os.path.join(root, "profiles.yml"),
+        PROFILES.format(path=os.path.join(root, "bench.duckdb")),
+    )
+    _write(os.path.join(root, "macros", "cents_to_dollars.sql"), MACRO)
+    _write(os.path.join(root, "models", "model_0.sql"), FIRST_MODEL)
+    for idx in range(1, num_models):
+        _write(
+            os.path.join(root, "models", f"model_{idx}.sql"),
+            MODEL.format(prev=idx - 1),
+        )
+
+
+def _time_lint(root: str, cache_dir: str = "") -> float:
+    _write(
+        os.path.join(root, ".sqlfluff"),
+        SQLFLUFF_CONFIG.format(
+            cache=f"compiled_cache_dir = {cache_dir}" if cache_dir else ""
+        ),
+    )
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "sqlfluff", "lint", "models", "--nofail"],
+        cwd=root,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    assert result.returncode == 0, result.stderr
+    return elapsed
+
+
+def main(num_models: int = 100) -> None:
+    """Time linting a dbt project with and without the compiled cache."""
+    with tempfile.TemporaryDirectory() as root:
+        _make_project(root, num_models)
+        cache_dir = os.path.join(root, ".dbt_cache")
+        runs = [
+            ("no cache", lambda: _time_lint(root)),
+            ("cold cache", lambda: _time_lint(root, cache_dir)),
+            ("warm cache", lambda: _time_lint(root, cache_dir)),
+        ]
+        print(f"{num_models} models")
+        print(f"{'run':>14} {'time (s)':>9}")
+        for label, run in runs:
+            print(f"{label:>14} {run():>9.3f}")
+        # Changing the last model only invalidates that model.
+        with open(
+            os.path.join(root, "models", f"model_{num_models - 1}.sql"), "a"
+        ) as f:
+            f.write("\n")
+        print(f"{'one changed':>14} {_time_lint(root, cache_dir):>9.3f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,80 @@
+"""Benchmark applying fixes rule by rule against batching them.
+
+Fixes a file with the fixes from each rule applied as soon as the rule
+has run (the default), and with the fixes from all the rules in each
+loop applied together (`batch_fixes`). For each, this reports the number
+of linter loops, the number of times fixes were applied to the tree, the
+best time of several runs, and whether the fixed file matches that from
+applying fixes rule by rule.
+
+Usage: python benchmarks/fix_batching.py [path]
+"""
+
+import logging
+import os
+import sys
+import time
+from typing import Dict
+
+from sqlfluff.core import FluffConfig, Linter
+
+REPEATS = 3
+
+
+class _CountingHandler(logging.Handler):
+    """Counts the linter loops and fix applications from the linter logs."""
+
+    def __init__(self, batch_fixes: bool) -> None:
+        super().__init__(logging.INFO)
+        # When batching, the fixes from each rule are still logged as
+        # they're found, but only the batches are applied.
+        self.apply_message = (
+            "Applying batched fixes" if batch_fixes else "Applying Fixes"
+        )
+        self.counts: Dict[str, int] = {"loops": 0, "applied": 0}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message = record.getMessage()
+        if message.lstrip().startswith("Entering linter phase"):
+            self.counts["loops"] += 1
+        elif message.startswith(self.apply_message):
+            self.counts["applied"] += 1
+
+
+def main(path: str = "benchmarks/bench_002/bench_002_pearson.sql") -> None:
+    """Time fixing a file with each way of applying fixes."""
+    with open(path, encoding="utf8") as f:
+        sql = f.read()
+    linter_logger = logging.getLogger("sqlfluff.linter")
+    linter_logger.setLevel(logging.INFO)
+
+    print(
+        f"{'strategy':>10} {'loops':>6} {'applied':>8} {'time (s)':>10} "
+        f"{'same fix':>9}"
+    )
+    per_rule_fixed = None
+    for label, batch_fixes in (("per rule", False), ("batch", True)):
+        config = FluffConfig.from_path(
+            os.path.dirname(path), overrides={"batch_fixes": batch_fixes}
+        )
+        linter = Linter(config=config)
+        best = float("inf")
+        for _ in range(REPEATS):
+            handler = _CountingHandler(batch_fixes)
+            linter_logger.addHandler(handler)
+            start = time.perf_counter()
+            result = linter.lint_string(sql, fname=path, fix=True)
+            best = min(best, time.perf_counter() - start)
+            linter_logger.removeHandler(handler)
+        fixed, _ = result.fix_string()
+        if per_rule_fixed is None:
+            per_rule_fixed = fixed
+        print(
+            f"{label:>10} {handler.counts['loops']:>6} "
+            f"{handler.counts['applied']:>8} {best:>10.3f} "
+            f"{str(fixed == per_rule_fixed):>9}"
+        )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,89 @@
+"""Benchmark templating files with a large macro library.
+
+Writes some macro files to a temporary directory, and times templating
+some files which use them with the jinja templater: with the jinja
+environment cache cleared before each file (so the macros are compiled
+for every file), and with it shared between the files. This reports
+the best time of several runs for each.
+
+Usage: python benchmarks/jinja_environments.py [macro files] [files]
+"""
+
+import sys
+import tempfile
+import time
+
+from sqlfluff.core import FluffConfig
+from sqlfluff.core.templaters import JinjaTemplater
+from sqlfluff.core.templaters.jinja import jinja_environment_cache
+
+REPEATS = 3
+
+MACRO_FILE = """
+{{% macro cents_to_dollars_{idx}(column_name, precision=2) %}}
+    ({{{{ column_name }}}} / 100)::numeric(16, {{{{ precision }}}})
+{{% endmacro %}}
+
+{{% macro safe_divide_{idx}(numerator, denominator) %}}
+    {{% if denominator %}}
+        {{{{ numerator }}}} / nullif({{{{ denominator }}}}, 0)
+    {{% else %}}
+        null
+    {{% endif %}}
+{{% endmacro %}}
+"""
+
+MODEL_FILE = """
+select
+    order_id,
+    {{ cents_to_dollars_0('amount') }} as amount,
+    {{ safe_divide_1('amount', 'quantity') }} as unit_price
+from {{ source_table }}
+"""
+
+
+def _time_templating(
+    templater: JinjaTemplater, config: FluffConfig, num_files: int, shared: bool
+) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        jinja_environment_cache.clear()
+        start = time.perf_counter()
+        for idx in range(num_files):
+            if not shared:
+                jinja_environment_cache.clear()
+            templated_file, violations = templater.process(
+                in_str=MODEL_FILE, fname=f"model_{idx}.sql", config=config
+            )
+            assert templated_file and not violations, violations
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(num_macro_files: int = 400, num_files: int = 20) -> None:
+    """Time templating files with and without sharing environments."""
+    with tempfile.TemporaryDirectory() as macros_path:
+        for idx in range(num_macro_files):
+            with open(f"{macros_path}/macros_{idx}.sql", "w") as f:
+                f.write(MACRO_FILE.format(idx=idx))
+        config = FluffConfig(
+            configs={
+                "templater": {
+                    "jinja": {
+                        "load_macros_from_path": macros_path,
+                        "context": {"source_table": "orders"},
+                    }
+                }
+            },
+            overrides={"dialect": "ansi"},
+        )
+        templater = JinjaTemplater()
+        print(f"{num_macro_files} macro files, {num_files} files")
+        print(f"{'environments':>12} {'time (s)':>9}")
+        for label, shared in (("per file", False), ("shared", True)):
+            best = _time_templating(templater, config, num_files, shared)
+            print(f"{label:>12} {best:>9.3f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,106 @@
+"""Benchmark slicing heavily templated dbt-style models.
+
+Generates some models with loops, conditionals and macro calls, and times
+templating them with the jinja templater: rendering each template twice
+(once traced and once plain) with the analysis redone for every file, and
+reconstructing the output from the traced render with the analysis cached.
+The corpus includes duplicate models, as generated projects often do. This
+reports the best time of several runs for each.
+
+Usage: python benchmarks/jinja_slicing.py [models] [columns]
+"""
+
+import sys
+import time
+
+from sqlfluff.core import FluffConfig
+from sqlfluff.core.templaters import JinjaTemplater
+from sqlfluff.core.templaters.slicers.tracer import jinja_analysis_cache
+
+REPEATS = 3
+
+MODEL_FILE = """
+{{%- set payment_methods = {methods} -%}}
+{{% macro amount(column_name) -%}}
+    coalesce({{{{ column_name }}}}, 0) / 100
+{{%- endmacro %}}
+
+with payments as (
+    select * from {{{{ source_schema }}}}.payments_{idx}
+),
+
+pivoted as (
+    select
+        order_id,
+        {{%- for method in payment_methods %}}
+        sum(
+            case when payment_method = '{{{{ method }}}}'
+            then {{{{ amount('amount') }}}} else 0 end
+        ) as {{{{ method }}}}_amount
+        {{%- if not loop.last %}},{{% endif %}}
+        {{%- endfor %}}
+    from payments
+    {{% if is_incremental %}}
+    where created_at > (select max(created_at) from {{{{ this }}}})
+    {{% endif %}}
+    group by 1
+)
+
+select * from pivoted
+"""
+
+
+def _time_templating(
+    templater: JinjaTemplater,
+    config: FluffConfig,
+    models,
+    single_render: bool,
+) -> float:
+    templater.single_render_tracing = single_render
+    best = float("inf")
+    for _ in range(REPEATS):
+        jinja_analysis_cache.clear()
+        start = time.perf_counter()
+        for fname, model in models:
+            if not single_render:
+                jinja_analysis_cache.clear()
+            templated_file, violations = templater.process(
+                in_str=model, fname=fname, config=config
+            )
+            assert templated_file and not violations, violations
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(num_models: int = 200, num_columns: int = 50) -> None:
+    """Time templating models with and without the single render."""
+    methods = [f"method_{idx}" for idx in range(num_columns)]
+    # Half the models are duplicates of the others.
+    models = [
+        (f"model_{idx}.sql", MODEL_FILE.format(methods=methods, idx=idx // 2))
+        for idx in range(num_models)
+    ]
+    config = FluffConfig(
+        configs={
+            "templater": {
+                "jinja": {
+                    "context": {
+                        "source_schema": "raw",
+                        "is_incremental": True,
+                        "this": "analytics.payments",
+                    }
+                }
+            }
+        },
+        overrides={"dialect": "ansi"},
+    )
+    templater = JinjaTemplater()
+    print(f"{num_models} models, {num_columns} columns")
+    print(f"{'slicing':>14} {'time (s)':>9}")
+    for label, single_render in (("double render", False), ("single render", True)):
+        best = _time_templating(templater, config, models, single_render)
+        print(f"{label:>14} {best:>9.3f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,77 @@
+"""Benchmark the layout rules on parsed files.
+
+Parses some files once, and then times running the layout rules on each
+of them as the linter does: with the tree indexed afresh for each file
+(so the reflow analysis is worked out again), and the rules run one after
+the other on the same tree. This reports the best time of several runs
+for each rule and for the group as a whole.
+
+Usage: python benchmarks/layout_rules.py [dialect] [path ...]
+"""
+
+import glob
+import os
+import sys
+import time
+from typing import Dict
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.parser.segments.type_index import TypeIndex
+
+REPEATS = 5
+
+
+def main(dialect: str = "ansi", *paths: str) -> None:
+    """Time the layout rules on some files."""
+    if not paths:
+        paths = (
+            "benchmarks/bench_001_package.sql",
+            "benchmarks/bench_002/bench_002_pearson.sql",
+            *sorted(
+                glob.glob(os.path.join("test", "fixtures", "dialects", "ansi", "*.sql"))
+            ),
+        )
+    linter = Linter(config=FluffConfig(overrides={"dialect": dialect}))
+    parsed_files = []
+    for path in paths:
+        with open(path, encoding="utf8") as f:
+            parsed = linter.parse_string(f.read(), fname=path)
+        if parsed.tree:
+            parsed_files.append(parsed)
+    rules = [
+        rule
+        for rule in linter.get_rulepack(config=parsed_files[0].config).rules
+        if "layout" in rule.groups
+    ]
+    print(f"{len(rules)} layout rules, {len(parsed_files)} files")
+
+    timings: Dict[str, float] = {}
+    for _ in range(REPEATS):
+        run_timings = {rule.code: 0.0 for rule in rules}
+        for parsed in parsed_files:
+            assert parsed.tree
+            # A fresh index, as the linter builds for each tree.
+            TypeIndex.build(parsed.tree)
+            kwargs = dict(
+                dialect=parsed.config.get("dialect_obj"),
+                fix=False,
+                templated_file=parsed.templated_file,
+                ignore_mask=None,
+                fname=parsed.fname,
+                config=parsed.config,
+            )
+            for rule in rules:
+                start = time.perf_counter()
+                rule.crawl(parsed.tree, **kwargs)
+                run_timings[rule.code] += time.perf_counter() - start
+        run_timings["total"] = sum(run_timings.values())
+        for code, duration in run_timings.items():
+            timings[code] = min(timings.get(code, float("inf")), duration)
+
+    print(f"{'rule':>8} {'time (s)':>10}")
+    for code, duration in timings.items():
+        print(f"{code:>8} {duration:>10.3f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,45 @@
+"""Benchmark lexing time against file size.
+
+Generates SQL files of increasing size (up to a few MB) and times
+lexing each of them. Lexing should scale linearly, so the time per
+MB should stay roughly constant as the files get larger.
+
+Usage: python benchmarks/lex_scaling.py [dialect]
+"""
+
+import sys
+import time
+
+from sqlfluff.core import FluffConfig
+from sqlfluff.core.parser import Lexer
+
+STATEMENT = """
+SELECT
+    a.id,
+    a.name AS "Name",  -- inline comment
+    SUM(b.amount * 1.5e3) AS total,
+    'it''s a string' AS str
+FROM schema_a.table_a AS a
+/* a block
+   comment */
+INNER JOIN table_b AS b ON a.id = b.a_id
+WHERE a.created_at > '2020-01-01' AND b.flag <> 0
+GROUP BY 1, 2;
+"""
+
+
+def main(dialect: str = "ansi") -> None:
+    """Time lexing a series of generated files."""
+    lexer = Lexer(config=FluffConfig(overrides={"dialect": dialect}))
+    print(f"{'size (MB)':>10} {'time (s)':>10} {'s/MB':>10}")
+    for repeats in (1000, 2000, 4000, 8000):
+        raw = STATEMENT * repeats
+        start = time.perf_counter()
+        lexer.lex(raw)
+        duration = time.perf_counter() - start
+        size = len(raw) / 1e6
+        print(f"{size:>10.2f} {duration:>10.2f} {duration / size:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,63 @@
+"""Benchmark the memory used by parsed trees.
+
+Parses each file of the dialect fixture corpus with :mod:`tracemalloc`
+running, and reports the peak memory while parsing and the memory held
+by the parsed tree once parsing is done, in KiB per thousand raw
+segments (tokens). The trees are then pickled and unpickled (as they
+are when returned from the worker processes of the parallel runner) to
+check they survive the round trip.
+
+Usage: python benchmarks/parse_memory.py [dialect ...]
+"""
+
+import glob
+import os
+import pickle
+import sys
+import tracemalloc
+
+from sqlfluff.core import FluffConfig, Linter
+
+
+def main(*dialects: str) -> None:
+    """Measure the memory of parsing the fixture files for some dialects."""
+    print(f"{'dialect':>12} {'files':>6} {'tokens':>8} {'peak/1k':>10} {'tree/1k':>10}")
+    for dialect in dialects or ("ansi", "snowflake", "tsql"):
+        linter = Linter(config=FluffConfig(overrides={"dialect": dialect}))
+        # Parse something first, so the grammar is set up before measuring.
+        linter.parse_string("select 1\n")
+        paths = sorted(
+            glob.glob(os.path.join("test", "fixtures", "dialects", dialect, "*.sql"))
+        )
+        files = tokens = peak = held = 0
+        for path in paths:
+            with open(path, encoding="utf8") as f:
+                sql = f.read()
+            tracemalloc.start()
+            parsed = linter.parse_string(sql, fname=path)
+            current, file_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            if not parsed.tree:  # pragma: no cover
+                continue
+            files += 1
+            file_tokens = len(parsed.tree.raw_segments)
+            tokens += file_tokens
+            peak += file_peak
+            held += current
+            # Check the tree survives being sent between processes.
+            unpickled = pickle.loads(pickle.dumps(parsed.tree))
+            assert unpickled.raw == parsed.tree.raw
+            assert unpickled.raw_segments[-1].pos_marker == (
+                parsed.tree.raw_segments[-1].pos_marker
+            )
+        # In KiB per thousand tokens.
+        peak_per_1k = peak / tokens * 1000 / 1024
+        held_per_1k = held / tokens * 1000 / 1024
+        print(
+            f"{dialect:>12} {files:>6} {tokens:>8} "
+            f"{peak_per_1k:>6.0f} KiB {held_per_1k:>6.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,51 @@
+"""Benchmark slicing python format strings with many placeholders.
+
+Times the python templater slicing files with increasing numbers of
+`{placeholder}` substitutions, and reports the time per placeholder,
+which should stay roughly flat if slicing scales linearly. This
+reports the best time of several runs for each size.
+
+Usage: python benchmarks/python_slicing.py [placeholders ...]
+"""
+
+import sys
+import time
+
+from sqlfluff.core.templaters import PythonTemplater
+
+REPEATS = 3
+
+
+def _time_slicing(num_placeholders: int) -> float:
+    raw_str = (
+        "SELECT\n"
+        + "".join(
+            f"    {{tbl}}.col_{idx} + {{v{idx}}} AS c{idx},\n"
+            for idx in range(num_placeholders // 2)
+        )
+        + "    1\nFROM {tbl}\n"
+    )
+    context = {f"v{idx}": idx * 7 for idx in range(num_placeholders // 2)}
+    context["tbl"] = "my_table"
+    templater = PythonTemplater(override_context=context)
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        _, sliced_file, _ = templater.slice_file(
+            raw_str, render_func=lambda s: s.format(**context)
+        )
+        best = min(best, time.perf_counter() - start)
+        assert sliced_file
+    return best
+
+
+def main(*sizes: int) -> None:
+    """Time slicing files with increasing numbers of placeholders."""
+    print(f"{'placeholders':>12} {'time (s)':>9} {'us/placeholder':>15}")
+    for size in sizes or (500, 1000, 2000, 4000, 8000):
+        best = _time_slicing(size)
+        print(f"{size:>12} {best:>9.3f} {best / size * 1e6:>15.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,61 @@
+"""Benchmark running all the rules on a parsed file.
+
+Parses a file once and then times running every rule on the tree,
+both crawling the tree separately for each rule and crawling it once
+for all the rules which can be combined. The best of several runs of
+each is reported.
+
+Usage: python benchmarks/rule_throughput.py [path] [dialect]
+"""
+
+import sys
+import time
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.rules.combined_crawler import CombinedCrawler
+
+REPEATS = 10
+
+
+def main(path: str = "benchmarks/bench_001_package.sql", dialect: str = "ansi") -> None:
+    """Time crawling a file with all rules, individually and combined."""
+    linter = Linter(config=FluffConfig(overrides={"dialect": dialect}))
+    with open(path, encoding="utf8") as f:
+        parsed = linter.parse_string(f.read(), fname=path)
+    assert parsed.tree
+    rules = linter.get_rulepack(config=parsed.config).rules
+    kwargs = dict(
+        dialect=parsed.config.get("dialect_obj"),
+        fix=False,
+        templated_file=parsed.templated_file,
+        ignore_mask=None,
+        fname=path,
+        config=parsed.config,
+    )
+    segments = sum(1 for _ in parsed.tree.recursive_crawl_all())
+    print(f"{len(rules)} rules, {segments} segments")
+
+    combinable = [rule for rule in rules if CombinedCrawler.can_combine(rule)]
+    others = [rule for rule in rules if not CombinedCrawler.can_combine(rule)]
+    runs = {
+        "individual": lambda: [rule.crawl(parsed.tree, **kwargs) for rule in rules],
+        "combined": lambda: (
+            CombinedCrawler(combinable).crawl(parsed.tree, **kwargs),
+            [rule.crawl(parsed.tree, **kwargs) for rule in others],
+        ),
+    }
+    # Interleave the runs and take the best of each, to reduce noise.
+    timings = {label: float("inf") for label in runs}
+    for _ in range(REPEATS):
+        for label, run in runs.items():
+            start = time.perf_counter()
+            run()
+            timings[label] = min(timings[label], time.perf_counter() - start)
+
+    print(f"{'crawl':>12} {'time (s)':>10} {'segments/s':>12}")
+    for label, duration in timings.items():
+        print(f"{label:>12} {duration:>10.3f} {segments / duration:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,67 @@
+"""Benchmark constructing a large tree of segments.
+
+Builds a tree of 100k raw segments (in groups of 100 under a parent
+segment) with the segment ids assigned as normal, and again with a
+`uuid4()` passed in for each segment (as segments were identified
+before). This reports the best time of several runs for each, and the
+memory held by the ids of the tree.
+
+Usage: python benchmarks/segment_ids.py [segments]
+"""
+
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlfluff.core.parser import BaseSegment, CodeSegment, PositionMarker
+from sqlfluff.core.templaters import TemplatedFile
+
+REPEATS = 5
+CHILDREN = 100
+
+
+def _build_tree(
+    num_segments: int, make_id: Optional[Callable[[], Any]], pos_marker: PositionMarker
+) -> BaseSegment:
+    kwargs: Dict[str, Any] = {}
+    parents: List[BaseSegment] = []
+    for _ in range(num_segments // CHILDREN):
+        children: List[BaseSegment] = []
+        for _ in range(CHILDREN):
+            if make_id:
+                kwargs["uuid"] = make_id()
+            children.append(CodeSegment("a", pos_marker, **kwargs))
+        if make_id:
+            kwargs["uuid"] = make_id()
+        parents.append(BaseSegment(tuple(children), pos_marker, **kwargs))
+    return BaseSegment(tuple(parents), pos_marker)
+
+
+def _time_build(
+    num_segments: int, make_id: Optional[Callable[[], Any]], pos_marker: PositionMarker
+) -> Tuple[float, int]:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        tree = _build_tree(num_segments, make_id, pos_marker)
+        best = min(best, time.perf_counter() - start)
+    # The memory of the ids themselves.
+    id_bytes = sum(sys.getsizeof(seg.uuid) for seg in tree.raw_segments)
+    if isinstance(tree.raw_segments[0].uuid, type(uuid4())):
+        id_bytes += sum(sys.getsizeof(seg.uuid.int) for seg in tree.raw_segments)
+    return best, id_bytes
+
+
+def main(num_segments: int = 100_000) -> None:
+    """Time building a tree with each kind of segment id."""
+    templated_file = TemplatedFile.from_string("a")
+    pos_marker = PositionMarker(slice(0, 1), slice(0, 1), templated_file)
+    print(f"{'ids':>8} {'segments':>9} {'time (s)':>9} {'id bytes':>9}")
+    for label, make_id in (("counter", None), ("uuid4", uuid4)):
+        best, id_bytes = _time_build(num_segments, make_id, pos_marker)
+        print(f"{label:>8} {num_segments:>9} {best:>9.3f} {id_bytes:>9}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,70 @@
+"""Benchmark mapping positions in templated files with many slices.
+
+Templates files with increasing numbers of Jinja loop iterations, and
+times mapping each of their templated slices back to the source (as is
+done for the position marker of every segment), and finding the raw
+slices spanning each source slice (as is done for every fix patch). The
+time per slice should stay roughly flat if the mapping doesn't depend on
+the number of slices. This reports the best time of several runs.
+
+Usage: python benchmarks/templated_positions.py [iterations ...]
+"""
+
+import sys
+import time
+
+from sqlfluff.core import FluffConfig
+from sqlfluff.core.templaters import JinjaTemplater
+
+REPEATS = 3
+
+TEMPLATE = """
+select
+    {%- for i in range(iterations) %}
+    {%- if i % 3 == 0 %}
+    col_{{ i }} + {{ i * 7 }} as c{{ i }},
+    {%- else %}
+    col_{{ i }} as c{{ i }},
+    {%- endif %}
+    {%- endfor %}
+    1 as last_col
+from my_table
+"""
+
+
+def _time_mapping(iterations: int):
+    templated_file, violations = JinjaTemplater().process(
+        in_str=TEMPLATE,
+        fname="loops.sql",
+        config=FluffConfig(
+            configs={"templater": {"jinja": {"context": {"iterations": iterations}}}},
+            overrides={"dialect": "ansi"},
+        ),
+    )
+    assert templated_file and not violations, violations
+    templated_slices = [tfs.templated_slice for tfs in templated_file.sliced_file]
+    source_slices = [tfs.source_slice for tfs in templated_file.sliced_file]
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for templated_slice in templated_slices:
+            templated_file.templated_slice_to_source_slice(templated_slice)
+        for source_slice in source_slices:
+            templated_file.raw_slices_spanning_source_slice(source_slice)
+        best = min(best, time.perf_counter() - start)
+    return len(templated_slices), best
+
+
+def main(*sizes: int) -> None:
+    """Time mapping positions in files with increasing numbers of slices."""
+    print(f"{'iterations':>10} {'slices':>8} {'time (s)':>9} {'us/slice':>9}")
+    for size in sizes or (250, 500, 1000, 2000, 4000):
+        num_slices, best = _time_mapping(size)
+        print(
+            f"{size:>10} {num_slices:>8} {best:>9.3f} "
+            f"{best / num_slices * 1e6:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,118 @@
+"""Benchmark re-indexing the types in a tree as fixes are applied.
+
+Each tree produced by applying fixes is indexed again in full (because
+applying fixes copies the tree, so none of the old index can be reused).
+This fixes some fix-heavy files with and without the type index, and
+reports the number of times fixes were applied, the best total time of
+several runs, and the time of that run spent applying the fixes and
+indexing the resulting trees. Indexing should be a small fraction of the
+cost of applying the fixes, and the total with the index shouldn't be
+slower than without it.
+
+Usage: python benchmarks/type_index_fixes.py [path ...]
+"""
+
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+from unittest import mock
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.parser import BaseSegment
+
+REPEATS = 3
+GENERATED_STATEMENTS = 30
+
+# A statement with lots of fixable problems, from several rules.
+FIX_HEAVY_STATEMENT = """SELECT  a.col_{idx} ,b.col_{idx}+1 AS total_{idx},
+   CASE WHEN a.x = {idx} THEN 'y' ELSE NULL END as flag_{idx}
+FROM tbl_{idx} a  JOIN other_{idx} b ON a.id=b.id
+WHERE a.col_{idx} > {idx} ;
+"""
+
+
+class _Timer:
+    """Times the outermost calls to a (possibly recursive) method."""
+
+    def __init__(self, method) -> None:
+        self.method = method
+        self.calls = 0
+        self.seconds = 0.0
+        self._depth = 0
+
+    def __call__(self, *args, **kwargs):
+        if self._depth:
+            return self.method(*args, **kwargs)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return self.method(*args, **kwargs)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.calls += 1
+            self._depth -= 1
+
+
+def _time_fix(
+    sql: str, config: FluffConfig, indexed: bool
+) -> Tuple[float, Dict[str, _Timer]]:
+    linter = Linter(config=config)
+    best = float("inf")
+    best_timers: Dict[str, _Timer] = {}
+    for _ in range(REPEATS):
+        timers = {
+            "apply_fixes": _Timer(BaseSegment.apply_fixes),
+            "build_type_index": _Timer(
+                BaseSegment.build_type_index if indexed else lambda self: None
+            ),
+        }
+        with mock.patch.object(
+            BaseSegment, "apply_fixes", lambda *a, **k: timers["apply_fixes"](*a, **k)
+        ), mock.patch.object(
+            BaseSegment,
+            "build_type_index",
+            lambda *a, **k: timers["build_type_index"](*a, **k),
+        ):
+            start = time.perf_counter()
+            linter.lint_string(sql, fix=True)
+            elapsed = time.perf_counter() - start
+        if elapsed < best:
+            best = elapsed
+            best_timers = timers
+    return best, best_timers
+
+
+def main(*paths: str) -> None:
+    """Time fixing files with and without the type index."""
+    files: List[Tuple[str, str, FluffConfig]] = []
+    for path in paths or ("benchmarks/bench_002/bench_002_pearson.sql",):
+        with open(path, encoding="utf8") as f:
+            files.append((path, f.read(), FluffConfig.from_path(os.path.dirname(path))))
+    files.append(
+        (
+            f"generated ({GENERATED_STATEMENTS} statements)",
+            "".join(
+                FIX_HEAVY_STATEMENT.format(idx=idx)
+                for idx in range(GENERATED_STATEMENTS)
+            ),
+            FluffConfig(overrides={"dialect": "ansi"}),
+        )
+    )
+    for name, sql, config in files:
+        print(name)
+        print(
+            f"{'index':>6} {'applied':>8} {'total (s)':>10} "
+            f"{'fixing (s)':>11} {'indexing (s)':>13}"
+        )
+        for label, indexed in (("off", False), ("on", True)):
+            best, timers = _time_fix(sql, config, indexed)
+            print(
+                f"{label:>6} {timers['apply_fixes'].calls:>8} {best:>10.3f} "
+                f"{timers['apply_fixes'].seconds:>11.3f} "
+                f"{timers['build_type_index'].seconds:>13.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,231 @@
+"""Defines the on-disk cache of compiled dbt models.
+
+Compiling a model needs the full dbt manifest, which is slow to load
+for large projects even with dbt's partial parsing. This cache stores
+the templated (and sliced) result of each model between runs, so that
+models which haven't changed are not compiled again, and if none of the
+selected models have changed then the manifest isn't loaded at all.
+
+Each entry records the files which the compiled model depends on (the
+model itself, its properties, the models it refers to and the project
+and profile files) and the macro directories of the project and its
+packages, and their hashes. All macros are included, rather than only
+those the model calls, as dbt also calls some implicitly (e.g.
+`generate_schema_name` or the targets of `adapter.dispatch`). An entry
+is only used if the run fingerprint (versions, profile, target and
+vars) and all of those files are unchanged. Anything else which dbt
+reads while compiling (e.g. the database, or environment variables
+read by the profile) isn't tracked, which is why the cache is opt-in.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlfluff.core.templaters.base import (
+    RawFileSlice,
+    TemplatedFile,
+    TemplatedFileSlice,
+)
+
+# Instantiate the templater logger
+templater_logger = logging.getLogger("sqlfluff.templater")
+
+# Bump this if the persisted format changes in a way which isn't
+# covered by the sqlfluff version (e.g. during development).
+CACHE_FORMAT_VERSION = 1
+
+
+@dataclass
+class CompiledNodeEntry:
+    """The templated result of compiling a model, and what it depended on."""
+
+    fingerprint: str
+    # The hash of the model as passed to the templater, and of its file.
+    source_hash: str
+    file_hash: Optional[str]
+    templated_str: str
+    sliced_file: List[TemplatedFileSlice]
+    raw_sliced: List[RawFileSlice]
+    # The hash of each file or directory the model depends on (None if it
+    # didn't exist).
+    dependencies: Dict[str, Optional[str]] = field(default_factory=dict)
+    # The values of the environment variables read by the project.
+    env_vars: Dict[str, Optional[str]] = field(default_factory=dict)
+
+
+def hash_str(in_str: str) -> str:
+    """Hash a string, as it's passed to the templater."""
+    return hashlib.sha256(in_str.encode("utf8", errors="backslashreplace")).hexdigest()
+
+
+class DbtCompiledNodeCache:
+    """An on-disk cache of compiled dbt models.
+
+    Entries are stored as one pickle file per model, keyed on its path.
+
+    Args:
+        cache_dir (:obj:`str`): The directory in which to store entries.
+            It will be created if it doesn't already exist.
+        fingerprint (:obj:`str`): A fingerprint of everything about this
+            run which affects compilation, other than the files.
+    """
+
+    entry_suffix = ".dbtcache"
+
+    def __init__(self, cache_dir: str, fingerprint: str) -> None:
+        self.cache_dir = cache_dir
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        # The hashes of files read during this run, with their mtime and size.
+        self._file_hashes: Dict[str, Tuple[int, int, str]] = {}
+        # The hashes of directories read during this run.
+        self._dir_hashes: Dict[str, str] = {}
+        # The entries which have been checked during this run.
+        self._fresh_entries: Dict[str, Optional[CompiledNodeEntry]] = {}
+
+    def _path_for(self, fname: str) -> str:
+        key = hashlib.sha256(os.path.abspath(fname).encode("utf8")).hexdigest()
+        return os.path.join(self.cache_dir, key + self.entry_suffix)
+
+    def hash_file(self, path: str) -> Optional[str]:
+        """Hash the contents of a file, or return None if it doesn't exist."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        known = self._file_hashes.get(path)
+        if known and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return known[2]
+        try:
+            with open(path, "rb") as f:
+                file_hash = hashlib.sha256(f.read()).hexdigest()
+        except OSError:  # pragma: no cover
+            return None
+        self._file_hashes[path] = (stat.st_mtime_ns, stat.st_size, file_hash)
+        return file_hash
+
+    def hash_path(self, path: str) -> Optional[str]:
+        """Hash a file, or the names and contents of the files in a directory.
+
+        Directories are only read once per run, as a directory's mtime
+        doesn't reflect changes to the files in its subdirectories.
+        """
+        if not os.path.isdir(path):
+            return self.hash_file(path)
+        if path not in self._dir_hashes:
+            hasher = hashlib.sha256()
+            for dirpath, dirnames, filenames in os.walk(path):
+                # Walk in a consistent order.
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    file_path = os.path.join(dirpath, filename)
+                    hasher.update(os.path.relpath(file_path, path).encode("utf8"))
+                    hasher.update(str(self.hash_file(file_path)).encode("utf8"))
+            self._dir_hashes[path] = hasher.hexdigest()
+        return self._dir_hashes[path]
+
+    def _load_fresh_entry(self, fname: str) -> Optional[CompiledNodeEntry]:
+        """Load the entry for a model, if nothing it depended on has changed."""
+        path = self._path_for(fname)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as err:  # pragma: no cover
+            # A corrupt or incompatible entry is treated as a miss.
+            templater_logger.info(
+                "Discarding unreadable dbt cache entry %s: %s", path, err
+            )
+            return None
+        if not isinstance(entry, CompiledNodeEntry) or (
+            entry.fingerprint != self.fingerprint
+        ):
+            return None
+        if entry.file_hash != self.hash_file(fname):
+            return None
+        for dependency, dependency_hash in entry.dependencies.items():
+            if self.hash_path(dependency) != dependency_hash:
+                templater_logger.debug(
+                    "dbt cache entry for %s is stale: %s changed.", fname, dependency
+                )
+                return None
+        for name, value in entry.env_vars.items():
+            if os.environ.get(name) != value:
+                return None
+        return entry
+
+    def is_fresh(self, fname: str) -> bool:
+        """Check whether a model's file and dependencies are unchanged."""
+        fname = os.path.abspath(fname)
+        if fname not in self._fresh_entries:
+            self._fresh_entries[fname] = self._load_fresh_entry(fname)
+        return self._fresh_entries[fname] is not None
+
+    def get(self, fname: str, in_str: str) -> Optional[TemplatedFile]:
+        """Fetch the templated file for a model, if it's fresh."""
+        entry = (
+            self._fresh_entries[os.path.abspath(fname)]
+            if self.is_fresh(fname)
+            else None
+        )
+        if entry is None or entry.source_hash != hash_str(in_str):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return TemplatedFile(
+            source_str=in_str,
+            templated_str=entry.templated_str,
+            fname=fname,
+            sliced_file=list(entry.sliced_file),
+            raw_sliced=list(entry.raw_sliced),
+        )
+
+    def put(
+        self,
+        fname: str,
+        templated_file: TemplatedFile,
+        dependencies: Iterable[str],
+        env_vars: Iterable[str] = (),
+    ) -> None:
+        """Store the templated file for a model, and what it depended on."""
+        path = self._path_for(fname)
+        entry = CompiledNodeEntry(
+            fingerprint=self.fingerprint,
+            source_hash=hash_str(templated_file.source_str),
+            file_hash=self.hash_file(os.path.abspath(fname)),
+            templated_str=templated_file.templated_str,
+            sliced_file=templated_file.sliced_file,
+            raw_sliced=templated_file.raw_sliced,
+            dependencies={
+                dependency: self.hash_path(dependency) for dependency in dependencies
+            },
+            env_vars={name: os.environ.get(name) for name in env_vars},
+        )
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write to a temporary file then move into place so that
+        # concurrent readers never see a partial entry.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as err:  # pragma: no cover
+            templater_logger.info("Unable to write dbt cache entry %s: %s", path, err)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self._fresh_entries[os.path.abspath(fname)] = entry
+        self.writes += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit, miss and write counts for this cache."""
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes}
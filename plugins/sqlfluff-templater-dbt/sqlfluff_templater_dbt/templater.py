@@ -11,6 +11,8 @@ DbtTemplater class and so are only imported when necessary.
 
 from collections import deque
 from contextlib import contextmanager
+import hashlib
+import json
 import os
 import os.path
 import logging
@@ -19,6 +21,7 @@ from typing import (
     List,
     Optional,
     Iterator,
+    Set,
     Tuple,
     Any,
     Dict,
@@ -39,6 +42,11 @@ from sqlfluff.core.templaters.base import TemplatedFile, large_file_check
 
 from sqlfluff.core.templaters.jinja import JinjaTemplater
 
+from sqlfluff_templater_dbt.compiled_cache import (
+    CACHE_FORMAT_VERSION,
+    DbtCompiledNodeCache,
+)
+
 if TYPE_CHECKING:  # pragma: no cover
     from dbt.semver import VersionSpecifier
     from sqlfluff.core import FluffConfig
@@ -75,6 +83,9 @@ class DbtTemplater(JinjaTemplater):
 
     name = "dbt"
     sequential_fail_limit = 3
+    # dbt strips the trailing newline when rendering, so the output can't
+    # be reconstructed from the traced render.
+    single_render_tracing = False
     adapters = {}
 
     def __init__(self, **kwargs):
@@ -355,6 +366,117 @@ class DbtTemplater(JinjaTemplater):
 
         return cli_vars if cli_vars else {}
 
+    @cached_property
+    def compiled_cache(self) -> Optional[DbtCompiledNodeCache]:
+        """Loads the cache of compiled models, if it's configured.
+
+        The cache is keyed on everything about this run which affects
+        compilation (other than the files). Like the dbt config, that's
+        only read once for each run.
+        """
+        cache_dir = self.sqlfluff_config.get_section(
+            (self.templater_selector, self.name, "compiled_cache_dir")
+        )
+        if not cache_dir:
+            return None
+        cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        from sqlfluff import __version__ as sqlfluff_version
+
+        hasher = hashlib.sha256()
+        for elem in (
+            str(CACHE_FORMAT_VERSION),
+            sqlfluff_version,
+            self.dbt_version,
+            self.project_dir,
+            self.profiles_dir,
+            str(self._get_profile()),
+            str(self._get_target()),
+            json.dumps(self._get_cli_vars(), sort_keys=True, default=str),
+        ):
+            hasher.update(elem.encode("utf8"))
+            # Separate each element so that boundaries are unambiguous.
+            hasher.update(b"\x00")
+        return DbtCompiledNodeCache(cache_dir, hasher.hexdigest())
+
+    def _project_files(self, projects) -> List[str]:
+        """The files and directories which any model may depend on.
+
+        This covers the project and profile files, and the macro
+        directories of the project and its packages. All the macros are
+        included as dbt calls some of them implicitly while compiling
+        (e.g. `generate_schema_name`, or the targets of
+        `adapter.dispatch`), so they aren't in the dependencies of
+        the node.
+        """
+        paths = [
+            os.path.join(self.project_dir, "dbt_project.yml"),
+            os.path.join(self.project_dir, "packages.yml"),
+            os.path.join(self.project_dir, "dependencies.yml"),
+            os.path.join(self.project_dir, "package-lock.yml"),
+            os.path.join(self.profiles_dir, "profiles.yml"),
+        ]
+        for project in projects:
+            paths += [
+                os.path.join(project.project_root, macro_path)
+                for macro_path in project.macro_paths
+            ]
+        return paths
+
+    def _node_dependencies(self, node) -> Optional[List[str]]:
+        """The files which the compiled SQL of a node depends on.
+
+        This covers the node's own files, the nodes and sources it refers
+        to (and recursively, the nodes which any ephemeral ones refer to,
+        as they're compiled into it) and the files of the whole project
+        (including its macros). Returns None if any of them can't be
+        found, in which case the node can't be cached.
+        """
+        projects = self.dbt_config.load_dependencies()
+        project_roots = {
+            name: project.project_root for name, project in projects.items()
+        }
+
+        def _path(package_name: str, rel_path: str) -> Optional[str]:
+            root = project_roots.get(package_name)
+            path = os.path.join(root, rel_path) if root else None
+            return path if path and os.path.exists(path) else None
+
+        paths: Set[str] = set(self._project_files(projects.values()))
+        seen: Set[str] = set()
+        to_visit = [node]
+        while to_visit:
+            resource = to_visit.pop()
+            path = _path(resource.package_name, resource.original_file_path)
+            if path is None:
+                return None
+            paths.add(path)
+            patch_path = getattr(resource, "patch_path", None)
+            if patch_path:
+                # The patch path is prefixed with the name of its package.
+                package_name, _, rel_path = patch_path.rpartition("://")
+                path = _path(package_name or resource.package_name, rel_path)
+                if path is None:  # pragma: no cover
+                    return None
+                paths.add(path)
+            # Only the relation name of other (non-ephemeral) nodes and
+            # sources is compiled in, which depends on their files.
+            if resource is not node and (
+                not hasattr(resource, "depends_on")
+                or getattr(resource.config, "materialized", None) != "ephemeral"
+            ):
+                continue
+            for unique_id in resource.depends_on.nodes:
+                if unique_id in seen:
+                    continue
+                seen.add(unique_id)
+                upstream = self.dbt_manifest.nodes.get(
+                    unique_id
+                ) or self.dbt_manifest.sources.get(unique_id)
+                if upstream is None:  # pragma: no cover
+                    return None
+                to_visit.append(upstream)
+        return sorted(paths)
+
     def sequence_files(
         self, fnames: List[str], config=None, formatter=None
     ) -> Iterator[str]:
@@ -372,6 +494,16 @@ class DbtTemplater(JinjaTemplater):
         if not self.profiles_dir:
             self.profiles_dir = self._get_profiles_dir()
 
+        # If none of the files need compiling, there's no need to sort them
+        # (or to load the manifest to do so).
+        if self.compiled_cache and all(
+            self.compiled_cache.is_fresh(os.path.join(self.working_dir, fname))
+            for fname in fnames
+        ):
+            templater_logger.debug("- All files are cached. Skipping sorting.")
+            yield from fnames
+            return
+
         # Populate full paths for selected files
         full_paths: Dict[str, str] = {}
         selected_files = set()
@@ -455,6 +587,14 @@ class DbtTemplater(JinjaTemplater):
         self.profiles_dir = self._get_profiles_dir()
         fname_absolute_path = os.path.abspath(fname)
 
+        # Use the cached compilation of the model, if nothing it depends on
+        # has changed.
+        if self.compiled_cache and in_str is not None:
+            templated_file = self.compiled_cache.get(fname_absolute_path, in_str)
+            if templated_file:
+                templater_logger.debug("    Using cached compilation of %s", fname)
+                return templated_file, []
+
         try:
             from dbt.exceptions import (
                 CompilationException as DbtCompilationException,
@@ -750,14 +890,29 @@ class DbtTemplater(JinjaTemplater):
         for k, v in save_ephemeral_nodes.items():
             if getattr(self.dbt_manifest.nodes[k], "compiled", False):
                 self.dbt_manifest.nodes[k] = v
+        templated_file = TemplatedFile(
+            source_str=source_dbt_sql,
+            templated_str=templated_sql,
+            fname=fname,
+            sliced_file=sliced_file,
+            raw_sliced=raw_sliced,
+        )
+        if self.compiled_cache:
+            dependencies = self._node_dependencies(node)
+            if dependencies is not None:
+                self.compiled_cache.put(
+                    fname,
+                    templated_file,
+                    dependencies,
+                    # The environment variables read by the project.
+                    env_vars=getattr(self.dbt_manifest, "env_vars", None) or (),
+                )
+            else:  # pragma: no cover
+                templater_logger.debug(
+                    "    Not caching %s, as its dependencies weren't found.", fname
+                )
         return (
-            TemplatedFile(
-                source_str=source_dbt_sql,
-                templated_str=templated_sql,
-                fname=fname,
-                sliced_file=sliced_file,
-                raw_sliced=raw_sliced,
-            ),
+            templated_file,
             # No violations returned in this way.
             [],
         )
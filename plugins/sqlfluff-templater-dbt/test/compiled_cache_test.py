@@ -0,0 +1,102 @@
+"""Tests for the on-disk cache of compiled dbt models."""
+
+from sqlfluff.core.templaters.base import (
+    RawFileSlice,
+    TemplatedFile,
+    TemplatedFileSlice,
+)
+
+from sqlfluff_templater_dbt.compiled_cache import DbtCompiledNodeCache
+
+
+def _templated_file(fname, in_str, templated_str):
+    return TemplatedFile(
+        source_str=in_str,
+        templated_str=templated_str,
+        fname=fname,
+        sliced_file=[
+            TemplatedFileSlice(
+                "templated", slice(0, len(in_str)), slice(0, len(templated_str))
+            )
+        ],
+        raw_sliced=[RawFileSlice(in_str, "templated", 0)],
+    )
+
+
+def test__compiled_cache_roundtrip(tmp_path):
+    """Test that entries are reused until a dependency changes."""
+    model = tmp_path / "model.sql"
+    macro = tmp_path / "macro.sql"
+    in_str = "select {{ my_macro() }}\n"
+    model.write_text(in_str)
+    macro.write_text("{% macro my_macro() %}1{% endmacro %}")
+    cache_dir = str(tmp_path / "cache")
+
+    cache = DbtCompiledNodeCache(cache_dir, "abc")
+    assert cache.get(str(model), in_str) is None
+    cache.put(
+        str(model),
+        _templated_file(str(model), in_str, "select 1\n"),
+        dependencies=[str(macro)],
+    )
+    assert cache.stats() == {"hits": 0, "misses": 1, "writes": 1}
+
+    # A new cache (i.e. a new run) reads the entry back from disk.
+    cache = DbtCompiledNodeCache(cache_dir, "abc")
+    assert cache.is_fresh(str(model))
+    templated_file = cache.get(str(model), in_str)
+    assert templated_file.templated_str == "select 1\n"
+    assert templated_file.source_str == in_str
+    # A different input string (e.g. after fixing) isn't a hit.
+    assert cache.get(str(model), in_str + "\n") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "writes": 0}
+
+    # A different fingerprint (e.g. target) isn't fresh.
+    assert not DbtCompiledNodeCache(cache_dir, "xyz").is_fresh(str(model))
+
+    # Nor is an entry whose dependencies have changed.
+    macro.write_text("{% macro my_macro() %}2{% endmacro %}")
+    cache = DbtCompiledNodeCache(cache_dir, "abc")
+    assert not cache.is_fresh(str(model))
+    assert cache.get(str(model), in_str) is None
+
+
+def test__compiled_cache_env_vars(tmp_path, monkeypatch):
+    """Test that entries are stale if an environment variable changes."""
+    model = tmp_path / "model.sql"
+    in_str = "select '{{ env_var(\"MY_VAR\") }}'\n"
+    model.write_text(in_str)
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setenv("MY_VAR", "a")
+
+    DbtCompiledNodeCache(cache_dir, "abc").put(
+        str(model),
+        _templated_file(str(model), in_str, "select 'a'\n"),
+        dependencies=[],
+        env_vars=["MY_VAR"],
+    )
+    assert DbtCompiledNodeCache(cache_dir, "abc").is_fresh(str(model))
+    monkeypatch.setenv("MY_VAR", "b")
+    assert not DbtCompiledNodeCache(cache_dir, "abc").is_fresh(str(model))
+
+
+def test__compiled_cache_directory_dependency(tmp_path):
+    """Test that entries are stale if a file in a directory changes."""
+    model = tmp_path / "model.sql"
+    macros = tmp_path / "macros"
+    (macros / "nested").mkdir(parents=True)
+    (macros / "nested" / "echo.sql").write_text("{% macro echo(x) %}{% endmacro %}")
+    in_str = "select 1\n"
+    model.write_text(in_str)
+    cache_dir = str(tmp_path / "cache")
+
+    DbtCompiledNodeCache(cache_dir, "abc").put(
+        str(model),
+        _templated_file(str(model), in_str, in_str),
+        dependencies=[str(macros)],
+    )
+    assert DbtCompiledNodeCache(cache_dir, "abc").is_fresh(str(model))
+
+    # Adding a file (e.g. an override of a builtin macro) makes it stale.
+    (macros / "generate_schema_name.sql").write_text("")
+    assert not DbtCompiledNodeCache(cache_dir, "abc").is_fresh(str(model))
@@ -519,6 +519,77 @@ def test__context_in_config_is_loaded(
     assert str(var_value) in processed.templated_str
 
 
+def test__templater_dbt_compiled_cache(
+    project_dir, dbt_templater, tmp_path  # noqa: F811
+):
+    """Test that unchanged models are reused from the compiled cache."""
+    config_dict = deepcopy(DBT_FLUFF_CONFIG)
+    config_dict["templater"]["dbt"]["compiled_cache_dir"] = str(tmp_path)
+    config = FluffConfig(config_dict)
+    path = Path(project_dir) / "models/my_new_project/use_var.sql"
+    in_str = path.read_text()
+
+    templated_file, violations = dbt_templater.process(
+        in_str=in_str, fname=str(path), config=config
+    )
+    assert not violations
+    assert dbt_templater.compiled_cache.stats() == {
+        "hits": 0,
+        "misses": 1,
+        "writes": 1,
+    }
+
+    # A fresh templater reuses the compiled model, without loading the
+    # manifest to sort or compile it.
+    templater = FluffConfig(overrides={"dialect": "ansi"}).get_templater("dbt")
+    with mock.patch.object(
+        DbtTemplater, "dbt_manifest", new_callable=mock.PropertyMock
+    ) as dbt_manifest:
+        assert list(templater.sequence_files([str(path)], config=config)) == [str(path)]
+        cached_file, violations = templater.process(
+            in_str=in_str, fname=str(path), config=config
+        )
+        dbt_manifest.assert_not_called()
+    assert not violations
+    assert cached_file.templated_str == templated_file.templated_str
+    assert cached_file.sliced_file == templated_file.sliced_file
+    assert templater.compiled_cache.stats()["hits"] == 1
+
+    # Changing the input means it's compiled again.
+    templater.process(in_str=in_str + "\n", fname=str(path), config=config)
+    assert templater.compiled_cache.stats()["misses"] == 1
+
+
+def test__templater_dbt_compiled_cache_macro_override(tmp_path):
+    """Test that overriding a macro dbt calls implicitly invalidates the cache."""
+    tmp_project_dir = tmp_path / "dbt_project"
+    shutil.copytree(
+        DBT_FLUFF_CONFIG["templater"]["dbt"]["project_dir"], tmp_project_dir
+    )
+    config_dict = deepcopy(DBT_FLUFF_CONFIG)
+    config_dict["templater"]["dbt"]["project_dir"] = str(tmp_project_dir)
+    config_dict["templater"]["dbt"]["compiled_cache_dir"] = str(tmp_path / "cache")
+    config = FluffConfig(config_dict)
+    path = tmp_project_dir / "models/my_new_project/use_var.sql"
+
+    templater = FluffConfig(overrides={"dialect": "ansi"}).get_templater("dbt")
+    templater.process(in_str=path.read_text(), fname=str(path), config=config)
+    templater = FluffConfig(overrides={"dialect": "ansi"}).get_templater("dbt")
+    assert list(templater.sequence_files([str(path)], config=config))
+    assert templater.compiled_cache.is_fresh(str(path))
+
+    # `generate_schema_name` isn't in the dependencies of any model, but
+    # decides the relation names which `ref()` compiles to.
+    (tmp_project_dir / "macros" / "generate_schema_name.sql").write_text(
+        "{% macro generate_schema_name(custom_schema_name, node) -%}\n"
+        "    other_schema\n"
+        "{%- endmacro %}\n"
+    )
+    templater = FluffConfig(overrides={"dialect": "ansi"}).get_templater("dbt")
+    assert list(templater.sequence_files([str(path)], config=config))
+    assert not templater.compiled_cache.is_fresh(str(path))
+
+
 def test__dbt_log_supression():
     """Test that when we try and parse in JSON format we get JSON.
 
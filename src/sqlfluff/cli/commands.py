@@ -7,7 +7,7 @@ import json
 import logging
 import time
 from logging import LogRecord
-from typing import Callable, Tuple, Optional
+from typing import Callable, Dict, Tuple, Optional
 
 import yaml
 
@@ -41,6 +41,11 @@ from sqlfluff.core import (
     dialect_readout,
 )
 from sqlfluff.core.linter import LintingResult
+from sqlfluff.core.linter.scheduling import load_timing_history
+from sqlfluff.core.parser.memo import statement_memo_stats
+from sqlfluff.core.parser.trace import write_chrome_trace
+from sqlfluff.core.templaters.jinja import jinja_environment_stats
+from sqlfluff.core.templaters.slicers.tracer import jinja_analysis_cache
 from sqlfluff.core.config import progress_bar_configuration
 
 from sqlfluff.core.enums import FormatType, Color
@@ -350,11 +355,34 @@ def lint_options(f: Callable) -> Callable:
         default=None,
         help=(
             "A filename to persist the timing information for a linting run to "
-            "in csv format for external analysis. NOTE: This feature should be "
+            "in csv format for external analysis. If the file already exists, "
+            "the timings in it are used to schedule the most expensive files "
+            "first when running in parallel. NOTE: This feature should be "
             "treated as beta, and the format of the csv file may change in "
             "future releases without warning."
         ),
     )(f)
+    f = click.option(
+        "--profile-rules",
+        default=None,
+        help=(
+            "A filename to write a profile of the rules to, with the number of "
+            "times each rule was evaluated, the time spent on each type of "
+            "segment, the fixes found and the functions each rule spent the "
+            "most time in. This slows linting down."
+        ),
+    )(f)
+    f = click.option(
+        "--profile-rules-format",
+        default="json",
+        type=click.Choice(["json", "chrome"], case_sensitive=False),
+        help=(
+            "The format of the --profile-rules file. This is either a JSON "
+            "summary of each rule, or a trace of every evaluation in the "
+            "Chrome trace event format (which can be opened in Perfetto or "
+            "speedscope). Defaults to json."
+        ),
+    )(f)
     f = click.option(
         "--warn-unused-ignores",
         is_flag=True,
@@ -400,6 +428,7 @@ def get_config(
         from_root_kwargs["require_dialect"] = kwargs.pop("require_dialect")
 
     library_path = kwargs.pop("library_path", None)
+    no_cache = kwargs.pop("no_cache", False)
 
     if not kwargs.get("warn_unused_ignores", True):
         # If it's present AND True, then keep it, otherwise remove this so
@@ -414,6 +443,9 @@ def get_config(
             library_path = None  # Set an explicit None value.
         # Set the global override
         overrides["library_path"] = library_path
+    if no_cache:
+        # Set an explicit None value to disable any configured cache.
+        overrides["cache_dir"] = None
     try:
         return FluffConfig.from_root(
             extra_config_path=extra_config_path,
@@ -525,6 +557,45 @@ def dump_file_payload(filename: Optional[str], payload: str) -> None:
         click.echo(payload)
 
 
+def _get_timing_history(persist_timing: Optional[str]) -> Optional[Dict[str, float]]:
+    """Load the timings from a previous run, if they exist."""
+    if persist_timing and os.path.isfile(persist_timing):
+        return load_timing_history(persist_timing)
+    return None
+
+
+def _echo_statement_memo_stats(formatter) -> None:
+    """Output the hits and misses of the statement memo, if enabled."""
+    memo_stats = statement_memo_stats()
+    if memo_stats:
+        click.echo("=== statement memo ===")
+        click.echo(formatter.cli_table(memo_stats.items(), cols=3, col_width=20))
+
+
+def _echo_jinja_environment_stats(formatter) -> None:
+    """Output the hits and misses of the jinja caches, if used."""
+    environment_stats = jinja_environment_stats()
+    if environment_stats:
+        click.echo("=== jinja environments ===")
+        click.echo(formatter.cli_table(environment_stats.items(), cols=3, col_width=20))
+    if jinja_analysis_cache.hits or jinja_analysis_cache.misses:
+        click.echo("=== jinja analysis ===")
+        click.echo(
+            formatter.cli_table(
+                jinja_analysis_cache.stats().items(), cols=3, col_width=20
+            )
+        )
+
+
+def _echo_scheduling_stats(result: LintingResult, formatter) -> None:
+    """Output the tail latency and worker utilisation of a parallel run."""
+    if result.scheduling_stats:
+        click.echo("=== parallel scheduling ===")
+        click.echo(
+            formatter.cli_table(result.scheduling_stats.items(), cols=3, col_width=20)
+        )
+
+
 @cli.command(cls=DeprecatedOptionsCommand)
 @common_options
 @core_options
@@ -567,6 +638,23 @@ def dump_file_payload(filename: Optional[str], payload: str) -> None:
     is_flag=True,
     help="Perform the operation regardless of .sqlfluffignore configurations",
 )
+@click.option(
+    "--cache-dir",
+    default=None,
+    help=(
+        "A directory in which to cache linting results between runs. Files "
+        "which are unchanged since a previous run (including their config and "
+        "the enabled rules) are not linted again. This overrides the "
+        "`cache_dir` value from configuration."
+    ),
+    type=click.Path(file_okay=False),
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=None,
+    help="Disable the linting result cache, even if configured.",
+)
 @click.argument("paths", nargs=-1, type=click.Path(allow_dash=True))
 def lint(
     paths: Tuple[str],
@@ -580,6 +668,8 @@ def lint(
     processes: Optional[int] = None,
     disable_progress_bar: Optional[bool] = False,
     persist_timing: Optional[str] = None,
+    profile_rules: Optional[str] = None,
+    profile_rules_format: str = "json",
     extra_config_path: Optional[str] = None,
     ignore_local_config: bool = False,
     **kwargs,
@@ -603,7 +693,14 @@ def lint(
 
     """
     config = get_config(
-        extra_config_path, ignore_local_config, require_dialect=False, **kwargs
+        extra_config_path,
+        ignore_local_config,
+        require_dialect=False,
+        profile_rules=True if profile_rules else None,
+        profile_rule_events=(
+            True if profile_rules and profile_rules_format == "chrome" else None
+        ),
+        **kwargs,
     )
     non_human_output = (format != FormatType.human.value) or (write_output is not None)
     file_output = None
@@ -637,6 +734,7 @@ def lint(
                 ignore_non_existent_files=False,
                 ignore_files=not disregard_sqlfluffignores,
                 processes=processes,
+                timing_history=_get_timing_history(persist_timing),
             )
 
     # Output the final stats
@@ -703,10 +801,21 @@ def lint(
     if persist_timing:
         result.persist_timing_records(persist_timing)
 
+    if profile_rules:
+        result.persist_rule_profile(profile_rules, profile_rules_format)
+
     output_stream.close()
     if bench:
         click.echo("==== overall timings ====")
         click.echo(formatter.cli_table([("Clock time", result.total_time)]))
+        if result.cache_stats:
+            click.echo("=== result cache ===")
+            click.echo(
+                formatter.cli_table(result.cache_stats.items(), cols=4, col_width=15)
+            )
+        _echo_scheduling_stats(result, formatter)
+        _echo_statement_memo_stats(formatter)
+        _echo_jinja_environment_stats(formatter)
         timing_summary = result.timing_summary()
         for step in timing_summary:
             click.echo(f"=== {step} ===")
@@ -801,6 +910,8 @@ def _paths_fix(
     show_lint_violations,
     warn_force: bool = True,
     persist_timing: Optional[str] = None,
+    profile_rules: Optional[str] = None,
+    profile_rules_format: str = "json",
 ) -> None:
     """Handle fixing from paths."""
     # Lint the paths (not with the fix argument at this stage), outputting as we go.
@@ -824,6 +935,7 @@ def _paths_fix(
             apply_fixes=force,
             fixed_file_suffix=fixed_suffix,
             fix_even_unparsable=fix_even_unparsable,
+            timing_history=_get_timing_history(persist_timing),
         )
 
     if not fix_even_unparsable:
@@ -885,6 +997,9 @@ def _paths_fix(
     if bench:
         click.echo("==== overall timings ====")
         click.echo(formatter.cli_table([("Clock time", result.total_time)]))
+        _echo_scheduling_stats(result, formatter)
+        _echo_statement_memo_stats(formatter)
+        _echo_jinja_environment_stats(formatter)
         timing_summary = result.timing_summary()
         for step in timing_summary:
             click.echo(f"=== {step} ===")
@@ -905,6 +1020,9 @@ def _paths_fix(
     if persist_timing:
         result.persist_timing_records(persist_timing)
 
+    if profile_rules:
+        result.persist_rule_profile(profile_rules, profile_rules_format)
+
     sys.exit(exit_code)
 
 
@@ -968,6 +1086,8 @@ def fix(
     processes: Optional[int] = None,
     disable_progress_bar: Optional[bool] = False,
     persist_timing: Optional[str] = None,
+    profile_rules: Optional[str] = None,
+    profile_rules_format: str = "json",
     extra_config_path: Optional[str] = None,
     ignore_local_config: bool = False,
     show_lint_violations: bool = False,
@@ -991,7 +1111,14 @@ def fix(
         kwargs["verbose"] = -1
 
     config = get_config(
-        extra_config_path, ignore_local_config, require_dialect=False, **kwargs
+        extra_config_path,
+        ignore_local_config,
+        require_dialect=False,
+        profile_rules=True if profile_rules else None,
+        profile_rule_events=(
+            True if profile_rules and profile_rules_format == "chrome" else None
+        ),
+        **kwargs,
     )
     fix_even_unparsable = config.get("fix_even_unparsable")
     output_stream = make_output_stream(
@@ -1027,6 +1154,8 @@ def fix(
             bench,
             show_lint_violations,
             persist_timing=persist_timing,
+            profile_rules=profile_rules,
+            profile_rules_format=profile_rules_format,
         )
 
 
@@ -1049,6 +1178,8 @@ def cli_format(
     processes: Optional[int] = None,
     disable_progress_bar: Optional[bool] = False,
     persist_timing: Optional[str] = None,
+    profile_rules: Optional[str] = None,
+    profile_rules_format: str = "json",
     extra_config_path: Optional[str] = None,
     ignore_local_config: bool = False,
     **kwargs,
@@ -1090,7 +1221,14 @@ def cli_format(
     )
 
     config = get_config(
-        extra_config_path, ignore_local_config, require_dialect=False, **kwargs
+        extra_config_path,
+        ignore_local_config,
+        require_dialect=False,
+        profile_rules=True if profile_rules else None,
+        profile_rule_events=(
+            True if profile_rules and profile_rules_format == "chrome" else None
+        ),
+        **kwargs,
     )
     output_stream = make_output_stream(
         config, None, os.devnull if fixing_stdin else None
@@ -1126,6 +1264,8 @@ def cli_format(
             show_lint_violations=False,
             warn_force=False,  # don't warn about being in force mode.
             persist_timing=persist_timing,
+            profile_rules=profile_rules,
+            profile_rules_format=profile_rules_format,
         )
 
 
@@ -1187,6 +1327,16 @@ def quoted_presenter(dumper, data):
         "on the use of terminators in the parser."
     ),
 )
+@click.option(
+    "--trace-file",
+    default=None,
+    help=(
+        "A filename to write a trace of the matching done by the parser to, "
+        "in the Chrome trace event format (which can be opened in Perfetto "
+        "or speedscope). This is useful for finding the grammars which make "
+        "a file slow to parse."
+    ),
+)
 @click.option(
     "--nofail",
     is_flag=True,
@@ -1207,6 +1357,7 @@ def parse(
     extra_config_path: Optional[str] = None,
     ignore_local_config: bool = False,
     parse_statistics: bool = False,
+    trace_file: Optional[str] = None,
     **kwargs,
 ) -> None:
     """Parse SQL files and just spit out the result.
@@ -1217,7 +1368,11 @@ def parse(
     be interpreted like passing the current working directory as a path argument.
     """
     c = get_config(
-        extra_config_path, ignore_local_config, require_dialect=False, **kwargs
+        extra_config_path,
+        ignore_local_config,
+        require_dialect=False,
+        parse_trace=True if trace_file else None,
+        **kwargs,
     )
     # We don't want anything else to be logged if we want json or yaml output
     # unless we're writing to a file.
@@ -1263,11 +1418,24 @@ def parse(
     total_time = time.monotonic() - t0
     violations_count = 0
 
+    if trace_file:
+        write_chrome_trace(
+            [
+                (parsed_string.fname, parsed_string.parse_trace)
+                for parsed_string in parsed_strings
+                if parsed_string.parse_trace
+            ],
+            trace_file,
+        )
+
     # iterative print for human readout
     if format == FormatType.human.value:
         violations_count = formatter.print_out_violations_and_timing(
             output_stream, bench, code_only, total_time, verbose, parsed_strings
         )
+        if bench:
+            _echo_statement_memo_stats(formatter)
+            _echo_jinja_environment_stats(formatter)
     else:
         parsed_strings_dict = [
             dict(
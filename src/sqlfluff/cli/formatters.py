@@ -1,7 +1,7 @@
 """Defines the formatters for the CLI."""
 from io import StringIO
 import sys
-from typing import List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import click
 from colorama import Style
@@ -656,9 +656,33 @@ class OutputStreamFormatter:
             for step in timing_summary:
                 output_stream.write(f"=== {step} ===")
                 output_stream.write(self.cli_table(timing_summary[step].items()))
+            parse_cache_stats = self._summarise_parse_cache_stats(parsed_strings)
+            if parse_cache_stats:
+                output_stream.write("=== parse cache ===")
+                output_stream.write(self.cli_table(parse_cache_stats.items()))
 
         return violations_count
 
+    @staticmethod
+    def _summarise_parse_cache_stats(
+        parsed_strings: List[ParsedString],
+    ) -> Dict[str, float]:
+        """Combine the parse cache statistics from several files."""
+        summary: Dict[str, float] = {}
+        for parsed_string in parsed_strings:
+            parse_stats = parsed_string.parse_stats or {}
+            for key in ("hits", "misses", "evictions"):
+                summary[key] = summary.get(key, 0) + parse_stats.get(
+                    f"parse_cache_{key}", 0
+                )
+            summary["peak size"] = max(
+                summary.get("peak size", 0), parse_stats.get("parse_cache_peak_size", 0)
+            )
+        lookups = summary.get("hits", 0) + summary.get("misses", 0)
+        if lookups:
+            summary["hit ratio"] = summary["hits"] / lookups
+        return summary
+
     def completion_message(self) -> None:
         """Prints message when SQLFluff is finished."""
         click.echo("All Finished" f"{'' if self.plain_output else ' 📜 🎉'}!")
@@ -1,6 +1,7 @@
 """Linter class and helper classes."""
 
 from sqlfluff.core.linter.common import ParsedString, RenderedFile, RuleTuple
+from sqlfluff.core.linter.incremental import TextEdit
 from sqlfluff.core.linter.linted_file import LintedFile
 from sqlfluff.core.linter.linter import Linter
 from sqlfluff.core.linter.linting_result import LintingResult
@@ -15,4 +16,5 @@ __all__ = (
     "LintingResult",
     "Linter",
     "RenderedFile",
+    "TextEdit",
 )
@@ -0,0 +1,283 @@
+"""Defines the on-disk cache of linting results.
+
+The cache is content addressed. The key for each file is a hash of
+everything which could influence the result of linting it: the raw
+and templated content of the file, the effective configuration, the
+enabled rules and the version of sqlfluff. If any of those change, the
+key changes and the file is linted again from scratch.
+
+Only results of *linting* are cached. Fixing requires the full parse
+tree, which is deliberately not persisted.
+"""
+
+import hashlib
+import inspect
+import logging
+import os
+import pickle
+import sys
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from sqlfluff.core.config import FluffConfig
+from sqlfluff.core.plugin.host import get_plugin_manager
+
+if sys.version_info >= (3, 8):
+    from importlib import metadata
+else:  # pragma: no cover
+    import importlib_metadata as metadata
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.linter.common import RenderedFile
+    from sqlfluff.core.linter.linted_file import LintedFile
+    from sqlfluff.core.rules import RulePack
+
+# Instantiate the linter logger
+linter_logger: logging.Logger = logging.getLogger("sqlfluff.linter")
+
+# Bump this if the persisted format changes in a way which isn't
+# covered by the sqlfluff version (e.g. during development).
+CACHE_FORMAT_VERSION = 1
+
+# Config values which have no influence on linting results, and so are
+# excluded when fingerprinting a config.
+NON_RESULT_CONFIG_KEYS = (
+    "verbose",
+    "nocolor",
+    "output_line_length",
+    "processes",
+    "cache_dir",
+    "cache_byte_limit",
+)
+
+
+def config_fingerprint(
+    config: FluffConfig, exclude: Sequence[str] = NON_RESULT_CONFIG_KEYS
+) -> str:
+    """Generate a stable fingerprint for the effective values of a config.
+
+    This uses the same (sorted) view of the config as is used to display
+    it, so private values like the dialect object aren't included, but
+    the dialect *name* is. By default, values which only affect the
+    presentation of results are skipped.
+    """
+    hasher = hashlib.sha256()
+    for indent, key, val in config.iter_vals():
+        if key in exclude:
+            continue
+        hasher.update(f"{indent}:{key}:{val!r}\n".encode("utf8"))
+    return hasher.hexdigest()
+
+
+# The hashes of rule source files, keyed on their path, mtime and size.
+_source_hashes: Dict[Tuple[str, int, int], str] = {}
+
+
+def _source_hash(cls: type) -> str:
+    """Hash the source file of a class, so that edits to it are noticed."""
+    try:
+        path = inspect.getsourcefile(cls)
+        stat = os.stat(path) if path else None
+    except (TypeError, OSError):
+        # e.g. classes defined dynamically, or without source.
+        return ""
+    if not path or not stat:  # pragma: no cover
+        return ""
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if key not in _source_hashes:
+        with open(path, "rb") as f:
+            _source_hashes[key] = hashlib.sha256(f.read()).hexdigest()
+    return _source_hashes[key]
+
+
+def rule_pack_fingerprint(rule_pack: "RulePack") -> str:
+    """Generate a fingerprint of the rules within a rule pack.
+
+    This includes the module of each rule so that user and plugin rules
+    sharing a code with a core rule are distinguished, a hash of the
+    source of each rule so that edits to user rules are noticed, and
+    the version of each registered plugin so that upgrades are.
+    """
+    hasher = hashlib.sha256()
+    for rule in rule_pack.rules:
+        rule_cls = type(rule)
+        hasher.update(
+            f"{rule.code}:{rule_cls.__module__}.{rule_cls.__qualname__}:"
+            f"{_source_hash(rule_cls)}\n".encode("utf8")
+        )
+    plugin_versions = {
+        f"{dist.project_name}=={dist.version}"
+        for _, dist in get_plugin_manager().list_plugin_distinfo()
+    }
+    for plugin_version in sorted(plugin_versions):
+        hasher.update(f"{plugin_version}\n".encode("utf8"))
+    return hasher.hexdigest()
+
+
+class LintResultCache:
+    """A size bounded, on-disk cache of `LintedFile` results.
+
+    Entries are stored as one pickle file per key, and are evicted on
+    a least recently used basis (using the file modification time, which
+    is refreshed on every hit) once the total size of the cache exceeds
+    `max_bytes`.
+
+    Args:
+        cache_dir (:obj:`str`): The directory in which to store entries.
+            It will be created if it doesn't already exist.
+        max_bytes (:obj:`int`): The maximum size of the cache on disk.
+            Set to zero or negative to disable eviction.
+    """
+
+    entry_suffix = ".lintcache"
+
+    def __init__(self, cache_dir: str, max_bytes: int = 0) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        try:
+            self._version = metadata.version("sqlfluff")
+        except metadata.PackageNotFoundError:  # pragma: no cover
+            self._version = "unknown"
+
+    @classmethod
+    def from_config(cls, config: FluffConfig) -> Optional["LintResultCache"]:
+        """Create a cache from config, or return None if it's not enabled."""
+        cache_dir = config.get("cache_dir")
+        if not cache_dir:
+            return None
+        return cls(
+            os.path.expanduser(str(cache_dir)),
+            max_bytes=config.get("cache_byte_limit", default=0) or 0,
+        )
+
+    def key_for(self, rendered: "RenderedFile", rule_pack: "RulePack") -> Optional[str]:
+        """Generate the cache key for a rendered file.
+
+        Returns None if the file isn't cacheable (e.g. if templating failed).
+        """
+        if rendered.templated_file is None:
+            return None
+        hasher = hashlib.sha256()
+        for elem in (
+            str(CACHE_FORMAT_VERSION),
+            self._version,
+            rendered.fname,
+            config_fingerprint(rendered.config),
+            rule_pack_fingerprint(rule_pack),
+            rendered.source_str,
+            rendered.templated_file.templated_str,
+        ):
+            hasher.update(elem.encode("utf8", errors="backslashreplace"))
+            # Separate each element so that boundaries are unambiguous.
+            hasher.update(b"\x00")
+        return hasher.hexdigest()
+
+    def _path_for(self, key: str) -> str:
+        # Shard by the first two characters to keep directories small.
+        return os.path.join(self.cache_dir, key[:2], key + self.entry_suffix)
+
+    def get(self, key: str) -> Optional["LintedFile"]:
+        """Fetch a result from the cache, returning None if not present."""
+        path = self._path_for(key)
+        try:
+            with open(path, "rb") as f:
+                linted_file = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as err:  # pragma: no cover
+            # A corrupt or incompatible entry is treated as a miss.
+            linter_logger.info("Discarding unreadable cache entry %s: %s", path, err)
+            self.misses += 1
+            self._remove(path)
+            return None
+        # Refresh the modification time so this entry is kept on eviction.
+        try:
+            os.utime(path)
+        except OSError:  # pragma: no cover
+            pass
+        self.hits += 1
+        return linted_file
+
+    def put(self, key: str, linted_file: "LintedFile") -> None:
+        """Store a result in the cache.
+
+        The parse tree isn't persisted, only the violations and the
+        information required to report and filter them.
+        """
+        path = self._path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file then move into place so that
+        # concurrent readers never see a partial entry.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(
+                    linted_file._replace(tree=None, timings=None),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, path)
+        except Exception as err:  # pragma: no cover
+            linter_logger.info("Unable to write cache entry %s: %s", path, err)
+            self._remove(tmp_path)
+            return
+        self.writes += 1
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:  # pragma: no cover
+            pass
+
+    def _iter_entries(self) -> List[Tuple[float, int, str]]:
+        """List entries as tuples of (mtime, size, path)."""
+        entries: List[Tuple[float, int, str]] = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for fname in filenames:
+                if not fname.endswith(self.entry_suffix):
+                    continue
+                path = os.path.join(dirpath, fname)
+                try:
+                    stat = os.stat(path)
+                except OSError:  # pragma: no cover
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def prune(self) -> None:
+        """Evict the least recently used entries until within the size limit."""
+        if self.max_bytes <= 0:
+            return
+        entries = self._iter_entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        t0 = time.monotonic()
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            self.evictions += 1
+        linter_logger.info(
+            "Evicted %s lint cache entries in %.3fs.",
+            self.evictions,
+            time.monotonic() - t0,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit, miss and eviction counts for this cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
@@ -5,6 +5,7 @@ from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 from sqlfluff.core.config import FluffConfig
 from sqlfluff.core.errors import SQLBaseError, SQLTemplaterError
 from sqlfluff.core.parser.segments.base import BaseSegment
+from sqlfluff.core.parser.trace import ParseTrace
 from sqlfluff.core.templaters import TemplatedFile
 
 
@@ -47,6 +48,10 @@ class ParsedString(NamedTuple):
             took in the process.
         `templated_file` is a :obj:`TemplatedFile` containing the details
             of the templated file.
+        `parse_stats` is a :obj:`dict` of statistics from parsing, including
+            the performance of the parse cache.
+        `parse_trace` is a :obj:`ParseTrace` of the matching done while
+            parsing, if the `parse_trace` config value is set.
     """
 
     tree: Optional[BaseSegment]
@@ -56,3 +61,5 @@ class ParsedString(NamedTuple):
     config: FluffConfig
     fname: str
     source_str: str
+    parse_stats: Optional[Dict[str, Any]] = None
+    parse_trace: Optional[ParseTrace] = None
@@ -0,0 +1,118 @@
+"""Collecting the fixes from several rules to apply together.
+
+By default, the fixes from each rule are applied as soon as the rule has
+run, so each rule in each linter loop rebuilds the tree. When batching,
+the fixes from all the rules in a loop are collected in a
+:obj:`FixBatch` and applied in a single rebuild at the end of the loop.
+
+The rules in a loop all see the same tree, so the fixes from one rule
+haven't taken into account those from another. To keep them apart, the
+fixes from a rule are only added to a batch if none of them conflict
+with the fixes already in it. Otherwise they're
+deferred, and the rule will find them again (or not) in the next loop.
+"""
+
+from bisect import bisect_right
+from typing import List, Tuple
+
+from sqlfluff.core.parser import BaseSegment
+from sqlfluff.core.rules.base import LintFix
+
+
+def fix_span(fix: LintFix) -> Tuple[int, int]:
+    """The span of the templated file a fix touches.
+
+    Creations touch the point before or after their anchor, and other
+    edits touch the whole anchor.
+    """
+    assert fix.anchor.pos_marker
+    templated_slice = fix.anchor.pos_marker.templated_slice
+    if fix.edit_type == "create_before":
+        return templated_slice.start, templated_slice.start
+    elif fix.edit_type == "create_after":
+        return templated_slice.stop, templated_slice.stop
+    return templated_slice.start, templated_slice.stop
+
+
+def _conflict_span(span: Tuple[int, int]) -> Tuple[int, int]:
+    """Map a span to a closed interval which overlaps those it conflicts with.
+
+    Edits of segments conflict if they overlap, and creations conflict
+    with each other at the same point, or with edits of segments which
+    they're inside. Edits of adjacent segments, or creations next to
+    edited segments, don't conflict. Doubling the positions maps the
+    inside of a span (without its ends) and each point to distinct
+    closed intervals, which overlap only when the spans conflict.
+    """
+    start, stop = span
+    if start == stop:
+        return 2 * start, 2 * start
+    return 2 * start + 1, 2 * stop - 1
+
+
+def _merge_spans(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge overlapping closed intervals into disjoint sorted intervals."""
+    merged: List[Tuple[int, int]] = []
+    for start, stop in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+class FixBatch:
+    """The non-conflicting fixes from several rules, to apply together."""
+
+    def __init__(self) -> None:
+        # The fixes from each rule in the batch, in the order added.
+        self.rule_fixes: List[Tuple[str, List[LintFix]]] = []
+        # The disjoint intervals (from `_conflict_span()`) covered by
+        # the batch, sorted by position.
+        self._spans: List[Tuple[int, int]] = []
+        self._starts: List[int] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.rule_fixes)
+
+    @property
+    def codes(self) -> List[str]:
+        """The codes of the rules with fixes in the batch."""
+        return [code for code, _ in self.rule_fixes]
+
+    @property
+    def fixes(self) -> List[LintFix]:
+        """All the fixes in the batch."""
+        return [fix for _, fixes in self.rule_fixes for fix in fixes]
+
+    def _overlaps(self, span: Tuple[int, int]) -> bool:
+        """Does an interval overlap any already in the batch."""
+        # The last interval starting at or before the end of this one is
+        # the only one which can overlap it, as they're disjoint.
+        idx = bisect_right(self._starts, span[1]) - 1
+        return idx >= 0 and self._spans[idx][1] >= span[0]
+
+    def add(self, code: str, fixes: List[LintFix]) -> bool:
+        """Add the fixes from a rule, if they don't conflict with the batch.
+
+        The fixes conflict if any of them edit the same part of the file
+        as the fixes already in the batch (which includes having an anchor
+        within another's), or create segments at the same point, or share
+        an anchor in a way :meth:`BaseSegment.compute_anchor_edit_info`
+        doesn't allow.
+
+        Returns:
+            True if the fixes were added, or False if they conflict and
+            should be deferred to the next loop.
+        """
+        spans = [_conflict_span(fix_span(fix)) for fix in fixes]
+        if any(self._overlaps(span) for span in spans):
+            return False
+        # Creations next to an edited segment can share its anchor.
+        anchor_info = BaseSegment.compute_anchor_edit_info(self.fixes + fixes)
+        if not all(info.is_valid for info in anchor_info.values()):
+            return False
+        self.rule_fixes.append((code, fixes))
+        self._spans = _merge_spans(self._spans + spans)
+        self._starts = [start for start, _ in self._spans]
+        return True
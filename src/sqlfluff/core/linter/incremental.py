@@ -0,0 +1,276 @@
+"""Incremental re-parsing of edited strings.
+
+Editor integrations re-parse a file after every edit, but most edits
+only affect a single statement. Rather than templating, lexing and
+parsing the whole file again, `reparse_edit()` re-lexes and re-parses
+only the statements affected by an edit, and splices them into the
+existing tree.
+
+This is only possible for files which aren't templated, and where the
+top level of the parsed file is a series of statements separated by
+statement terminators. Where that isn't the case, `reparse_edit()`
+returns None and the file should be parsed in full.
+"""
+
+import logging
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlfluff.core.errors import SQLBaseError, SQLParseError
+from sqlfluff.core.linter.common import ParsedString
+from sqlfluff.core.parser import Lexer
+from sqlfluff.core.parser.context import ParseContext
+from sqlfluff.core.parser.lexer import LexedElement
+from sqlfluff.core.parser.markers import PositionMarker
+from sqlfluff.core.parser.segments import BaseFileSegment, BaseSegment, EndOfFile
+from sqlfluff.core.templaters import TemplatedFile
+
+# Instantiate the linter logger
+linter_logger: logging.Logger = logging.getLogger("sqlfluff.linter")
+
+# Templaters for which a file without templating tags renders as itself.
+_LITERAL_TEMPLATERS = {"raw": (), "jinja": ("{{", "{%", "{#")}
+
+
+class TextEdit(NamedTuple):
+    """An edit to a string, replacing `string[start:stop]` with `replacement`.
+
+    Positions are character offsets in the source string of the parsed
+    file, i.e. after newlines have been normalised.
+    """
+
+    start: int
+    stop: int
+    replacement: str
+
+    def apply(self, string: str) -> str:
+        """Apply the edit to a string."""
+        return string[: self.start] + self.replacement + string[self.stop :]
+
+
+def _can_reparse(parsed: ParsedString, edit: TextEdit, new_source: str) -> bool:
+    """Check whether the file and edit are suitable for re-parsing."""
+    templated_file = parsed.templated_file
+    if parsed.tree is None or not isinstance(parsed.tree, BaseFileSegment):
+        return False
+    if templated_file.templated_str != templated_file.source_str or any(
+        file_slice.slice_type != "literal" for file_slice in templated_file.sliced_file
+    ):
+        return False
+    tags = _LITERAL_TEMPLATERS.get(parsed.config.get("templater"))
+    if tags is None:
+        return False
+    # Any new tag must overlap the replacement, and so be in this window.
+    new_stop = edit.start + len(edit.replacement)
+    window = new_source[max(edit.start - 1, 0) : new_stop + 1]
+    if any(tag in window for tag in tags):
+        return False
+    # Inline config comments could change how the whole file is parsed, so
+    # check the lines affected by the edit both before and after.
+    for string, start, stop in (
+        (parsed.source_str, edit.start, edit.stop),
+        (new_source, edit.start, new_stop),
+    ):
+        line_stop = string.find("\n", stop)
+        lines = string[
+            string.rfind("\n", 0, start) + 1 : len(string)
+            if line_stop == -1
+            else line_stop
+        ]
+        if "sqlfluff" in lines:
+            return False
+    return True
+
+
+def _reposition(
+    segment: BaseSegment, templated_file: TemplatedFile, shift: int
+) -> None:
+    """Move a segment (and its children) to a new position in a new file."""
+    marker = segment.pos_marker
+    assert marker
+    segment.pos_marker = PositionMarker(
+        slice(marker.source_slice.start + shift, marker.source_slice.stop + shift),
+        slice(
+            marker.templated_slice.start + shift, marker.templated_slice.stop + shift
+        ),
+        templated_file,
+    )
+    for child in segment.segments:
+        _reposition(child, templated_file, shift)
+
+
+def _lex_region(
+    lexer: Lexer,
+    new_source: str,
+    start: int,
+    sync_points: List[Tuple[slice, int]],
+) -> Tuple[List[LexedElement], int, Optional[int]]:
+    """Lex from `start` until the lexing is back in step with the old file.
+
+    The lexer only looks forward, so once a new element starts at the
+    same place as an old statement terminator, every element after it
+    will be the same as before. The terminator itself is included in
+    the region, so that the statement before it parses as it would in
+    the whole file.
+
+    Args:
+        lexer: The lexer to use.
+        new_source: The edited string.
+        start: The position to lex from.
+        sync_points: Tuples of the slice in the new string of each old
+            statement terminator after the edit, and its index in the
+            children of the old file.
+
+    Returns:
+        A tuple of the lexed elements, the position at which lexing
+        stopped, and the index of the old child after the terminator at
+        that position (or None if lexing reached the end of the string).
+    """
+    elements: List[LexedElement] = []
+    pos = start
+    for sync_slice, child_idx in sync_points:
+        if pos > sync_slice.start:
+            continue
+        new_elements, pos = lexer.lex_elements(new_source, pos, sync_slice.start)
+        elements += new_elements
+        if pos == sync_slice.start:
+            new_elements, pos = lexer.lex_elements(new_source, pos, sync_slice.stop)
+            elements += new_elements
+            return elements, pos, child_idx + 1
+    new_elements, pos = lexer.lex_elements(new_source, pos)
+    elements += new_elements
+    return elements, pos, None
+
+
+def reparse_edit(parsed: ParsedString, edit: TextEdit) -> Optional[ParsedString]:
+    """Re-parse a parsed file after an edit, reusing what hasn't changed.
+
+    The statements affected by the edit are re-lexed and re-parsed, and
+    spliced into the existing tree. The unaffected segments of the
+    previous tree are reused in the new one (with updated positions),
+    so the previous tree shouldn't be used after calling this.
+
+    Returns:
+        The new :obj:`ParsedString`, or None if the edit can't be handled
+        incrementally, in which case the file should be parsed in full.
+    """
+    t0 = time.monotonic()
+    new_source = edit.apply(parsed.source_str)
+    if not _can_reparse(parsed, edit, new_source):
+        return None
+    tree = parsed.tree
+    assert isinstance(tree, BaseFileSegment)
+    children = tree.segments
+    # Unparsable sections can extend beyond a statement, so if the file
+    # didn't parse cleanly, the edit might change how the rest of it parses.
+    if next(tree.iter_unparsables(), None):
+        return None
+    terminators = [
+        idx
+        for idx, child in enumerate(children)
+        if child.is_type("statement_terminator")
+    ]
+
+    # Start the region after the last terminator before the edit. There
+    # must be a gap between them, in case the edit changes how the
+    # terminator is lexed.
+    start_idx = 0
+    region_start = 0
+    for idx in terminators:
+        marker = children[idx].pos_marker
+        assert marker
+        if marker.source_slice.stop >= edit.start:
+            break
+        start_idx = idx + 1
+        region_start = marker.source_slice.stop
+
+    # Lex until we're back in step with one of the terminators after the
+    # edit, and end the region with it.
+    delta = len(edit.replacement) - (edit.stop - edit.start)
+    sync_points = []
+    for idx in terminators:
+        marker = children[idx].pos_marker
+        assert marker
+        if marker.source_slice.start >= edit.stop:
+            sync_points.append(
+                (
+                    slice(
+                        marker.source_slice.start + delta,
+                        marker.source_slice.stop + delta,
+                    ),
+                    idx,
+                )
+            )
+    lexer = Lexer(config=parsed.config)
+    elements, region_stop, stop_idx = _lex_region(
+        lexer, new_source, region_start, sync_points
+    )
+    linter_logger.info(
+        "Re-parsing %s from %s to %s", parsed.fname, region_start, region_stop
+    )
+
+    # Turn the elements into segments. With no templating, the positions
+    # in the source and templated file are the same.
+    templated_file = TemplatedFile(new_source, fname=parsed.templated_file.fname)
+    tokens: List[BaseSegment] = []
+    pos = region_start
+    for element in elements:
+        marker = PositionMarker(
+            slice(pos, pos + len(element.raw)),
+            slice(pos, pos + len(element.raw)),
+            templated_file,
+        )
+        tokens.append(element.matcher.construct_segment(element.raw, marker))
+        pos += len(element.raw)
+    if stop_idx is None:
+        # The region runs to the end of the file.
+        stop_idx = len(children)
+        tokens.append(
+            EndOfFile(pos_marker=PositionMarker.from_point(pos, pos, templated_file))
+        )
+
+    t1 = time.monotonic()
+    parse_context = ParseContext.from_config(parsed.config)
+    region: Tuple[BaseSegment, ...] = tuple(tokens)
+    if any(token.is_code for token in region):
+        try:
+            root = tree.root_parse(region, parse_context, fname=tree.file_path)
+        except SQLParseError:
+            # Leave it to the full parse to report.
+            return None
+        parse_context.record_parse_cache_stats()
+        # Likewise, if the region doesn't parse cleanly then it might affect
+        # how the rest of the file parses.
+        if next(root.iter_unparsables(), None):
+            return None
+        region = root.segments
+
+    for child in children[:start_idx]:
+        _reposition(child, templated_file, 0)
+    for child in children[stop_idx:]:
+        _reposition(child, templated_file, delta)
+    new_tree = tree.__class__(
+        children[:start_idx] + region + children[stop_idx:], fname=tree.file_path
+    )
+
+    # Import here to avoid a circular import.
+    from sqlfluff.core.linter.linter import Linter
+
+    violations: List[SQLBaseError] = []
+    violations += Lexer.violations_from_segments(tuple(new_tree.raw_segments))
+    violations += Linter.unparsable_violations(new_tree)
+    return ParsedString(
+        new_tree,
+        violations,
+        {
+            "templating": 0.0,
+            "lexing": t1 - t0,
+            "parsing": time.monotonic() - t1,
+        },
+        templated_file,
+        parsed.config,
+        parsed.fname,
+        new_source,
+        parse_context.parse_stats,
+        parse_context.trace,
+    )
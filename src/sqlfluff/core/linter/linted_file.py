@@ -25,6 +25,7 @@ from sqlfluff.core.linter.noqa import IgnoreMask
 
 # Classes needed only for type checking
 from sqlfluff.core.parser.segments import BaseSegment, FixPatch
+from sqlfluff.core.rules.profiler import RuleProfile
 from sqlfluff.core.templaters import RawFileSlice, TemplatedFile
 
 # Instantiate the linter logger
@@ -42,6 +43,8 @@ class FileTimings:
     # given file we record each run and then we can post
     # process this as we wish later.
     rule_timings: List[Tuple[str, str, float]]
+    # The profile of the rules, if the `profile_rules` config is set.
+    rule_profile: Optional[RuleProfile] = None
 
     def __repr__(self):  # pragma: no cover
         return "<FileTimings>"
@@ -6,6 +6,7 @@ import time
 from typing import (
     TYPE_CHECKING,
     Any,
+    Dict,
     Iterable,
     Iterator,
     List,
@@ -16,7 +17,6 @@ from typing import (
     Type,
     cast,
 )
-
 import pathspec
 import regex
 from tqdm import tqdm
@@ -31,7 +31,10 @@ from sqlfluff.core.errors import (
     SQLParseError,
 )
 from sqlfluff.core.file_helpers import get_encoding
+from sqlfluff.core.linter.cache import LintResultCache
 from sqlfluff.core.linter.common import ParsedString, RenderedFile, RuleTuple
+from sqlfluff.core.linter.fix_batch import FixBatch
+from sqlfluff.core.linter.incremental import TextEdit, reparse_edit
 from sqlfluff.core.linter.linted_dir import LintedDir
 from sqlfluff.core.linter.linted_file import (
     TMP_PRS_ERROR_TYPES,
@@ -41,10 +44,17 @@ from sqlfluff.core.linter.linted_file import (
 from sqlfluff.core.linter.linting_result import LintingResult
 from sqlfluff.core.linter.noqa import IgnoreMask
 from sqlfluff.core.parser import Lexer, Parser
+from sqlfluff.core.parser.context import ParseContext
 from sqlfluff.core.parser.segments.base import BaseSegment, SourceFix
+from sqlfluff.core.parser.segments.fix import AnchorEditInfo
 from sqlfluff.core.rules import BaseRule, RulePack, get_ruleset
+from sqlfluff.core.rules.combined_crawler import CombinedCrawler, CrawlResult
+from sqlfluff.core.rules.dirty_regions import DirtyRegionTracker
+from sqlfluff.core.rules.profiler import RuleProfile, RuleProfiler
 
 if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.dialects import Dialect
+    from sqlfluff.core.linter.runner import LintWorkerPool
     from sqlfluff.core.parser.segments.meta import MetaSegment
     from sqlfluff.core.templaters import TemplatedFile
 
@@ -89,6 +99,8 @@ class Linter:
         self.formatter = formatter
         # Store references to user rule classes
         self.user_rules = user_rules or []
+        # Set up the result cache (if enabled).
+        self.result_cache = LintResultCache.from_config(self.config)
 
     def get_rulepack(self, config: Optional[FluffConfig] = None) -> RulePack:
         """Get hold of a set of rules."""
@@ -209,12 +221,14 @@ class Linter:
         # Return new buffer
         return new_tokens, violations, config
 
-    @staticmethod
+    @classmethod
     def _parse_tokens(
+        cls,
         tokens: Sequence[BaseSegment],
         config: FluffConfig,
         fname: Optional[str] = None,
         parse_statistics: bool = False,
+        parse_context: Optional[ParseContext] = None,
     ) -> Tuple[Optional[BaseSegment], List[SQLParseError]]:
         parser = Parser(config=config)
         violations = []
@@ -227,6 +241,7 @@ class Linter:
                 tuple(tokens),
                 fname=fname,
                 parse_statistics=parse_statistics,
+                parse_context=parse_context,
             )
         except SQLParseError as err:
             linter_logger.info("PARSING FAILED! : %s", err)
@@ -238,6 +253,13 @@ class Linter:
 
         linter_logger.info("\n###\n#\n# {}\n#\n###".format("Parsed Tree:"))
         linter_logger.info("\n" + parsed.stringify())
+        violations += cls.unparsable_violations(parsed)
+        return parsed, violations
+
+    @staticmethod
+    def unparsable_violations(parsed: BaseSegment) -> List[SQLParseError]:
+        """Generate parsing errors for any unparsable sections."""
+        violations = []
         # We may succeed parsing, but still have unparsable segments. Extract them
         # here.
         for unparsable in parsed.iter_unparsables():
@@ -258,7 +280,7 @@ class Linter:
             )
             linter_logger.info("Found unparsable segment...")
             linter_logger.info(unparsable.stringify())
-        return parsed, violations
+        return violations
 
     @staticmethod
     def remove_templated_errors(
@@ -295,6 +317,92 @@ class Linter:
             f"One fix for {code} not applied, it would re-cause the same error."
         )
 
+    @classmethod
+    def _apply_fixes_if_valid(
+        cls,
+        tree: BaseSegment,
+        dialect: "Dialect",
+        code: str,
+        anchor_info: Dict[int, AnchorEditInfo],
+        previous_versions: Set[Tuple[str, Tuple["SourceFix", ...]]],
+    ) -> Optional[BaseSegment]:
+        """Apply fixes to a tree, unless that makes it invalid or loops.
+
+        Returns:
+            The fixed tree, or None if the fixes weren't applied.
+        """
+        new_tree, _, _, _valid = tree.apply_fixes(dialect, code, anchor_info)
+        # Check for infinite loops. We use a combination of the fixed
+        # templated file and the list of source fixes to apply.
+        loop_check_tuple = (
+            new_tree.raw,
+            tuple(new_tree.source_fixes),
+        )
+        if not _valid:
+            # The fixes result in an invalid file. Don't apply the fix and
+            # skip onward. Show a warning.
+            linter_logger.warning(
+                f"Fixes for {code} not applied, as it "
+                "would result in an unparsable file. Please "
+                "report this as a bug with a minimal query "
+                "which demonstrates this warning."
+            )
+        elif loop_check_tuple not in previous_versions:
+            # We've not seen this version of the file so far. Continue.
+            previous_versions.add(loop_check_tuple)
+            new_tree.build_type_index()
+            return new_tree
+        else:
+            # Applying these fixes took us back to a state which we've seen
+            # before. We're in a loop, so we want to stop.
+            cls._warn_unfixable(code)
+        return None
+
+    @classmethod
+    def _apply_fix_batch(
+        cls,
+        tree: BaseSegment,
+        dialect: "Dialect",
+        batch: FixBatch,
+        previous_versions: Set[Tuple[str, Tuple["SourceFix", ...]]],
+    ) -> Optional[BaseSegment]:
+        """Apply a batch of fixes from several rules to a tree.
+
+        The whole batch is applied in one go if possible. If that makes
+        the tree invalid or loops, the fixes from each rule are applied
+        in turn instead, so that only those causing the problem are
+        skipped.
+
+        Returns:
+            The fixed tree, or None if no fixes were applied.
+        """
+        codes = ",".join(batch.codes)
+        linter_logger.info(f"Applying batched fixes [{codes}]: {batch.fixes}")
+        new_tree, _, _, _valid = tree.apply_fixes(
+            dialect, codes, BaseSegment.compute_anchor_edit_info(batch.fixes)
+        )
+        loop_check_tuple = (new_tree.raw, tuple(new_tree.source_fixes))
+        if _valid and loop_check_tuple not in previous_versions:
+            previous_versions.add(loop_check_tuple)
+            new_tree.build_type_index()
+            return new_tree
+        linter_logger.info(f"Applying fixes for {codes} one rule at a time.")
+        # The fixes from different rules in the batch don't conflict, so
+        # the anchors of each are left alone by applying the others.
+        changed = False
+        for code, fixes in batch.rule_fixes:
+            fixed_tree = cls._apply_fixes_if_valid(
+                tree,
+                dialect,
+                code,
+                BaseSegment.compute_anchor_edit_info(fixes),
+                previous_versions,
+            )
+            if fixed_tree:
+                tree = fixed_tree
+                changed = True
+        return tree if changed else None
+
     # ### Class Methods
     # These compose the base static methods into useful recipes.
 
@@ -319,14 +427,20 @@ class Linter:
         t1 = time.monotonic()
         linter_logger.info("PARSING (%s)", rendered.fname)
 
+        parse_stats = None
+        parse_trace = None
         if tokens:
+            parse_context = ParseContext.from_config(rendered.config)
             parsed, pvs = cls._parse_tokens(
                 tokens,
                 rendered.config,
                 fname=rendered.fname,
                 parse_statistics=parse_statistics,
+                parse_context=parse_context,
             )
             violations += pvs
+            parse_stats = parse_context.parse_stats
+            parse_trace = parse_context.trace
         else:
             parsed = None
 
@@ -343,8 +457,21 @@ class Linter:
             rendered.config,
             rendered.fname,
             rendered.source_str,
+            parse_stats,
+            parse_trace,
         )
 
+    @staticmethod
+    def _clear_tree_cache(tree: BaseSegment) -> None:
+        """Drop anything the rules cached about a tree while linting it.
+
+        The linted tree is kept on the :obj:`LintedFile`, but the rules
+        are done with it.
+        """
+        entry = tree.get_type_index()
+        if entry:
+            entry[0].cache.clear()
+
     @classmethod
     def lint_fix_parsed(
         cls,
@@ -355,8 +482,13 @@ class Linter:
         fname: Optional[str] = None,
         templated_file: Optional["TemplatedFile"] = None,
         formatter: Any = None,
+        profiler: Optional[RuleProfiler] = None,
     ) -> Tuple[BaseSegment, List[SQLBaseError], Optional[IgnoreMask], RuleTimingsType]:
-        """Lint and optionally fix a tree object."""
+        """Lint and optionally fix a tree object.
+
+        If a `profiler` is given, each evaluation of each rule is recorded
+        with it.
+        """
         # Keep track of the linting errors on the very first linter pass. The
         # list of issues output by "lint" and "fix" only includes issues present
         # in the initial SQL code, EXCLUDING any issues that may be created by
@@ -368,6 +500,11 @@ class Linter:
         previous_versions: Set[Tuple[str, Tuple["SourceFix", ...]]] = {(tree.raw, ())}
         # Keep a buffer for recording rule timings.
         rule_timings: RuleTimingsType = []
+        # When fixing, rules are only re-run on the parts of the file which
+        # have changed since they last found nothing there.
+        dirty_regions = DirtyRegionTracker()
+        # Whether to apply the fixes from all the rules in each loop together.
+        batch_fixes = fix and config.get("batch_fixes")
 
         # If we are fixing then we want to loop up to the runaway_limit, otherwise just
         # once for linting.
@@ -377,6 +514,10 @@ class Linter:
         if formatter:
             formatter.dispatch_lint_header(fname, sorted(rule_pack.codes()))
 
+        # Index the types in the tree for the rules to search. Each fixed
+        # tree is indexed again as the fixes are applied.
+        tree.build_type_index()
+
         # Look for comment segments which might indicate lines to ignore.
         if not config.get("disable_noqa"):
             ignore_mask, ivs = IgnoreMask.from_tree(tree, rule_pack.reference_map)
@@ -425,8 +566,15 @@ class Linter:
                     leave=False,
                     disable=progress_bar_configuration.disable_progress_bar,
                 )
-
-                for crawler in progress_bar_crawler:
+                # Results for rules which have been crawled together, by code.
+                # When fixing, each rule must see the fixes applied by the
+                # rules before it, so they're only crawled together when
+                # linting.
+                combined_results: Dict[str, CrawlResult] = {}
+                # The fixes to apply at the end of the loop, when batching.
+                batch = FixBatch()
+
+                for rule_idx, crawler in enumerate(progress_bar_crawler):
                     # Performance: After first loop pass, skip rules that don't
                     # do fixes. Any results returned won't be seen by the user
                     # anyway (linting errors ADDED by rules changing SQL, are
@@ -447,15 +595,54 @@ class Linter:
                     # edit and create are list of tuples. The first element is
                     # the "anchor", the segment to look for either to edit or to
                     # insert BEFORE. The second is the element to insert or create.
-                    linting_errors, _, fixes, _ = crawler.crawl(
-                        tree,
-                        dialect=config.get("dialect_obj"),
-                        fix=fix,
-                        templated_file=templated_file,
-                        ignore_mask=ignore_mask,
-                        fname=fname,
-                        config=config,
-                    )
+                    if not fix and CombinedCrawler.can_combine(crawler):
+                        if crawler.code not in combined_results:
+                            # Crawl the tree once for this and all the later
+                            # rules which can be combined.
+                            combined_results = CombinedCrawler(
+                                [
+                                    rule
+                                    for rule in rules_this_phase[rule_idx:]
+                                    if CombinedCrawler.can_combine(rule)
+                                ]
+                            ).crawl(
+                                tree,
+                                dialect=config.get("dialect_obj"),
+                                fix=fix,
+                                templated_file=templated_file,
+                                ignore_mask=ignore_mask,
+                                fname=fname,
+                                config=config,
+                                profiler=profiler,
+                            )
+                        linting_errors, fixes, duration = combined_results.pop(
+                            crawler.code
+                        )
+                        # Only count the time evaluating this rule.
+                        t0 = time.monotonic() - duration
+                    elif fix:
+                        linting_errors, fixes = dirty_regions.crawl(
+                            crawler,
+                            tree,
+                            dialect=config.get("dialect_obj"),
+                            fix=fix,
+                            templated_file=templated_file,
+                            ignore_mask=ignore_mask,
+                            fname=fname,
+                            config=config,
+                            profiler=profiler,
+                        )
+                    else:
+                        linting_errors, _, fixes, _ = crawler.crawl(
+                            tree,
+                            dialect=config.get("dialect_obj"),
+                            fix=fix,
+                            templated_file=templated_file,
+                            ignore_mask=ignore_mask,
+                            fname=fname,
+                            config=config,
+                            profiler=profiler,
+                        )
                     if is_first_linter_pass():
                         initial_linting_errors += linting_errors
 
@@ -480,6 +667,16 @@ class Linter:
                             cls._report_conflicting_fixes_same_anchor(message)
                             for lint_result in linting_errors:
                                 lint_result.fixes = []
+                        elif batch_fixes:
+                            # The fixes are applied at the end of the loop,
+                            # unless they conflict with those from an earlier
+                            # rule, in which case they wait for the next loop.
+                            if not batch.add(crawler.code, fixes):
+                                linter_logger.info(
+                                    f"Deferring fixes for {crawler.code} to the "
+                                    "next loop, as they conflict with those from "
+                                    f"{', '.join(batch.codes)}."
+                                )
                         elif fixes == last_fixes:  # pragma: no cover
                             # If we generate the same fixes two times in a row,
                             # that means we're in a loop, and we want to stop.
@@ -490,43 +687,31 @@ class Linter:
                             # This is the happy path. We have fixes, now we want to
                             # apply them.
                             last_fixes = fixes
-                            new_tree, _, _, _valid = tree.apply_fixes(
-                                config.get("dialect_obj"), crawler.code, anchor_info
-                            )
-                            # Check for infinite loops. We use a combination of the
-                            # fixed templated file and the list of source fixes to
-                            # apply.
-                            loop_check_tuple = (
-                                new_tree.raw,
-                                tuple(new_tree.source_fixes),
+                            new_tree = cls._apply_fixes_if_valid(
+                                tree,
+                                config.get("dialect_obj"),
+                                crawler.code,
+                                anchor_info,
+                                previous_versions,
                             )
-                            if not _valid:
-                                # The fixes result in an invalid file. Don't apply
-                                # the fix and skip onward. Show a warning.
-                                linter_logger.warning(
-                                    f"Fixes for {crawler.code} not applied, as it "
-                                    "would result in an unparsable file. Please "
-                                    "report this as a bug with a minimal query "
-                                    "which demonstrates this warning."
-                                )
-                            elif loop_check_tuple not in previous_versions:
-                                # We've not seen this version of the file so
-                                # far. Continue.
+                            if new_tree:
                                 tree = new_tree
-                                previous_versions.add(loop_check_tuple)
                                 changed = True
                                 continue
-                            else:
-                                # Applying these fixes took us back to a state
-                                # which we've seen before. We're in a loop, so
-                                # we want to stop.
-                                cls._warn_unfixable(crawler.code)
 
                     # Record rule timing
                     rule_timings.append(
                         (crawler.code, crawler.name, time.monotonic() - t0)
                     )
 
+                if batch:
+                    new_tree = cls._apply_fix_batch(
+                        tree, config.get("dialect_obj"), batch, previous_versions
+                    )
+                    if new_tree:
+                        tree = new_tree
+                        changed = True
+
                 if fix and not changed:
                     # We did not change the file. Either the file is clean (no
                     # fixes), or any fixes which are present will take us back
@@ -562,6 +747,7 @@ class Linter:
                     # Reason: When the linter hits the loop limit, the file is often
                     # messy, e.g. some of the fixes were applied repeatedly, possibly
                     # other weird things. We don't want the user to see this junk!
+                    cls._clear_tree_cache(save_tree)
                     return save_tree, initial_linting_errors, ignore_mask, rule_timings
 
         if config.get("ignore_templated_areas", default=True):
@@ -570,6 +756,7 @@ class Linter:
         linter_logger.info("\n###\n#\n# {}\n#\n###".format("Fixed Tree:"))
         linter_logger.info("\n" + tree.stringify())
 
+        cls._clear_tree_cache(tree)
         return tree, initial_linting_errors, ignore_mask, rule_timings
 
     @classmethod
@@ -585,9 +772,19 @@ class Linter:
         violations = parsed.violations
         time_dict = parsed.time_dict
         tree: Optional[BaseSegment]
+        rule_profile: Optional[RuleProfile]
         if parsed.tree:
             t0 = time.monotonic()
             linter_logger.info("LINTING (%s)", parsed.fname)
+            profiler = (
+                RuleProfiler(
+                    parsed.tree,
+                    parsed.fname,
+                    record_events=parsed.config.get("profile_rule_events"),
+                )
+                if parsed.config.get("profile_rules")
+                else None
+            )
             (
                 tree,
                 initial_linting_errors,
@@ -601,7 +798,9 @@ class Linter:
                 fname=parsed.fname,
                 templated_file=parsed.templated_file,
                 formatter=formatter,
+                profiler=profiler,
             )
+            rule_profile = profiler.finish() if profiler else None
             # Update the timing dict
             time_dict["linting"] = time.monotonic() - t0
 
@@ -613,6 +812,7 @@ class Linter:
             tree = None
             ignore_mask = None
             rule_timings = []
+            rule_profile = None
             if not parsed.config.get("disable_noqa"):
                 # Templating and/or parsing have failed. Look for "noqa"
                 # comments (the normal path for identifying these comments
@@ -638,7 +838,7 @@ class Linter:
             parsed.fname,
             # Deduplicate violations
             LintedFile.deduplicate_in_source_space(violations),
-            FileTimings(time_dict, rule_timings),
+            FileTimings(time_dict, rule_timings, rule_profile),
             tree,
             ignore_mask=ignore_mask,
             templated_file=parsed.templated_file,
@@ -776,6 +976,25 @@ class Linter:
 
         return self.parse_rendered(rendered, parse_statistics=parse_statistics)
 
+    def parse_edit(self, parsed: ParsedString, edit: TextEdit) -> ParsedString:
+        """Parse a string after an edit, given the result of parsing it before.
+
+        Where possible, only the statements affected by the edit are
+        re-parsed (see `reparse_edit()`), otherwise the edited string is
+        parsed in full. In either case, the result should be the same as
+        parsing the edited string with `parse_string()`.
+
+        NOTE: The previous tree may be reused in the new one, and so
+        shouldn't be used after calling this.
+        """
+        reparsed = reparse_edit(parsed, edit)
+        if reparsed is not None:
+            return reparsed
+        linter_logger.info("Unable to re-parse %s incrementally.", parsed.fname)
+        return self.parse_string(
+            edit.apply(parsed.source_str), fname=parsed.fname, config=parsed.config
+        )
+
     def fix(
         self,
         tree: BaseSegment,
@@ -1025,8 +1244,19 @@ class Linter:
         apply_fixes: bool = False,
         fixed_file_suffix: str = "",
         fix_even_unparsable: bool = False,
+        worker_pool: Optional["LintWorkerPool"] = None,
+        timing_history: Optional[Dict[str, float]] = None,
     ) -> LintingResult:
-        """Lint an iterable of paths."""
+        """Lint an iterable of paths.
+
+        If a `worker_pool` is provided, it is used for parallel processing
+        in place of starting a new pool for this call. Unless `processes` is
+        explicitly set, all of its processes are used.
+
+        When linting in parallel, `timing_history` (a mapping of paths to
+        the time taken to process them previously) is used to start the
+        most expensive files first.
+        """
         # If no paths specified - assume local
         if not paths:  # pragma: no cover
             paths = (os.getcwd(),)
@@ -1048,7 +1278,10 @@ class Linter:
 
         files_count = len(expanded_paths)
         if processes is None:
-            processes = self.config.get("processes", default=1)
+            if worker_pool:
+                processes = worker_pool.processes
+            else:
+                processes = self.config.get("processes", default=1)
         # Hard set processes to 1 if only 1 file is queued.
         # The overhead will never be worth it with one file.
         if files_count == 1:
@@ -1062,6 +1295,8 @@ class Linter:
             self.config,
             processes=processes,
             allow_process_parallelism=self.allow_process_parallelism,
+            worker_pool=worker_pool,
+            timing_history=timing_history,
         )
 
         if self.formatter and effective_processes != 1:
@@ -1104,6 +1339,11 @@ class Linter:
             if i < len(expanded_paths):
                 progress_bar_files.set_description(f"file {expanded_paths[i]}")
 
+        if self.result_cache:
+            self.result_cache.prune()
+            result.cache_stats = self.result_cache.stats()
+        result.scheduling_stats = runner.scheduling_stats()
+
         result.stop_timer()
         return result
 
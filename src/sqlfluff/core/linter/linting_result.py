@@ -1,6 +1,7 @@
 """Defines the linter class."""
 
 import csv
+import json
 import time
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union, overload
 
@@ -9,6 +10,7 @@ from typing_extensions import Literal
 from sqlfluff.core.errors import CheckTuple
 from sqlfluff.core.linter.linted_dir import LintedDir
 from sqlfluff.core.linter.linted_file import TMP_PRS_ERROR_TYPES
+from sqlfluff.core.rules.profiler import RuleProfile
 from sqlfluff.core.timing import RuleTimingSummary, TimingSummary
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -26,6 +28,10 @@ class LintingResult:
         self.paths: List[LintedDir] = []
         self._start_time: float = time.monotonic()
         self.total_time: float = 0.0
+        # Hit and miss counts for the result cache, if enabled.
+        self.cache_stats: Dict[str, int] = {}
+        # Tail latency and worker utilisation, if linting in parallel.
+        self.scheduling_stats: Dict[str, float] = {}
 
     @staticmethod
     def sum_dicts(d1: Dict[str, Any], d2: Dict[str, Any]) -> Dict[str, Any]:
@@ -193,6 +199,30 @@ class LintingResult:
                         }
                     )
 
+    def rule_profile(self) -> RuleProfile:
+        """Combine the profiles of the rules on all the files."""
+        profile = RuleProfile()
+        for dir in self.paths:
+            for file in dir.files:
+                if file.timings and file.timings.rule_profile:
+                    profile.merge(file.timings.rule_profile)
+        return profile
+
+    def persist_rule_profile(self, filename: str, format: str = "json") -> None:
+        """Persist the profile of the rules for external analysis.
+
+        The `format` is either `json`, for a summary of each rule, or
+        `chrome`, for a trace of every evaluation in the Chrome trace
+        event format.
+        """
+        profile = self.rule_profile()
+        with open(filename, "w", encoding="utf8") as f:
+            json.dump(
+                profile.as_chrome_trace() if format == "chrome" else profile.as_dict(),
+                f,
+                indent=None if format == "chrome" else 2,
+            )
+
     def as_records(self) -> List[dict]:
         """Return the result as a list of dictionaries.
 
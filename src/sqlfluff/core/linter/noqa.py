@@ -2,6 +2,8 @@
 
 import fnmatch
 import logging
+from bisect import bisect_right
+from collections import defaultdict
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Set, Tuple, cast
 
@@ -23,31 +25,61 @@ class NoQaDirective:
     raw_str: str = ""  # The raw representation of the directive for warnings.
     used: bool = False  # Has it been used.
 
-    def _filter_violations_single_line(
-        self, violations: List[SQLBaseError]
-    ) -> List[SQLBaseError]:
-        """Filter a list of violations based on this single line noqa.
 
-        Also record whether this class was _used_ in any of that filtering.
-
-        The "ignore" list is assumed to ONLY contain NoQaDirectives with
-        action=None.
+class _LineRangeIndex:
+    """The disable/enable directives which apply to one rule, by line.
+
+    For each directive (in line order), this precomputes the "disable"
+    directive in force after it, so that finding whether a violation on
+    a given line is ignored is a binary search of the line numbers.
+    """
+
+    def __init__(self, directives: List[NoQaDirective]):
+        # Assumed to be sorted by line number.
+        self.directives = directives
+        self.line_nos = [ignore.line_no for ignore in directives]
+        self.in_force: List[Optional[NoQaDirective]] = []
+        # The positions of "enable" directives which end a disabled range.
+        self.closing: List[int] = []
+        disable: Optional[NoQaDirective] = None
+        for idx, ignore in enumerate(directives):
+            if ignore.action == "enable":
+                if disable:
+                    self.closing.append(idx)
+                disable = None
+            elif ignore.action == "disable":
+                disable = ignore
+            self.in_force.append(disable)
+        # How many of the closing directives have been marked as used.
+        self._closing_used = 0
+
+    def ignores(self, line_no: int) -> bool:
+        """Whether a violation of the rule at a line is ignored.
+
+        This also marks directives as used in the same way as working
+        through them in order would:
+        - An "enable" which ends a disabled range is used once there's
+          a violation on or after its line.
+        - The first "enable" after the line of a violation is used.
+        - The "disable" in force at the line of a violation is used.
         """
-        assert not self.action
-        matched_violations = [
-            v
-            for v in violations
-            if (
-                v.line_no == self.line_no
-                and (self.rules is None or v.rule_code() in self.rules)
-            )
-        ]
-        if matched_violations:
-            # Successful match, mark ignore as used.
-            self.used = True
-            return [v for v in violations if v not in matched_violations]
-        else:
-            return violations
+        next_idx = bisect_right(self.line_nos, line_no)
+        while (
+            self._closing_used < len(self.closing)
+            and self.closing[self._closing_used] < next_idx
+        ):
+            self.directives[self.closing[self._closing_used]].used = True
+            self._closing_used += 1
+        if (
+            next_idx < len(self.directives)
+            and self.directives[next_idx].action == "enable"
+        ):
+            self.directives[next_idx].used = True
+        disable = self.in_force[next_idx - 1] if next_idx else None
+        if disable:
+            disable.used = True
+            return True
+        return False
 
 
 class IgnoreMask:
@@ -55,6 +87,31 @@ class IgnoreMask:
 
     def __init__(self, ignores: List[NoQaDirective]):
         self._ignore_list = ignores
+        # Single line directives, by line number.
+        self._single_line: Dict[int, List[NoQaDirective]] = defaultdict(list)
+        # Disable/enable directives, by the rules they apply to. Directives
+        # for all rules apply to every entry, and the entry for `None` is
+        # used for any rule not mentioned by any directive.
+        self._line_ranges: Dict[Optional[str], _LineRangeIndex] = {}
+
+        range_ignores: List[NoQaDirective] = []
+        for ignore in ignores:
+            if ignore.action:
+                range_ignores.append(ignore)
+            else:
+                self._single_line[ignore.line_no].append(ignore)
+        range_ignores.sort(key=lambda ignore: ignore.line_no)
+        rule_codes: Set[Optional[str]] = {None}
+        for ignore in range_ignores:
+            rule_codes.update(ignore.rules or ())
+        for rule_code in rule_codes:
+            self._line_ranges[rule_code] = _LineRangeIndex(
+                [
+                    ignore
+                    for ignore in range_ignores
+                    if not ignore.rules or rule_code in ignore.rules
+                ]
+            )
 
     def __repr__(self):  # pragma: no cover
         return "<IgnoreMask>"
@@ -208,108 +265,43 @@ class IgnoreMask:
 
     # ### Application methods.
 
-    @staticmethod
-    def _ignore_masked_violations_single_line(
-        violations: List[SQLBaseError], ignore_mask: List[NoQaDirective]
-    ):
-        """Filter a list of violations based on this single line noqa.
+    def _ignore_single_line(self, violation: SQLBaseError, rule_code: str) -> bool:
+        """Whether a violation is ignored by a single line noqa on its line.
 
-        The "ignore" list is assumed to ONLY contain NoQaDirectives with
-        action=None.
+        If so, the first such directive (in the order they were found) is
+        marked as used.
         """
-        for ignore in ignore_mask:
-            violations = ignore._filter_violations_single_line(violations)
-        return violations
+        for ignore in self._single_line.get(violation.line_no, ()):
+            if ignore.rules is None or rule_code in ignore.rules:
+                ignore.used = True
+                return True
+        return False
 
-    @staticmethod
-    def _should_ignore_violation_line_range(
-        line_no: int, ignore_rules: List[NoQaDirective]
-    ) -> Tuple[bool, Optional[NoQaDirective]]:
-        """Returns whether to ignore a violation at line_no.
-
-        Loop through the NoQaDirectives to find the state of things at
-        line_no. Assumptions about "ignore_rules":
-        - Contains directives for only ONE RULE, i.e. the rule that was
-          violated at line_no
-        - Sorted in ascending order by line number
-        """
-        ignore = False
-        last_ignore = None
-        for idx, ignore_rule in enumerate(ignore_rules):
-            if ignore_rule.line_no > line_no:
-                # Peak at the next rule to see if it's a matching disable
-                # and if it is, then mark it as used.
-                if ignore_rule.action == "enable":
-                    # Mark as used
-                    ignore_rule.used = True
-                break
-
-            if ignore_rule.action == "enable":
-                # First, if this enable did counteract a
-                # corresponding _disable_, then it has been _used_.
-                if last_ignore:
-                    ignore_rule.used = True
-                last_ignore = None
-                ignore = False
-            elif ignore_rule.action == "disable":
-                last_ignore = ignore_rule
-                ignore = True
-
-        return ignore, last_ignore
-
-    @classmethod
-    def _ignore_masked_violations_line_range(
-        cls, violations: List[SQLBaseError], ignore_mask: List[NoQaDirective]
-    ):
-        """Returns whether to ignore error for line-range directives.
-
-        The "ignore" list is assumed to ONLY contain NoQaDirectives where
-        action is "enable" or "disable".
-        """
-        result = []
-        for v in violations:
-            # Find the directives that affect the violated rule "v", either
-            # because they specifically reference it or because they don't
-            # specify a list of rules, thus affecting ALL rules.
-            ignore_rule = sorted(
-                (
-                    ignore
-                    for ignore in ignore_mask
-                    if not ignore.rules
-                    or (v.rule_code() in cast(Tuple[str, ...], ignore.rules))
-                ),
-                key=lambda ignore: ignore.line_no,
-            )
-            # Determine whether to ignore the violation, based on the relevant
-            # enable/disable directives.
-            ignore, last_ignore = cls._should_ignore_violation_line_range(
-                v.line_no, ignore_rule
-            )
-            if not ignore:
-                result.append(v)
-            # If there was a previous ignore which mean that we filtered out
-            # a violation, then mark it as used.
-            elif last_ignore:
-                last_ignore.used = True
-
-        return result
+    def _ignore_line_range(self, violation: SQLBaseError, rule_code: str) -> bool:
+        """Whether a violation is ignored by the disable/enable directives."""
+        index = self._line_ranges.get(rule_code, self._line_ranges[None])
+        return index.ignores(violation.line_no)
 
     def ignore_masked_violations(
         self, violations: List[SQLBaseError]
     ) -> List[SQLBaseError]:
         """Remove any violations specified by ignore_mask.
 
-        This involves two steps:
-        1. Filter out violations affected by single-line "noqa" directives.
-        2. Filter out violations affected by disable/enable "noqa" directives.
+        A violation is removed if either:
+        1. It's affected by a single-line "noqa" directive.
+        2. It's affected by disable/enable "noqa" directives.
         """
-        ignore_specific = [ignore for ignore in self._ignore_list if not ignore.action]
-        ignore_range = [ignore for ignore in self._ignore_list if ignore.action]
-        violations = self._ignore_masked_violations_single_line(
-            violations, ignore_specific
-        )
-        violations = self._ignore_masked_violations_line_range(violations, ignore_range)
-        return violations
+        if not self._ignore_list:
+            return violations
+        result = []
+        for v in violations:
+            rule_code = v.rule_code()
+            if self._ignore_single_line(v, rule_code):
+                continue
+            if self._ignore_line_range(v, rule_code):
+                continue
+            result.append(v)
+        return result
 
     def generate_warnings_for_unused(self) -> List[SQLBaseError]:
         """Generates warnings for any unused NoQaDirectives."""
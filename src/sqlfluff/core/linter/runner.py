@@ -8,18 +8,45 @@ Implements various runner types for SQLFluff:
 """
 import bdb
 import functools
+import hashlib
 import logging
 import multiprocessing
 import multiprocessing.dummy
+import os
+import pickle
+import shutil
 import signal
 import sys
+import tempfile
+import threading
+import time
 import traceback
 from abc import ABC
-from typing import Callable, Iterator, List, Tuple
+from contextlib import nullcontext
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    cast,
+)
 
 from sqlfluff.core import FluffConfig, Linter
 from sqlfluff.core.errors import SQLFluffSkipFile
 from sqlfluff.core.linter import LintedFile, RenderedFile
+from sqlfluff.core.linter.cache import config_fingerprint
+from sqlfluff.core.linter.linted_file import FileTimings
+from sqlfluff.core.linter.scheduling import (
+    FileCostEstimator,
+    TaskRecord,
+    batch_by_cost,
+    summarise_utilisation,
+)
+from sqlfluff.core.rules import RulePack
 from sqlfluff.core.plugin.host import is_main_process
 
 linter_logger: logging.Logger = logging.getLogger("sqlfluff.linter")
@@ -35,6 +62,9 @@ class BaseRunner(ABC):
     ) -> None:
         self.linter = linter
         self.config = config
+        # Keys for results which should be written to the result
+        # cache once they're available, indexed by filename.
+        self._pending_cache_keys: Dict[str, str] = {}
 
     pass_formatter = True
 
@@ -57,26 +87,87 @@ class BaseRunner(ABC):
 
         Generates filenames and objects which return LintedFiles.
         """
+        formatter = self.linter.formatter if self.pass_formatter else None
         for fname, rendered in self.iter_rendered(fnames):
-            # Generate a fresh ruleset
-            rule_pack = self.linter.get_rulepack(config=rendered.config)
-            yield (
-                fname,
-                functools.partial(
-                    self.linter.lint_rendered,
-                    rendered,
-                    rule_pack,
-                    fix,
-                    # Formatters may or may not be passed. They don't pickle
-                    # nicely so aren't appropriate in a multiprocessing world.
-                    self.linter.formatter if self.pass_formatter else None,
-                ),
+            rule_pack = self._get_rulepack(rendered.config)
+            # Check the result cache. Only linting results are cached
+            # because fixing needs the full parse tree, and it's skipped
+            # when profiling because the rules need to actually run.
+            cache = self.linter.result_cache
+            if cache and not fix and not rendered.config.get("profile_rules"):
+                key = cache.key_for(rendered, rule_pack)
+                if key:
+                    cached = cache.get(key)
+                    if cached:
+                        linter_logger.info("Lint cache hit for %s", fname)
+                        yield (
+                            fname,
+                            functools.partial(
+                                self._rehydrate_cached,
+                                cached,
+                                rendered,
+                                formatter,
+                            ),
+                        )
+                        continue
+                    self._pending_cache_keys[fname] = key
+            yield fname, self._lint_partial(rendered, rule_pack, fix, formatter)
+
+    def _get_rulepack(self, config: FluffConfig) -> RulePack:
+        """Get the rule pack with which to lint a file with a given config."""
+        # Generate a fresh ruleset
+        return self.linter.get_rulepack(config=config)
+
+    def _lint_partial(
+        self, rendered: RenderedFile, rule_pack: RulePack, fix: bool, formatter: Any
+    ) -> Callable[[], LintedFile]:
+        """Generate the partial which lints a rendered file."""
+        return functools.partial(
+            self.linter.lint_rendered,
+            rendered,
+            rule_pack,
+            fix,
+            # Formatters may or may not be passed. They don't pickle
+            # nicely so aren't appropriate in a multiprocessing world.
+            formatter,
+        )
+
+    @staticmethod
+    def _rehydrate_cached(
+        linted_file: LintedFile, rendered: RenderedFile, formatter: Any
+    ) -> LintedFile:
+        """Return a cached result as though the file had just been linted."""
+        # Timings are only recorded for the steps which actually ran.
+        linted_file = linted_file._replace(
+            timings=FileTimings(dict(rendered.time_dict), [])
+        )
+        if formatter:
+            formatter.dispatch_file_violations(
+                rendered.fname,
+                linted_file,
+                only_fixable=False,
+                warn_unused_ignores=rendered.config.get("warn_unused_ignores"),
             )
+        return linted_file
+
+    def _cache_result(self, linted_file: LintedFile) -> None:
+        """Store a freshly linted file in the result cache if appropriate."""
+        key = self._pending_cache_keys.pop(linted_file.path, None)
+        if key is None or self.linter.result_cache is None:
+            return
+        # Don't persist results from a halted run.
+        if any(v.fatal for v in linted_file.violations):  # pragma: no cover
+            return
+        self.linter.result_cache.put(key, linted_file)
 
     def run(self, fnames: List[str], fix: bool):
         """Run linting on the specified list of files."""
         raise NotImplementedError  # pragma: no cover
 
+    def scheduling_stats(self) -> Dict[str, float]:
+        """Return statistics on how work was scheduled in the last run."""
+        return {}
+
     @classmethod
     def _init_global(cls, config) -> None:
         """Initializes any global state.
@@ -106,7 +197,9 @@ class SequentialRunner(BaseRunner):
         """Sequential implementation."""
         for fname, partial in self.iter_partials(fnames, fix=fix):
             try:
-                yield partial()
+                linted_file = partial()
+                self._cache_result(linted_file)
+                yield linted_file
             except (bdb.BdbQuit, KeyboardInterrupt):  # pragma: no cover
                 raise
             except Exception as e:
@@ -121,53 +214,119 @@ class ParallelRunner(BaseRunner):
     # Don't pass the formatter in a parallel world, they
     # don't pickle well.
     pass_formatter = False
+    # Cheap files are dispatched in batches until the estimated cost
+    # of the batch (in seconds) reaches this value, or the batch
+    # reaches the maximum size.
+    min_batch_cost = 0.05
+    max_batch_size = 16
 
-    def __init__(self, linter, config, processes) -> None:
+    def __init__(
+        self,
+        linter: Linter,
+        config: FluffConfig,
+        processes: int,
+        timing_history: Optional[Dict[str, float]] = None,
+    ) -> None:
         super().__init__(linter, config)
         self.processes = processes
+        self.estimator = FileCostEstimator(timing_history)
+        self._task_records: List[TaskRecord] = []
+        self._run_start = 0.0
+        self._run_end = 0.0
 
     def run(self, fnames: List[str], fix: bool):
         """Parallel implementation.
 
+        Files are ordered so that those expected to be most expensive
+        are dispatched first, and workers take the next task as soon as
+        they're free. Cheap files are dispatched in batches.
+
         Note that the partials are generated one at a time then
         passed directly into the pool as they're ready. This means
         the main thread can do the IO work while passing the parsing
         and linting work out to the threads.
         """
-        with self._create_pool(
-            self.processes,
-            self._init_global,
-            (self.config,),
-        ) as pool:
+        fnames, costs = self.estimator.order(fnames)
+        self._task_records = []
+        self._run_start = time.time()
+        with self._pool_context() as pool:
             try:
-                for lint_result in self._map(
+                for batch_result in self._map(
                     pool,
-                    self._apply,
-                    self.iter_partials(fnames, fix=fix),
+                    self._apply_batch,
+                    batch_by_cost(
+                        self.iter_partials(fnames, fix=fix),
+                        costs,
+                        self.min_batch_cost,
+                        self.max_batch_size,
+                    ),
                 ):
-                    if isinstance(lint_result, DelayedException):
-                        try:
-                            lint_result.reraise()
-                        except Exception as e:
-                            self._handle_lint_path_exception(lint_result.fname, e)
-                    else:
-                        # It's a LintedDir.
-                        if self.linter.formatter:
-                            self.linter.formatter.dispatch_file_violations(
-                                lint_result.path,
-                                lint_result,
-                                only_fixable=fix,
-                                warn_unused_ignores=self.linter.config.get(
-                                    "warn_unused_ignores"
-                                ),
-                            )
-                        yield lint_result
+                    yield from self._handle_batch_result(batch_result, fix)
             except KeyboardInterrupt:  # pragma: no cover
                 # On keyboard interrupt (Ctrl-C), terminate the workers.
                 # Notify the user we've received the signal and are cleaning up,
                 # in case it takes awhile.
                 print("Received keyboard interrupt. Cleaning up and shutting down...")
                 pool.terminate()
+        self._run_end = time.time()
+
+    def _handle_batch_result(self, batch_result, fix: bool) -> Iterator[LintedFile]:
+        """Unpack the results from a batch, handling any exceptions."""
+        if isinstance(batch_result, BatchResult):
+            self._task_records.append(batch_result.record)
+            lint_results = batch_result.results
+        else:
+            # e.g. an exception raised by the pool itself.
+            lint_results = [batch_result]
+        for lint_result in lint_results:
+            if isinstance(lint_result, DelayedException):
+                try:
+                    lint_result.reraise()
+                except Exception as e:
+                    self._handle_lint_path_exception(lint_result.fname, e)
+            else:
+                # It's a LintedDir.
+                self._cache_result(lint_result)
+                if self.linter.formatter:
+                    self.linter.formatter.dispatch_file_violations(
+                        lint_result.path,
+                        lint_result,
+                        only_fixable=fix,
+                        warn_unused_ignores=self.linter.config.get(
+                            "warn_unused_ignores"
+                        ),
+                    )
+                yield lint_result
+
+    def scheduling_stats(self) -> Dict[str, float]:
+        """Return the tail latency and utilisation of workers in the last run."""
+        return summarise_utilisation(
+            self._task_records, self._run_start, self._run_end, self.processes
+        )
+
+    def _pool_context(self):
+        """Get a context manager providing the pool for a single run."""
+        return self._create_pool(
+            self.processes,
+            self._init_global,
+            (self.config,),
+        )
+
+    @staticmethod
+    def _apply_batch(batch) -> "BatchResult":
+        """Shim function used in parallel mode to process a batch of files."""
+        start = time.time()
+        results = [ParallelRunner._apply(partial_tuple) for partial_tuple in batch]
+        return BatchResult(
+            results,
+            TaskRecord(
+                # Identify both the process and thread, to cover both types
+                # of pool.
+                f"{os.getpid()}:{threading.get_ident()}",
+                start,
+                time.time(),
+            ),
+        )
 
     @staticmethod
     def _apply(partial_tuple):
@@ -198,11 +357,79 @@ class ParallelRunner(BaseRunner):
 
 
 class MultiProcessRunner(ParallelRunner):
-    """Runner that does parallel processing using multiple processes."""
+    """Runner that does parallel processing using multiple processes.
+
+    Rather than pickling the config and rule pack alongside every file,
+    each distinct configuration is written once to a context directory
+    and files are sent to the workers with only a fingerprint of their
+    config. Each worker loads (and warms) a given context on first use,
+    and then reuses it for every later file with the same config.
+
+    If a :obj:`LintWorkerPool` is provided, then its processes (and the
+    contexts already loaded within them) are reused rather than starting
+    a fresh pool for this run.
+    """
 
     POOL_TYPE = multiprocessing.Pool
     MAP_FUNCTION_NAME = "imap_unordered"
 
+    def __init__(
+        self,
+        linter: Linter,
+        config: FluffConfig,
+        processes: int,
+        timing_history: Optional[Dict[str, float]] = None,
+        worker_pool: Optional["LintWorkerPool"] = None,
+    ) -> None:
+        super().__init__(linter, config, processes, timing_history=timing_history)
+        self.worker_pool = worker_pool
+        self._context_dir: Optional[str] = None
+        # Rule packs (and their fingerprints) for each config seen this run.
+        self._rule_packs: Dict[str, RulePack] = {}
+        self._rule_pack_fingerprints: Dict[int, str] = {}
+
+    def run(self, fnames: List[str], fix: bool):
+        """Parallel implementation, using a worker context directory."""
+        if self.worker_pool:
+            self._context_dir = self.worker_pool.context_dir
+            yield from super().run(fnames, fix)
+        else:
+            with tempfile.TemporaryDirectory(prefix="sqlfluff-") as context_dir:
+                self._context_dir = context_dir
+                yield from super().run(fnames, fix)
+
+    def _pool_context(self):
+        if self.worker_pool:
+            # The pool outlives this run, so it shouldn't be closed after it.
+            return nullcontext(self.worker_pool.pool)
+        return super()._pool_context()
+
+    def _get_rulepack(self, config: FluffConfig) -> RulePack:
+        """Get a rule pack, building and registering each distinct config once."""
+        fingerprint = worker_context_fingerprint(config, self.linter)
+        rule_pack = self._rule_packs.get(fingerprint)
+        if rule_pack is None:
+            rule_pack = super()._get_rulepack(config)
+            assert self._context_dir
+            write_worker_context(self._context_dir, fingerprint, config, rule_pack)
+            self._rule_packs[fingerprint] = rule_pack
+            self._rule_pack_fingerprints[id(rule_pack)] = fingerprint
+        return rule_pack
+
+    def _lint_partial(
+        self, rendered: RenderedFile, rule_pack: RulePack, fix: bool, formatter: Any
+    ) -> Callable[[], LintedFile]:
+        """Generate a partial which only carries the config fingerprint."""
+        assert self._context_dir
+        return functools.partial(
+            lint_in_worker_context,
+            self._context_dir,
+            self._rule_pack_fingerprints[id(rule_pack)],
+            # The config is provided by the worker context.
+            rendered._replace(config=cast(FluffConfig, None)),
+            fix,
+        )
+
     @classmethod
     def _init_global(cls, config) -> None:  # pragma: no cover
         super()._init_global(config)
@@ -225,6 +452,13 @@ class MultiThreadRunner(ParallelRunner):
     MAP_FUNCTION_NAME = "imap"
 
 
+class BatchResult(NamedTuple):
+    """The results of processing a batch of files in a worker."""
+
+    results: List[Any]
+    record: TaskRecord
+
+
 class DelayedException(Exception):
     """Multiprocessing process pool uses this to propagate exceptions."""
 
@@ -239,11 +473,118 @@ class DelayedException(Exception):
         raise self.ee.with_traceback(self.tb)
 
 
+# The maximum number of contexts held by each worker process. Beyond this
+# the oldest are discarded (and will be reloaded if required).
+MAX_WORKER_CONTEXTS = 32
+
+# The config and rule pack for each distinct configuration loaded in this
+# process, indexed by fingerprint. Worker processes populate this on first
+# use of each config and reuse it for every subsequent file.
+_worker_contexts: Dict[str, Tuple[FluffConfig, RulePack]] = {}
+
+
+def worker_context_fingerprint(config: FluffConfig, linter: Linter) -> str:
+    """Fingerprint the context required to lint a file with a given config.
+
+    This covers every config value (not just the ones which affect results)
+    and any user rules registered on the linter.
+    """
+    hasher = hashlib.sha256(config_fingerprint(config, exclude=()).encode("utf8"))
+    for rule in linter.user_rules:
+        hasher.update(f"{rule.__module__}.{rule.__qualname__}".encode("utf8"))
+    return hasher.hexdigest()
+
+
+def write_worker_context(
+    context_dir: str, fingerprint: str, config: FluffConfig, rule_pack: RulePack
+) -> None:
+    """Persist a worker context, if it hasn't already been written."""
+    path = os.path.join(context_dir, fingerprint + ".pickle")
+    if os.path.exists(path):
+        return
+    # Write to a temporary file then move into place so that workers
+    # never load a partially written context.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump((config, rule_pack), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def lint_in_worker_context(
+    context_dir: str, fingerprint: str, rendered: RenderedFile, fix: bool
+) -> LintedFile:
+    """Lint a rendered file, using the worker context for its config."""
+    context = _worker_contexts.get(fingerprint)
+    if context is None:
+        linter_logger.debug("Loading worker context %s", fingerprint)
+        with open(os.path.join(context_dir, fingerprint + ".pickle"), "rb") as f:
+            context = pickle.load(f)
+        if len(_worker_contexts) >= MAX_WORKER_CONTEXTS:
+            # Discard the oldest context.
+            del _worker_contexts[next(iter(_worker_contexts))]
+        _worker_contexts[fingerprint] = context
+    config, rule_pack = context
+    return Linter.lint_rendered(rendered._replace(config=config), rule_pack, fix)
+
+
+class LintWorkerPool:
+    """A long-lived pool of worker processes for linting.
+
+    Starting worker processes, and loading a dialect and rule pack within
+    each of them, has a fixed cost for every call to `Linter.lint_paths`.
+    When linting repeatedly (e.g. from an editor integration or a script
+    using the Python API), a pool can be created once and passed to each
+    call so that those costs are only paid once.
+
+    .. code-block:: python
+
+        with LintWorkerPool(processes=4) as pool:
+            for paths in batches:
+                linter.lint_paths(paths, worker_pool=pool)
+
+    Args:
+        processes (:obj:`int`): The number of processes to use. As with
+            :obj:`get_runner`, zero or negative values are interpreted as
+            relative to the number of cpus.
+    """
+
+    def __init__(self, processes: int = 0) -> None:
+        if processes <= 0:
+            processes = max(multiprocessing.cpu_count() + processes, 1)
+        self.processes = processes
+        self.context_dir = tempfile.mkdtemp(prefix="sqlfluff-")
+        self.pool = MultiProcessRunner.POOL_TYPE(
+            processes, MultiProcessRunner._init_global, (None,)
+        )
+
+    def close(self) -> None:
+        """Wait for the workers to finish and then shut down the pool."""
+        self.pool.close()
+        self.pool.join()
+        shutil.rmtree(self.context_dir, ignore_errors=True)
+
+    def terminate(self) -> None:
+        """Stop the workers immediately."""
+        self.pool.terminate()
+        shutil.rmtree(self.context_dir, ignore_errors=True)
+
+    def __enter__(self) -> "LintWorkerPool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type:
+            self.terminate()
+        else:
+            self.close()
+
+
 def get_runner(
     linter: Linter,
     config: FluffConfig,
     processes: int,
     allow_process_parallelism: bool = True,
+    worker_pool: Optional[LintWorkerPool] = None,
+    timing_history: Optional[Dict[str, float]] = None,
 ) -> Tuple[BaseRunner, int]:
     """Generate a runner instance based on parallel and system configuration.
 
@@ -256,7 +597,24 @@ def get_runner(
     0 = all cpus
     1 = 1 cpu
 
+    If a `worker_pool` is provided, and more than one process is requested,
+    then the pool is used for all parallel processing.
+
+    The `timing_history` is used by the parallel runners to estimate the
+    cost of each file, so that the most expensive are started first.
     """
+    if worker_pool and processes != 1:
+        return (
+            MultiProcessRunner(
+                linter,
+                config,
+                processes=worker_pool.processes,
+                timing_history=timing_history,
+                worker_pool=worker_pool,
+            ),
+            worker_pool.processes,
+        )
+
     if processes <= 0:
         processes = max(multiprocessing.cpu_count() + processes, 1)
 
@@ -265,8 +623,24 @@ def get_runner(
         # so this flag allows us to fall back to a threaded runner
         # in those cases.
         if allow_process_parallelism:
-            return MultiProcessRunner(linter, config, processes=processes), processes
+            return (
+                MultiProcessRunner(
+                    linter,
+                    config,
+                    processes=processes,
+                    timing_history=timing_history,
+                ),
+                processes,
+            )
         else:
-            return MultiThreadRunner(linter, config, processes=processes), processes
+            return (
+                MultiThreadRunner(
+                    linter,
+                    config,
+                    processes=processes,
+                    timing_history=timing_history,
+                ),
+                processes,
+            )
     else:
         return SequentialRunner(linter, config), processes
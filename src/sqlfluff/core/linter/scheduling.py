@@ -0,0 +1,213 @@
+"""Cost estimation and scheduling helpers for the parallel runners.
+
+When linting in parallel, the order in which files are dispatched to
+workers matters. If a large file is dispatched late in a run, then
+every other worker sits idle while it finishes. Dispatching the most
+expensive files first (Longest Processing Time first), while workers
+pull new tasks as soon as they're free, keeps that tail short.
+"""
+
+import csv
+import logging
+import os
+import statistics
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Instantiate the linter logger
+linter_logger: logging.Logger = logging.getLogger("sqlfluff.linter")
+
+# The timing steps (as recorded in FileTimings) which make up the
+# total cost of processing a file.
+COST_STEPS = ("templating", "lexing", "parsing", "linting")
+
+
+def load_timing_history(filename: str) -> Dict[str, float]:
+    """Load the total time per file from a csv of persisted timings.
+
+    The csv is expected to be in the format written by
+    `LintingResult.persist_timing_records`.
+    """
+    history: Dict[str, float] = {}
+    with open(filename, newline="") as f:
+        for row in csv.DictReader(f):
+            total = 0.0
+            for step in COST_STEPS:
+                try:
+                    total += float(row.get(step) or 0)
+                except ValueError:  # pragma: no cover
+                    continue
+            history[os.path.normpath(row["path"])] = total
+    return history
+
+
+class FileCostEstimator:
+    """Estimate the relative cost of processing a set of files.
+
+    Where a file has a timing from a previous run, that is used directly.
+    Otherwise the cost is estimated from the size of the file, with each
+    templating tag weighted as though it were a number of additional
+    bytes (because loops and macros can expand to much more than the
+    source). Sizes are converted to seconds using the rate observed in
+    the timing history, or a default rate if there isn't any. That rate
+    is only calibrated once a file without history needs estimating, and
+    from a limited sample of the history (preferring files in the current
+    run), so that a long history doesn't delay the start of a run.
+
+    Files are read by the workers anyway, so only the start of each file
+    is read here to sample the density of templating tags, and the size
+    comes from the file system.
+
+    Args:
+        history (:obj:`dict`, optional): A mapping of file paths to the
+            time taken to process them on a previous run.
+    """
+
+    # A rough rate of processing time per byte, for use without history.
+    default_seconds_per_byte = 2e-5
+    # The number of bytes each templating tag is treated as being worth.
+    template_tag_weight = 200
+    template_tags = (b"{%", b"{{")
+    # The number of bytes at the start of each file to count tags in.
+    sample_bytes = 8192
+    # The most files in the history to read when calibrating the rate.
+    calibration_samples = 20
+
+    def __init__(self, history: Optional[Dict[str, float]] = None) -> None:
+        self.history = {
+            os.path.normpath(path): seconds for path, seconds in (history or {}).items()
+        }
+        self._seconds_per_byte: Optional[float] = None
+        # The files being ordered, which are preferred for calibration.
+        self._run_fnames: List[str] = []
+
+    @property
+    def seconds_per_byte(self) -> float:
+        """The processing rate, calibrated from the history on first use."""
+        if self._seconds_per_byte is None:
+            self._seconds_per_byte = self._calibrate()
+        return self._seconds_per_byte
+
+    def _calibration_paths(self) -> Iterator[str]:
+        """Yield the paths in the history, starting with those in this run."""
+        seen = set()
+        run_paths = (os.path.normpath(fname) for fname in self._run_fnames)
+        for path in chain(run_paths, self.history):
+            if path in self.history and path not in seen:
+                seen.add(path)
+                yield path
+
+    def _calibrate(self) -> float:
+        """Derive a processing rate from the history, where possible."""
+        rates = []
+        for path in islice(self._calibration_paths(), self.calibration_samples):
+            seconds = self.history[path]
+            try:
+                size = self._weighted_size(path)
+            except OSError:
+                continue
+            if size and seconds:
+                rates.append(seconds / size)
+        if rates:
+            return statistics.median(rates)
+        return self.default_seconds_per_byte
+
+    def _weighted_size(self, fname: str) -> float:
+        size = os.stat(fname).st_size
+        with open(fname, "rb") as f:
+            sample = f.read(self.sample_bytes)
+        if not sample:
+            return size
+        tags = sum(sample.count(tag) for tag in self.template_tags)
+        # Assume the rest of the file is as templated as the sample.
+        return size + tags * self.template_tag_weight * size / len(sample)
+
+    def estimate(self, fname: str) -> float:
+        """Estimate the cost of processing a file, in seconds."""
+        seconds = self.history.get(os.path.normpath(fname))
+        if seconds is not None:
+            return seconds
+        try:
+            return self._weighted_size(fname) * self.seconds_per_byte
+        except OSError:  # pragma: no cover
+            # If we can't read it, it's not going to be expensive to lint.
+            return 0.0
+
+    def order(self, fnames: Iterable[str]) -> Tuple[List[str], Dict[str, float]]:
+        """Order files with the most expensive first.
+
+        Returns:
+            A tuple of the ordered filenames and the estimated cost of each.
+        """
+        self._run_fnames = list(fnames)
+        costs = {fname: self.estimate(fname) for fname in self._run_fnames}
+        # NOTE: Sorting is stable, so ties retain their original order.
+        return sorted(costs, key=lambda fname: -costs[fname]), costs
+
+
+def batch_by_cost(
+    tasks: Iterable[Tuple[str, object]],
+    costs: Dict[str, float],
+    min_batch_cost: float,
+    max_batch_size: int,
+) -> Iterator[List[Tuple[str, object]]]:
+    """Group consecutive cheap tasks into batches.
+
+    Each task is a tuple with the filename as its first element. Tasks
+    are accumulated until their combined estimated cost reaches
+    `min_batch_cost` (or the batch reaches `max_batch_size`), so that
+    expensive files are dispatched on their own but the overhead of
+    dispatching many tiny files is shared.
+    """
+    batch: List[Tuple[str, object]] = []
+    batch_cost = 0.0
+    for task in tasks:
+        batch.append(task)
+        batch_cost += costs.get(task[0], 0.0)
+        if batch_cost >= min_batch_cost or len(batch) >= max_batch_size:
+            yield batch
+            batch = []
+            batch_cost = 0.0
+    if batch:
+        yield batch
+
+
+class TaskRecord(NamedTuple):
+    """A record of when and where a batch of tasks was processed."""
+
+    worker: str
+    start: float
+    end: float
+
+
+def summarise_utilisation(
+    records: List[TaskRecord], start: float, end: float, processes: int
+) -> Dict[str, float]:
+    """Summarise the utilisation of the workers over a parallel run.
+
+    The "tail" is the time between the first worker running out of
+    work and the end of the run, i.e. the period in which at least one
+    worker was idle waiting for others to finish. If any worker was
+    never used, then the tail is the whole run.
+    """
+    if not records:
+        return {}
+    wall_time = max(end - start, 1e-9)
+    busy: Dict[str, float] = {}
+    last_end: Dict[str, float] = {}
+    for record in records:
+        busy[record.worker] = busy.get(record.worker, 0.0) + (record.end - record.start)
+        last_end[record.worker] = max(last_end.get(record.worker, 0.0), record.end)
+    if len(busy) < processes:
+        tail = wall_time
+    else:
+        tail = max(end - min(last_end.values()), 0.0)
+    summary = {
+        "wall time": wall_time,
+        "tail": tail,
+        "mean util": sum(busy.values()) / (max(processes, len(busy)) * wall_time),
+    }
+    # Label workers in order of first use.
+    for idx, worker in enumerate(busy, start=1):
+        summary[f"worker {idx}"] = busy[worker] / wall_time
+    return summary
@@ -0,0 +1,94 @@
+"""The parse cache, used to avoid repeated matching at the same location."""
+
+import heapq
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.parser.match_result import MatchResult
+
+# The location key is the raw, working location, type and the number of
+# segments being matched. See `BaseGrammar._longest_trimmed_match()`.
+LocKey = Tuple[Any, ...]
+
+
+class ParseCache:
+    """A cache of match results, keyed by location and matcher.
+
+    Parsing generally makes forward progress through a file, and so once
+    the parser has moved on from a location, matches at it are unlikely
+    to be needed again. When the cache reaches `max_entries`, entries are
+    therefore evicted from the earliest locations first, rather than the
+    least recently used.
+
+    Args:
+        max_entries (:obj:`int`, optional): The maximum number of matches
+            to hold. If zero or less, the cache is unbounded.
+    """
+
+    def __init__(self, max_entries: int = 0) -> None:
+        self.max_entries = max_entries
+        # Entries are grouped by their working location (line, pos),
+        # so that all the entries for a location can be evicted together.
+        self._entries: Dict[
+            Tuple[int, int], Dict[Tuple[LocKey, str], "MatchResult"]
+        ] = {}
+        self._locations: List[Tuple[int, int]] = []
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.peak_size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _location(loc_key: LocKey) -> Tuple[int, int]:
+        return loc_key[1]
+
+    def get(self, loc_key: LocKey, matcher_key: str) -> Optional["MatchResult"]:
+        """Get a match from the cache, returning None if not present."""
+        bucket = self._entries.get(self._location(loc_key))
+        match = bucket.get((loc_key, matcher_key)) if bucket else None
+        if match:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return match
+
+    def put(self, loc_key: LocKey, matcher_key: str, match: "MatchResult") -> None:
+        """Store a match in the cache, evicting others if necessary.
+
+        Failed matches aren't stored, because they would never be served
+        (`get` treats them as misses) and would only take up room.
+        """
+        if not match:
+            return
+        location = self._location(loc_key)
+        bucket = self._entries.get(location)
+        if bucket is None:
+            bucket = self._entries[location] = {}
+            heapq.heappush(self._locations, location)
+        if (loc_key, matcher_key) not in bucket:
+            self._size += 1
+        bucket[(loc_key, matcher_key)] = match
+        if self.max_entries > 0:
+            while self._size > self.max_entries and len(self._locations) > 1:
+                self._evict_earliest()
+        self.peak_size = max(self.peak_size, self._size)
+
+    def _evict_earliest(self) -> None:
+        """Evict all the entries at the earliest location in the cache."""
+        location = heapq.heappop(self._locations)
+        bucket = self._entries.pop(location)
+        self._size -= len(bucket)
+        self.evictions += len(bucket)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit, miss and eviction counts for the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "peak size": self.peak_size,
+        }
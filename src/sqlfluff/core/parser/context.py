@@ -17,12 +17,15 @@ from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence,
 from tqdm import tqdm
 
 from sqlfluff.core.config import progress_bar_configuration
+from sqlfluff.core.parser.cache import ParseCache
+from sqlfluff.core.parser.trace import ParseTrace
 
 if TYPE_CHECKING:  # pragma: no cover
     from sqlfluff.core.config import FluffConfig
     from sqlfluff.core.dialects.base import Dialect
     from sqlfluff.core.parser.match_result import MatchResult
     from sqlfluff.core.parser.matchable import Matchable
+    from sqlfluff.core.parser.memo import StatementMemo
     from sqlfluff.core.parser.segments import BaseSegment
 
 # Get the parser logger
@@ -55,6 +58,9 @@ class ParseContext:
         self,
         dialect: "Dialect",
         indentation_config: Optional[Dict[str, Any]] = None,
+        statement_memo: Optional["StatementMemo"] = None,
+        parse_cache: Optional[ParseCache] = None,
+        trace: Optional[ParseTrace] = None,
     ) -> None:
         self.dialect = dialect
         # Indentation config is used by Indent and Dedent and used to control
@@ -65,9 +71,14 @@ class ParseContext:
         self.logger = parser_logger
         # A uuid for this parse context to enable cache invalidation
         self.uuid = uuid.uuid4()
-        # A dict for parse caching. This is reset for each file,
+        # A cache of matches. This is reset for each file,
         # but persists for the duration of an individual file parse.
-        self._parse_cache: Dict[Tuple[Any, ...], "MatchResult"] = {}
+        self._parse_cache = ParseCache() if parse_cache is None else parse_cache
+        # An optional memo of parsed statements. Unlike the parse cache,
+        # this is shared between files.
+        self.statement_memo = statement_memo
+        # An optional trace of the matching, for finding slow grammars.
+        self.trace = trace
         # A dictionary for keeping track of some statistics on parsing
         # for performance optimisation.
         # Focused around BaseGrammar._longest_trimmed_match().
@@ -109,9 +120,19 @@ class ParseContext:
                 "One of the configuration keys in the `indentation` section is not "
                 "True or False: {!r}".format(indentation_config)
             )
+        # NOTE: Imported here to avoid a circular import.
+        from sqlfluff.core.parser.memo import get_statement_memo
+
         return cls(
             dialect=config.get("dialect_obj"),
             indentation_config=indentation_config,
+            statement_memo=get_statement_memo(
+                config.get("statement_memo_size", default=0) or 0
+            ),
+            parse_cache=ParseCache(
+                max_entries=config.get("parse_cache_size", default=0) or 0
+            ),
+            trace=ParseTrace() if config.get("parse_trace", default=False) else None,
         )
 
     def _set_terminators(
@@ -161,6 +182,7 @@ class ParseContext:
         clear_terminators: bool = False,
         push_terminators: Optional[Sequence["Matchable"]] = None,
         track_progress: Optional[bool] = None,
+        segments: Sequence["BaseSegment"] = (),
     ) -> Iterator["ParseContext"]:
         """Increment match depth.
 
@@ -179,10 +201,15 @@ class ParseContext:
                 tracking for deeper matches. This avoids having the linting
                 progress bar jump forward when performing greedy matches on
                 terminators.
+            segments (:obj:`Sequence` of :obj:`BaseSegment`, optional): The
+                segments being matched. NOTE: This is only used to record
+                the position of the match when tracing.
         """
         self._match_stack.append(self.match_segment)
         self.match_segment = name
         self.match_depth += 1
+        if self.trace:
+            self.trace.begin(name, "deeper_match", segments)
         _append, _terms = self._set_terminators(clear_terminators, push_terminators)
         _track_progress = self.track_progress
         if track_progress is False:
@@ -201,6 +228,8 @@ class ParseContext:
             self.match_segment = self._match_stack.pop()
             # Reset back to old progress tracking.
             self.track_progress = _track_progress
+            if self.trace:
+                self.trace.end()
 
     @contextmanager
     def progress_bar(self, last_char: int) -> Iterator["ParseContext"]:
@@ -262,13 +291,18 @@ class ParseContext:
 
         If no match is found in the cache, this returns None.
         """
-        return self._parse_cache.get((loc_key, matcher_key))
+        return self._parse_cache.get(loc_key, matcher_key)
 
     def put_parse_cache(
         self, loc_key: Tuple[Any, ...], matcher_key: str, match: "MatchResult"
     ) -> None:
         """Store a match in the cache for later retrieval."""
-        self._parse_cache[(loc_key, matcher_key)] = match
+        self._parse_cache.put(loc_key, matcher_key, match)
+
+    def record_parse_cache_stats(self) -> None:
+        """Add the statistics of the parse cache to the parse stats."""
+        for key, value in self._parse_cache.stats().items():
+            self.parse_stats[f"parse_cache_{key.replace(' ', '_')}"] = value
 
     def increment(self, key: str, default: int = 0) -> None:
         """Increment one of the parse stats by name."""
@@ -134,6 +134,7 @@ class AnyNumberOf(BaseGrammar):
         """
         with parse_context.deeper_match(
             name=self.__class__.__name__,
+            segments=segments,
             clear_terminators=self.reset_terminators,
             push_terminators=self.terminators,
         ) as ctx:
@@ -142,6 +143,7 @@ class AnyNumberOf(BaseGrammar):
                 self._elements,
                 parse_context=ctx,
                 trim_noncode=False,
+                option_index=self._first_token_index(ctx),
             )
 
         return match, matched_option
@@ -159,7 +161,7 @@ class AnyNumberOf(BaseGrammar):
         # which would prevent the rest of this grammar from matching.
         if self.exclude:
             with parse_context.deeper_match(
-                name=self.__class__.__name__ + "-Exclude"
+                name=self.__class__.__name__ + "-Exclude", segments=segments
             ) as ctx:
                 if self.exclude.match(segments, ctx):
                     return MatchResult.from_unmatched(segments)
@@ -172,7 +174,7 @@ class AnyNumberOf(BaseGrammar):
         if self.parse_mode == ParseMode.GREEDY:
             _terminators = [*self.terminators, *parse_context.terminators]
             with parse_context.deeper_match(
-                name="AnyOf-Greedy-@0", track_progress=False
+                name="AnyOf-Greedy-@0", segments=segments, track_progress=False
             ) as ctx:
                 _term_match = greedy_match(
                     segments,
@@ -5,6 +5,7 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    Dict,
     List,
     Optional,
     Sequence,
@@ -17,7 +18,11 @@ from uuid import UUID, uuid4
 
 from sqlfluff.core.parser.context import ParseContext
 from sqlfluff.core.parser.helpers import trim_non_code_segments
-from sqlfluff.core.parser.match_algorithms import greedy_match, prune_options
+from sqlfluff.core.parser.match_algorithms import (
+    FirstTokenIndex,
+    greedy_match,
+    prune_options,
+)
 from sqlfluff.core.parser.match_logging import parse_match_logging
 from sqlfluff.core.parser.match_result import MatchResult
 from sqlfluff.core.parser.match_wrapper import match_wrapper
@@ -170,6 +175,9 @@ class BaseGrammar(Matchable):
         self.parse_mode = parse_mode
         # Generate a cache key
         self._cache_key = uuid4().hex
+        # Indices of the elements by first token, per dialect.
+        # See `_first_token_index()`.
+        self._first_token_indices: Dict[Optional[str], FirstTokenIndex] = {}
 
     def cache_key(self) -> str:
         """Get the cache key for this grammar.
@@ -206,6 +214,22 @@ class BaseGrammar(Matchable):
         """Does this matcher support a lowercase hash matching route?"""
         return None
 
+    def _first_token_index(self, parse_context: ParseContext) -> FirstTokenIndex:
+        """Get the index of the elements of this grammar by first token.
+
+        The index depends on the simple hints of the elements, which
+        in turn depend on the dialect. They're therefore built once
+        per dialect and reused for every file parsed with it.
+        """
+        # NOTE: Some tests parse without a dialect.
+        dialect_name = parse_context.dialect.name if parse_context.dialect else None
+        try:
+            return self._first_token_indices[dialect_name]
+        except KeyError:
+            index = FirstTokenIndex(self._elements, parse_context)
+            self._first_token_indices[dialect_name] = index
+            return index
+
     @classmethod
     def _longest_trimmed_match(
         cls,
@@ -213,6 +237,7 @@ class BaseGrammar(Matchable):
         matchers: List[Matchable],
         parse_context: ParseContext,
         trim_noncode: bool = True,
+        option_index: Optional[FirstTokenIndex] = None,
     ) -> Tuple[MatchResult, Optional[Matchable]]:
         """Return longest match from a selection of matchers.
 
@@ -220,6 +245,9 @@ class BaseGrammar(Matchable):
         If two matches of the same length match at the same time, then it's the first in
         the iterable of matchers.
 
+        If an `option_index` is provided for the `matchers`, it is used for
+        pruning rather than considering each of them in turn.
+
         Returns:
             `tuple` of (match_object, matcher).
 
@@ -229,9 +257,9 @@ class BaseGrammar(Matchable):
         using the `parse_stats` object on the context.
 
         The things which determine the performance of this method are:
-        1. Pruning. This method uses `prune_options()` to filter down which matchable
-           options proceed to the full matching step. Ideally only very few do and this
-           can handle the majority of the filtering.
+        1. Pruning. This method uses `prune_options()` (or a `FirstTokenIndex`) to
+           filter down which matchable options proceed to the full matching step.
+           Ideally only very few do and this can handle the majority of the filtering.
         2. Caching. This method uses the parse cache (`check_parse_cache` and
            `put_parse_cache`) on the ParseContext to speed up repetitive matching
            operations. As we make progress through a file there will often not be a
@@ -255,11 +283,14 @@ class BaseGrammar(Matchable):
 
         # Prune available options, based on their simple representation for efficiency.
         # NOTE: We're also passing in terminators as options.
-        available_options = prune_options(
-            matchers,
-            segments,
-            parse_context=parse_context,
-        )
+        if option_index is not None:
+            available_options = option_index.prune(segments)
+        else:
+            available_options = prune_options(
+                matchers,
+                segments,
+                parse_context=parse_context,
+            )
 
         # If we've pruned all the options, return no match
         if not available_options:
@@ -292,6 +323,7 @@ class BaseGrammar(Matchable):
 
         best_match_length = 0
         best_match: Optional[Tuple[MatchResult, Matchable]] = None
+        trace = parse_context.trace
         # iterate at this position across all the matchers
         for idx, matcher in enumerate(available_options):
             # Check parse cache.
@@ -299,6 +331,13 @@ class BaseGrammar(Matchable):
             res_match: Optional[MatchResult] = parse_context.check_parse_cache(
                 loc_key, matcher_key
             )
+            if trace:
+                trace.begin(
+                    trace.name(matcher),
+                    "longest_trimmed_match",
+                    segments,
+                    cache_hit=bool(res_match),
+                )
             if res_match:
                 parse_match_logging(
                     cls.__name__,
@@ -313,6 +352,8 @@ class BaseGrammar(Matchable):
                 res_match = matcher.match(segments, parse_context)
                 # Cache it for later to for performance.
                 parse_context.put_parse_cache(loc_key, matcher_key, res_match)
+            if trace:
+                trace.end()
 
             # No match. Skip this one.
             if not res_match:
@@ -509,6 +550,7 @@ class BaseGrammar(Matchable):
                     )
         new_grammar = copy.copy(self)
         new_grammar._elements = new_elems
+        new_grammar._first_token_indices = {}
 
         if replace_terminators:  # pragma: no cover
             # Override (NOTE: Not currently used).
@@ -604,6 +646,7 @@ class Ref(BaseGrammar):
         if self.exclude:
             with parse_context.deeper_match(
                 name=self._ref + "-Exclude",
+                segments=segments,
                 clear_terminators=self.reset_terminators,
                 push_terminators=self.terminators,
             ) as ctx:
@@ -614,6 +657,7 @@ class Ref(BaseGrammar):
         # References shouldn't really count as a depth of match.
         with parse_context.deeper_match(
             name=self._ref,
+            segments=segments,
             clear_terminators=self.reset_terminators,
             push_terminators=self.terminators,
         ) as ctx:
@@ -114,7 +114,9 @@ class Delimited(OneOf):
                 break
 
             # Check whether there is a terminator before checking for content
-            with parse_context.deeper_match(name="Delimited-Term") as ctx:
+            with parse_context.deeper_match(
+                name="Delimited-Term", segments=seg_content
+            ) as ctx:
                 match, _ = self._longest_trimmed_match(
                     segments=seg_content,
                     matchers=terminator_matchers,
@@ -132,18 +134,27 @@ class Delimited(OneOf):
 
             with parse_context.deeper_match(
                 name="Delimited",
+                segments=seg_content,
                 push_terminators=[] if seeking_delimiter else delimiter_matchers,
                 clear_terminators=self.reset_terminators,
             ) as ctx:
-                match, _ = self._longest_trimmed_match(
-                    segments=seg_content,
-                    matchers=delimiter_matchers
-                    if seeking_delimiter
-                    else self._elements,
-                    parse_context=ctx,
-                    # We've already trimmed
-                    trim_noncode=False,
-                )
+                if seeking_delimiter:
+                    match, _ = self._longest_trimmed_match(
+                        segments=seg_content,
+                        matchers=delimiter_matchers,
+                        parse_context=ctx,
+                        # We've already trimmed
+                        trim_noncode=False,
+                    )
+                else:
+                    match, _ = self._longest_trimmed_match(
+                        segments=seg_content,
+                        matchers=self._elements,
+                        parse_context=ctx,
+                        # We've already trimmed
+                        trim_noncode=False,
+                        option_index=self._first_token_index(ctx),
+                    )
 
             if not match:
                 unmatched_segments = (
@@ -61,7 +61,9 @@ def _trim_to_terminator(
     # match will appear to not match (because there's "nothing" before
     # the terminator). To resolve that case, we first match immediately
     # on the terminators and handle that case explicitly if it occurs.
-    with parse_context.deeper_match(name="Sequence-GreedyA-@0") as ctx:
+    with parse_context.deeper_match(
+        name="Sequence-GreedyA-@0", segments=segments
+    ) as ctx:
         pruned_terms = prune_options(terminators, segments, parse_context=ctx)
         for term in pruned_terms:
             if term.match(segments, ctx):
@@ -70,7 +72,7 @@ def _trim_to_terminator(
 
     # If the above case didn't match then we proceed as expected.
     with parse_context.deeper_match(
-        name="Sequence-GreedyB-@0", track_progress=False
+        name="Sequence-GreedyB-@0", segments=segments, track_progress=False
     ) as ctx:
         term_match = greedy_match(
             segments,
@@ -163,6 +165,17 @@ class Sequence(BaseGrammar):
         versions of any segments which _have_ been processed to provide
         better feedback to the user.
         """
+        if parse_context.trace:
+            with parse_context.trace.span(
+                parse_context.trace.name(self), "Sequence", segments
+            ):
+                return self._match(segments, parse_context)
+        return self._match(segments, parse_context)
+
+    def _match(
+        self, segments: Tuple[BaseSegment, ...], parse_context: ParseContext
+    ) -> MatchResult:
+        """Match the sequence, without tracing (see :meth:`match`)."""
         matched_segments: Tuple[BaseSegment, ...] = ()
         unmatched_segments = segments
         tail: Tuple[BaseSegment, ...] = ()
@@ -267,7 +280,9 @@ class Sequence(BaseGrammar):
                 )
 
             # 4. Match the current element against the current position.
-            with parse_context.deeper_match(name=f"Sequence-@{idx}") as ctx:
+            with parse_context.deeper_match(
+                name=f"Sequence-@{idx}", segments=unmatched_segments
+            ) as ctx:
                 elem_match = elem.match(unmatched_segments, ctx)
 
             # Did we fail to match? (totally or un-cleanly)
@@ -525,7 +540,9 @@ class Bracketed(Sequence):
         # Otherwise try and match the segments directly.
         else:
             # Look for the first bracket
-            with parse_context.deeper_match(name="Bracketed-First") as ctx:
+            with parse_context.deeper_match(
+                name="Bracketed-First", segments=seg_buff
+            ) as ctx:
                 start_match = start_bracket.match(seg_buff, ctx)
             if start_match:
                 seg_buff = start_match.unmatched_segments
@@ -536,7 +553,7 @@ class Bracketed(Sequence):
             # Look for the closing bracket.
             # Within the brackets, clear any inherited terminators.
             with parse_context.deeper_match(
-                name="Bracketed-End", clear_terminators=True
+                name="Bracketed-End", segments=seg_buff, clear_terminators=True
             ) as ctx:
                 content_segs, end_match, _ = bracket_sensitive_look_ahead_match(
                     segments=seg_buff,
@@ -590,7 +607,7 @@ class Bracketed(Sequence):
         # Match the content using super. Sequence will interpret the content of the
         # elements. Within the brackets, clear any inherited terminators.
         with parse_context.deeper_match(
-            name="Bracketed", clear_terminators=True
+            name="Bracketed", segments=content_segs, clear_terminators=True
         ) as ctx:
             content_match = super().match(content_segs, ctx)
 
@@ -161,16 +161,20 @@ class StringLexer:
         """
         pass
 
-    def _match(self, forward_string: str) -> Optional[LexedElement]:
-        """The private match function. Just look for a literal string."""
-        if forward_string.startswith(self.template):
+    def _match(self, forward_string: str, pos: int = 0) -> Optional[LexedElement]:
+        """The private match function. Just look for a literal string.
+
+        Matching starts at `pos`, so that callers can work through a
+        buffer without slicing it.
+        """
+        if forward_string.startswith(self.template, pos):
             return LexedElement(self.template, self)
         else:
             return None
 
-    def search(self, forward_string: str) -> Optional[Tuple[int, int]]:
-        """Use string methods to find a substring."""
-        loc = forward_string.find(self.template)
+    def search(self, forward_string: str, pos: int = 0) -> Optional[Tuple[int, int]]:
+        """Use string methods to find a substring, starting at `pos`."""
+        loc = forward_string.find(self.template, pos)
         if loc >= 0:
             return loc, loc + len(self.template)
         else:
@@ -239,21 +243,22 @@ class StringLexer:
         if self.subdivider:
             # Yes subdivision
             elem_buff: List[LexedElement] = []
-            str_buff = matched.raw
-            while str_buff:
+            raw = matched.raw
+            pos = 0
+            while pos < len(raw):
                 # Iterate through subdividing as appropriate
-                div_pos = self.subdivider.search(str_buff)
+                div_pos = self.subdivider.search(raw, pos)
                 if div_pos:
                     # Found a division
-                    trimmed_elems = self._trim_match(str_buff[: div_pos[0]])
+                    trimmed_elems = self._trim_match(raw[pos : div_pos[0]])
                     div_elem = LexedElement(
-                        str_buff[div_pos[0] : div_pos[1]], self.subdivider
+                        raw[div_pos[0] : div_pos[1]], self.subdivider
                     )
                     elem_buff += trimmed_elems + [div_elem]
-                    str_buff = str_buff[div_pos[1] :]
+                    pos = div_pos[1]
                 else:
                     # No more division matches. Trim?
-                    trimmed_elems = self._trim_match(str_buff)
+                    trimmed_elems = self._trim_match(raw[pos:])
                     elem_buff += trimmed_elems
                     break
             return elem_buff
@@ -315,9 +320,9 @@ class RegexLexer(StringLexer):
         flags = regex.DOTALL
         self._compiled_regex = regex.compile(self.template, flags)
 
-    def _match(self, forward_string: str) -> Optional[LexedElement]:
-        """Use regexes to match chunks."""
-        match = self._compiled_regex.match(forward_string)
+    def _match(self, forward_string: str, pos: int = 0) -> Optional[LexedElement]:
+        """Use regexes to match chunks, starting at `pos`."""
+        match = self._compiled_regex.match(forward_string, pos)
         if match:
             # We can only match strings with length
             match_str = match.group(0)
@@ -330,9 +335,9 @@ class RegexLexer(StringLexer):
                 )
         return None
 
-    def search(self, forward_string: str) -> Optional[Tuple[int, int]]:
-        """Use regex to find a substring."""
-        match = self._compiled_regex.search(forward_string)
+    def search(self, forward_string: str, pos: int = 0) -> Optional[Tuple[int, int]]:
+        """Use regex to find a substring, starting at `pos`."""
+        match = self._compiled_regex.search(forward_string, pos)
         if match:
             # We can only match strings with length
             if match.group(0):
@@ -345,6 +350,138 @@ class RegexLexer(StringLexer):
         return None
 
 
+class CompiledLexerMatchers:
+    """A single pass matcher, compiled from a list of lexer matchers.
+
+    `Lexer.lex_match()` tries each matcher in turn at each position,
+    restarting from the top after every match. This instead combines
+    the matchers into a single regex alternation, with a named group
+    for each matcher. Alternations are tried in order, so the first
+    matcher to match wins, just as with the iterative approach. The
+    buffer is scanned by offset rather than by slicing it after each
+    match.
+
+    Some templates can't be combined without changing their meaning
+    (e.g. those with back references or recursion, which depend on
+    group numbering). Those matchers are matched on their own, between
+    the combined regexes of the matchers before and after them.
+    """
+
+    # Constructs which depend on the template being the whole regex.
+    _uncombinable = regex.compile(r"(?<!\\)\\[1-9]|\(\?(?:R|[&0-9+-]|P?[<>]\w|P=)")
+    # Leading global flags, which need to be scoped to the group.
+    _leading_flags = regex.compile(r"^\(\?([a-zA-Z]+)\)")
+
+    def __init__(self, lexer_matchers: List[StringLexer]) -> None:
+        self.lexer_matchers = lexer_matchers
+        # Each chunk is either a combined regex, with the matchers which
+        # correspond to each named group, or a lone matcher.
+        self._chunks: List[
+            Tuple[Optional["regex.Pattern[str]"], List[StringLexer]]
+        ] = []
+        patterns: List[str] = []
+        combined: List[StringLexer] = []
+        for matcher in lexer_matchers:
+            pattern = self._pattern_for(matcher)
+            if pattern is None:
+                if combined:
+                    self._chunks.append((self._compile(patterns), combined))
+                    patterns, combined = [], []
+                self._chunks.append((None, [matcher]))
+            else:
+                patterns.append(pattern)
+                combined.append(matcher)
+        if combined:
+            self._chunks.append((self._compile(patterns), combined))
+
+    @classmethod
+    def _pattern_for(cls, matcher: StringLexer) -> Optional[str]:
+        """Get the pattern for a matcher, if it can be combined."""
+        if type(matcher) is StringLexer:
+            return regex.escape(matcher.template)
+        elif type(matcher) is RegexLexer:
+            template = matcher.template
+            if cls._uncombinable.search(template):
+                return None
+            flags = cls._leading_flags.match(template)
+            if flags:
+                template = f"(?{flags.group(1)}:{template[flags.end():]})"
+            return template
+        # Subclasses may override the matching methods, so leave them alone.
+        return None
+
+    @staticmethod
+    def _compile(patterns: List[str]) -> "regex.Pattern[str]":
+        return regex.compile(
+            "|".join(f"(?P<m{idx}>{pattern})" for idx, pattern in enumerate(patterns)),
+            regex.DOTALL,
+        )
+
+    def _match_at(self, buffer: str, pos: int) -> Optional[LexedElement]:
+        """Find the first matcher which matches at `pos` in the buffer."""
+        for compiled, matchers in self._chunks:
+            if compiled is None:
+                element = matchers[0]._match(buffer, pos)
+                if element:
+                    return element
+                continue
+            match = compiled.match(buffer, pos)
+            if not match:
+                continue
+            if not match.group(0):
+                # The first option to match did so with zero length, which
+                # the iterative approach would skip. Fall back to that, for
+                # this chunk at this position.
+                for matcher in matchers:
+                    element = matcher._match(buffer, pos)
+                    if element:
+                        return element
+                continue
+            # The winning option is the only named group which matched.
+            assert match.lastgroup
+            return LexedElement(match.group(0), matchers[int(match.lastgroup[1:])])
+        return None
+
+    def scan(
+        self, buffer: str, pos: int = 0, end: Optional[int] = None
+    ) -> Tuple[List[LexedElement], int]:
+        """Match as much of the buffer as possible, starting at `pos`.
+
+        If `end` is provided, matching stops at the first element which
+        ends at or beyond it.
+
+        Returns:
+            A tuple of the matched elements (subdivided as appropriate)
+            and the position at which matching stopped.
+        """
+        elem_buff: List[LexedElement] = []
+        if end is None:
+            end = len(buffer)
+        while pos < end:
+            element = self._match_at(buffer, pos)
+            if element is None:
+                break
+            elem_buff += element.matcher._subdivide(element)
+            pos += len(element.raw)
+        return elem_buff, pos
+
+
+# Compiled matchers are cached, as lexers are created for every file.
+_compiled_matchers: Dict[Tuple[StringLexer, ...], CompiledLexerMatchers] = {}
+
+
+def compile_lexer_matchers(
+    lexer_matchers: List[StringLexer],
+) -> CompiledLexerMatchers:
+    """Get the compiled version of a list of lexer matchers."""
+    key = tuple(lexer_matchers)
+    try:
+        return _compiled_matchers[key]
+    except KeyError:
+        compiled = _compiled_matchers[key] = CompiledLexerMatchers(lexer_matchers)
+        return compiled
+
+
 def _handle_zero_length_slice(
     tfs: TemplatedFileSlice,
     next_tfs: Optional[TemplatedFileSlice],
@@ -738,6 +875,7 @@ class Lexer:
         self.config = FluffConfig.from_kwargs(config=config, dialect=dialect)
         # Store the matchers
         self.lexer_matchers = self.config.get("dialect_obj").get_lexer_matchers()
+        self.compiled_matchers = compile_lexer_matchers(self.lexer_matchers)
 
         self.last_resort_lexer = last_resort_lexer or RegexLexer(
             "<unlexable>",
@@ -764,25 +902,7 @@ class Lexer:
             str_buff = str(template)
 
         # Lex the string to get a tuple of LexedElement
-        element_buffer: List[LexedElement] = []
-        while True:
-            res = self.lex_match(str_buff, self.lexer_matchers)
-            element_buffer += res.elements
-            if res.forward_string:
-                resort_res = self.last_resort_lexer.match(res.forward_string)
-                if not resort_res:  # pragma: no cover
-                    # If we STILL can't match, then just panic out.
-                    raise SQLLexError(
-                        "Fatal. Unable to lex characters: {0!r}".format(
-                            res.forward_string[:10] + "..."
-                            if len(res.forward_string) > 9
-                            else res.forward_string
-                        )
-                    )
-                str_buff = resort_res.forward_string
-                element_buffer += resort_res.elements
-            else:  # pragma: no cover TODO?
-                break
+        element_buffer, _ = self.lex_elements(str_buff)
 
         # Map tuple LexedElement to list of TemplateElement.
         # This adds the template_slice to the object.
@@ -798,6 +918,41 @@ class Lexer:
 
         return segments, violations
 
+    def lex_elements(
+        self, str_buff: str, pos: int = 0, end: Optional[int] = None
+    ) -> Tuple[List[LexedElement], int]:
+        """Lex a string into elements, starting at `pos`.
+
+        If `end` is provided, lexing stops at the first element which
+        ends at or beyond it, otherwise the whole string is lexed.
+
+        Returns:
+            A tuple of the lexed elements and the position at which
+            lexing stopped.
+        """
+        if end is None:
+            end = len(str_buff)
+        element_buffer: List[LexedElement] = []
+        while True:
+            elements, pos = self.compiled_matchers.scan(str_buff, pos, end)
+            element_buffer += elements
+            if pos < end:
+                resort_elem = self.last_resort_lexer._match(str_buff, pos)
+                if not resort_elem:  # pragma: no cover
+                    # If we STILL can't match, then just panic out.
+                    raise SQLLexError(
+                        "Fatal. Unable to lex characters: {0!r}".format(
+                            str_buff[pos : pos + 10] + "..."
+                            if len(str_buff) - pos > 9
+                            else str_buff[pos:]
+                        )
+                    )
+                element_buffer += self.last_resort_lexer._subdivide(resort_elem)
+                pos += len(resort_elem.raw)
+            else:  # pragma: no cover TODO?
+                break
+        return element_buffer, pos
+
     def elements_to_segments(
         self, elements: List[TemplateElement], templated_file: TemplatedFile
     ) -> Tuple[RawSegment, ...]:
@@ -842,21 +997,22 @@ class Lexer:
     def lex_match(forward_string: str, lexer_matchers: List[StringLexer]) -> LexMatch:
         """Iteratively match strings using the selection of submatchers."""
         elem_buff: List[LexedElement] = []
-        while True:
-            if len(forward_string) == 0:
-                return LexMatch(forward_string, elem_buff)
+        # Work through the string by position, rather than slicing it.
+        pos = 0
+        while pos < len(forward_string):
             for matcher in lexer_matchers:
-                res = matcher.match(forward_string)
-                if res.elements:
+                matched = matcher._match(forward_string, pos)
+                if matched:
                     # If we have new segments then whoop!
-                    elem_buff += res.elements
-                    forward_string = res.forward_string
+                    elem_buff += matcher._subdivide(matched)
+                    pos += len(matched.raw)
                     # Cycle back around again and start with the top
                     # matcher again.
                     break
             else:
-                # We've got so far, but now can't match. Return
-                return LexMatch(forward_string, elem_buff)
+                # We've got so far, but now can't match.
+                break
+        return LexMatch(forward_string[pos:], elem_buff)
 
     @staticmethod
     def map_template_slices(
@@ -874,8 +1030,8 @@ class Lexer:
             template_slice = offset_slice(idx, len(element.raw))
             idx += len(element.raw)
             templated_buff.append(TemplateElement.from_element(element, template_slice))
-            if (
-                template.templated_str[template_slice] != element.raw
+            if not template.templated_str.startswith(
+                element.raw, template_slice.start
             ):  # pragma: no cover
                 raise ValueError(
                     "Template and lexed elements do not match. This should never "
@@ -3,7 +3,7 @@
 This class is a construct to keep track of positions within a file.
 """
 
-from dataclasses import dataclass
+from dataclasses import FrozenInstanceError
 from typing import TYPE_CHECKING, Any, Optional, Tuple
 
 from sqlfluff.core.slice_helpers import zero_slice
@@ -12,7 +12,6 @@ if TYPE_CHECKING:
     from sqlfluff.core.templaters import TemplatedFile  # pragma: no cover
 
 
-@dataclass(frozen=True)
 class PositionMarker:
     """A reference to a position in a file.
 
@@ -27,25 +26,80 @@ class PositionMarker:
         - Positions within the fixed file are identified with a line number and line
           position, which identify a point.
         - Arithmetic comparisons are on the location in the fixed file.
+        - There's one of these for every segment, so they're immutable and
+          compact: the slices are stored as plain integers in `__slots__`
+          (and the templated file is a shared reference).
     """
 
-    source_slice: slice
-    templated_slice: slice
+    __slots__ = (
+        "_source_start",
+        "_source_stop",
+        "_templated_start",
+        "_templated_stop",
+        "templated_file",
+        "working_line_no",
+        "working_line_pos",
+    )
+
+    _source_start: int
+    _source_stop: int
+    _templated_start: int
+    _templated_stop: int
     templated_file: "TemplatedFile"
-    # If not set, these will be initialised in the post init.
-    working_line_no: int = -1
-    working_line_pos: int = -1
+    working_line_no: int
+    working_line_pos: int
 
-    def __post_init__(self) -> None:
+    def __init__(
+        self,
+        source_slice: slice,
+        templated_slice: slice,
+        templated_file: "TemplatedFile",
+        # If not set, these will be inferred from the templated file.
+        working_line_no: int = -1,
+        working_line_pos: int = -1,
+    ) -> None:
+        # Use the base method because this is a frozen class.
+        _set = object.__setattr__
+        _set(self, "_source_start", source_slice.start)
+        _set(self, "_source_stop", source_slice.stop)
+        _set(self, "_templated_start", templated_slice.start)
+        _set(self, "_templated_stop", templated_slice.stop)
+        _set(self, "templated_file", templated_file)
         # If the working position has not been explicitly set
         # then infer it from the position in the templated file.
         # This is accurate up until the point that any fixes have
         # been applied.
-        if self.working_line_no == -1 or self.working_line_pos == -1:
-            line_no, line_pos = self.templated_position()
-            # Use the base method because we're working with a frozen class
-            object.__setattr__(self, "working_line_no", line_no)
-            object.__setattr__(self, "working_line_pos", line_pos)
+        if working_line_no == -1 or working_line_pos == -1:
+            working_line_no, working_line_pos = self.templated_position()
+        _set(self, "working_line_no", working_line_no)
+        _set(self, "working_line_pos", working_line_pos)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {key!r}")
+
+    def __delattr__(self, key: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {key!r}")
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (
+            self.__class__,
+            (
+                self.source_slice,
+                self.templated_slice,
+                self.templated_file,
+                self.working_line_no,
+                self.working_line_pos,
+            ),
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(source_slice={self.source_slice!r}, "
+            f"templated_slice={self.templated_slice!r}, "
+            f"templated_file={self.templated_file!r}, "
+            f"working_line_no={self.working_line_no!r}, "
+            f"working_line_pos={self.working_line_pos!r})"
+        )
 
     def __str__(self) -> str:
         return self.to_source_string()
@@ -67,6 +121,19 @@ class PositionMarker:
             return False  # pragma: no cover
         return self.working_loc == other.working_loc
 
+    def __hash__(self) -> int:
+        return hash(self.working_loc)
+
+    @property
+    def source_slice(self) -> slice:
+        """The slice of the source file."""
+        return slice(self._source_start, self._source_stop)
+
+    @property
+    def templated_slice(self) -> slice:
+        """The slice of the templated file."""
+        return slice(self._templated_start, self._templated_stop)
+
     @property
     def working_loc(self) -> Tuple[int, int]:
         """Location tuple for the working position."""
@@ -105,12 +172,12 @@ class PositionMarker:
         """Construct a position marker from the section between two points."""
         return cls(
             slice(
-                start_point_marker.source_slice.start,
-                end_point_marker.source_slice.stop,
+                start_point_marker._source_start,
+                end_point_marker._source_stop,
             ),
             slice(
-                start_point_marker.templated_slice.start,
-                end_point_marker.templated_slice.stop,
+                start_point_marker._templated_start,
+                end_point_marker._templated_stop,
             ),
             # The templated file references from the point markers
             # should be the same, so we're just going to pick one.
@@ -128,12 +195,12 @@ class PositionMarker:
     ) -> "PositionMarker":
         """Create a parent marker from it's children."""
         source_slice = slice(
-            min(m.source_slice.start for m in markers if m),
-            max(m.source_slice.stop for m in markers if m),
+            min(m._source_start for m in markers if m),
+            max(m._source_stop for m in markers if m),
         )
         templated_slice = slice(
-            min(m.templated_slice.start for m in markers if m),
-            max(m.templated_slice.stop for m in markers if m),
+            min(m._templated_start for m in markers if m),
+            max(m._templated_stop for m in markers if m),
         )
         templated_files = {m.templated_file for m in markers if m}
         if len(templated_files) != 1:  # pragma: no cover
@@ -144,13 +211,13 @@ class PositionMarker:
     def source_position(self) -> Tuple[int, int]:
         """Return the line and position of this marker in the source."""
         return self.templated_file.get_line_pos_of_char_pos(
-            self.source_slice.start, source=True
+            self._source_start, source=True
         )
 
     def templated_position(self) -> Tuple[int, int]:
         """Return the line and position of this marker in the source."""
         return self.templated_file.get_line_pos_of_char_pos(
-            self.templated_slice.start, source=False
+            self._templated_start, source=False
         )
 
     @property
@@ -171,8 +238,8 @@ class PositionMarker:
     def start_point_marker(self) -> "PositionMarker":
         """Get a point marker from the start."""
         return self.__class__.from_point(
-            self.source_slice.start,
-            self.templated_slice.start,
+            self._source_start,
+            self._templated_start,
             templated_file=self.templated_file,
             # Start points also pass on the working position.
             working_line_no=self.working_line_no,
@@ -182,8 +249,8 @@ class PositionMarker:
     def end_point_marker(self) -> "PositionMarker":
         """Get a point marker from the end."""
         return self.__class__.from_point(
-            self.source_slice.stop,
-            self.templated_slice.stop,
+            self._source_stop,
+            self._templated_stop,
             templated_file=self.templated_file,
         )
 
@@ -195,8 +262,9 @@ class PositionMarker:
 
     def is_point(self) -> bool:
         """A marker is a point if it has zero length in templated and source file."""
-        return self.slice_is_point(self.source_slice) and self.slice_is_point(
-            self.templated_slice
+        return (
+            self._source_start == self._source_stop
+            and self._templated_start == self._templated_stop
         )
 
     @staticmethod
@@ -216,13 +284,16 @@ class PositionMarker:
 
     def with_working_position(self, line_no: int, line_pos: int) -> "PositionMarker":
         """Copy this position and replace the working position."""
-        return self.__class__(
-            source_slice=self.source_slice,
-            templated_slice=self.templated_slice,
-            templated_file=self.templated_file,
-            working_line_no=line_no,
-            working_line_pos=line_pos,
-        )
+        new_marker = object.__new__(self.__class__)
+        _set = object.__setattr__
+        _set(new_marker, "_source_start", self._source_start)
+        _set(new_marker, "_source_stop", self._source_stop)
+        _set(new_marker, "_templated_start", self._templated_start)
+        _set(new_marker, "_templated_stop", self._templated_stop)
+        _set(new_marker, "templated_file", self.templated_file)
+        _set(new_marker, "working_line_no", line_no)
+        _set(new_marker, "working_line_pos", line_pos)
+        return new_marker
 
     def is_literal(self) -> bool:
         """Infer literalness from context.
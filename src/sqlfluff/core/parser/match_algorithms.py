@@ -5,7 +5,7 @@ or BaseGrammar to un-bloat those classes.
 """
 
 from dataclasses import dataclass
-from typing import Iterable, List, Optional, Sequence, Set, Tuple, cast
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple, cast
 
 from sqlfluff.core.errors import SQLParseError
 from sqlfluff.core.parser.context import ParseContext
@@ -130,6 +130,64 @@ def prune_options(
     return available_options
 
 
+class FirstTokenIndex:
+    """A precomputed index of options by the first token they could match.
+
+    This gives the same result as `prune_options()`, but rather than
+    checking the simple hint of every option on each call, options are
+    indexed up front by each raw and type in their simple hint. Options
+    which aren't simple are always included. The pruned options for each
+    combination of first raw and types are then cached, so that (after the
+    first time) pruning is a single dictionary lookup.
+
+    Because the simple hints depend on the dialect, an index should only
+    be used with the dialect it was built for.
+    """
+
+    def __init__(
+        self, options: Sequence[Matchable], parse_context: ParseContext
+    ) -> None:
+        self.options = tuple(options)
+        self._unconditional: List[int] = []
+        self._by_raw: Dict[str, List[int]] = {}
+        self._by_type: Dict[str, List[int]] = {}
+        for idx, opt in enumerate(self.options):
+            simple = opt.simple(parse_context=parse_context)
+            if simple is None:
+                self._unconditional.append(idx)
+                continue
+            simple_raws, simple_types = simple
+            for raw in simple_raws:
+                self._by_raw.setdefault(raw, []).append(idx)
+            for simple_type in simple_types:
+                self._by_type.setdefault(simple_type, []).append(idx)
+        self._pruned: Dict[Tuple[Optional[str], FrozenSet[str]], List[Matchable]] = {}
+
+    def prune(self, segments: Tuple[BaseSegment, ...]) -> List[Matchable]:
+        """Return the options which could match the first segment."""
+        first_segment = _first_non_whitespace(segments)
+        if not first_segment:
+            return list(self.options)
+        first_raw, first_types = first_segment
+        # Raws which no option is looking for are all equivalent, so
+        # share a key to keep the cache small.
+        key = (
+            first_raw if first_raw in self._by_raw else None,
+            frozenset(first_types.intersection(self._by_type)),
+        )
+        try:
+            return self._pruned[key]
+        except KeyError:
+            pass
+        indices = set(self._unconditional)
+        if key[0] is not None:
+            indices.update(self._by_raw[key[0]])
+        for first_type in key[1]:
+            indices.update(self._by_type[first_type])
+        pruned = self._pruned[key] = [self.options[idx] for idx in sorted(indices)]
+        return pruned
+
+
 def look_ahead_match(
     segments: Tuple[BaseSegment, ...],
     matchers: List[Matchable],
@@ -436,7 +494,7 @@ def greedy_match(
     seg_bank: Tuple[BaseSegment, ...] = ()  # Empty tuple
 
     while True:
-        with parse_context.deeper_match(name="Greedy") as ctx:
+        with parse_context.deeper_match(name="Greedy", segments=seg_buff) as ctx:
             pre, mat, matcher = bracket_sensitive_look_ahead_match(
                 seg_buff, list(matchers), parse_context=ctx
             )
@@ -0,0 +1,266 @@
+"""A memo of parsed statements, shared between files.
+
+Large projects often contain many files with identical statements
+(e.g. generated migrations which share the same preamble). Parsing
+each copy from scratch is wasteful, so this memo allows a statement
+which has already been parsed to be reused, by rebuilding its tree
+on top of the raw segments of the new file.
+
+Statements are keyed on their token stream up to the next statement
+terminator (`;`), so this assumes that the parsing of a statement
+doesn't depend on anything beyond that terminator. That's true of
+the vast majority of statements, but to be safe the memo is disabled
+unless `statement_memo_size` is configured.
+"""
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlfluff.core.parser.markers import PositionMarker
+from sqlfluff.core.parser.match_result import MatchResult
+from sqlfluff.core.parser.segments.base import new_segment_id
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.parser.context import ParseContext
+    from sqlfluff.core.parser.segments import BaseSegment
+
+
+StatementMemoKey = Tuple[Any, ...]
+
+
+class StatementMemo:
+    """A bounded LRU memo of parsed statements.
+
+    Args:
+        max_size (:obj:`int`): The maximum number of statements to hold.
+            The least recently used statements are evicted beyond this.
+    """
+
+    # The raw which ends the span of tokens used to key each statement.
+    terminator = ";"
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._memo: "OrderedDict[StatementMemoKey, BaseSegment]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._memo)
+
+    def _span_length(self, segments: Sequence["BaseSegment"]) -> Optional[int]:
+        """Find the length of the candidate statement at the start of `segments`.
+
+        This runs up to the last code segment before the next terminator
+        (or the end). Returns None if the span contains anything other
+        than raw segments, or any meta segments (e.g. templated
+        placeholders), because those can't be reliably distinguished
+        from the metas inserted during parsing.
+        """
+        span = 0
+        for idx, segment in enumerate(segments):
+            if segment.is_meta or segment.segments:
+                return None
+            if segment.raw == self.terminator:
+                break
+            if segment.is_code:
+                span = idx + 1
+        return span or None
+
+    def key_for(
+        self,
+        segment_cls: type,
+        segments: Sequence["BaseSegment"],
+        parse_context: "ParseContext",
+    ) -> Optional[Tuple[StatementMemoKey, int]]:
+        """Generate a key for the statement at the start of `segments`.
+
+        Non-code segments are only keyed on their type, so that statements
+        which only differ in their whitespace or comments share an entry.
+
+        Returns:
+            A tuple of the key and the number of segments it covers, or
+            None if the statement can't be memoised.
+        """
+        span = self._span_length(segments)
+        if not span:
+            return None
+        tokens = tuple(
+            (seg.get_type(), seg.raw) if seg.is_code else (seg.get_type(),)
+            for seg in segments[:span]
+        )
+        # Include the next code segment, as the terminator of the statement.
+        lookahead = next(
+            (seg.raw for seg in segments[span:] if seg.is_code),
+            None,
+        )
+        key = (
+            segment_cls.__name__,
+            parse_context.dialect.name,
+            tuple(sorted(parse_context.indentation_config.items())),
+            tuple(repr(terminator) for terminator in parse_context.terminators),
+            tokens,
+            lookahead,
+        )
+        return key, span
+
+    def lookup(
+        self,
+        segment_cls: type,
+        segments: Sequence["BaseSegment"],
+        parse_context: "ParseContext",
+    ) -> Tuple[Optional[Tuple[StatementMemoKey, int]], Optional[MatchResult]]:
+        """Look up a statement, returning a match for it if there is one.
+
+        Returns:
+            A tuple of the key (to use when storing the result after
+            parsing) and the match, if the statement was in the memo.
+        """
+        memo_key = self.key_for(segment_cls, segments, parse_context)
+        if not memo_key:
+            return None, None
+        key, span = memo_key
+        statement = self._memo.get(key)
+        if statement is None:
+            self.misses += 1
+            parse_context.increment("statement_memo_misses")
+            return memo_key, None
+        self._memo.move_to_end(key)
+        self.hits += 1
+        parse_context.increment("statement_memo_hits")
+        rebuilt, _ = self._rebuild(statement, segments[:span], 0)
+        return memo_key, MatchResult((rebuilt,), tuple(segments[span:]))
+
+    def store(
+        self,
+        memo_key: Tuple[StatementMemoKey, int],
+        segments: Sequence["BaseSegment"],
+        match: MatchResult,
+    ) -> None:
+        """Store the result of parsing a statement.
+
+        Only statements which matched exactly the span of the key are
+        stored, otherwise the key doesn't describe the statement.
+        """
+        key, span = memo_key
+        if len(match.matched_segments) != 1 or len(match.unmatched_segments) != (
+            len(segments) - span
+        ):
+            return
+        statement = match.matched_segments[0]
+        # The parser may have split raw segments, in which case the
+        # statement can't be rebuilt from the tokens.
+        if sum(not seg.is_meta for seg in statement.raw_segments) != span:
+            return
+        self._memo[key] = self._detach(statement)
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.max_size:
+            self._memo.popitem(last=False)
+            self.evictions += 1
+
+    @classmethod
+    def _detach(cls, segment: "BaseSegment") -> "BaseSegment":
+        """Copy a statement to store, without its position markers.
+
+        The position markers of the new file's tokens are used when
+        rebuilding, so storing them (and through them the templated
+        file) would only keep each file in memory after it's parsed.
+        """
+        if segment.segments:
+            new_segment = segment.copy(
+                segments=tuple(cls._detach(child) for child in segment.segments)
+            )
+            new_segment.set_as_parent(recurse=False)
+        else:
+            new_segment = segment.copy()
+        new_segment.pos_marker = None
+        return new_segment
+
+    @classmethod
+    def _rebuild(
+        cls,
+        segment: "BaseSegment",
+        tokens: Sequence["BaseSegment"],
+        idx: int,
+    ) -> Tuple["BaseSegment", int]:
+        """Rebuild a memoised segment on top of a new set of raw tokens.
+
+        Returns:
+            A tuple of the new segment and the index of the next token.
+        """
+        if segment.is_meta:
+            # Metas have no content in the source, and are positioned
+            # as a point at the start of the following token.
+            new_segment = segment.copy()
+            if idx < len(tokens):
+                next_marker = tokens[idx].pos_marker
+                assert next_marker
+                new_segment.pos_marker = next_marker.start_point_marker()
+            else:
+                prev_marker = tokens[idx - 1].pos_marker
+                assert prev_marker
+                new_segment.pos_marker = prev_marker.end_point_marker()
+        elif not segment.segments:
+            token = tokens[idx]
+            idx += 1
+            if not token.is_code:
+                # Non-code isn't changed by parsing, so use it directly.
+                return token, idx
+            # The parser may have replaced the raw token with a more
+            # specific one (e.g. a keyword), so copy the memoised one.
+            new_segment = segment.copy()
+            new_segment.pos_marker = token.pos_marker
+        else:
+            children: List["BaseSegment"] = []
+            for child in segment.segments:
+                new_child, idx = cls._rebuild(child, tokens, idx)
+                children.append(new_child)
+            new_segment = segment.copy(segments=tuple(children))
+            new_segment.pos_marker = PositionMarker.from_child_markers(
+                *(child.pos_marker for child in children)
+            )
+            new_segment.set_as_parent(recurse=False)
+        new_segment.uuid = new_segment_id()
+        return new_segment, idx
+
+    def stats(self) -> Dict[str, float]:
+        """Return the hit and miss counts for the memo."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._memo),
+            "hit ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# The memo is shared between all files parsed by this process.
+_statement_memo: Optional[StatementMemo] = None
+
+
+def get_statement_memo(max_size: int) -> Optional[StatementMemo]:
+    """Get the statement memo for this process, if enabled.
+
+    If the memo already exists with a different size, it's resized,
+    retaining the most recently used statements.
+    """
+    global _statement_memo
+    if max_size <= 0:
+        return None
+    if _statement_memo is None:
+        _statement_memo = StatementMemo(max_size)
+    elif _statement_memo.max_size != max_size:
+        _statement_memo.max_size = max_size
+        while len(_statement_memo._memo) > max_size:
+            _statement_memo._memo.popitem(last=False)
+            _statement_memo.evictions += 1
+    return _statement_memo
+
+
+def statement_memo_stats() -> Dict[str, float]:
+    """Return the stats of the statement memo for this process, if any."""
+    if _statement_memo is None:
+        return {}
+    return _statement_memo.stats()
@@ -0,0 +1,301 @@
+"""Parsing a single large file in parallel.
+
+Parallelism while linting is per file, so a single very large file
+(e.g. a database dump) is otherwise parsed on one core. Here, the lexed
+tokens of a file are split into chunks at top level statement delimiters,
+the chunks are parsed in a pool of processes, and the results are
+stitched together into a single file segment.
+
+This assumes that the parsing of a statement doesn't depend on anything
+beyond the delimiter which ends it (as does the statement memo). That's
+true of the vast majority of statements, but to be safe, any chunk which
+doesn't parse cleanly (or which doesn't end with its delimiter at the top
+level) causes the whole file to be parsed in one go instead.
+"""
+
+import logging
+import multiprocessing
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+)
+
+from sqlfluff.core.errors import SQLParseError
+from sqlfluff.core.parser.context import ParseContext
+from sqlfluff.core.parser.markers import PositionMarker
+from sqlfluff.core.parser.trace import ParseTrace
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.config import FluffConfig
+    from sqlfluff.core.parser.segments import BaseFileSegment, BaseSegment
+    from sqlfluff.core.templaters import TemplatedFile
+
+parser_logger = logging.getLogger("sqlfluff.parser")
+
+# The raw which ends a statement (see also the statement memo).
+STATEMENT_DELIMITER = ";"
+_OPENING_BRACKETS = {"(", "[", "{"}
+_CLOSING_BRACKETS = {")", "]", "}"}
+# Keywords which follow BEGIN when it starts a transaction, not a block.
+_TRANSACTION_KEYWORDS = {";", "TRANSACTION", "TRAN", "WORK"}
+# Keywords which follow END when it closes a block not opened with BEGIN.
+_END_BLOCK_KEYWORDS = {"IF", "LOOP", "WHILE", "REPEAT", "FOR"}
+# Chunks are smaller than an even split between processes, so that a
+# process which finishes early can pick up more work.
+CHUNKS_PER_PROCESS = 4
+
+
+def find_split_points(
+    segments: Sequence["BaseSegment"], batch_separators: Set[str]
+) -> List[int]:
+    """Find the indices at which lexed segments can be split into chunks.
+
+    Each split point is the index of the segment after a top level
+    delimiter. For dialects with batch separators (e.g. `GO` in T-SQL),
+    files are only split after a separator on its own line, otherwise
+    they are split after statement delimiters (`;`).
+
+    Delimiters don't count as top level if they're within brackets,
+    within a `BEGIN`/`CASE` ... `END` block or within a templated block
+    (e.g. a jinja `{% if %}` or `{% for %}`). A split point is only
+    recorded once there's been a statement since the last one, so that
+    no chunk consists only of delimiters.
+    """
+    code_idx = [idx for idx, seg in enumerate(segments) if seg.is_code]
+    code_raws = [segments[idx].raw.upper() for idx in code_idx]
+
+    # Anything between the first and last segment of a templated block
+    # (including all iterations of a loop) is off limits.
+    block_spans: Dict[str, List[int]] = {}
+    for idx, segment in enumerate(segments):
+        block_uuid = getattr(segment, "block_uuid", None)
+        if block_uuid:
+            block_spans.setdefault(block_uuid, [idx, idx])[1] = idx
+    in_block = [0] * (len(segments) + 1)
+    for start, stop in block_spans.values():
+        in_block[start] += 1
+        in_block[stop + 1] -= 1
+    for idx in range(1, len(in_block)):
+        in_block[idx] += in_block[idx - 1]
+
+    split_points: List[int] = []
+    depth = 0
+    has_statement = False
+    for pos, (idx, raw) in enumerate(zip(code_idx, code_raws)):
+        next_raw = code_raws[pos + 1] if pos + 1 < len(code_raws) else ""
+        if raw in _OPENING_BRACKETS:
+            depth += 1
+        elif raw in _CLOSING_BRACKETS:
+            depth -= 1
+        elif raw == "CASE" and (pos == 0 or code_raws[pos - 1] != "END"):
+            depth += 1
+        elif raw == "BEGIN" and next_raw not in _TRANSACTION_KEYWORDS:
+            depth += 1
+        elif raw == "END" and next_raw not in _END_BLOCK_KEYWORDS:
+            depth -= 1
+
+        if batch_separators:
+            is_delimiter = raw in batch_separators and _on_own_line(
+                segments, code_idx, pos
+            )
+        else:
+            is_delimiter = raw == STATEMENT_DELIMITER
+        if not is_delimiter:
+            has_statement = True
+        elif (
+            has_statement
+            and depth == 0
+            and not in_block[idx]
+            # Keep runs of delimiters together.
+            and next_raw != raw
+        ):
+            split_points.append(idx + 1)
+            has_statement = False
+    return split_points
+
+
+def _on_own_line(
+    segments: Sequence["BaseSegment"], code_idx: List[int], pos: int
+) -> bool:
+    """Is the code segment at `code_idx[pos]` the only code on its line?"""
+    line_no = segments[code_idx[pos]].pos_marker.working_line_no  # type: ignore
+    return all(
+        segments[code_idx[other]].pos_marker.working_line_no != line_no  # type: ignore
+        for other in (pos - 1, pos + 1)
+        if 0 <= other < len(code_idx)
+    )
+
+
+def group_chunks(
+    split_points: List[int], num_segments: int, num_chunks: int
+) -> List[Tuple[int, int]]:
+    """Group the segments between split points into roughly even chunks.
+
+    Returns:
+        A list of `(start, stop)` indices of each chunk.
+    """
+    target = num_segments / max(num_chunks, 1)
+    chunks = []
+    start = 0
+    for split_point in split_points:
+        if split_point - start >= target and split_point < num_segments:
+            chunks.append((start, split_point))
+            start = split_point
+    chunks.append((start, num_segments))
+    return chunks
+
+
+# The root segment, config and lexed segments of the file being parsed by this
+# worker process. These are set when the pool is created, so that they're
+# inherited by the workers rather than being sent with each chunk.
+_worker_state: Optional[
+    Tuple[Type["BaseFileSegment"], "FluffConfig", Tuple["BaseSegment", ...]]
+] = None
+
+
+def _init_worker(
+    root_segment: Type["BaseFileSegment"],
+    config: "FluffConfig",
+    segments: Tuple["BaseSegment", ...],
+) -> None:
+    global _worker_state
+    _worker_state = (root_segment, config, segments)
+
+
+def _parse_chunk(
+    chunk: Tuple[int, int]
+) -> Optional[Tuple["BaseFileSegment", Dict[str, Any], Optional[ParseTrace]]]:
+    """Parse a chunk of the file in a worker.
+
+    Returns:
+        A tuple of the parsed chunk, the parse stats and the parse trace
+        (if tracing), or None if the chunk couldn't be parsed.
+    """
+    assert _worker_state
+    root_segment, config, segments = _worker_state
+    ctx = ParseContext.from_config(config)
+    try:
+        root = root_segment.root_parse(segments[chunk[0] : chunk[1]], ctx)
+    except SQLParseError:
+        return None
+    ctx.record_parse_cache_stats()
+    return root, ctx.parse_stats, ctx.trace
+
+
+def _ends_at_top_level(root: "BaseFileSegment", delimiter: "BaseSegment") -> bool:
+    """Check the delimiter ending a chunk was parsed at the top level."""
+    last_code = next(seg for seg in reversed(root.segments) if seg.is_code)
+    return last_code.raw == delimiter.raw
+
+
+def _reposition(segment: "BaseSegment", templated_file: "TemplatedFile") -> None:
+    """Point a segment returned by a worker back at the original file."""
+    marker = segment.pos_marker
+    assert marker
+    segment.pos_marker = PositionMarker(
+        marker.source_slice,
+        marker.templated_slice,
+        templated_file,
+        marker.working_line_no,
+        marker.working_line_pos,
+    )
+    for child in segment.segments:
+        _reposition(child, templated_file)
+
+
+def _merge_stats(parse_stats: Dict[str, Any], chunk_stats: Dict[str, Any]) -> None:
+    """Add the parse stats from a chunk to those for the file."""
+    for key, value in chunk_stats.items():
+        if key == "next_counts":
+            for next_key, count in value.items():
+                parse_stats["next_counts"][next_key] += count
+        elif "peak" in key:
+            parse_stats[key] = max(parse_stats.get(key, 0), value)
+        else:
+            parse_stats[key] = parse_stats.get(key, 0) + value
+
+
+def parse_in_parallel(
+    root_segment: Type["BaseFileSegment"],
+    config: "FluffConfig",
+    segments: Tuple["BaseSegment", ...],
+    processes: int,
+    parse_context: ParseContext,
+    fname: Optional[str] = None,
+    pool_type: Callable = multiprocessing.Pool,
+) -> Optional["BaseFileSegment"]:
+    """Parse a file by splitting it into chunks and parsing them in parallel.
+
+    Args:
+        root_segment: The file segment class of the dialect.
+        config: The config to parse with.
+        segments: The lexed segments of the whole file.
+        processes: The number of processes to use.
+        parse_context: The parse context of the file, to which the
+            parse stats (and any trace) of each chunk are added.
+        fname: The name of the file being parsed.
+        pool_type: The pool class, which can be replaced with a thread
+            pool for testing.
+
+    Returns:
+        The parsed file, or None if the file couldn't be split, or any
+        chunk didn't parse cleanly, in which case the file should be
+        parsed in one go.
+    """
+    # Pool workers are daemonic and can't start a pool of their own.
+    if multiprocessing.current_process().daemon:
+        return None
+    dialect = config.get("dialect_obj")
+    split_points = find_split_points(segments, dialect.sets("batch_separators"))
+    chunks = group_chunks(split_points, len(segments), processes * CHUNKS_PER_PROCESS)
+    if len(chunks) < 2:
+        return None
+    parser_logger.info(
+        "Parsing %s in %s chunks with %s processes", fname, len(chunks), processes
+    )
+
+    with pool_type(
+        min(processes, len(chunks)),
+        _init_worker,
+        (root_segment, config, segments),
+    ) as pool:
+        results = pool.map(_parse_chunk, chunks)
+
+    children: List["BaseSegment"] = []
+    stats: List[Dict[str, Any]] = []
+    traces: List[ParseTrace] = []
+    for (_, stop), result in zip(chunks, results):
+        if result is None:
+            return None
+        root, chunk_stats, chunk_trace = result
+        if next(root.iter_unparsables(), None) or (
+            stop < len(segments) and not _ends_at_top_level(root, segments[stop - 1])
+        ):
+            parser_logger.info("Chunk ending at %s didn't parse cleanly.", stop)
+            return None
+        stats.append(chunk_stats)
+        if chunk_trace:
+            traces.append(chunk_trace)
+        children += root.segments
+
+    # Only add the stats and traces of the chunks once they've all parsed
+    # cleanly, otherwise the file is parsed again in one go and they'd be
+    # counted twice.
+    for chunk_stats in stats:
+        _merge_stats(parse_context.parse_stats, chunk_stats)
+    if parse_context.trace:
+        for chunk_trace in traces:
+            parse_context.trace.merge(chunk_trace)
+
+    templated_file = segments[0].pos_marker.templated_file  # type: ignore
+    for child in children:
+        _reposition(child, templated_file)
+    return root_segment(tuple(children), fname=fname)
@@ -1,10 +1,12 @@
 """Defines the Parser class."""
 
+import multiprocessing
 from typing import TYPE_CHECKING, Optional, Sequence, Type
 
 from sqlfluff.core.config import FluffConfig
 from sqlfluff.core.parser.context import ParseContext
 from sqlfluff.core.parser.helpers import check_still_complete
+from sqlfluff.core.parser.parallel import parse_in_parallel
 
 if TYPE_CHECKING:  # pragma: no cover
     from sqlfluff.core.parser.segments import BaseFileSegment, BaseSegment
@@ -27,8 +29,14 @@ class Parser:
         segments: Sequence["BaseSegment"],
         fname: Optional[str] = None,
         parse_statistics: bool = False,
+        parse_context: Optional[ParseContext] = None,
     ) -> Optional["BaseSegment"]:
-        """Parse a series of lexed tokens using the current dialect."""
+        """Parse a series of lexed tokens using the current dialect.
+
+        A `parse_context` may be provided, to allow inspection of the
+        `parse_stats` after parsing. Otherwise one is created from the
+        config.
+        """
         if not segments:  # pragma: no cover
             # This should normally never happen because there will usually
             # be an end_of_file segment. It would probably only happen in
@@ -38,13 +46,28 @@ class Parser:
         # NOTE: This is the only time we use the parse context not in the
         # context of a context manager. That's because it's the initial
         # instantiation.
-        ctx = ParseContext.from_config(config=self.config)
-        # Kick off parsing with the root segment. The BaseFileSegment has
-        # a unique entry point to facilitate exaclty this. All other segments
-        # will use the standard .match()/.parse() route.
-        root = self.RootSegment.root_parse(
-            tuple(segments), fname=fname, parse_context=ctx
-        )
+        ctx = parse_context or ParseContext.from_config(config=self.config)
+        root = None
+        processes = self._parse_processes(segments)
+        if processes > 1:
+            root = parse_in_parallel(
+                self.RootSegment,
+                self.config,
+                tuple(segments),
+                processes,
+                ctx,
+                fname=fname,
+            )
+        if root is None:
+            # Kick off parsing with the root segment. The BaseFileSegment has
+            # a unique entry point to facilitate exaclty this. All other
+            # segments will use the standard .match()/.parse() route.
+            root = self.RootSegment.root_parse(
+                tuple(segments), fname=fname, parse_context=ctx
+            )
+            # NOTE: When parsed in parallel, the cache stats of each chunk
+            # have already been merged, and this context's cache is unused.
+            ctx.record_parse_cache_stats()
 
         # Basic Validation, that we haven't dropped anything.
         check_still_complete(tuple(segments), (root,), ())
@@ -72,3 +95,22 @@ class Parser:
             ctx.logger.warning("==== End Parse Statistics ====")
 
         return root
+
+    def _parse_processes(self, segments: Sequence["BaseSegment"]) -> int:
+        """The number of processes to parse a file with.
+
+        Only files of at least `parallel_parse_min_chars` characters are
+        parsed in parallel, as there's a cost to starting the processes.
+        """
+        processes = self.config.get("parse_processes", default=1)
+        if processes == 1:
+            return 1
+        final_marker = segments[-1].pos_marker
+        assert final_marker
+        if final_marker.templated_slice.stop < self.config.get(
+            "parallel_parse_min_chars", default=0
+        ):
+            return 1
+        if processes <= 0:
+            processes = max(multiprocessing.cpu_count() + processes, 1)
+        return processes
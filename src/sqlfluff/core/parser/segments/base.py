@@ -11,11 +11,12 @@ Here we define:
 from __future__ import annotations
 
 import logging
+import os
 import weakref
 from collections import defaultdict
 from dataclasses import dataclass
 from io import StringIO
-from itertools import chain
+from itertools import chain, count
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -32,7 +33,7 @@ from typing import (
     Union,
     cast,
 )
-from uuid import UUID, uuid4
+from uuid import uuid4
 
 from sqlfluff.core.cached_property import cached_property
 from sqlfluff.core.parser.context import ParseContext
@@ -43,6 +44,7 @@ from sqlfluff.core.parser.match_result import MatchResult
 from sqlfluff.core.parser.match_wrapper import match_wrapper
 from sqlfluff.core.parser.matchable import Matchable
 from sqlfluff.core.parser.segments.fix import AnchorEditInfo, FixPatch, SourceFix
+from sqlfluff.core.parser.segments.type_index import TypeIndex
 from sqlfluff.core.parser.types import SimpleHintType
 from sqlfluff.core.templaters.base import TemplatedFile
 
@@ -54,6 +56,36 @@ if TYPE_CHECKING:  # pragma: no cover
 # Instantiate the linter logger (only for use in methods involved with fixing.)
 linter_logger = logging.getLogger("sqlfluff.linter")
 
+# Segments are told apart (e.g. to match fixes to their anchors) by an
+# integer id. The ids count up within each process, from a start based
+# on the process id, so that segments made in different processes (e.g.
+# the chunks of a file parsed in parallel) don't clash when brought
+# together.
+_SEGMENT_IDS_PER_PROCESS = 1 << 40
+_segment_ids: Iterator[int] = count(os.getpid() * _SEGMENT_IDS_PER_PROCESS)
+
+
+def _reset_segment_ids() -> None:
+    global _segment_ids
+    _segment_ids = count(os.getpid() * _SEGMENT_IDS_PER_PROCESS)
+
+
+# Forked processes would otherwise carry on from the same count as their
+# parent. Spawned processes import this module afresh anyway.
+if hasattr(os, "register_at_fork"):  # pragma: no cover
+    os.register_at_fork(after_in_child=_reset_segment_ids)
+
+
+def new_segment_id() -> int:
+    """Get a new id for a segment.
+
+    These are much cheaper to make (and to keep) than a `uuid4()`, and
+    are unique among the segments of this process and of any of the
+    processes it's running alongside.
+    """
+    return next(_segment_ids)
+
+
 TupleSerialisedSegment = Tuple[str, Union[str, Tuple["TupleSerialisedSegment", ...]]]
 RecordSerialisedSegment = Dict[
     str, Union[None, str, "RecordSerialisedSegment", List["RecordSerialisedSegment"]]
@@ -158,12 +190,15 @@ class BaseSegment(metaclass=SegmentMetaclass):
     _preface_modifier: str = ""
     # Optional reference to the parent. Stored as a weakref.
     _parent: Optional[weakref.ReferenceType["BaseSegment"]] = None
+    # The type index of the tree this segment is in (if it has been
+    # indexed) and the position of this segment within it.
+    _type_index: Optional[Tuple[TypeIndex, int]] = None
 
     def __init__(
         self,
         segments: Tuple["BaseSegment", ...],
         pos_marker: Optional[PositionMarker] = None,
-        uuid: Optional[UUID] = None,
+        uuid: Optional[int] = None,
     ) -> None:
         if len(segments) == 0:  # pragma: no cover
             raise RuntimeError(
@@ -183,7 +218,7 @@ class BaseSegment(metaclass=SegmentMetaclass):
         self.pos_marker = pos_marker
         self.segments: Tuple["BaseSegment", ...] = segments
         # Tracker for matching when things start moving.
-        self.uuid = uuid or uuid4()
+        self.uuid = uuid if uuid is not None else new_segment_id()
 
         self.set_as_parent(recurse=False)
         self.validate_non_code_ends()
@@ -193,6 +228,7 @@ class BaseSegment(metaclass=SegmentMetaclass):
         try:
             if key == "segments":
                 self._recalculate_caches()
+                self._discard_type_index()
 
         except (AttributeError, KeyError):  # pragma: no cover
             pass
@@ -239,6 +275,8 @@ class BaseSegment(metaclass=SegmentMetaclass):
         s = self.__dict__.copy()
         # Kill the parent ref. It won't pickle well.
         s["_parent"] = None
+        # The type index holds weak references, so won't pickle either.
+        s.pop("_type_index", None)
         return s
 
     def __setstate__(self, state: Dict[str, Any]) -> None:
@@ -670,12 +708,24 @@ class BaseSegment(metaclass=SegmentMetaclass):
             return MatchResult((segments[0],), segments[1:])
 
         if cls.match_grammar:
+            # Statements may have already been parsed in another file.
+            statement_memo = parse_context.statement_memo
+            memo_key = None
+            if statement_memo is not None and cls.type == "statement":
+                memo_key, memo_match = statement_memo.lookup(
+                    cls, segments, parse_context
+                )
+                if memo_match:
+                    return memo_match
+
             # Call the private method
-            with parse_context.deeper_match(name=cls.__name__) as ctx:
+            with parse_context.deeper_match(
+                name=cls.__name__, segments=segments
+            ) as ctx:
                 m = cls.match_grammar.match(segments=segments, parse_context=ctx)
 
             if m.has_match():
-                return MatchResult(
+                match = MatchResult(
                     # Return result of the match_grammar match, wrapped in a new
                     # instance of this segment. The matched portion of the
                     # MatchResult from the match_grammar, becomes the children
@@ -683,6 +733,9 @@ class BaseSegment(metaclass=SegmentMetaclass):
                     (cls(segments=m.matched_segments),),
                     m.unmatched_segments,
                 )
+                if statement_memo is not None and memo_key:
+                    statement_memo.store(memo_key, segments, match)
+                return match
             else:
                 return MatchResult.from_unmatched(segments)
         else:  # pragma: no cover
@@ -711,6 +764,13 @@ class BaseSegment(metaclass=SegmentMetaclass):
         ]:
             self.__dict__.pop(key, None)
 
+    def _discard_type_index(self) -> None:
+        entry = self.__dict__.pop("_type_index", None)
+        # NOTE: A copy of an indexed segment also has its position, but
+        # only changing the original makes the index out of date.
+        if entry and entry[0].is_current(self, entry[1]):
+            entry[0].stale = True
+
     def _preface(self, ident: int, tabsize: int) -> str:
         """Returns the preamble to any logging."""
         padded_type = "{padding}{modifier}{type}".format(
@@ -793,6 +853,30 @@ class BaseSegment(metaclass=SegmentMetaclass):
 
         self._recalculate_caches()
 
+    def build_type_index(self) -> None:
+        """Index the types of all the segments within this one.
+
+        Once indexed, searches for segments of a type within this segment
+        (or any segment within it) with :meth:`recursive_crawl` or the
+        rule crawlers use the index rather than searching the tree. If any
+        segment within it is changed, the index is no longer used, so this
+        is for trees which aren't expected to change, like those being
+        linted.
+        """
+        if not self.get_type_index():
+            TypeIndex.build(self)
+
+    def get_type_index(self) -> Optional[Tuple[TypeIndex, int]]:
+        """Get the type index this segment is in, and its position in it.
+
+        Returns None if the segment isn't indexed, or the index is out of
+        date.
+        """
+        entry = self._type_index
+        if entry and entry[0].is_current(self, entry[1]):
+            return entry
+        return None
+
     def get_start_point_marker(self) -> PositionMarker:  # pragma: no cover
         """Get a point marker at the start of this segment."""
         assert self.pos_marker, f"{self} has no PositionMarker"
@@ -1054,6 +1138,19 @@ class BaseSegment(metaclass=SegmentMetaclass):
             allow_self: :obj:`bool`: Whether to allow the initial segment this
                 is called on to be one of the results.
         """
+        # If this segment is in an indexed tree, look the segments up.
+        entry = self.get_type_index()
+        if entry:
+            index, pos = entry
+            yield from index.crawl(
+                pos,
+                seg_type,
+                recurse_into=recurse_into,
+                no_recursive_seg_type=no_recursive_seg_type,
+                allow_self=allow_self,
+            )
+            return None
+
         # Assuming there is a segment to be found, first check self (if allowed):
         if allow_self and self.is_type(*seg_type):
             match = True
@@ -1204,13 +1301,14 @@ class BaseSegment(metaclass=SegmentMetaclass):
         )
 
     def apply_fixes(
-        self, dialect: "Dialect", rule_code: str, fixes: Dict[UUID, AnchorEditInfo]
+        self, dialect: "Dialect", rule_code: str, fixes: Dict[int, AnchorEditInfo]
     ) -> Tuple["BaseSegment", List["BaseSegment"], List["BaseSegment"], bool]:
         """Apply an iterable of fixes to this segment.
 
         Used in applying fixes if we're fixing linting errors.
         If anything changes, this should return a new version of the segment
-        rather than mutating the original.
+        rather than mutating the original. If no fixes apply within the
+        segment, the original is returned unchanged.
 
         Note: We need to have fixes to apply AND this must have children. In the case
         of raw segments, they will be replaced or removed by their parent and
@@ -1323,8 +1421,11 @@ class BaseSegment(metaclass=SegmentMetaclass):
         # Then recurse (i.e. deal with the children) (Requeueing)
         seg_queue = seg_buffer
         seg_buffer = []
+        children_changed = False
         for seg in seg_queue:
             s, pre, post, validated = seg.apply_fixes(dialect, rule_code, fixes)
+            if s is not seg or pre or post:
+                children_changed = True
             # 'before' and 'after' will usually be empty. Only used when
             # lower-level fixes left 'seg' with non-code (usually
             # whitespace) segments as the first or last children. This is
@@ -1361,6 +1462,13 @@ class BaseSegment(metaclass=SegmentMetaclass):
             after = seg_buffer[_idx:]
             seg_buffer = seg_buffer[:_idx]
 
+        # If nothing within this segment has changed, keep the original
+        # (and its uuid) rather than reforming it. This means that the
+        # subtrees which have been replaced by fixes are the ones with new
+        # uuids, and the rest can be recognised between linter loops.
+        if not fixes_applied and not children_changed and not before and not after:
+            return self, [], [], True
+
         # Reform into a new segment
         try:
             new_seg = self.__class__(
@@ -1399,7 +1507,7 @@ class BaseSegment(metaclass=SegmentMetaclass):
     @classmethod
     def compute_anchor_edit_info(
         cls, fixes: List["LintFix"]
-    ) -> Dict[UUID, AnchorEditInfo]:
+    ) -> Dict[int, AnchorEditInfo]:
         """Group and count fixes by anchor, return dictionary."""
         anchor_info = defaultdict(AnchorEditInfo)  # type: ignore
         for fix in fixes:
@@ -14,7 +14,7 @@ class CodeSegment(RawSegment):
     This has a more explicit name for segment creation.
     """
 
-    pass
+    __slots__ = ()
 
 
 class UnlexableSegment(CodeSegment):
@@ -23,12 +23,16 @@ class UnlexableSegment(CodeSegment):
     This otherwise behaves exactly like a code section.
     """
 
+    __slots__ = ()
+
     type = "unlexable"
 
 
 class CommentSegment(RawSegment):
     """Segment containing a comment."""
 
+    __slots__ = ()
+
     type = "comment"
     _is_code = False
     _is_comment = True
@@ -37,6 +41,8 @@ class CommentSegment(RawSegment):
 class WhitespaceSegment(RawSegment):
     """Segment containing whitespace."""
 
+    __slots__ = ()
+
     type = "whitespace"
     _is_whitespace = True
     _is_code = False
@@ -54,6 +60,8 @@ class NewlineSegment(RawSegment):
     to match on both, call .is_type('whitespace', 'newline')
     """
 
+    __slots__ = ()
+
     type = "newline"
     _is_whitespace = True
     _is_code = False
@@ -69,6 +77,8 @@ class SymbolSegment(CodeSegment):
     but don't end up being labelled as a `keyword` later.
     """
 
+    __slots__ = ()
+
     type = "symbol"
 
 
@@ -78,6 +88,8 @@ class IdentifierSegment(CodeSegment):
     Defined here for type inheritance.
     """
 
+    __slots__ = ()
+
     type = "identifier"
 
 
@@ -87,6 +99,8 @@ class LiteralSegment(CodeSegment):
     Defined here for type inheritance.
     """
 
+    __slots__ = ()
+
     type = "literal"
 
 
@@ -96,6 +110,8 @@ class BinaryOperatorSegment(CodeSegment):
     Defined here for type inheritance. Inherits from RawSegment.
     """
 
+    __slots__ = ()
+
     type = "binary_operator"
 
 
@@ -114,6 +130,8 @@ class ComparisonOperatorSegment(CodeSegment):
     Defined here for type inheritance. Inherits from RawSegment.
     """
 
+    __slots__ = ()
+
     type = "comparison_operator"
 
 
@@ -135,4 +153,6 @@ class WordSegment(CodeSegment):
     naked identifiers.
     """
 
+    __slots__ = ()
+
     type = "word"
@@ -15,6 +15,8 @@ class KeywordSegment(WordSegment):
     but don't end up being labelled as a `keyword` later.
     """
 
+    __slots__ = ()
+
     type = "keyword"
 
     def __init__(
@@ -62,4 +64,6 @@ class LiteralKeywordSegment(KeywordSegment):
     Defined here for type inheritance.
     """
 
+    __slots__ = ()
+
     type = "literal"
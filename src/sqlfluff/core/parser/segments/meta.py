@@ -15,6 +15,8 @@ from sqlfluff.core.templaters.base import TemplatedFile
 class MetaSegment(RawSegment):
     """A segment which is empty but indicates where something should be."""
 
+    __slots__ = ("is_template", "block_uuid")
+
     type = "meta"
     _is_code = False
     _template = "<unset>"
@@ -85,6 +87,8 @@ class MetaSegment(RawSegment):
 class EndOfFile(MetaSegment):
     """A meta segment to indicate the end of the file."""
 
+    __slots__ = ()
+
     type = "end_of_file"
 
 
@@ -100,6 +104,8 @@ class TemplateLoop(MetaSegment):
     see trailing whitespace.
     """
 
+    __slots__ = ()
+
     type = "template_loop"
 
 
@@ -113,6 +119,8 @@ class Indent(MetaSegment):
     be compared later.
     """
 
+    __slots__ = ()
+
     type = "indent"
     indent_val = 1
 
@@ -134,6 +142,8 @@ class ImplicitIndent(Indent):
             AND b
     """
 
+    __slots__ = ()
+
     _preface_modifier = "[META] (implicit) "
     is_implicit = True
 
@@ -149,6 +159,8 @@ class Dedent(Indent):
 
     """
 
+    __slots__ = ()
+
     type = "dedent"
     indent_val = -1
 
@@ -167,6 +179,8 @@ class TemplateSegment(MetaSegment):
     case rules want to lint this down the line.
     """
 
+    __slots__ = ("source_str", "block_type")
+
     type = "placeholder"
 
     def __init__(
@@ -4,15 +4,65 @@ This is designed to be the root segment, without
 any children, and the output of the lexer.
 """
 
-from typing import Any, List, Optional, Set, Tuple
-from uuid import UUID, uuid4
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
 
 from sqlfluff.core.parser.markers import PositionMarker
-from sqlfluff.core.parser.segments.base import BaseSegment, SourceFix
+from sqlfluff.core.parser.segments.base import (
+    BaseSegment,
+    SourceFix,
+    new_segment_id,
+)
+
+# The distinct tuples of instance types, so that the (many) raw segments
+# with the same types share a single tuple.
+_interned_types: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _intern_types(instance_types: Tuple[str, ...]) -> Tuple[str, ...]:
+    return _interned_types.setdefault(instance_types, instance_types)
+
+
+@lru_cache(maxsize=None)
+def _raw_attributes(cls: Type["RawSegment"]) -> Tuple[Tuple[str, ...], bool]:
+    """The slots of a raw segment class, and whether it also uses `__dict__`.
+
+    Subclasses which don't define `__slots__` store their own attributes
+    in the `__dict__` (inherited from BaseSegment) as usual.
+    """
+    slots: List[str] = []
+    uses_dict = False
+    for klass in cls.__mro__:
+        if klass is BaseSegment:
+            break
+        if "__slots__" in klass.__dict__:
+            slots.extend(klass.__dict__["__slots__"])
+        else:
+            uses_dict = True
+    return tuple(slots), uses_dict
 
 
 class RawSegment(BaseSegment):
-    """This is a segment without any subsegments."""
+    """This is a segment without any subsegments.
+
+    There are a lot of these (one for every token in a file), so their
+    attributes are stored in `__slots__` rather than in an instance dict.
+    Subclasses should define `__slots__` too (even if it's empty) to keep
+    the same compact representation.
+    """
+
+    __slots__ = (
+        "_raw",
+        "_raw_upper",
+        "pos_marker",
+        "instance_types",
+        "trim_start",
+        "trim_chars",
+        "_source_fixes",
+        "uuid",
+        "_parent",
+        "_type_index",
+    )
 
     type = "raw"
     _is_code = True
@@ -21,6 +71,8 @@ class RawSegment(BaseSegment):
     # Classes inheriting from RawSegment may provide a _default_raw
     # to enable simple initialisation.
     _default_raw = ""
+    # Raw segments have no children.
+    segments: Tuple[BaseSegment, ...] = ()
 
     def __init__(
         self,
@@ -34,7 +86,7 @@ class RawSegment(BaseSegment):
         trim_start: Optional[Tuple[str, ...]] = None,
         trim_chars: Optional[Tuple[str, ...]] = None,
         source_fixes: Optional[List[SourceFix]] = None,
-        uuid: Optional[UUID] = None,
+        uuid: Optional[int] = None,
     ):
         """Initialise raw segment.
 
@@ -46,42 +98,61 @@ class RawSegment(BaseSegment):
             self._raw = raw
         else:
             self._raw = self._default_raw
-        self._raw_upper = self._raw.upper()
+        raw_upper = self._raw.upper()
+        # Share the raw string if it's already upper case.
+        self._raw_upper = self._raw if raw_upper == self._raw else raw_upper
         # pos marker is required here. We ignore the typing initially
         # because it might *initially* be unset, but it will be reset
         # later.
         self.pos_marker: PositionMarker = pos_marker  # type: ignore
-        # Set the segments attribute to be an empty tuple.
-        self.segments = ()
         self.instance_types: Tuple[str, ...]
         if type:
             assert not instance_types, "Cannot set `type` and `instance_types`."
-            self.instance_types = (type,)
+            self.instance_types = _intern_types((type,))
         else:
-            self.instance_types = instance_types
+            self.instance_types = _intern_types(instance_types)
         # What should we trim off the ends to get to content
         self.trim_start = trim_start
         self.trim_chars = trim_chars
         # Keep track of any source fixes
         self._source_fixes = source_fixes
-        # UUID for matching
-        self.uuid = uuid or uuid4()
-        self.representation = "<{}: ({}) {!r}>".format(
-            self.__class__.__name__, self.pos_marker, self.raw
-        )
+        # Id for matching
+        self.uuid = uuid if uuid is not None else new_segment_id()
+        self._parent = None
+        self._type_index = None
 
     def __repr__(self) -> str:
-        # This is calculated at __init__, because all elements are immutable
-        # and this was previously recalculating the pos marker,
-        # and became very expensive
         return self.representation
 
     def __setattr__(self, key: str, value: Any) -> None:
         """Overwrite BaseSegment's __setattr__ with BaseSegment's superclass."""
         super(BaseSegment, self).__setattr__(key, value)
 
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get the current state to allow pickling."""
+        slots, uses_dict = _raw_attributes(self.__class__)
+        state = {name: getattr(self, name) for name in slots}
+        if uses_dict:
+            state.update(self.__dict__)
+        # Kill the parent ref and type index. They won't pickle well.
+        state["_parent"] = None
+        state["_type_index"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Set state during process of unpickling."""
+        for key, value in state.items():
+            setattr(self, key, value)
+
     # ################ PUBLIC PROPERTIES
 
+    @property
+    def representation(self) -> str:
+        """The representation of the segment, with its class and position."""
+        return "<{}: ({}) {!r}>".format(
+            self.__class__.__name__, self.pos_marker, self.raw
+        )
+
     @property
     def matched_length(self) -> int:
         """Return the length of the segment in characters."""
@@ -136,6 +207,28 @@ class RawSegment(BaseSegment):
         """Overwrite superclass functionality."""
         pass
 
+    def copy(
+        self,
+        segments: Optional[Tuple["BaseSegment", ...]] = None,
+        parent: Optional["BaseSegment"] = None,
+    ) -> "RawSegment":
+        """Copy the segment, with appropriate copying of references.
+
+        Raw segments have no children, so this is a shallow copy (keeping
+        the same uuid), apart from resetting the parent if provided.
+        """
+        cls = self.__class__
+        assert not segments, f"Cannot provide `segments` argument to {cls.__name__}"
+        new_segment = cls.__new__(cls)
+        slots, uses_dict = _raw_attributes(cls)
+        for name in slots:
+            setattr(new_segment, name, getattr(self, name))
+        if uses_dict:
+            new_segment.__dict__.update(self.__dict__)
+        if parent:
+            new_segment.set_parent(parent)
+        return new_segment
+
     def get_type(self) -> str:
         """Returns the type of this segment as a string."""
         if self.instance_types:
@@ -0,0 +1,195 @@
+"""An index of the types of the segments within a tree.
+
+Searching a tree for segments of a type (with :meth:`recursive_crawl` or
+the rule crawlers) prunes on the `descendant_type_set` of each segment,
+but still visits every segment on the way down to each match, for every
+search. The :obj:`TypeIndex` flattens a tree once, in pre-order, so that
+the segments within any segment of the tree are a contiguous range of
+positions, and keeps a sorted list of the positions of each type. Those
+questions then become a binary search of the relevant lists.
+"""
+
+import weakref
+from bisect import bisect_left, bisect_right
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.parser.segments.base import BaseSegment
+
+
+class TypeIndex:
+    """A pre-order index of the types of the segments within a tree.
+
+    Each segment in the tree keeps a reference to the index and its
+    position in it, so a search can start from any segment within the
+    tree. The index only keeps weak references to the segments, so that
+    it doesn't keep a tree alive (or create a reference cycle).
+
+    If any segment within the tree is changed, the index is marked as
+    `stale` and no longer used.
+
+    The index also has a `cache` for anything else worked out from the
+    tree as it is (e.g. by the reflow utilities), so that it can be
+    shared between rules and is dropped along with the index.
+    """
+
+    def __init__(self) -> None:
+        self._refs: List["weakref.ReferenceType[BaseSegment]"] = []
+        # The position after the last segment within each segment.
+        self.ends: List[int] = []
+        # The position of the parent of each segment (-1 for the root),
+        # and its index within the parent.
+        self.parents: List[int] = []
+        self.child_idx: List[int] = []
+        # The positions of the segments of each type, in order.
+        self.positions: Dict[str, List[int]] = {}
+        self.stale = False
+        self.cache: Dict[str, Any] = {}
+
+    @classmethod
+    def build(cls, root: "BaseSegment") -> "TypeIndex":
+        """Index a tree, and set the position of each segment within it."""
+        index = cls()
+        refs = index._refs
+        ends = index.ends
+        parents = index.parents
+        child_idx = index.child_idx
+        positions = index.positions
+        # Segments still to visit (with the position of their parent and
+        # their index within it), or None to mark the end of the segment
+        # at the parent position.
+        stack: List[Tuple[Optional["BaseSegment"], int, int]] = [(root, -1, 0)]
+        while stack:
+            segment, parent, idx = stack.pop()
+            if segment is None:
+                ends[parent] = len(refs)
+                continue
+            pos = len(refs)
+            refs.append(weakref.ref(segment))
+            ends.append(pos + 1)
+            parents.append(parent)
+            child_idx.append(idx)
+            for seg_type in segment.class_types:
+                type_positions = positions.get(seg_type)
+                if type_positions is None:
+                    positions[seg_type] = [pos]
+                else:
+                    type_positions.append(pos)
+            segment._type_index = (index, pos)
+            children = segment.segments
+            if children:
+                stack.append((None, pos, 0))
+                for child_pos in range(len(children) - 1, -1, -1):
+                    stack.append((children[child_pos], pos, child_pos))
+        return index
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def segment(self, pos: int) -> "BaseSegment":
+        """The segment at a position."""
+        segment = self._refs[pos]()
+        assert segment is not None, "Segment in type index no longer exists."
+        return segment
+
+    def is_current(self, segment: "BaseSegment", pos: int) -> bool:
+        """Whether the index is still valid for a segment at a position.
+
+        Copies of indexed segments also hold the position of the
+        original, but only the original is in the index.
+        """
+        return not self.stale and self._refs[pos]() is segment
+
+    def positions_within(
+        self, seg_types: Sequence[str], start: int, stop: int
+    ) -> List[int]:
+        """The positions of segments of any of the types in a range, in order."""
+        found: List[List[int]] = []
+        for seg_type in seg_types:
+            type_positions = self.positions.get(seg_type)
+            if not type_positions:
+                continue
+            lo = bisect_left(type_positions, start)
+            hi = bisect_left(type_positions, stop, lo)
+            if lo < hi:
+                found.append(type_positions[lo:hi])
+        if len(found) == 1:
+            return found[0]
+        # A segment can have more than one of the types.
+        return sorted({pos for type_positions in found for pos in type_positions})
+
+    def contains(self, pos: int, seg_types: Sequence[str]) -> bool:
+        """Whether any segments within the one at `pos` have any of the types.
+
+        NOTE: Like `descendant_type_set`, this doesn't include the segment
+        itself.
+        """
+        stop = self.ends[pos]
+        for seg_type in seg_types:
+            type_positions = self.positions.get(seg_type)
+            if type_positions:
+                idx = bisect_right(type_positions, pos)
+                if idx < len(type_positions) and type_positions[idx] < stop:
+                    return True
+        return False
+
+    def unskipped_positions(
+        self,
+        matches: Sequence[int],
+        excluded: Sequence[int] = (),
+        recurse_into: bool = True,
+    ) -> Iterator[int]:
+        """The matched positions which aren't skipped over, in order.
+
+        Matches at or within any of the `excluded` positions are skipped
+        and, unless `recurse_into`, so are matches within an earlier one.
+        Both `matches` and `excluded` must be in order.
+        """
+        ends = self.ends
+        skip_until = 0
+        excluded_idx = 0
+        for match_pos in matches:
+            while excluded_idx < len(excluded) and excluded[excluded_idx] <= match_pos:
+                skip_until = max(skip_until, ends[excluded[excluded_idx]])
+                excluded_idx += 1
+            if match_pos < skip_until:
+                continue
+            yield match_pos
+            if not recurse_into:
+                skip_until = ends[match_pos]
+
+    def crawl(
+        self,
+        pos: int,
+        seg_types: Sequence[str],
+        recurse_into: bool = True,
+        no_recursive_seg_type: Optional[str] = None,
+        allow_self: bool = True,
+    ) -> Iterator["BaseSegment"]:
+        """The segments of the given types within the one at `pos`.
+
+        This gives the same segments, in the same order, as
+        :meth:`BaseSegment.recursive_crawl`, with the same arguments.
+        """
+        stop = self.ends[pos]
+        matches = self.positions_within(seg_types, pos if allow_self else pos + 1, stop)
+        if not matches:
+            return
+        # Segments of the `no_recursive_seg_type` below this one are
+        # skipped along with everything within them.
+        excluded = (
+            self.positions_within((no_recursive_seg_type,), pos + 1, stop)
+            if no_recursive_seg_type
+            else []
+        )
+        for match_pos in self.unskipped_positions(matches, excluded, recurse_into):
+            yield self.segment(match_pos)
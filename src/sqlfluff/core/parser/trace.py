@@ -0,0 +1,137 @@
+"""Tracing the matching done while parsing.
+
+The `parse_stats` on the :obj:`ParseContext` count how often the parser
+does various things, but not where the time goes. When the `parse_trace`
+config value is set, the parse context instead keeps a :obj:`ParseTrace`,
+which records the start and end of each deeper match, each option tried
+by :meth:`BaseGrammar._longest_trimmed_match` (and whether it came from
+the parse cache) and each :obj:`Sequence` match, along with the position
+in the file. The traces of several files can then be written in the
+Chrome trace event format with :func:`write_chrome_trace`, to be opened
+in Perfetto or speedscope.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.parser.segments import BaseSegment
+
+
+# A single event, as the phase ("B" to begin or "E" to end), the time in
+# nanoseconds and the process id, and for the start of an event, the
+# name, the category, the working position and whether the match came
+# from the parse cache.
+_TraceEvent = Tuple[Any, ...]
+
+
+class ParseTrace:
+    """A record of the matching done while parsing a file.
+
+    Events are stored as plain tuples to keep the overhead of tracing
+    low, so that it can be used on real files, and so that the trace
+    can be returned from worker processes when parsing in parallel.
+    """
+
+    def __init__(self) -> None:
+        self.events: List[_TraceEvent] = []
+        self._pid = os.getpid()
+        # Names of the grammars matched, by id.
+        self._names: Dict[int, str] = {}
+
+    def name(self, matcher: Any) -> str:
+        """A name for a grammar or segment, for use in events."""
+        key = id(matcher)
+        name = self._names.get(key)
+        if name is None:
+            name = self._names[key] = (
+                matcher.__name__ if isinstance(matcher, type) else repr(matcher)
+            )
+        return name
+
+    def begin(
+        self,
+        name: str,
+        category: str,
+        segments: Sequence["BaseSegment"] = (),
+        cache_hit: Optional[bool] = None,
+    ) -> None:
+        """Record the start of a match, at the start of some segments."""
+        loc = None
+        if segments and segments[0].pos_marker:
+            loc = segments[0].pos_marker.working_loc
+        self.events.append(
+            ("B", time.perf_counter_ns(), self._pid, name, category, loc, cache_hit)
+        )
+
+    def end(self) -> None:
+        """Record the end of the latest match to begin."""
+        self.events.append(("E", time.perf_counter_ns(), self._pid))
+
+    @contextmanager
+    def span(
+        self, name: str, category: str, segments: Sequence["BaseSegment"] = ()
+    ) -> Iterator[None]:
+        """Record the start and end of a match."""
+        self.begin(name, category, segments)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def merge(self, other: "ParseTrace") -> None:
+        """Add the events from another trace (e.g. of a chunk) to this one."""
+        self.events += other.events
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The names are only valid within this process.
+        return {**self.__dict__, "_names": {}}
+
+
+def as_chrome_trace(traces: Sequence[Tuple[str, ParseTrace]]) -> Dict[str, Any]:
+    """Convert the traces of several files to the Chrome trace event format.
+
+    Each file gets its own track (within each process, if it was parsed
+    in parallel), named after the file.
+    """
+    start = min((event[1] for _, trace in traces for event in trace.events), default=0)
+    trace_events: List[Dict[str, Any]] = []
+    for tid, (fname, trace) in enumerate(traces, start=1):
+        for pid in sorted({event[2] for event in trace.events}):
+            trace_events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": fname},
+                }
+            )
+        for event in trace.events:
+            trace_event: Dict[str, Any] = {
+                "ph": event[0],
+                "ts": (event[1] - start) / 1000,
+                "pid": event[2],
+                "tid": tid,
+            }
+            if event[0] == "B":
+                _, _, _, name, category, loc, cache_hit = event
+                trace_event["name"] = name
+                trace_event["cat"] = category
+                args: Dict[str, Any] = {}
+                if loc:
+                    args["line_no"], args["line_pos"] = loc
+                if cache_hit is not None:
+                    args["cache_hit"] = cache_hit
+                trace_event["args"] = args
+            trace_events.append(trace_event)
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(traces: Sequence[Tuple[str, ParseTrace]], filename: str) -> None:
+    """Write the traces of several files to a Chrome trace event file."""
+    with open(filename, "w", encoding="utf8") as f:
+        json.dump(as_chrome_trace(traces), f)
@@ -60,6 +60,7 @@ if TYPE_CHECKING:  # pragma: no cover
     from sqlfluff.core.config import FluffConfig
     from sqlfluff.core.linter import IgnoreMask
     from sqlfluff.core.plugin.hookspecs import PluginSpec
+    from sqlfluff.core.rules.profiler import RuleProfiler
 
     _LoggerAdapter = logging.LoggerAdapter[logging.Logger]
 else:
@@ -832,6 +833,7 @@ class BaseRule(metaclass=RuleMetaclass):
         ignore_mask: Optional["IgnoreMask"],
         fname: Optional[str],
         config: "FluffConfig",
+        profiler: Optional["RuleProfiler"] = None,
     ) -> Tuple[
         List[SQLLintError],
         Tuple[RawSegment, ...],
@@ -840,6 +842,8 @@ class BaseRule(metaclass=RuleMetaclass):
     ]:
         """Run the rule on a given tree.
 
+        If a `profiler` is given, each evaluation is recorded with it.
+
         Returns:
             A tuple of (vs, raw_stack, fixes, memory)
 
@@ -859,88 +863,143 @@ class BaseRule(metaclass=RuleMetaclass):
         memory = root_context.memory
         context = root_context
         for context in self.crawl_behaviour.crawl(root_context):
-            try:
-                context.memory = memory
-                res = self._eval(context=context)
-            except (bdb.BdbQuit, KeyboardInterrupt):  # pragma: no cover
-                raise
-            # Any exception at this point would halt the linter and
-            # cause the user to get no results
-            except Exception as e:
-                # If a filename is present, include it in the critical exception.
-                self.logger.critical(
-                    f"Applying rule {self.code} to {fname!r} threw an Exception: {e}"
-                    if fname
-                    else f"Applying rule {self.code} threw an Exception: {e}",
-                    exc_info=True,
+            context.memory = memory
+            memory, halt = self.eval_context(
+                context,
+                tree,
+                templated_file,
+                ignore_mask,
+                fname,
+                vs,
+                fixes,
+                profiler=profiler,
+            )
+            if halt:
+                return vs, context.raw_stack, fixes, context.memory
+        return vs, context.raw_stack if context else tuple(), fixes, context.memory
+
+    def eval_context(
+        self,
+        context: RuleContext,
+        tree: BaseSegment,
+        templated_file: Optional["TemplatedFile"],
+        ignore_mask: Optional["IgnoreMask"],
+        fname: Optional[str],
+        vs: List[SQLLintError],
+        fixes: List[LintFix],
+        profiler: Optional["RuleProfiler"] = None,
+    ) -> Tuple[Any, bool]:
+        """Evaluate the rule on a single context yielded by the crawler.
+
+        Any violations and fixes are appended to `vs` and `fixes`, and if
+        a `profiler` is given, the evaluation is recorded with it.
+
+        Returns:
+            A tuple of the memory to pass to the next evaluation, and
+            whether to stop crawling because the rule raised an exception.
+        """
+        if profiler:
+            with profiler.profile_eval(self, context, vs, fixes):
+                return self._eval_context(
+                    context, tree, templated_file, ignore_mask, fname, vs, fixes
                 )
-                assert context.segment.pos_marker
-                exception_line, _ = context.segment.pos_marker.source_position()
-                self._log_critical_errors(e)
-                vs.append(
-                    SQLLintError(
-                        rule=self,
-                        segment=context.segment,
-                        fixes=[],
-                        description=(
-                            f"Unexpected exception: {str(e)};\n"
-                            "Could you open an issue at "
-                            "https://github.com/sqlfluff/sqlfluff/issues ?\n"
-                            "You can ignore this exception for now, by adding "
-                            f"'-- noqa: {self.code}' at the end\n"
-                            f"of line {exception_line}\n"
-                        ),
-                    )
+        return self._eval_context(
+            context, tree, templated_file, ignore_mask, fname, vs, fixes
+        )
+
+    def _eval_context(
+        self,
+        context: RuleContext,
+        tree: BaseSegment,
+        templated_file: Optional["TemplatedFile"],
+        ignore_mask: Optional["IgnoreMask"],
+        fname: Optional[str],
+        vs: List[SQLLintError],
+        fixes: List[LintFix],
+    ) -> Tuple[Any, bool]:
+        """Evaluate the rule on a single context, without profiling."""
+        memory = context.memory
+        try:
+            res = self._eval(context=context)
+        except (bdb.BdbQuit, KeyboardInterrupt):  # pragma: no cover
+            raise
+        # Any exception at this point would halt the linter and
+        # cause the user to get no results
+        except Exception as e:
+            # If a filename is present, include it in the critical exception.
+            self.logger.critical(
+                f"Applying rule {self.code} to {fname!r} threw an Exception: {e}"
+                if fname
+                else f"Applying rule {self.code} threw an Exception: {e}",
+                exc_info=True,
+            )
+            assert context.segment.pos_marker
+            exception_line, _ = context.segment.pos_marker.source_position()
+            self._log_critical_errors(e)
+            vs.append(
+                SQLLintError(
+                    rule=self,
+                    segment=context.segment,
+                    fixes=[],
+                    description=(
+                        f"Unexpected exception: {str(e)};\n"
+                        "Could you open an issue at "
+                        "https://github.com/sqlfluff/sqlfluff/issues ?\n"
+                        "You can ignore this exception for now, by adding "
+                        f"'-- noqa: {self.code}' at the end\n"
+                        f"of line {exception_line}\n"
+                    ),
                 )
-                return vs, context.raw_stack, fixes, context.memory
+            )
+            return memory, True
 
-            new_lerrs: List[SQLLintError] = []
-            new_fixes: List[LintFix] = []
+        new_lerrs: List[SQLLintError] = []
+        new_fixes: List[LintFix] = []
 
-            if res is None or res == []:
-                # Assume this means no problems (also means no memory)
-                pass
-            elif isinstance(res, LintResult):
-                # Extract any memory
-                memory = res.memory
-                self._adjust_anchors_for_fixes(context, res)
+        if res is None or res == []:
+            # Assume this means no problems (also means no memory)
+            pass
+        elif isinstance(res, LintResult):
+            # Extract any memory
+            memory = res.memory
+            self._adjust_anchors_for_fixes(context, res)
+            self._process_lint_result(
+                res, templated_file, ignore_mask, new_lerrs, new_fixes, tree
+            )
+        elif isinstance(res, list) and all(
+            isinstance(elem, LintResult) for elem in res
+        ):
+            # Extract any memory from the *last* one, assuming
+            # it was the last to be added
+            memory = res[-1].memory
+            for elem in res:
+                self._adjust_anchors_for_fixes(context, elem)
                 self._process_lint_result(
-                    res, templated_file, ignore_mask, new_lerrs, new_fixes, tree
+                    elem, templated_file, ignore_mask, new_lerrs, new_fixes, tree
                 )
-            elif isinstance(res, list) and all(
-                isinstance(elem, LintResult) for elem in res
-            ):
-                # Extract any memory from the *last* one, assuming
-                # it was the last to be added
-                memory = res[-1].memory
-                for elem in res:
-                    self._adjust_anchors_for_fixes(context, elem)
-                    self._process_lint_result(
-                        elem, templated_file, ignore_mask, new_lerrs, new_fixes, tree
-                    )
-            else:  # pragma: no cover
-                raise TypeError(
-                    "Got unexpected result [{!r}] back from linting rule: {!r}".format(
-                        res, self.code
-                    )
+        else:  # pragma: no cover
+            raise TypeError(
+                "Got unexpected result [{!r}] back from linting rule: {!r}".format(
+                    res, self.code
                 )
+            )
 
-            for lerr in new_lerrs:
-                self.logger.info("!! Violation Found: %r", lerr.description)
-            if new_fixes:
-                if not self.is_fix_compatible:  # pragma: no cover
-                    rules_logger.error(
-                        f"Rule {self.code} returned a fix but is not documented as "
-                        "`is_fix_compatible`, you may encounter unusual fixing "
-                        "behaviour. Report this a bug to the developer of this rule."
-                    )
-                for lfix in new_fixes:
-                    self.logger.info("!! Fix Proposed: %r", lfix)
+        for lerr in new_lerrs:
+            self.logger.info("!! Violation Found: %r", lerr.description)
+        if new_fixes:
+            if not self.is_fix_compatible:  # pragma: no cover
+                rules_logger.error(
+                    f"Rule {self.code} returned a fix but is not documented as "
+                    "`is_fix_compatible`, you may encounter unusual fixing "
+                    "behaviour. Report this a bug to the developer of this rule."
+                )
+            for lfix in new_fixes:
+                self.logger.info("!! Fix Proposed: %r", lfix)
 
-            # Consume the new results
-            vs += new_lerrs
-            fixes += new_fixes
-        return vs, context.raw_stack if context else tuple(), fixes, context.memory
+        # Consume the new results
+        vs += new_lerrs
+        fixes += new_fixes
+        return memory, False
 
     # HELPER METHODS --------
     @staticmethod
@@ -0,0 +1,303 @@
+"""Crawling a tree once for several rules.
+
+Each rule has its own crawler, and so linting a file with every rule
+walks the tree once per rule. For the standard crawlers, the segments
+each rule is interested in only depend on their types, so the
+:obj:`CombinedCrawler` instead walks the tree once, dispatching each
+segment to the rules interested in it. Each rule is evaluated on the
+same segments, in the same order and with the same context as its own
+crawler would have provided.
+"""
+
+import pathlib
+import time
+from collections import defaultdict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from sqlfluff.core.dialects import Dialect
+from sqlfluff.core.errors import SQLLintError
+from sqlfluff.core.parser import BaseSegment
+from sqlfluff.core.rules.base import BaseRule, LintFix
+from sqlfluff.core.rules.context import RuleContext
+from sqlfluff.core.rules.crawlers import (
+    ParentOfSegmentCrawler,
+    RootOnlyCrawler,
+    SegmentSeekerCrawler,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.config import FluffConfig
+    from sqlfluff.core.linter import IgnoreMask
+    from sqlfluff.core.rules.profiler import RuleProfiler
+    from sqlfluff.core.templaters import TemplatedFile
+
+
+# The arguments to `BaseRule.eval_context()` which are fixed for a crawl:
+# the tree, templated file, ignore mask and file name.
+_EvalArgs = Tuple[
+    BaseSegment, Optional["TemplatedFile"], Optional["IgnoreMask"], Optional[str]
+]
+
+
+class CrawlResult(NamedTuple):
+    """The results of crawling a tree with a single rule."""
+
+    violations: List[SQLLintError]
+    fixes: List[LintFix]
+    # The time spent evaluating the rule, in seconds.
+    duration: float
+
+
+class _RuleState:
+    """The state of a single rule during a combined crawl."""
+
+    __slots__ = ("rule", "context", "memory", "vs", "fixes", "halted", "duration")
+
+    def __init__(self, rule: BaseRule, root_context: RuleContext) -> None:
+        self.rule = rule
+        self.context = root_context
+        self.memory = root_context.memory
+        self.vs: List[SQLLintError] = []
+        self.fixes: List[LintFix] = []
+        self.halted = False
+        self.duration = 0.0
+
+
+class CombinedCrawler:
+    """A crawler which walks a tree once for several rules.
+
+    Only rules using the standard :obj:`RootOnlyCrawler`,
+    :obj:`SegmentSeekerCrawler` and :obj:`ParentOfSegmentCrawler` can be
+    combined. Rules which need a raw stack, or which customise their
+    crawling in any other way, should be crawled individually (see
+    :meth:`can_combine`).
+
+    The rules interested in each segment are tracked as bit masks (with
+    one bit per rule), so that the cost of visiting each segment doesn't
+    grow with the number of rules.
+
+    Args:
+        rules (:obj:`list` of :obj:`BaseRule`): The rules to crawl for,
+            all of which must be combinable.
+    """
+
+    def __init__(self, rules: Sequence[BaseRule]) -> None:
+        assert all(self.can_combine(rule) for rule in rules)
+        self.rules = list(rules)
+        self._root_rules: List[int] = []
+        # Masks of the rules interested in each type, either as the type
+        # of the segment itself, or of one of its children.
+        self._self_masks: Dict[str, int] = defaultdict(int)
+        self._child_masks: Dict[str, int] = defaultdict(int)
+        # Masks of rules which don't recurse into matching segments, and
+        # of those which crawl unparsable segments.
+        self._no_recurse_mask = 0
+        self._unparsable_mask = 0
+        for idx, rule in enumerate(self.rules):
+            crawler = rule.crawl_behaviour
+            bit = 1 << idx
+            if crawler.works_on_unparsable:
+                self._unparsable_mask |= bit
+            if isinstance(crawler, RootOnlyCrawler):
+                self._root_rules.append(idx)
+                continue
+            assert isinstance(crawler, SegmentSeekerCrawler)
+            masks = (
+                self._child_masks
+                if isinstance(crawler, ParentOfSegmentCrawler)
+                else self._self_masks
+            )
+            for seg_type in crawler.types:
+                masks[seg_type] |= bit
+            if not crawler.allow_recurse:
+                self._no_recurse_mask |= bit
+        # Masks for each combination of segment class and instance types.
+        self._type_mask_cache: Dict[Tuple[Any, ...], Tuple[int, int]] = {}
+        # The profiler for the current crawl, if any.
+        self._profiler: Optional["RuleProfiler"] = None
+
+    @staticmethod
+    def can_combine(rule: BaseRule) -> bool:
+        """Can a rule be crawled as part of a combined crawl."""
+        crawler = rule.crawl_behaviour
+        if type(rule).crawl is not BaseRule.crawl:
+            return False
+        if type(crawler) is RootOnlyCrawler:
+            return True
+        return (
+            type(crawler) in (SegmentSeekerCrawler, ParentOfSegmentCrawler)
+            and not crawler.provide_raw_stack  # type: ignore
+        )
+
+    def crawl(
+        self,
+        tree: BaseSegment,
+        dialect: Dialect,
+        fix: bool,
+        templated_file: Optional["TemplatedFile"],
+        ignore_mask: Optional["IgnoreMask"],
+        fname: Optional[str],
+        config: "FluffConfig",
+        profiler: Optional["RuleProfiler"] = None,
+    ) -> Dict[str, CrawlResult]:
+        """Run all the rules on a given tree.
+
+        If a `profiler` is given, each evaluation is recorded with it.
+
+        Returns:
+            A dict of the results of each rule, by rule code.
+        """
+        states = [
+            _RuleState(
+                rule,
+                RuleContext(
+                    dialect=dialect,
+                    fix=fix,
+                    templated_file=templated_file,
+                    path=pathlib.Path(fname) if fname else None,
+                    segment=tree,
+                    config=config,
+                ),
+            )
+            for rule in self.rules
+        ]
+        args: _EvalArgs = (tree, templated_file, ignore_mask, fname)
+        self._profiler = profiler
+        for idx in self._root_rules:
+            if self.rules[idx].crawl_behaviour.passes_filter(tree):
+                self._eval(states[idx], tree, (), 0, args)
+        seeker_mask = (1 << len(self.rules)) - 1
+        for idx in self._root_rules:
+            seeker_mask &= ~(1 << idx)
+        if seeker_mask:
+            descendant_masks: Dict[int, Tuple[int, int]] = {}
+            self._index(tree, descendant_masks)
+            self._crawl(tree, (), 0, seeker_mask, states, args, descendant_masks)
+        return {
+            state.rule.code: CrawlResult(state.vs, state.fixes, state.duration)
+            for state in states
+        }
+
+    def _type_masks(self, segment: BaseSegment) -> Tuple[int, int]:
+        """Get the masks of the rules interested in the types of a segment.
+
+        Returns:
+            A tuple of the mask of rules which match the segment itself,
+            and of rules which match its parent.
+        """
+        key = (segment.__class__, getattr(segment, "instance_types", ()))
+        masks = self._type_mask_cache.get(key)
+        if masks is None:
+            self_mask = child_mask = 0
+            for seg_type in segment.class_types:
+                self_mask |= self._self_masks.get(seg_type, 0)
+                child_mask |= self._child_masks.get(seg_type, 0)
+            masks = self._type_mask_cache[key] = (self_mask, child_mask)
+        return masks
+
+    def _index(
+        self, segment: BaseSegment, descendant_masks: Dict[int, Tuple[int, int]]
+    ) -> int:
+        """Work out which rules are interested in the children of each segment.
+
+        For each segment with children, this records a tuple of the mask
+        of rules interested in any of its descendants (which mirrors the
+        pruning on `descendant_type_set` in the individual crawlers),
+        and the mask of rules which match it as the parent of one of its
+        direct children.
+
+        Returns:
+            The mask of rules interested in the segment or any of its
+            descendants.
+        """
+        self_mask, child_mask = self._type_masks(segment)
+        if not segment.segments:
+            return self_mask | child_mask
+        descendant_mask = 0
+        parent_mask = 0
+        for child in segment.segments:
+            descendant_mask |= self._index(child, descendant_masks)
+            parent_mask |= self._type_masks(child)[1]
+        descendant_masks[id(segment)] = (descendant_mask, parent_mask)
+        return self_mask | child_mask | descendant_mask
+
+    def _eval(
+        self,
+        state: _RuleState,
+        segment: BaseSegment,
+        parent_stack: Tuple[BaseSegment, ...],
+        segment_idx: int,
+        args: _EvalArgs,
+    ) -> None:
+        """Evaluate a rule on a segment, as its own crawler would have."""
+        context = state.context
+        context.segment = segment
+        context.parent_stack = parent_stack
+        context.segment_idx = segment_idx
+        context.memory = state.memory
+        t0 = time.monotonic()
+        state.memory, state.halted = state.rule.eval_context(
+            context, *args, state.vs, state.fixes, profiler=self._profiler
+        )
+        state.duration += time.monotonic() - t0
+
+    def _crawl(
+        self,
+        segment: BaseSegment,
+        parent_stack: Tuple[BaseSegment, ...],
+        segment_idx: int,
+        active: int,
+        states: List[_RuleState],
+        args: _EvalArgs,
+        descendant_masks: Dict[int, Tuple[int, int]],
+    ) -> int:
+        """Crawl a segment for the rules which are still active within it.
+
+        Returns:
+            The mask of rules which have halted, and so shouldn't be
+            evaluated any further.
+        """
+        if segment.is_type("unparsable"):
+            active &= self._unparsable_mask
+        descendant_mask, parent_mask = descendant_masks.get(id(segment), (0, 0))
+
+        # Evaluate the rules interested in this segment, in order.
+        matched = active & (self._type_masks(segment)[0] | parent_mask)
+        halted = 0
+        remaining = matched
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            state = states[bit.bit_length() - 1]
+            self._eval(state, segment, parent_stack, segment_idx, args)
+            if state.halted:
+                halted |= bit
+
+        # Work out which rules might be interested in the children.
+        active &= descendant_mask & ~halted & ~(matched & self._no_recurse_mask)
+        if not active:
+            return halted
+        new_parent_stack = parent_stack + (segment,)
+        for idx, child in enumerate(segment.segments):
+            child_halted = self._crawl(
+                child,
+                new_parent_stack,
+                idx,
+                active,
+                states,
+                args,
+                descendant_masks,
+            )
+            if child_halted:
+                active &= ~child_halted
+                halted |= child_halted
+        return halted
@@ -1,10 +1,11 @@
 """Definitions of crawlers."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Iterator, Set, cast
+from typing import Any, Dict, Iterator, List, Set, Tuple, cast
 
 from sqlfluff.core.parser.segments.base import BaseSegment
 from sqlfluff.core.parser.segments.raw import RawSegment
+from sqlfluff.core.parser.segments.type_index import TypeIndex
 from sqlfluff.core.rules.context import RuleContext
 
 
@@ -73,11 +74,27 @@ class SegmentSeekerCrawler(BaseCrawler):
         """Does this segment match the relevant criteria."""
         return segment.is_type(*self.types)
 
+    def index_matches(self, index: TypeIndex, pos: int) -> List[int]:
+        """The positions in a type index of the segments which match.
+
+        This is the equivalent of `is_self_match` for all the segments
+        within the one at `pos` (including itself), in order.
+        """
+        return index.positions_within(tuple(self.types), pos, index.ends[pos])
+
     def crawl(self, context: RuleContext) -> Iterator[RuleContext]:
         """Yields a RuleContext for each segment the rule should process.
 
         We assume that segments are yielded by their parent.
         """
+        # If the segment is in an indexed tree, we can go straight to the
+        # matching segments (unless we need to track the raw stack).
+        if not self.provide_raw_stack:
+            entry = context.segment.get_type_index()
+            if entry:
+                yield from self._crawl_index(context, *entry)
+                return
+
         # Check whether we should consider this segment _or it's children_
         # at all.
         self_match = False
@@ -128,6 +145,49 @@ class SegmentSeekerCrawler(BaseCrawler):
             context.segment_idx = idx
             yield from self.crawl(context)
 
+    def _crawl_index(
+        self, context: RuleContext, index: TypeIndex, pos: int
+    ) -> Iterator[RuleContext]:
+        """Yields the same contexts as `crawl`, using a type index."""
+        if not self.passes_filter(context.segment):
+            return
+        matches = self.index_matches(index, pos)
+        if not matches:
+            return
+        # Unparsable sections are skipped, along with everything in them.
+        excluded = (
+            []
+            if self.works_on_unparsable
+            else index.positions_within(("unparsable",), pos + 1, index.ends[pos])
+        )
+        root_parent_stack = context.parent_stack
+        root_idx = context.segment_idx
+        # The parent stack for the children of each position, as needed.
+        parent_stacks: Dict[int, Tuple[BaseSegment, ...]] = {
+            pos: root_parent_stack + (context.segment,)
+        }
+
+        def _parent_stack(parent_pos: int) -> Tuple[BaseSegment, ...]:
+            parent_stack = parent_stacks.get(parent_pos)
+            if parent_stack is None:
+                parent_stack = parent_stacks[parent_pos] = _parent_stack(
+                    index.parents[parent_pos]
+                ) + (index.segment(parent_pos),)
+            return parent_stack
+
+        for match_pos in index.unskipped_positions(
+            matches, excluded, self.allow_recurse
+        ):
+            if match_pos == pos:
+                context.segment = index.segment(pos)
+                context.parent_stack = root_parent_stack
+                context.segment_idx = root_idx
+            else:
+                context.segment = index.segment(match_pos)
+                context.parent_stack = _parent_stack(index.parents[match_pos])
+                context.segment_idx = index.child_idx[match_pos]
+            yield context
+
 
 class ParentOfSegmentCrawler(SegmentSeekerCrawler):
     """A crawler that efficiently searches for parents of specific segment types.
@@ -144,3 +204,18 @@ class ParentOfSegmentCrawler(SegmentSeekerCrawler):
         kind of segment.
         """
         return bool(self.types & segment.direct_descendant_type_set)
+
+    def index_matches(self, index: TypeIndex, pos: int) -> List[int]:
+        """The positions in a type index of the segments which match.
+
+        These are the parents of the segments of the types we're looking
+        for, within the one at `pos`.
+        """
+        return sorted(
+            {
+                index.parents[child_pos]
+                for child_pos in index.positions_within(
+                    tuple(self.types), pos + 1, index.ends[pos]
+                )
+            }
+        )
@@ -0,0 +1,188 @@
+"""Tracking which parts of a file have changed between fix loops.
+
+When fixing, each rule is run on the whole file in every loop, even if
+the fixes applied since it last ran only touched one statement.
+:meth:`BaseSegment.apply_fixes` keeps any segment which it hasn't
+changed (along with its uuid), so the :obj:`DirtyRegionTracker` can
+record the top level segments of the file (usually statements) in
+which each rule found nothing, and only re-run the rule on the top
+level segments which have been replaced since.
+"""
+
+import pathlib
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from sqlfluff.core.dialects import Dialect
+from sqlfluff.core.errors import SQLLintError
+from sqlfluff.core.parser import BaseSegment
+from sqlfluff.core.rules.base import BaseRule, LintFix
+from sqlfluff.core.rules.context import RuleContext
+from sqlfluff.core.rules.crawlers import ParentOfSegmentCrawler, SegmentSeekerCrawler
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.config import FluffConfig
+    from sqlfluff.core.linter import IgnoreMask
+    from sqlfluff.core.rules.profiler import RuleProfiler
+    from sqlfluff.core.templaters import TemplatedFile
+
+
+# A top level segment is recognised by its uuid, its raw (in case a fix
+# replaced it with a copy of itself) and its working position (in case
+# a rule depends on it).
+_RegionKey = Tuple[int, str, Tuple[int, int]]
+
+
+class DirtyRegionTracker:
+    """Tracks the top level segments each rule has found no problems in.
+
+    This assumes that rules are local to top level statements, i.e. that
+    the results of a rule within a top level segment only depend on that
+    segment. That's true of rules which crawl for specific segment types,
+    as long as they don't carry memory from one evaluation to the next
+    (memory would let the results in one statement depend on those
+    before it). Rules with any other crawlers, or which turn out to use
+    memory, are always run on the whole file. A rule which looks outside
+    the segment it's evaluated on (e.g. through `context.parent_stack`)
+    would break this assumption, and isn't detected.
+
+    A new tracker should be used for each file.
+    """
+
+    def __init__(self) -> None:
+        # The regions each rule found no problems in when it last ran.
+        self._clean: Dict[str, Set[_RegionKey]] = {}
+        # Rules which have been found to use memory.
+        self._uses_memory: Set[str] = set()
+
+    @staticmethod
+    def can_track(rule: BaseRule) -> bool:
+        """Can a rule be run on only the changed regions of a file."""
+        crawler = rule.crawl_behaviour
+        return (
+            type(rule).crawl is BaseRule.crawl
+            and type(crawler) in (SegmentSeekerCrawler, ParentOfSegmentCrawler)
+            and not crawler.provide_raw_stack  # type: ignore
+        )
+
+    @staticmethod
+    def _region_key(segment: BaseSegment) -> _RegionKey:
+        assert segment.pos_marker
+        return segment.uuid, segment.raw, segment.pos_marker.working_loc
+
+    @staticmethod
+    def _memory_used(memory: Any, initial_memory: Any) -> bool:
+        """Has a rule stored anything in its memory.
+
+        Any change counts, even to a falsy value (e.g. `0` or `[]`). A
+        result without memory resets it to None, which doesn't count.
+        """
+        # The initial memory is an empty dict, which may be updated in place.
+        return bool(initial_memory) or (
+            memory is not None and memory is not initial_memory
+        )
+
+    def crawl(
+        self,
+        rule: BaseRule,
+        tree: BaseSegment,
+        dialect: Dialect,
+        fix: bool,
+        templated_file: Optional["TemplatedFile"],
+        ignore_mask: Optional["IgnoreMask"],
+        fname: Optional[str],
+        config: "FluffConfig",
+        profiler: Optional["RuleProfiler"] = None,
+    ) -> Tuple[List[SQLLintError], List[LintFix]]:
+        """Run a rule on the regions of a tree which have changed.
+
+        If a `profiler` is given, each evaluation is recorded with it.
+
+        Returns:
+            A tuple of the violations and fixes found, which are the same
+            as those from crawling the whole tree, assuming that the rule
+            still finds nothing in the regions it isn't run on.
+        """
+        crawler = rule.crawl_behaviour
+        if (
+            rule.code in self._uses_memory
+            or not self.can_track(rule)
+            or not crawler.passes_filter(tree)
+            or crawler.is_self_match(tree)  # type: ignore
+        ):
+            result = rule.crawl(
+                tree,
+                dialect,
+                fix,
+                templated_file,
+                ignore_mask,
+                fname,
+                config,
+                profiler=profiler,
+            )
+            return result[0], result[2]
+
+        clean = self._clean.pop(rule.code, set())
+        new_clean: Set[_RegionKey] = set()
+        vs: List[SQLLintError] = []
+        fixes: List[LintFix] = []
+        context = RuleContext(
+            dialect=dialect,
+            fix=fix,
+            templated_file=templated_file,
+            path=pathlib.Path(fname) if fname else None,
+            segment=tree,
+            config=config,
+        )
+        initial_memory: Any = context.memory
+        memory = initial_memory
+        for idx, segment in enumerate(tree.segments):
+            key = self._region_key(segment)
+            if key in clean:
+                new_clean.add(key)
+                continue
+            num_vs = len(vs)
+            num_fixes = len(fixes)
+            context.segment = segment
+            context.parent_stack = (tree,)
+            context.segment_idx = idx
+            for context in crawler.crawl(context):
+                context.memory = memory
+                memory, halt = rule.eval_context(
+                    context,
+                    tree,
+                    templated_file,
+                    ignore_mask,
+                    fname,
+                    vs,
+                    fixes,
+                    profiler=profiler,
+                )
+                if self._memory_used(memory, initial_memory):
+                    # The results may depend on the evaluations we've
+                    # skipped, so start again with the whole tree.
+                    self._uses_memory.add(rule.code)
+                    return self.crawl(
+                        rule,
+                        tree,
+                        dialect,
+                        fix,
+                        templated_file,
+                        ignore_mask,
+                        fname,
+                        config,
+                        profiler=profiler,
+                    )
+                if halt:
+                    return vs, fixes
+            if len(vs) == num_vs and len(fixes) == num_fixes:
+                new_clean.add(key)
+        self._clean[rule.code] = new_clean
+        return vs, fixes
@@ -0,0 +1,267 @@
+"""Profiling the evaluation of rules.
+
+When the `profile_rules` config value is set, the linter records every
+evaluation of each rule on a file with a :obj:`RuleProfiler`: how long
+it took, the type of the segment which triggered it, and the violations
+and fixes it found, along with the functions the rule spent its time in
+(using :mod:`cProfile`). These are kept as a :obj:`RuleProfile` for each
+file, which can be combined across files (including those linted in
+other processes) and exported as JSON. When the `profile_rule_events`
+config value is also set, each evaluation is kept as an event too, so
+that they can be exported as a trace in the Chrome trace event format
+(which can be opened in Perfetto or speedscope).
+"""
+
+import cProfile
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlfluff.core.errors import SQLLintError
+from sqlfluff.core.parser import BaseSegment
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlfluff.core.rules.base import BaseRule, LintFix
+    from sqlfluff.core.rules.context import RuleContext
+
+
+# The number of functions to report for each rule, by cumulative time.
+HOT_PATH_LIMIT = 20
+
+# A single evaluation, as the rule code, the type of the segment, the
+# file name, the process id, and the start and duration in nanoseconds.
+_Event = Tuple[str, str, str, int, int, int]
+
+
+def _function_label(key: Tuple[str, int, str]) -> str:
+    """A readable label for a function in the :mod:`cProfile` stats."""
+    filename, lineno, funcname = key
+    if filename == "~":
+        # Built in functions have no file.
+        return funcname
+    parts = filename.split(os.sep)
+    # Show paths within sqlfluff (or plugins) from the package name.
+    if "sqlfluff" in parts:
+        idx = len(parts) - 1 - parts[::-1].index("sqlfluff")
+        filename = "/".join(parts[idx:])
+    return f"{filename}:{lineno}({funcname})"
+
+
+@dataclass
+class RuleStats:
+    """The evaluations of a single rule."""
+
+    evals: int = 0
+    # The total time spent in evaluations, in seconds.
+    time: float = 0.0
+    violations: int = 0
+    fixes: int = 0
+    # The evaluations and time spent on each type of segment.
+    segment_types: Dict[str, List[float]] = field(default_factory=dict)
+    # The calls, own time and cumulative time of each function called
+    # during the evaluations, by label.
+    functions: Dict[str, List[float]] = field(default_factory=dict)
+
+    def merge(self, other: "RuleStats") -> None:
+        """Add the evaluations from another set of stats to these."""
+        self.evals += other.evals
+        self.time += other.time
+        self.violations += other.violations
+        self.fixes += other.fixes
+        for stats, other_stats in (
+            (self.segment_types, other.segment_types),
+            (self.functions, other.functions),
+        ):
+            for key, values in other_stats.items():
+                if key in stats:
+                    stats[key] = [a + b for a, b in zip(stats[key], values)]
+                else:
+                    stats[key] = list(values)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """A summary of the stats, with the hottest functions."""
+        hot_paths = sorted(
+            self.functions.items(), key=lambda item: item[1][2], reverse=True
+        )[:HOT_PATH_LIMIT]
+        return {
+            "evals": self.evals,
+            "time": self.time,
+            "violations": self.violations,
+            "fixes": self.fixes,
+            "segment_types": {
+                seg_type: {"evals": int(evals), "time": seg_time}
+                for seg_type, (evals, seg_time) in sorted(
+                    self.segment_types.items(),
+                    key=lambda item: item[1][1],
+                    reverse=True,
+                )
+            },
+            "hot_paths": [
+                {
+                    "function": label,
+                    "calls": int(calls),
+                    "own_time": own_time,
+                    "cumulative_time": cum_time,
+                }
+                for label, (calls, own_time, cum_time) in hot_paths
+            ],
+        }
+
+
+@dataclass
+class RuleProfile:
+    """The profile of the rules on one or more files.
+
+    This only holds plain data, so that it can be returned from worker
+    processes as part of a :obj:`LintedFile`.
+    """
+
+    files: int = 0
+    # The total number of segments in the trees linted.
+    segments: int = 0
+    rules: Dict[str, RuleStats] = field(default_factory=dict)
+    events: List[_Event] = field(default_factory=list)
+
+    def merge(self, other: "RuleProfile") -> None:
+        """Add the profile of other files to this one."""
+        self.files += other.files
+        self.segments += other.segments
+        for code, stats in other.rules.items():
+            self.rules.setdefault(code, RuleStats()).merge(stats)
+        self.events += other.events
+
+    def as_dict(self) -> Dict[str, Any]:
+        """A summary of the profile, with the slowest rules first."""
+        return {
+            "files": self.files,
+            "segments": self.segments,
+            "rules": {
+                code: stats.as_dict()
+                for code, stats in sorted(
+                    self.rules.items(), key=lambda item: item[1].time, reverse=True
+                )
+            },
+        }
+
+    def as_chrome_trace(self) -> Dict[str, Any]:
+        """The evaluations in the Chrome trace event format.
+
+        Each rule gets its own track within each process, with an event
+        for each evaluation, named after the type of the segment.
+        """
+        tids = {code: idx for idx, code in enumerate(sorted(self.rules), start=1)}
+        start = min((event[4] for event in self.events), default=0)
+        trace_events: List[Dict[str, Any]] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tids[code],
+                "args": {"name": code},
+            }
+            for code, pid in sorted({(event[0], event[3]) for event in self.events})
+        ]
+        for code, seg_type, fname, pid, t0, duration in self.events:
+            trace_events.append(
+                {
+                    "name": seg_type,
+                    "cat": code,
+                    "ph": "X",
+                    "ts": (t0 - start) / 1000,
+                    "dur": duration / 1000,
+                    "pid": pid,
+                    "tid": tids[code],
+                    "args": {"file": fname},
+                }
+            )
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+class RuleProfiler:
+    """Records the evaluations of rules on a single file.
+
+    Args:
+        tree (:obj:`BaseSegment`): The parsed tree of the file.
+        fname (:obj:`str`, optional): The name of the file.
+        record_events (:obj:`bool`, optional): Whether to keep an event
+            for every evaluation, for a trace. There can be a great many
+            of these, so by default only the totals for each rule are kept.
+    """
+
+    def __init__(
+        self,
+        tree: BaseSegment,
+        fname: Optional[str] = None,
+        record_events: bool = False,
+    ) -> None:
+        self.fname = fname or "<string>"
+        self.record_events = record_events
+        self.profile = RuleProfile(files=1, segments=tree.count_segments())
+        self._pid = os.getpid()
+        self._profilers: Dict[str, cProfile.Profile] = {}
+
+    @contextmanager
+    def profile_eval(
+        self,
+        rule: "BaseRule",
+        context: "RuleContext",
+        vs: List[SQLLintError],
+        fixes: List["LintFix"],
+    ) -> Iterator[None]:
+        """Record a single evaluation of a rule.
+
+        The violations and fixes found are those appended to `vs` and
+        `fixes` within the context.
+        """
+        stats = self.profile.rules.get(rule.code)
+        if stats is None:
+            stats = self.profile.rules[rule.code] = RuleStats()
+        profiler = self._profilers.get(rule.code)
+        if profiler is None:
+            profiler = self._profilers[rule.code] = cProfile.Profile()
+        num_vs = len(vs)
+        num_fixes = len(fixes)
+        seg_type = context.segment.get_type()
+        t0 = time.perf_counter_ns()
+        try:
+            profiler.enable()
+            profiling = True
+        except ValueError:  # pragma: no cover
+            # Another profiler is already running, so we'll just have to
+            # do without the functions.
+            profiling = False
+        try:
+            yield
+        finally:
+            if profiling:
+                profiler.disable()
+            duration = time.perf_counter_ns() - t0
+            stats.evals += 1
+            stats.time += duration / 1e9
+            stats.violations += len(vs) - num_vs
+            stats.fixes += len(fixes) - num_fixes
+            type_stats = stats.segment_types.setdefault(seg_type, [0, 0.0])
+            type_stats[0] += 1
+            type_stats[1] += duration / 1e9
+            if self.record_events:
+                self.profile.events.append(
+                    (rule.code, seg_type, self.fname, self._pid, t0, duration)
+                )
+
+    def finish(self) -> RuleProfile:
+        """Collect the functions called by each rule into the profile."""
+        for code, profiler in self._profilers.items():
+            functions = self.profile.rules[code].functions
+            for key, (_, calls, own_time, cum_time, _) in pstats.Stats(
+                profiler
+            ).stats.items():  # type: ignore
+                label = _function_label(key)
+                if "_lsprof.Profiler" in label:
+                    # Skip disabling the profiler.
+                    continue
+                functions[label] = [calls, own_time, cum_time]
+        self._profilers = {}
+        return self.profile
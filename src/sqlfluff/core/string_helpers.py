@@ -1,6 +1,6 @@
 """String Helpers for the parser module."""
 
-from typing import Iterator
+from typing import Dict, Iterable, Iterator, List
 
 
 def curtail_string(s: str, length: int = 20) -> str:
@@ -23,3 +23,64 @@ def findall(substr: str, in_str: str) -> Iterator[int]:
     while idx != -1:
         yield idx
         idx = in_str.find(substr, idx + 1)
+
+
+def findall_substrings(substrs: Iterable[str], in_str: str) -> Dict[str, List[int]]:
+    """Find all the positions of each of some substrings within in_str.
+
+    This is equivalent to calling `findall()` for each substring, but
+    scans in_str once with an Aho-Corasick automaton, so it's linear
+    in the length of in_str (plus the number of occurrences) rather
+    than proportional to the number of substrings.
+    https://en.wikipedia.org/wiki/Aho%E2%80%93Corasick_algorithm
+
+    Returns:
+        A dict of the (sorted) positions of each substring.
+    """
+    occurrences: Dict[str, List[int]] = {substr: [] for substr in substrs}
+    # Build a trie of the substrings. Each node has its transitions, and
+    # the substring which ends at it (if any).
+    goto: List[Dict[str, int]] = [{}]
+    ends: List[str] = [""]
+    for substr in occurrences:
+        node = 0
+        for char in substr:
+            next_node = goto[node].get(char)
+            if next_node is None:
+                next_node = len(goto)
+                goto[node][char] = next_node
+                goto.append({})
+                ends.append("")
+            node = next_node
+        ends[node] = substr
+    # Link each node to the node of its longest proper suffix in the trie,
+    # and to the nearest node along those links which ends a substring.
+    fail = [0] * len(goto)
+    output = [0] * len(goto)
+    queue = list(goto[0].values())
+    for node in queue:
+        for char, child in goto[node].items():
+            queue.append(child)
+            suffix = fail[node]
+            while suffix and char not in goto[suffix]:
+                suffix = fail[suffix]
+            fail[child] = goto[suffix].get(char, 0) if node else 0
+            output[child] = fail[child] if ends[fail[child]] else output[fail[child]]
+    # Scan the string, collecting the substrings which end at each position.
+    # Transitions which follow the suffix links are added to the trie as
+    # they're found, so that each one is only followed once.
+    node = 0
+    for idx, char in enumerate(in_str):
+        next_node = goto[node].get(char)
+        if next_node is None:
+            suffix = fail[node]
+            while suffix and char not in goto[suffix]:
+                suffix = fail[suffix]
+            next_node = goto[node][char] = goto[suffix].get(char, 0)
+        node = next_node
+        match = node if ends[node] else output[node]
+        while match:
+            substr = ends[match]
+            occurrences[substr].append(idx - len(substr) + 1)
+            match = output[match]
+    return occurrences
@@ -1,7 +1,7 @@
 """Defines the templaters."""
 
 import logging
-from bisect import bisect_left
+from bisect import bisect_left, bisect_right
 from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 from sqlfluff.core.config import FluffConfig
@@ -203,6 +203,17 @@ class TemplatedFile:
                     f"{len(templated_str)} != {tfs.templated_slice.stop}."
                 )
 
+        # Index the start and stop positions of the slices. The slices are
+        # contiguous (as checked above), so these are sorted and can be
+        # searched with bisect when mapping positions.
+        self._templated_slice_starts = [
+            tfs.templated_slice.start for tfs in self.sliced_file
+        ]
+        self._templated_slice_stops = [
+            tfs.templated_slice.stop for tfs in self.sliced_file
+        ]
+        self._raw_slice_starts = [rfs.source_idx for rfs in self.raw_sliced]
+
     @classmethod
     def from_string(cls, raw: str) -> "TemplatedFile":
         """Create TemplatedFile from a string."""
@@ -254,26 +265,23 @@ class TemplatedFile:
         NB: the last_idx is exclusive, as the intent is to use this as a slice.
         """
         start_idx = start_idx or 0
-        first_idx = None
-        last_idx = start_idx
-        # Work through the sliced file, starting at the start_idx if given
-        # as an optimisation hint. The sliced_file is a list of TemplatedFileSlice
-        # which reference parts of the templated file and where they exist in the
-        # source.
-        for idx, elem in enumerate(self.sliced_file[start_idx:]):
-            last_idx = idx + start_idx
-            if elem[2].stop >= templated_pos:
-                if first_idx is None:
-                    first_idx = idx + start_idx
-                if elem[2].start > templated_pos:
-                    break
-                elif not inclusive and elem[2].start >= templated_pos:
-                    break
-        # If we got to the end add another index
-        else:
-            last_idx += 1
-        if first_idx is None:  # pragma: no cover
+        # The first slice which touches the point is the first which stops
+        # at or after it. The sliced_file is a list of TemplatedFileSlice
+        # which reference parts of the templated file and where they exist in
+        # the source, and its start and stop positions are sorted.
+        first_idx = bisect_left(self._templated_slice_stops, templated_pos, start_idx)
+        if first_idx >= len(self.sliced_file):  # pragma: no cover
             raise ValueError("Position Not Found")
+        # The slices which touch the point end before the first which starts
+        # after it (or at it, if not inclusive).
+        if inclusive:
+            last_idx = bisect_right(
+                self._templated_slice_starts, templated_pos, first_idx
+            )
+        else:
+            last_idx = bisect_left(
+                self._templated_slice_starts, templated_pos, first_idx
+            )
         return first_idx, last_idx
 
     def raw_slices_spanning_source_slice(
@@ -284,24 +292,18 @@ class TemplatedFile:
         last_raw_slice = self.raw_sliced[-1]
         if source_slice.start >= last_raw_slice.source_idx + len(last_raw_slice.raw):
             return []
-        # First find the start index
-        raw_slice_idx = 0
-        # Move the raw pointer forward to the start of this patch
-        while (
-            raw_slice_idx + 1 < len(self.raw_sliced)
-            and self.raw_sliced[raw_slice_idx + 1].source_idx <= source_slice.start
-        ):
-            raw_slice_idx += 1
-        # Find slice index of the end of this patch.
-        slice_span = 1
-        while (
-            raw_slice_idx + slice_span < len(self.raw_sliced)
-            and self.raw_sliced[raw_slice_idx + slice_span].source_idx
-            < source_slice.stop
-        ):
-            slice_span += 1
+        # First find the start index, i.e. the last slice starting at or
+        # before the start of this patch.
+        raw_slice_idx = max(
+            bisect_right(self._raw_slice_starts, source_slice.start) - 1, 0
+        )
+        # Find slice index of the end of this patch, i.e. the first slice
+        # starting at or after its stop.
+        stop_idx = bisect_left(
+            self._raw_slice_starts, source_slice.stop, raw_slice_idx + 1
+        )
         # Return the raw slices:
-        return self.raw_sliced[raw_slice_idx : raw_slice_idx + slice_span]
+        return self.raw_sliced[raw_slice_idx:stop_idx]
 
     def templated_slice_to_source_slice(
         self,
@@ -360,11 +362,12 @@ class TemplatedFile:
 
         # Update starting position based on insertion point:
         if insertion_point >= 0:
-            for elem in self.sliced_file[ts_start_sf_start:]:
-                if elem[1].start != insertion_point:
-                    ts_start_sf_start += 1
-                else:
-                    break
+            # NB: Iterate by index, to avoid copying the rest of the file.
+            while (
+                ts_start_sf_start < len(self.sliced_file)
+                and self.sliced_file[ts_start_sf_start][1].start != insertion_point
+            ):
+                ts_start_sf_start += 1
 
         subslices = self.sliced_file[
             # Very inclusive slice
@@ -428,7 +431,11 @@ class TemplatedFile:
         if source_slice.start == source_slice.stop:
             return True
         is_literal = True
-        for raw_slice in self.raw_sliced:
+        # Only the slices from the last one starting at or before the start
+        # of the slice can affect the result.
+        start_idx = max(bisect_right(self._raw_slice_starts, source_slice.start) - 1, 0)
+        for raw_slice_idx in range(start_idx, len(self.raw_sliced)):
+            raw_slice = self.raw_sliced[raw_slice_idx]
             # Reset if we find a literal and we're up to the start
             # otherwise set false.
             if raw_slice.source_idx <= source_slice.start:
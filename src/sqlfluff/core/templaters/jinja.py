@@ -4,8 +4,20 @@ import logging
 import os.path
 import pkgutil
 import sys
+from dataclasses import dataclass
 from functools import reduce
-from typing import Callable, Dict, Generator, List, Optional, Tuple
+from types import CodeType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import jinja2.nodes
 from jinja2 import (
@@ -28,11 +40,99 @@ from sqlfluff.core.templaters.base import (
     large_file_check,
 )
 from sqlfluff.core.templaters.python import PythonTemplater
-from sqlfluff.core.templaters.slicers.tracer import JinjaAnalyzer
+from sqlfluff.core.templaters.slicers.tracer import jinja_analysis_cache
 
 # Instantiate the templater logger
 templater_logger = logging.getLogger("sqlfluff.templater")
 
+# The path, mtime and size of each file an environment was loaded from.
+FileSignature = Tuple[Tuple[str, int, int], ...]
+
+
+@dataclass
+class LoadedEnvironment:
+    """A jinja environment, with the libraries and macros of a config."""
+
+    env: Environment
+    libraries: Dict[str, Any]
+    # The compiled macro templates, in the order they're loaded. The macros
+    # are extracted from these for each file, so that they use its context.
+    path_macros: List[CodeType]
+    config_macros: List[CodeType]
+    file_signature: FileSignature = ()
+
+
+class JinjaEnvironmentCache:
+    """The jinja environments loaded by this process, by templater config.
+
+    Loading the environment for a config imports the modules in its
+    `library_path` and compiles every file in `load_macros_from_path`.
+    The environments are shared between files with the same config, and
+    loaded again if any of the files they were loaded from have changed.
+    """
+
+    def __init__(self) -> None:
+        self._environments: Dict[Hashable, LoadedEnvironment] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._environments)
+
+    def get(
+        self, key: Hashable, file_signature: FileSignature
+    ) -> Optional[LoadedEnvironment]:
+        """Get the environment for a key, if the files it used are unchanged."""
+        loaded = self._environments.get(key)
+        if loaded is not None:
+            if loaded.file_signature == file_signature:
+                self.hits += 1
+                return loaded
+            del self._environments[key]
+            self.invalidations += 1
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, loaded: LoadedEnvironment) -> None:
+        """Store the environment for a key."""
+        self._environments[key] = loaded
+
+    def clear(self) -> None:
+        """Drop all the environments, e.g. to pick up changed libraries."""
+        self._environments.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Return the hit and miss counts for the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": len(self._environments),
+            "hit ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# The cache is shared between all files templated by this process.
+jinja_environment_cache = JinjaEnvironmentCache()
+
+
+def jinja_environment_stats() -> Dict[str, float]:
+    """Return the stats of the jinja environment cache, if it's been used."""
+    if not (jinja_environment_cache.hits or jinja_environment_cache.misses):
+        return {}
+    return jinja_environment_cache.stats()
+
+
+def _freeze_section(section: Any) -> Hashable:
+    """Make a (nested) config section hashable, for use in a cache key."""
+    if isinstance(section, dict):
+        return tuple(sorted((k, _freeze_section(v)) for k, v in section.items()))
+    if isinstance(section, list):
+        return tuple(_freeze_section(v) for v in section)
+    return section
+
 
 class JinjaTemplater(PythonTemplater):
     """A templater using the jinja2 library.
@@ -41,6 +141,10 @@ class JinjaTemplater(PythonTemplater):
     """
 
     name = "jinja"
+    # Reconstruct the output from the traced render when slicing, rather
+    # than rendering the template again. This relies on the environment
+    # keeping trailing newlines.
+    single_render_tracing = True
 
     class Libraries:
         """Mock namespace for user-defined Jinja library."""
@@ -48,20 +152,25 @@ class JinjaTemplater(PythonTemplater):
         pass
 
     @staticmethod
-    def _extract_macros_from_template(template, env, ctx):
-        """Take a template string and extract any macros from it.
+    def _extract_macros_from_template(
+        macro_template: CodeType, env: Environment, ctx: Dict
+    ) -> Dict:
+        """Take a compiled template and extract any macros from it.
 
         Lovingly inspired by http://codyaray.com/2015/05/auto-load-jinja2-macros
         """
         from jinja2.runtime import Macro  # noqa
 
-        # Iterate through keys exported from the loaded template string
+        # Iterate through keys exported from the loaded template, which is
+        # bound to the context (as `env.from_string()` would do).
         context = {}
-        macro_template = env.from_string(template, globals=ctx)
+        template = env.template_class.from_code(
+            env, macro_template, env.make_globals(ctx), None
+        )
         # This is kind of low level and hacky but it works
         try:
-            for k in macro_template.module.__dict__:
-                attr = getattr(macro_template.module, k)
+            for k in template.module.__dict__:
+                attr = getattr(template.module, k)
                 # Is it a macro? If so install it at the name of the macro
                 if isinstance(attr, Macro):
                     context[k] = attr
@@ -74,67 +183,72 @@ class JinjaTemplater(PythonTemplater):
         return context
 
     @classmethod
-    def _extract_macros_from_path(
-        cls, path: List[str], env: Environment, ctx: Dict
-    ) -> dict:
-        """Take a path and extract macros from it."""
+    def _extract_macros(
+        cls, macro_templates: List[CodeType], env: Environment, ctx: Dict
+    ) -> Dict:
+        """Extract the macros from some compiled templates, in order."""
         macro_ctx = {}
+        for macro_template in macro_templates:
+            macro_ctx.update(
+                cls._extract_macros_from_template(macro_template, env, ctx)
+            )
+        return macro_ctx
+
+    @staticmethod
+    def _iter_macro_files(path: List[str]) -> Iterator[str]:
+        """Iterate through the macro files in a path."""
         for path_entry in path:
             # Does it exist? It should as this check was done on config load.
             if not os.path.exists(path_entry):
                 raise ValueError(f"Path does not exist: {path_entry}")
 
             if os.path.isfile(path_entry):
-                # It's a file. Extract macros from it.
-                with open(path_entry) as opened_file:
-                    template = opened_file.read()
-                # Update the context with macros from the file.
-                try:
-                    macro_ctx.update(
-                        cls._extract_macros_from_template(template, env=env, ctx=ctx)
-                    )
-                except TemplateSyntaxError as err:
-                    raise SQLTemplaterError(
-                        f"Error in Jinja macro file {os.path.relpath(path_entry)}: "
-                        f"{err.message}",
-                        line_no=err.lineno,
-                        line_pos=1,
-                    ) from err
+                yield path_entry
             else:
-                # It's a directory. Iterate through files in it and extract from them.
+                # It's a directory. Iterate through the files in it.
                 for dirpath, _, files in os.walk(path_entry):
                     for fname in files:
                         if fname.endswith(".sql"):
-                            macro_ctx.update(
-                                cls._extract_macros_from_path(
-                                    [os.path.join(dirpath, fname)], env=env, ctx=ctx
-                                )
-                            )
-        return macro_ctx
+                            yield os.path.join(dirpath, fname)
 
-    def _extract_macros_from_config(self, config, env, ctx):
-        """Take a config and load any macros from it."""
-        if config:
-            # This is now a nested section
-            loaded_context = (
-                config.get_section((self.templater_selector, self.name, "macros")) or {}
-            )
-        else:  # pragma: no cover TODO?
-            loaded_context = {}
-
-        # Iterate to load macros
-        macro_ctx = {}
-        for value in loaded_context.values():
-            macro_ctx.update(
-                self._extract_macros_from_template(value, env=env, ctx=ctx)
-            )
-        return macro_ctx
+    @classmethod
+    def _compile_macros_from_path(
+        cls, path: List[str], env: Environment
+    ) -> List[CodeType]:
+        """Take a path and compile the macro files in it."""
+        macro_templates = []
+        for macro_file in cls._iter_macro_files(path):
+            with open(macro_file) as opened_file:
+                template = opened_file.read()
+            try:
+                macro_templates.append(env.compile(template))
+            except TemplateSyntaxError as err:
+                raise SQLTemplaterError(
+                    f"Error in Jinja macro file {os.path.relpath(macro_file)}: "
+                    f"{err.message}",
+                    line_no=err.lineno,
+                    line_pos=1,
+                ) from err
+        return macro_templates
+
+    def _compile_macros_from_config(
+        self, config: FluffConfig, env: Environment
+    ) -> List[CodeType]:
+        """Take a config and compile any macros from it."""
+        # This is now a nested section
+        loaded_context = (
+            config.get_section((self.templater_selector, self.name, "macros")) or {}
+        )
+        return [env.compile(value) for value in loaded_context.values()]
 
-    def _extract_libraries_from_config(self, config):
+    def _get_library_path(self, config: FluffConfig) -> Optional[str]:
         # If a more global library_path is set, let that take precedence.
-        library_path = config.get("library_path") or config.get_section(
+        return config.get("library_path") or config.get_section(
             (self.templater_selector, self.name, "library_path")
         )
+
+    def _extract_libraries_from_config(self, config):
+        library_path = self._get_library_path(config)
         if not library_path:
             return {}
 
@@ -299,20 +413,94 @@ class JinjaTemplater(PythonTemplater):
             )
         return False
 
+    def _environment_key(self, config: FluffConfig) -> Hashable:
+        """The key of the environment for a config.
+
+        This covers everything the environment, libraries and macros are
+        loaded from, except the content of the files (see
+        `_environment_file_signature()`). The context isn't part of it,
+        because that's built for each file.
+        """
+        section = dict(config.get_section((self.templater_selector, self.name)) or {})
+        section.pop("context", None)
+        return (
+            type(self),
+            _freeze_section(section),
+            config.get("library_path"),
+            "templating" in config.get("ignore"),
+        )
+
+    def _environment_file_signature(self, config: FluffConfig) -> FileSignature:
+        """The files the environment for a config is loaded from."""
+        paths = list(self._iter_macro_files(self._get_macros_path(config) or []))
+        library_path = self._get_library_path(config)
+        if library_path and os.path.isdir(library_path):
+            for dirpath, _, files in os.walk(library_path):
+                paths.extend(
+                    os.path.join(dirpath, fname)
+                    for fname in files
+                    if fname.endswith(".py")
+                )
+        signature = []
+        for path in paths:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _load_environment(
+        self,
+        env: Environment,
+        config: FluffConfig,
+        file_signature: FileSignature = (),
+    ) -> LoadedEnvironment:
+        """Load the libraries and macros of a config into an environment."""
+        libraries = self._extract_libraries_from_config(config=config)
+        if libraries.get("SQLFLUFF_JINJA_FILTERS"):
+            env.filters.update(libraries.get("SQLFLUFF_JINJA_FILTERS"))
+        macros_path = self._get_macros_path(config)
+        return LoadedEnvironment(
+            env=env,
+            libraries=libraries,
+            path_macros=(
+                self._compile_macros_from_path(macros_path, env) if macros_path else []
+            ),
+            config_macros=self._compile_macros_from_config(config, env),
+            file_signature=file_signature,
+        )
+
+    def get_environment(self, config: FluffConfig) -> LoadedEnvironment:
+        """Get the jinja environment for a config, with its libraries and macros.
+
+        These are loaded once per config (and again if any of the files they
+        were loaded from change), and shared between files.
+        """
+        key = self._environment_key(config)
+        file_signature = self._environment_file_signature(config)
+        loaded = jinja_environment_cache.get(key, file_signature)
+        if loaded is None:
+            loaded = self._load_environment(
+                self._get_jinja_env(config), config, file_signature
+            )
+            jinja_environment_cache.put(key, loaded)
+        return loaded
+
     def get_context(self, fname=None, config=None, **kw) -> Dict:
-        """Get the templating context from the config."""
+        """Get the templating context from the config.
+
+        If a `loaded_env` is passed, its libraries and macros are used,
+        otherwise they're loaded into `env`.
+        """
         # Load the context
         env = kw.pop("env")
+        loaded_env = kw.pop("loaded_env", None)
         live_context = super().get_context(fname=fname, config=config)
         # Apply dbt builtin functions if we're allowed.
         if config:
+            if loaded_env is None:
+                loaded_env = self._load_environment(env, config)
             # first make libraries available in the context
             # so they can be used by the macros too
-            libraries = self._extract_libraries_from_config(config=config)
-            live_context.update(libraries)
-
-            if libraries.get("SQLFLUFF_JINJA_FILTERS"):
-                env.filters.update(libraries.get("SQLFLUFF_JINJA_FILTERS"))
+            live_context.update(loaded_env.libraries)
 
             if self._apply_dbt_builtins(config):
                 # This feels a bit wrong defining these here, they should probably
@@ -324,21 +512,14 @@ class JinjaTemplater(PythonTemplater):
                     if name not in live_context:
                         live_context[name] = dbt_builtins[name]
 
-        # Load macros from path (if applicable)
-        if config:
-            macros_path = self._get_macros_path(config)
-            if macros_path:
-                live_context.update(
-                    self._extract_macros_from_path(
-                        macros_path, env=env, ctx=live_context
-                    )
-                )
-
+            # Load macros from path (if applicable). The macros are bound to
+            # the context of this file, so they're extracted for each file.
+            live_context.update(
+                self._extract_macros(loaded_env.path_macros, env, live_context)
+            )
             # Load config macros, these will take precedence over macros from the path
             live_context.update(
-                self._extract_macros_from_config(
-                    config=config, env=env, ctx=live_context
-                )
+                self._extract_macros(loaded_env.config_macros, env, live_context)
             )
 
         return live_context
@@ -348,8 +529,15 @@ class JinjaTemplater(PythonTemplater):
     ) -> Tuple[Environment, dict, Callable[[str], str]]:
         """Builds and returns objects needed to create and run templates."""
         # Load the context
-        env = self._get_jinja_env(config)
-        live_context = self.get_context(fname=fname, config=config, env=env)
+        if config:
+            loaded_env = self.get_environment(config)
+            env = loaded_env.env
+            live_context = self.get_context(
+                fname=fname, config=config, env=env, loaded_env=loaded_env
+            )
+        else:
+            env = self._get_jinja_env(config)
+            live_context = self.get_context(fname=fname, config=config, env=env)
 
         def render_func(in_str: str) -> str:
             """Used by JinjaTracer to instantiate templates.
@@ -523,13 +711,19 @@ class JinjaTemplater(PythonTemplater):
     ) -> Tuple[List[RawFileSlice], List[TemplatedFileSlice], str]:
         """Slice the file to determine regions where we can fix."""
         # The JinjaTracer slicing algorithm is more robust, but it requires
-        # us to create and render a second template (not raw_str).
+        # us to create and render a second template (not raw_str). Where
+        # possible, the output is reconstructed from that render rather than
+        # rendering raw_str as well.
 
         templater_logger.info("Slicing File Template")
         templater_logger.debug("    Raw String: %r", raw_str[:80])
-        analyzer = JinjaAnalyzer(raw_str, self._get_jinja_env())
-        tracer = analyzer.analyze(render_func)
-        trace = tracer.trace(append_to_templated=kwargs.pop("append_to_templated", ""))
+        tracer = jinja_analysis_cache.analyze(
+            raw_str, self._get_jinja_env(), render_func
+        )
+        trace = tracer.trace(
+            append_to_templated=kwargs.pop("append_to_templated", ""),
+            single_render=self.single_render_tracing,
+        )
         return trace.raw_sliced, trace.sliced_file, trace.templated_str
 
 
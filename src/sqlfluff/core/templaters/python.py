@@ -1,6 +1,7 @@
 """Defines the templaters."""
 
 import ast
+from bisect import bisect_left
 from string import Formatter
 from typing import (
     Any,
@@ -16,7 +17,7 @@ from typing import (
 
 from sqlfluff.core.errors import SQLTemplaterError
 from sqlfluff.core.slice_helpers import offset_slice, zero_slice
-from sqlfluff.core.string_helpers import findall
+from sqlfluff.core.string_helpers import findall, findall_substrings
 from sqlfluff.core.templaters.base import (
     RawFileSlice,
     RawTemplater,
@@ -168,6 +169,9 @@ class PythonTemplater(RawTemplater):
     """
 
     name = "python"
+    # The number of distinct literals above which their occurrences are
+    # found in a single scan of the string (rather than a search for each).
+    min_substrings_to_index = 1000
 
     def __init__(self, override_context=None, **kwargs) -> None:
         self.default_context = dict(test_value="__test__")
@@ -399,9 +403,16 @@ class PythonTemplater(RawTemplater):
     def _substring_occurrences(
         cls, in_str: str, substrings: Iterable[str]
     ) -> Dict[str, List[int]]:
-        """Find every occurrence of the given substrings."""
+        """Find every occurrence of the given substrings.
+
+        With many substrings, scanning the string once for all of them
+        is faster than searching it for each in turn.
+        """
+        unique_substrings = dict.fromkeys(substrings)
+        if len(unique_substrings) >= cls.min_substrings_to_index:
+            return findall_substrings(unique_substrings, in_str)
         occurrences = {}
-        for substring in substrings:
+        for substring in unique_substrings:
             occurrences[substring] = list(findall(substring, in_str))
         return occurrences
 
@@ -478,36 +489,36 @@ class PythonTemplater(RawTemplater):
         are more likely to the the anchors.
         """
         # Calculate invariants
-        invariants = [
+        candidates = [
             literal
             for literal in literals
             if len(raw_occurrences[literal]) == 1
             and len(templated_occurrences[literal]) == 1
         ]
         # Work through the invariants and make sure they appear
-        # in order.
-        for linv in sorted(invariants, key=len, reverse=True):
-            # Any invariants which have templated positions, relative
-            # to source positions, which aren't in order, should be
-            # ignored.
-
-            # Is this one still relevant?
-            if linv not in invariants:
-                continue  # pragma: no cover
-
-            source_pos, templ_pos = raw_occurrences[linv], templated_occurrences[linv]
-            # Copy the list before iterating because we're going to edit it.
-            for tinv in invariants.copy():
-                if tinv != linv:
-                    src_dir = source_pos > raw_occurrences[tinv]
-                    tmp_dir = templ_pos > templated_occurrences[tinv]
-                    # If it's not in the same direction in the source and template
-                    # remove it.
-                    if src_dir != tmp_dir:  # pragma: no cover
-                        templater_logger.debug(
-                            "          Invariant found out of order: %r", tinv
-                        )
-                        invariants.remove(tinv)
+        # in order. Any invariants which have templated positions, relative
+        # to source positions, which aren't in order with a longer one,
+        # should be ignored.
+        invariants = set()
+        # The source and templated positions of the invariants we've kept,
+        # sorted by source position. Because they're in order, an invariant
+        # is in order with all of them if it's in order with its neighbours.
+        source_positions: List[int] = []
+        templ_positions: List[int] = []
+        for linv in sorted(candidates, key=len, reverse=True):
+            source_pos = raw_occurrences[linv][0]
+            templ_pos = templated_occurrences[linv][0]
+            idx = bisect_left(source_positions, source_pos)
+            if (idx > 0 and templ_positions[idx - 1] > templ_pos) or (
+                idx < len(source_positions) and templ_positions[idx] < templ_pos
+            ):  # pragma: no cover
+                templater_logger.debug(
+                    "          Invariant found out of order: %r", linv
+                )
+                continue
+            invariants.add(linv)
+            source_positions.insert(idx, source_pos)
+            templ_positions.insert(idx, templ_pos)
 
         # Set up some buffers
         buffer: List[RawFileSlice] = []
@@ -570,15 +581,14 @@ class PythonTemplater(RawTemplater):
         file_slice: slice, occurrences: Dict[str, List[int]]
     ) -> Dict[str, List[int]]:
         """Filter a dict of occurrences to just those within a slice."""
-        filtered = {
-            key: [
-                pos
-                for pos in occurrences[key]
-                if pos >= file_slice.start and pos < file_slice.stop
-            ]
-            for key in occurrences.keys()
-        }
-        return {key: filtered[key] for key in filtered.keys() if filtered[key]}
+        filtered = {}
+        for key, positions in occurrences.items():
+            # The positions are sorted, so find those within the slice.
+            start = bisect_left(positions, file_slice.start)
+            stop = bisect_left(positions, file_slice.stop, start)
+            if stop > start:
+                filtered[key] = positions[start:stop]
+        return filtered
 
     @staticmethod
     def _coalesce_types(elems: List[RawFileSlice]) -> str:
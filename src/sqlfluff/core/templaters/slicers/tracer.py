@@ -6,7 +6,9 @@ This is a newer slicing algorithm that handles cases heuristic.py does not.
 # Import annotations for py 3.7 to allow `regex.Match[str]`
 from __future__ import annotations
 
+import hashlib
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union, cast
 
@@ -51,6 +53,7 @@ class JinjaTracer:
         raw_slice_info: Dict[RawFileSlice, RawSliceInfo],
         sliced_file: List[TemplatedFileSlice],
         render_func: Callable[[str], str],
+        literals_transformed: bool = False,
     ):
         # Input
         self.raw_str = raw_str
@@ -58,13 +61,32 @@ class JinjaTracer:
         self.raw_slice_info = raw_slice_info
         self.sliced_file = sliced_file
         self.render_func = render_func
+        # Whether the template may transform its literals (e.g. with
+        # {% filter %}), in which case the output can't be reconstructed
+        # from the trace.
+        self.literals_transformed = literals_transformed
 
         # Internal bookkeeping
         self.program_counter: int = 0
         self.source_idx: int = 0
-
-    def trace(self, append_to_templated: str = "") -> JinjaTrace:
-        """Executes raw_str. Returns template output and trace."""
+        self._slice_indices: Dict[str, int] = {}
+
+    def trace(
+        self, append_to_templated: str = "", single_render: bool = False
+    ) -> JinjaTrace:
+        """Executes raw_str. Returns template output and trace.
+
+        Args:
+            append_to_templated (:obj:`str`): A string to append to the
+                template output.
+            single_render (:obj:`bool`): If True, reconstruct the template
+                output from the traced render (by replacing the markers of
+                each literal with the literal itself) rather than rendering
+                raw_str again. If that isn't possible (e.g. because the
+                template transforms its literals), raw_str is rendered
+                anyway. This assumes the render_func preserves trailing
+                newlines, which the traced render can't strip.
+        """
         trace_template_str = "".join(
             cast(str, self.raw_slice_info[rs].alternate_code)
             if self.raw_slice_info[rs].alternate_code is not None
@@ -76,6 +98,17 @@ class JinjaTracer:
         trace_entries: List[regex.Match[str]] = list(
             regex.finditer(r"\0", trace_template_output)
         )
+        # The parts of the template output, if we're reconstructing it. Any
+        # output which isn't attributed to a slice (i.e. before the first
+        # entry, or after the marker of a literal) means we can't.
+        templated_parts: Optional[List[str]] = None
+        if (
+            single_render
+            and not self.literals_transformed
+            and trace_entries
+            and trace_entries[0].start() == 0
+        ):
+            templated_parts = []
         # If the file has no templated entries, we should just iterate
         # through the raw slices to add all the placeholders.
         if not trace_entries:
@@ -106,6 +139,15 @@ class JinjaTracer:
                 alt_id, slice_length = m_id.group(0), len(p[len(m_id.group(0)) + 1 :])
 
             target_slice_idx = self.find_slice_index(alt_id)
+            if templated_parts is not None:
+                if not m_id.group(3):
+                    templated_parts.append(p[len(m_id.group(0)) + 1 :])
+                elif len(p) == len(m_id.group(0)):
+                    templated_parts.append(
+                        self.raw_sliced[target_slice_idx].raw[:slice_length]
+                    )
+                else:
+                    templated_parts = None
             target_inside_block = self.raw_slice_info[
                 self.raw_sliced[target_slice_idx]
             ].inside_block
@@ -123,7 +165,10 @@ class JinjaTracer:
         # 'append_to_templated' gets the default value of "", empty string.)
         # For more detail, see the comments near the call to slice_file() in
         # plugins/sqlfluff-templater-dbt/sqlfluff_templater_dbt/templater.py.
-        templated_str = self.render_func(self.raw_str) + append_to_templated
+        if templated_parts is not None:
+            templated_str = "".join(templated_parts) + append_to_templated
+        else:
+            templated_str = self.render_func(self.raw_str) + append_to_templated
         return JinjaTrace(templated_str, self.raw_sliced, self.sliced_file)
 
     def find_slice_index(self, slice_identifier: Union[int, str]) -> int:
@@ -131,16 +176,21 @@ class JinjaTracer:
 
         A slice identifier is a string like 00000000000000000000000000000002.
         """
-        raw_slices_search_result = [
-            idx
-            for idx, rs in enumerate(self.raw_sliced)
-            if self.raw_slice_info[rs].unique_alternate_id == slice_identifier
-        ]
-        if len(raw_slices_search_result) != 1:
+        if not self._slice_indices:
+            # Index the slices by identifier on first use.
+            for idx, rs in enumerate(self.raw_sliced):
+                alternate_id = self.raw_slice_info[rs].unique_alternate_id
+                if alternate_id is not None:
+                    # Identifiers should be unique, so mark any duplicates.
+                    self._slice_indices[alternate_id] = (
+                        -1 if alternate_id in self._slice_indices else idx
+                    )
+        idx = self._slice_indices.get(str(slice_identifier), -1)
+        if idx < 0:
             raise ValueError(  # pragma: no cover
                 f"Internal error. Unable to locate slice for {slice_identifier}."
             )
-        return raw_slices_search_result[0]
+        return idx
 
     def move_to_slice(self, target_slice_idx: int, target_slice_length: int) -> None:
         """Given a template location, walk execution to that point."""
@@ -218,6 +268,8 @@ class JinjaAnalyzer:
         # {% set %} or {% macro %} or {% call %}
         self.inside_set_macro_or_call: bool = False
         self.inside_block = False  # {% block %}
+        # Whether there's a {% filter %} block, which transforms its literals.
+        self.literals_transformed = False
         self.stack: List[int] = []
         self.idx_raw: int = 0
 
@@ -399,6 +451,8 @@ class JinjaAnalyzer:
                         block_type, block_subtype = self.extract_block_type(
                             tag_contents[0], block_subtype
                         )
+                        if block_type == "block_start" and tag_contents[0] == "filter":
+                            self.literals_transformed = True
                     if block_type == "templated" and tag_contents:
                         assert m_open and m_close
                         raw_slice_info = self.track_templated(
@@ -475,6 +529,7 @@ class JinjaAnalyzer:
             self.raw_slice_info,
             self.sliced_file,
             render_func,
+            self.literals_transformed,
         )
 
     def track_templated(
@@ -669,3 +724,88 @@ class JinjaAnalyzer:
         )
         self.raw_slice_info[self.raw_sliced[-1]] = self.slice_info_for_literal(0)
         self.idx_raw += num_chars_skipped
+
+
+class JinjaAnalysisCache:
+    """A bounded LRU cache of the analysis of templates, by source hash.
+
+    The analysis of a template only depends on its source and the syntax
+    of the environment, so it's shared between renders of the same
+    template (e.g. identical files, or the same file with different
+    contexts).
+
+    Args:
+        max_size (:obj:`int`): The maximum number of templates to hold.
+            The least recently used templates are evicted beyond this.
+    """
+
+    def __init__(self, max_size: int = 1000) -> None:
+        self.max_size = max_size
+        self._analyses: "OrderedDict[Tuple[str, ...], JinjaAnalyzer]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._analyses)
+
+    @staticmethod
+    def key_for(raw_str: str, env: Environment) -> Tuple[str, ...]:
+        """Generate a key for a template source in an environment."""
+        return (
+            hashlib.sha1(raw_str.encode("utf-8", "surrogatepass")).hexdigest(),
+            env.block_start_string,
+            env.block_end_string,
+            env.variable_start_string,
+            env.variable_end_string,
+            env.comment_start_string,
+            env.comment_end_string,
+            *sorted(env.extensions),
+        )
+
+    def analyze(
+        self, raw_str: str, env: Environment, render_func: Callable[[str], str]
+    ) -> JinjaTracer:
+        """Analyze a template, or reuse its analysis, ready for tracing."""
+        key = self.key_for(raw_str, env)
+        analyzer = self._analyses.get(key)
+        if analyzer is None:
+            self.misses += 1
+            analyzer = JinjaAnalyzer(raw_str, env)
+            analyzer.analyze(render_func)
+            self._analyses[key] = analyzer
+            while len(self._analyses) > self.max_size:
+                self._analyses.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._analyses.move_to_end(key)
+            self.hits += 1
+        # The tracer only appends to the sliced file, so everything else
+        # can be shared, but copy the list of slices as it's returned.
+        return JinjaTracer(
+            analyzer.raw_str,
+            list(analyzer.raw_sliced),
+            analyzer.raw_slice_info,
+            [],
+            render_func,
+            analyzer.literals_transformed,
+        )
+
+    def clear(self) -> None:
+        """Drop all the analyses."""
+        self._analyses.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Return the hit and miss counts for the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._analyses),
+            "hit ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# The cache is shared between all files templated by this process.
+jinja_analysis_cache = JinjaAnalysisCache()
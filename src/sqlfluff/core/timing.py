@@ -16,6 +16,12 @@ class TimingSummary:
         self._timings.append(timing_dict)
         if not self.steps:
             self.steps = list(timing_dict.keys())
+        else:
+            # Not every file necessarily runs every step (e.g. if the
+            # result was fetched from the cache), so add any new ones.
+            for step in timing_dict.keys():
+                if step not in self.steps:
+                    self.steps.append(step)
 
     def summary(self) -> Dict[str, Dict[str, float]]:
         """Generate a summary for display."""
@@ -106,6 +106,9 @@ tsql_dialect.sets("bare_functions").update(
     ["system_user", "session_user", "current_user"]
 )
 
+# Files are split into batches by GO, rather than into statements.
+tsql_dialect.sets("batch_separators").update(["GO"])
+
 tsql_dialect.sets("sqlcmd_operators").clear()
 tsql_dialect.sets("sqlcmd_operators").update(["r", "setvar"])
 
@@ -2,7 +2,7 @@
 
 import logging
 from dataclasses import dataclass
-from typing import FrozenSet, List, Sequence, Tuple, Type, Dict
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple, Type
 
 from sqlfluff.core.parser import BaseSegment
 from sqlfluff.core.parser.segments.base import PathStep
@@ -51,6 +51,10 @@ class StackPosition:
         return cls(path_step.idx, path_step.len, cls._stack_pos_interpreter(path_step))
 
 
+# The hash, class types and position of a step in a stack.
+_StepInfo = Tuple[int, FrozenSet[str], StackPosition]
+
+
 @dataclass(frozen=True)
 class DepthInfo:
     """An object to hold the depth information for a specific raw segment."""
@@ -64,18 +68,38 @@ class DepthInfo:
 
     @classmethod
     def from_raw_and_stack(
-        cls, raw: RawSegment, stack: Sequence[PathStep]
+        cls,
+        raw: RawSegment,
+        stack: Sequence[PathStep],
+        step_cache: Optional[Dict[int, _StepInfo]] = None,
     ) -> "DepthInfo":
-        """Construct from a raw and its stack."""
-        stack_hashes = tuple(hash(ps.segment) for ps in stack)
+        """Construct from a raw and its stack.
+
+        The stacks of the raws within a segment share most of their
+        steps, so when constructing many at once, pass the same
+        `step_cache` dict so that each step is only interpreted once.
+        The steps must stay alive as long as the cache is in use,
+        because it's keyed on their ids.
+        """
+        if step_cache is None:
+            step_cache = {}
+        steps = []
+        for ps in stack:
+            step = step_cache.get(id(ps))
+            if step is None:
+                step = step_cache[id(ps)] = (
+                    hash(ps.segment),
+                    frozenset(ps.segment.class_types),
+                    StackPosition.from_path_step(ps),
+                )
+            steps.append(step)
+        stack_hashes = tuple(step[0] for step in steps)
         return cls(
             stack_depth=len(stack),
             stack_hashes=stack_hashes,
             stack_hash_set=frozenset(stack_hashes),
-            stack_class_types=tuple(frozenset(ps.segment.class_types) for ps in stack),
-            stack_positions={
-                hash(ps.segment): StackPosition.from_path_step(ps) for ps in stack
-            },
+            stack_class_types=tuple(step[1] for step in steps),
+            stack_positions={step[0]: step[2] for step in steps},
         )
 
     def common_with(self, other: "DepthInfo") -> Tuple[int, ...]:
@@ -125,9 +149,12 @@ class DepthMap:
         # TODO: decide whether we need the raw segments?
         # self.raw_segments = []
         self.depth_info = {}
+        step_cache: Dict[int, _StepInfo] = {}
         for raw, stack in raws_with_stack:
             # self.raw_segments.append(raw)
-            self.depth_info[raw.uuid] = DepthInfo.from_raw_and_stack(raw, stack)
+            self.depth_info[raw.uuid] = DepthInfo.from_raw_and_stack(
+                raw, stack, step_cache
+            )
 
     @classmethod
     def from_parent(cls: Type["DepthMap"], parent: BaseSegment) -> "DepthMap":
@@ -2,7 +2,7 @@
 
 from itertools import chain
 import logging
-from typing import Iterator, List, Optional, Sequence, Tuple, cast, Type
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, cast, Type
 from sqlfluff.core.config import FluffConfig
 
 from sqlfluff.core.parser import BaseSegment, RawSegment
@@ -30,6 +30,51 @@ from sqlfluff.utils.reflow.helpers import fixes_from_results
 reflow_logger = logging.getLogger("sqlfluff.rules.reflow")
 
 
+class _RootAnalysis:
+    """The reflow analysis of a whole tree, shared between rules.
+
+    Several rules (e.g. LT01, LT02 & LT05) build a sequence for the whole
+    file, and others build one around each of their targets, all of which
+    need the depth of the raw segments in the file. Until a fix changes
+    the tree, that's the same for every rule, so it's worked out once and
+    kept in the `cache` of the type index of the tree (which the linter
+    builds for each version of the tree), and so dropped along with it.
+
+    NOTE: This doesn't hold any references to segments, because the
+    segments hold a reference to the index.
+    """
+
+    def __init__(self, root_segment: BaseSegment) -> None:
+        self.depth_map = DepthMap.from_parent(root_segment)
+        # The position of each raw segment within the root, by uuid.
+        self.raw_positions: Dict[int, int] = {
+            raw.uuid: idx for idx, raw in enumerate(root_segment.raw_segments)
+        }
+        # The last config used, and the reflow config from it.
+        self._config: Optional[FluffConfig] = None
+        self._reflow_config: Optional[ReflowConfig] = None
+
+    @classmethod
+    def from_root(cls, root_segment: BaseSegment) -> Optional["_RootAnalysis"]:
+        """Get the analysis of a tree, if the root of the tree is indexed."""
+        entry = root_segment.get_type_index()
+        if not entry or entry[1] != 0:
+            return None
+        cache = entry[0].cache
+        analysis = cache.get("reflow")
+        if analysis is None:
+            analysis = cache["reflow"] = cls(root_segment)
+        return analysis
+
+    def reflow_config(self, config: FluffConfig) -> ReflowConfig:
+        """Get the reflow config from a config (usually the same one)."""
+        if self._config is not config or self._reflow_config is None:
+            reflow_config = ReflowConfig.from_fluff_config(config)
+            self._config, self._reflow_config = config, reflow_config
+            return reflow_config
+        return self._reflow_config
+
+
 class ReflowSequence:
     """Class for keeping track of elements in a reflow operation.
 
@@ -188,8 +233,18 @@ class ReflowSequence:
         a depth map (for example because it has access to a common root
         segment for all the content), it should do that instead and pass
         it in.
+
+        If the root segment is the root of an indexed tree (as it is
+        while linting), the depth map and reflow config are shared with
+        any other sequences from the same tree.
         """
-        reflow_config = ReflowConfig.from_fluff_config(config)
+        analysis = _RootAnalysis.from_root(root_segment)
+        if analysis:
+            reflow_config = analysis.reflow_config(config)
+            if depth_map is None:
+                depth_map = analysis.depth_map
+        else:
+            reflow_config = ReflowConfig.from_fluff_config(config)
         if depth_map is None:
             depth_map = DepthMap.from_raws_and_root(segments, root_segment)
         return cls(
@@ -217,12 +272,15 @@ class ReflowSequence:
             config (:obj:`FluffConfig`): A config object from which
                 to load the spacing behaviours of different segments.
         """
+        analysis = _RootAnalysis.from_root(root_segment)
         return cls.from_raw_segments(
             root_segment.raw_segments,
             root_segment,
             config=config,
             # This is the efficient route. We use it here because we can.
-            depth_map=DepthMap.from_parent(root_segment),
+            depth_map=(
+                analysis.depth_map if analysis else DepthMap.from_parent(root_segment)
+            ),
         )
 
     @classmethod
@@ -264,8 +322,13 @@ class ReflowSequence:
 
         target_raws = target_segment.raw_segments
         assert target_raws
-        pre_idx = all_raws.index(target_raws[0])
-        post_idx = all_raws.index(target_raws[-1]) + 1
+        analysis = _RootAnalysis.from_root(root_segment)
+        if analysis:
+            pre_idx = analysis.raw_positions[target_raws[0].uuid]
+            post_idx = analysis.raw_positions[target_raws[-1].uuid] + 1
+        else:
+            pre_idx = all_raws.index(target_raws[0])
+            post_idx = all_raws.index(target_raws[-1]) + 1
         initial_idx = (pre_idx, post_idx)
         if sides in ("both", "before"):
             # Catch at least the previous segment
@@ -467,6 +467,59 @@ def test__cli__command_lint_parse(command):
     invoke_assert_code(args=command)
 
 
+@pytest.mark.parametrize("processes", [1, 2])
+def test__cli__command_lint_profile_rules(processes, tmp_path):
+    """Check the rule profile is written, merging files across processes."""
+    profile_path = str(tmp_path / "profile.json")
+    invoke_assert_code(
+        ret_code=1,
+        args=[
+            lint,
+            [
+                "test/fixtures/linter/indentation_errors.sql",
+                "test/fixtures/linter/whitespace_errors.sql",
+                "--processes",
+                str(processes),
+                "--profile-rules",
+                profile_path,
+            ],
+        ],
+    )
+    with open(profile_path) as f:
+        profile = json.load(f)
+    assert profile["files"] == 2
+    assert profile["segments"] > 0
+    assert profile["rules"]["LT01"]["evals"] == 2
+    assert profile["rules"]["LT01"]["segment_types"]["file"]["evals"] == 2
+    assert profile["rules"]["LT01"]["violations"] > 0
+    assert profile["rules"]["LT01"]["hot_paths"]
+
+    trace_path = str(tmp_path / "profile.trace.json")
+    invoke_assert_code(
+        ret_code=1,
+        args=[
+            lint,
+            [
+                "test/fixtures/linter/whitespace_errors.sql",
+                "--processes",
+                str(processes),
+                "--profile-rules",
+                trace_path,
+                "--profile-rules-format",
+                "chrome",
+            ],
+        ],
+    )
+    with open(trace_path) as f:
+        trace = json.load(f)
+    assert {event["ph"] for event in trace["traceEvents"]} == {"M", "X"}
+    assert any(
+        event["cat"] == "LT01" and event["name"] == "file"
+        for event in trace["traceEvents"]
+        if event["ph"] == "X"
+    )
+
+
 @pytest.mark.parametrize(
     "command, ret_code",
     [
@@ -623,6 +676,57 @@ def test__cli__command_lint_parse_with_retcode(command, ret_code):
     invoke_assert_code(ret_code=ret_code, args=command)
 
 
+def test__cli__command_lint_cache(tmpdir):
+    """Check the result cache is used and reported in the bench output."""
+    cache_dir = str(tmpdir / "cache")
+    args = [
+        "test/fixtures/linter/indentation_errors.sql",
+        "--cache-dir",
+        cache_dir,
+        "--bench",
+    ]
+    first = invoke_assert_code(ret_code=1, args=[lint, args])
+    assert "=== result cache ===" in first.output
+    assert re.search(r"misses:\s+1", first.output)
+    second = invoke_assert_code(ret_code=1, args=[lint, args])
+    assert re.search(r"hits:\s+1", second.output)
+    # The same violations should be reported either way.
+    assert second.output.split("====")[0] == first.output.split("====")[0]
+    # With caching disabled, there are no cache stats.
+    third = invoke_assert_code(ret_code=1, args=[lint, args + ["--no-cache"]])
+    assert "=== result cache ===" not in third.output
+
+
+def test__cli__command_parse_bench_parse_cache():
+    """Check the parse cache statistics are reported in the bench output."""
+    result = invoke_assert_code(
+        args=[parse, ["-n", "test/fixtures/cli/passing_b.sql", "--bench"]]
+    )
+    assert "=== parse cache ===" in result.output
+    assert re.search(r"hits:\s+\d+", result.output)
+    assert re.search(r"peak size:\s+\d+", result.output)
+
+
+def test__cli__command_parse_trace_file(tmp_path):
+    """Check the parser trace is written in the Chrome trace format."""
+    trace_file = str(tmp_path / "trace.json")
+    invoke_assert_code(
+        args=[
+            parse,
+            ["-n", "test/fixtures/cli/passing_b.sql", "--trace-file", trace_file],
+        ]
+    )
+    with open(trace_file) as f:
+        trace_events = json.load(f)["traceEvents"]
+    assert trace_events[0]["args"] == {"name": "test/fixtures/cli/passing_b.sql"}
+    assert {event["ph"] for event in trace_events} == {"M", "B", "E"}
+    assert {event.get("cat") for event in trace_events} >= {
+        "deeper_match",
+        "longest_trimmed_match",
+        "Sequence",
+    }
+
+
 def test__cli__command_lint_warning_explicit_file_ignored():
     """Check ignoring file works when file is in an ignore directory."""
     runner = CliRunner()
@@ -0,0 +1,145 @@
+"""Tests for the on-disk linting result cache."""
+
+import importlib.util
+import os
+import sys
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.linter.cache import (
+    LintResultCache,
+    config_fingerprint,
+    rule_pack_fingerprint,
+)
+from sqlfluff.core.rules import RulePack
+
+USER_RULE = '''
+from sqlfluff.core.rules import BaseRule, LintResult
+from sqlfluff.core.rules.crawlers import RootOnlyCrawler
+
+
+class Rule_T300(BaseRule):
+    """A user rule."""
+
+    groups = ("all",)
+    crawl_behaviour = RootOnlyCrawler()
+
+    def _eval(self, context):
+        return {result}
+'''
+
+
+def _user_rule_pack(path, monkeypatch):
+    spec = importlib.util.spec_from_file_location("user_rule_t300", str(path))
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "user_rule_t300", module)
+    spec.loader.exec_module(module)
+    return RulePack(
+        rules=[module.Rule_T300(code="T300", description="")], reference_map={}
+    )
+
+
+def _cached_linter(cache_dir, **overrides) -> Linter:
+    return Linter(
+        config=FluffConfig(
+            overrides={"dialect": "ansi", "cache_dir": str(cache_dir), **overrides}
+        )
+    )
+
+
+def test__linter__cache_disabled_by_default():
+    """By default there should be no result cache."""
+    assert Linter(dialect="ansi").result_cache is None
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test__linter__cache_hit_same_result(tmpdir, processes):
+    """Test that cached results match freshly linted ones."""
+    path = "test/fixtures/linter/indentation_errors.sql"
+    first = _cached_linter(tmpdir).lint_paths((path,), processes=processes)
+    assert first.cache_stats == {"hits": 0, "misses": 1, "writes": 1, "evictions": 0}
+
+    second = _cached_linter(tmpdir).lint_paths((path,), processes=processes)
+    assert second.cache_stats == {"hits": 1, "misses": 0, "writes": 0, "evictions": 0}
+    assert second.check_tuples() == first.check_tuples()
+    assert second.check_tuples()
+    # The tree isn't persisted.
+    assert second.paths[0].files[0].tree is None
+
+
+def test__linter__cache_miss_on_config_change(tmpdir):
+    """A change in config should mean a cache miss."""
+    path = "test/fixtures/linter/indentation_errors.sql"
+    _cached_linter(tmpdir).lint_paths((path,))
+    result = _cached_linter(tmpdir, rules="LT01").lint_paths((path,))
+    assert result.cache_stats["hits"] == 0
+    assert result.cache_stats["misses"] == 1
+
+
+def test__linter__cache_not_used_for_fix(tmpdir):
+    """Fixing requires the tree, so the cache shouldn't be used."""
+    path = "test/fixtures/linter/indentation_errors.sql"
+    _cached_linter(tmpdir).lint_paths((path,))
+    result = _cached_linter(tmpdir).lint_paths((path,), fix=True)
+    assert result.cache_stats["hits"] == 0
+    assert result.paths[0].files[0].tree is not None
+
+
+def test__linter__cache_eviction(tmpdir):
+    """Test that the cache is pruned back to its size limit."""
+    result = _cached_linter(tmpdir, cache_byte_limit=1).lint_paths(
+        ("test/fixtures/linter/multiple_files",)
+    )
+    assert result.cache_stats["writes"] == 3
+    assert result.cache_stats["evictions"] == 3
+    assert not any(files for _, _, files in os.walk(str(tmpdir)))
+
+
+def test__config_fingerprint_ignores_presentation():
+    """Presentation only config values shouldn't change the fingerprint."""
+    base = FluffConfig(overrides={"dialect": "ansi"})
+    verbose = FluffConfig(overrides={"dialect": "ansi", "verbose": 2})
+    different = FluffConfig(overrides={"dialect": "postgres"})
+    assert config_fingerprint(base) == config_fingerprint(verbose)
+    assert config_fingerprint(base) != config_fingerprint(different)
+
+
+def test__cache_from_config():
+    """Test the cache is only configured when a directory is set."""
+    assert LintResultCache.from_config(FluffConfig(overrides={"dialect": "ansi"})) is (
+        None
+    )
+    cache = LintResultCache.from_config(
+        FluffConfig(overrides={"dialect": "ansi", "cache_dir": "~/.sqlfluff_cache"})
+    )
+    assert cache
+    assert not cache.cache_dir.startswith("~")
+
+
+def test__rule_pack_fingerprint_changes(tmp_path, monkeypatch):
+    """Editing a rule or upgrading a plugin should change the fingerprint."""
+    path = tmp_path / "user_rule_t300.py"
+    path.write_text(USER_RULE.format(result="None"))
+    fingerprint = rule_pack_fingerprint(_user_rule_pack(path, monkeypatch))
+    assert rule_pack_fingerprint(_user_rule_pack(path, monkeypatch)) == fingerprint
+
+    path.write_text(USER_RULE.format(result="LintResult(context.segment)"))
+    edited = rule_pack_fingerprint(_user_rule_pack(path, monkeypatch))
+    assert edited != fingerprint
+
+    plugin_manager = mock.Mock()
+    plugin_manager.list_plugin_distinfo.return_value = [
+        (None, SimpleNamespace(project_name="sqlfluff-plugin-t300", version="1.0"))
+    ]
+    with mock.patch(
+        "sqlfluff.core.linter.cache.get_plugin_manager", return_value=plugin_manager
+    ):
+        old_plugin = rule_pack_fingerprint(_user_rule_pack(path, monkeypatch))
+        plugin_manager.list_plugin_distinfo.return_value = [
+            (None, SimpleNamespace(project_name="sqlfluff-plugin-t300", version="1.1"))
+        ]
+        new_plugin = rule_pack_fingerprint(_user_rule_pack(path, monkeypatch))
+    assert len({edited, old_plugin, new_plugin}) == 3
@@ -0,0 +1,65 @@
+"""Tests for applying the fixes from several rules together."""
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.linter.fix_batch import FixBatch, fix_span
+from sqlfluff.core.parser import KeywordSegment, NewlineSegment
+from sqlfluff.core.rules import LintFix
+
+
+@pytest.fixture(scope="module")
+def raws():
+    """The raw segments of a simple statement."""
+    parsed = Linter(dialect="ansi").parse_string("select a from b\n")
+    # select, " ", a, " ", from, " ", b, "\n"
+    return [seg for seg in parsed.tree.raw_segments if seg.raw]
+
+
+def test__linter__fix_span(raws):
+    """Test the span of the file each kind of fix touches."""
+    assert fix_span(LintFix.delete(raws[4])) == (9, 13)
+    assert fix_span(LintFix.create_before(raws[4], [NewlineSegment()])) == (9, 9)
+    assert fix_span(LintFix.create_after(raws[4], [NewlineSegment()])) == (13, 13)
+
+
+@pytest.mark.parametrize(
+    "other_fix,conflicts",
+    [
+        # Edits of the same segment.
+        (lambda raws: LintFix.delete(raws[4]), True),
+        # Creations at the same point.
+        (lambda raws: LintFix.create_after(raws[2], [NewlineSegment()]), True),
+        # Creations anchored on an edited segment.
+        (lambda raws: LintFix.create_before(raws[4], [NewlineSegment()]), True),
+        # Edits of adjacent segments.
+        (lambda raws: LintFix.delete(raws[5]), False),
+        (lambda raws: LintFix.replace(raws[2], [KeywordSegment("c")]), False),
+        # Creations elsewhere.
+        (lambda raws: LintFix.create_before(raws[6], [NewlineSegment()]), False),
+    ],
+)
+def test__linter__fix_batch_conflicts(raws, other_fix, conflicts):
+    """Test fixes from a rule which conflict with the batch are refused."""
+    batch = FixBatch()
+    assert not batch
+    assert batch.add(
+        "A",
+        [
+            LintFix.replace(raws[4], [KeywordSegment("FROM")]),
+            LintFix.create_before(raws[3], [NewlineSegment()]),
+        ],
+    )
+    assert batch.add("B", [other_fix(raws)]) is not conflicts
+    assert batch.codes == (["A"] if conflicts else ["A", "B"])
+    assert len(batch.fixes) == (2 if conflicts else 3)
+
+
+def test__linter__fix_batch_linter():
+    """Test fixing with batched fixes gives a clean file."""
+    sql = "SELECT a+b  as x ,c FROM d\nwhere e =1\n"
+    config = FluffConfig(overrides={"dialect": "ansi", "batch_fixes": True})
+    result = Linter(config=config).lint_string(sql, fix=True)
+    fixed, _ = result.fix_string()
+    assert fixed == "SELECT\n    c,\n    a + b AS x\nFROM d\nWHERE e = 1\n"
+    assert not Linter(dialect="ansi").lint_string(fixed).violations
@@ -0,0 +1,112 @@
+"""Tests for incremental re-parsing."""
+
+import glob
+import random
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.linter import TextEdit
+from sqlfluff.core.linter.incremental import reparse_edit
+
+SQL = "select a from b;\nselect c, d from e;\n\n-- comment\nselect f from g;\n"
+
+
+def _summarise(parsed):
+    """Summarise a parsed string, including all positions."""
+    return (
+        parsed.source_str,
+        parsed.tree.stringify() if parsed.tree else None,
+        [
+            (seg.get_type(), seg.raw, seg.pos_marker.source_slice)
+            for seg in parsed.tree.recursive_crawl_all()
+        ]
+        if parsed.tree
+        else None,
+        [(v.desc(), v.line_no, v.line_pos) for v in parsed.violations],
+    )
+
+
+def _assert_same_as_full_parse(linter, sql, edit, incremental=True):
+    """Check re-parsing after an edit gives the same result as a full parse."""
+    reparsed = reparse_edit(linter.parse_string(sql), edit)
+    assert (reparsed is not None) == incremental
+    full = linter.parse_string(edit.apply(sql))
+    if reparsed:
+        assert _summarise(reparsed) == _summarise(full)
+    # The linter method should give the same result either way.
+    assert _summarise(linter.parse_edit(linter.parse_string(sql), edit)) == (
+        _summarise(full)
+    )
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        # Within a statement.
+        TextEdit(25, 26, "cc, x"),
+        # Inserting and deleting.
+        TextEdit(7, 7, "z, "),
+        TextEdit(24, 27, ""),
+        # At the start and end of the file.
+        TextEdit(0, 0, "\n\n"),
+        TextEdit(len(SQL), len(SQL), "select h from i;\n"),
+        # Adding a statement terminator.
+        TextEdit(26, 26, ";\nselect 1"),
+        # Removing a statement terminator, merging two statements.
+        TextEdit(15, 16, " union all"),
+        # Commenting out a terminator, which changes the lexing beyond
+        # the statement.
+        TextEdit(17, 17, "--"),
+        # Replacing everything.
+        TextEdit(0, len(SQL), "select 1"),
+        TextEdit(0, len(SQL), ""),
+    ],
+)
+def test__incremental__reparse(edit):
+    """Test re-parsing gives the same result as a full parse."""
+    _assert_same_as_full_parse(Linter(dialect="ansi"), SQL, edit)
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        # Unparsable results might extend beyond the statement.
+        TextEdit(7, 8, "("),
+        # Templating and inline config affect the whole file.
+        TextEdit(7, 8, "{{ a }}"),
+        TextEdit(34, 34, "-- sqlfluff:dialect:ansi\n"),
+    ],
+)
+def test__incremental__fallback(edit):
+    """Test edits which can't be re-parsed incrementally."""
+    _assert_same_as_full_parse(Linter(dialect="ansi"), SQL, edit, incremental=False)
+
+
+def test__incremental__fallback_templated():
+    """Test templated files are always parsed in full."""
+    sql = "select {{ 'a' }} from b;\nselect c from d;\n"
+    _assert_same_as_full_parse(
+        Linter(dialect="ansi"), sql, TextEdit(31, 32, "e"), incremental=False
+    )
+
+
+@pytest.mark.parametrize("dialect", ["ansi", "postgres", "snowflake"])
+def test__incremental__random_edits(dialect):
+    """Test random edits to the dialect fixtures match a full parse."""
+    linter = Linter(config=FluffConfig(overrides={"dialect": dialect}))
+    rng = random.Random(0)
+    fnames = sorted(glob.glob(f"test/fixtures/dialects/{dialect}/*.sql"))
+    snippets = ["", ";", " ", "\n", "'", "/*", "x", "select 1", "(", ",", "from"]
+    for fname in rng.sample(fnames, 5):
+        with open(fname, encoding="utf8") as f:
+            sql = Linter._normalise_newlines(f.read())
+        for _ in range(5):
+            start = rng.randint(0, len(sql))
+            stop = min(len(sql), start + rng.choice([0, 1, 5]))
+            edit = TextEdit(start, stop, rng.choice(snippets))
+            reparsed = reparse_edit(linter.parse_string(sql), edit)
+            if reparsed:
+                assert _summarise(reparsed) == _summarise(
+                    linter.parse_string(edit.apply(sql))
+                )
@@ -315,6 +315,37 @@ def test__linter__linting_parallel_thread(force_error, monkeypatch):
     all([isinstance(v, SQLLintError) for v in result.get_violations()])
 
 
+def test__linter__linting_worker_pool():
+    """Test that a persistent worker pool can be reused across runs."""
+    paths = (
+        "test/fixtures/linter/comma_errors.sql",
+        "test/fixtures/linter/whitespace_errors.sql",
+    )
+    lntr = Linter(dialect="ansi")
+    expected = sorted(lntr.lint_paths(paths, processes=1).check_tuples())
+    with runner.LintWorkerPool(processes=2) as pool:
+        for _ in range(2):
+            result = lntr.lint_paths(paths, worker_pool=pool)
+            assert sorted(result.check_tuples()) == expected
+
+
+def test__linter__lint_in_worker_context(tmpdir):
+    """Test linting a file using a persisted worker context."""
+    lntr = Linter(dialect="ansi")
+    rendered = lntr.render_file("test/fixtures/linter/comma_errors.sql", lntr.config)
+    rule_pack = lntr.get_rulepack(config=rendered.config)
+    fingerprint = runner.worker_context_fingerprint(rendered.config, lntr)
+    runner.write_worker_context(str(tmpdir), fingerprint, rendered.config, rule_pack)
+    linted_file = runner.lint_in_worker_context(
+        str(tmpdir), fingerprint, rendered._replace(config=None), False
+    )
+    assert fingerprint in runner._worker_contexts
+    assert (
+        linted_file.check_tuples()
+        == lntr.lint_rendered(rendered, rule_pack).check_tuples()
+    )
+
+
 @patch("sqlfluff.core.linter.Linter.lint_rendered")
 def test_lint_path_parallel_wrapper_exception(patched_lint):
     """Tests the error catching behavior of _lint_path_parallel_wrapper().
@@ -376,6 +376,52 @@ def test_linted_file_ignore_masked_violations(
     assert actually_used == expected_used
 
 
+def test_ignore_mask_filtered_one_by_one():
+    """Test filtering violations one by one (as rules do) matches all at once.
+
+    The directives are out of line order, and overlap on several rules.
+    """
+    noqa = [
+        dict(comment="noqa: enable=LT01", line_no=9),
+        dict(comment="noqa: disable=all", line_no=2),
+        dict(comment="noqa: disable=LT01,CP01", line_no=6),
+        dict(comment="noqa: enable=all", line_no=4),
+        dict(comment="noqa: LT01", line_no=7),
+        dict(comment="noqa", line_no=7),
+        dict(comment="noqa: enable=CP01", line_no=12),
+        dict(comment="noqa: CP01", line_no=11),
+    ]
+    violations = [
+        DummyLintError(1),
+        DummyLintError(3, "CP01"),
+        DummyLintError(5),
+        DummyLintError(7),
+        DummyLintError(7, "CP01"),
+        DummyLintError(8, "CP01"),
+        DummyLintError(10),
+        DummyLintError(10, "CP01"),
+    ]
+    results = []
+    for one_by_one in (False, True):
+        ignore_mask = [
+            IgnoreMask._parse_noqa(reference_map=dummy_rule_map, line_pos=0, **c)
+            for c in noqa
+        ]
+        mask = IgnoreMask(ignore_mask)
+        if one_by_one:
+            result = []
+            for v in violations:
+                result += mask.ignore_masked_violations([v])
+        else:
+            result = mask.ignore_masked_violations(violations)
+        results.append((result, [i.used for i in ignore_mask]))
+    assert results[0] == results[1]
+    assert results[0] == (
+        [violations[0], violations[2], violations[6]],
+        [True, True, True, True, True, True, True, False],
+    )
+
+
 def test_linter_noqa():
     """Test "noqa" feature at the higher "Linter" level."""
     lntr = Linter(
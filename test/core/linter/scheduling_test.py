@@ -0,0 +1,157 @@
+"""Tests for the parallel scheduling helpers."""
+
+import os
+
+import pytest
+
+from sqlfluff.core import Linter
+from sqlfluff.core.linter import runner
+from sqlfluff.core.linter.scheduling import (
+    FileCostEstimator,
+    TaskRecord,
+    batch_by_cost,
+    load_timing_history,
+    summarise_utilisation,
+)
+
+
+def test__estimator_orders_by_size(tmpdir):
+    """Without history, larger and more templated files come first."""
+    small = tmpdir.join("small.sql")
+    small.write("select 1\n")
+    large = tmpdir.join("large.sql")
+    large.write("select 1\n" * 100)
+    templated = tmpdir.join("templated.sql")
+    templated.write("{% for i in range(10) %}select {{ i }}{% endfor %}\n" * 5)
+    order, costs = FileCostEstimator().order([str(small), str(large), str(templated)])
+    assert order == [str(templated), str(large), str(small)]
+    assert costs[str(small)] < costs[str(large)]
+
+
+def test__estimator_samples_large_files(tmpdir):
+    """The tag density of large files is extrapolated from their start."""
+    path = tmpdir.join("large.sql")
+    path.write("select {{ i }}\n" * 2000)
+    estimator = FileCostEstimator()
+    size = os.path.getsize(str(path))
+    assert size > estimator.sample_bytes
+    assert estimator._weighted_size(str(path)) == pytest.approx(
+        size + 2000 * estimator.template_tag_weight, rel=0.01
+    )
+
+
+def test__estimator_uses_history(tmpdir):
+    """Timings from a previous run take precedence over file size."""
+    small = tmpdir.join("small.sql")
+    small.write("select 1\n")
+    large = tmpdir.join("large.sql")
+    large.write("select 1\n" * 100)
+    unseen = tmpdir.join("unseen.sql")
+    unseen.write("select 1\n" * 10)
+    estimator = FileCostEstimator({str(small): 2.0, str(large): 0.1})
+    order, costs = estimator.order([str(large), str(unseen), str(small)])
+    assert order.index(str(small)) < order.index(str(large))
+    assert costs[str(small)] == 2.0
+    # The unseen file is estimated using the rate calibrated from history.
+    assert costs[str(unseen)] == pytest.approx(
+        os.path.getsize(str(unseen)) * estimator.seconds_per_byte
+    )
+    assert estimator.seconds_per_byte != FileCostEstimator.default_seconds_per_byte
+
+
+def test__estimator_calibrates_lazily(tmpdir, monkeypatch):
+    """The history is only sampled if a file has no history, and sparingly."""
+    paths = []
+    for idx in range(5):
+        path = tmpdir.join(f"file_{idx}.sql")
+        path.write("select 1\n" * (idx + 1))
+        paths.append(str(path))
+    estimator = FileCostEstimator({path: 1.0 for path in paths[:4]})
+    monkeypatch.setattr(estimator, "calibration_samples", 2)
+    read = []
+    weighted_size = estimator._weighted_size
+    monkeypatch.setattr(
+        estimator,
+        "_weighted_size",
+        lambda fname: read.append(fname) or weighted_size(fname),
+    )
+    # Every file has a history, so nothing is read.
+    estimator.order(paths[2:4])
+    assert read == []
+    # A new file is read, then a sample of the history which
+    # starts with the files in this run.
+    estimator.order([paths[4], paths[3]])
+    assert read == [paths[4], paths[3], paths[0]]
+
+
+@pytest.mark.parametrize(
+    "costs,expected",
+    [
+        # Expensive files go on their own.
+        ({"a": 1.0, "b": 1.0, "c": 1.0}, [["a"], ["b"], ["c"]]),
+        # Cheap files are grouped until they reach the minimum cost.
+        ({"a": 0.5, "b": 0.5, "c": 0.5}, [["a", "b"], ["c"]]),
+        # ...or the maximum batch size.
+        ({"a": 0.0, "b": 0.0, "c": 0.0, "d": 0.0}, [["a", "b", "c"], ["d"]]),
+    ],
+)
+def test__batch_by_cost(costs, expected):
+    """Test that tasks are batched by their estimated cost."""
+    tasks = [(fname, None) for fname in costs]
+    batches = list(batch_by_cost(tasks, costs, min_batch_cost=1.0, max_batch_size=3))
+    assert [[task[0] for task in batch] for batch in batches] == expected
+
+
+def test__summarise_utilisation():
+    """Test the summary of worker utilisation."""
+    records = [
+        TaskRecord("a", 0.0, 4.0),
+        TaskRecord("b", 0.0, 1.0),
+        TaskRecord("b", 1.0, 2.0),
+    ]
+    summary = summarise_utilisation(records, 0.0, 4.0, processes=2)
+    assert summary == {
+        "wall time": 4.0,
+        "tail": 2.0,
+        "mean util": 0.75,
+        "worker 1": 1.0,
+        "worker 2": 0.5,
+    }
+    # An unused worker is idle for the whole run.
+    assert summarise_utilisation(records, 0.0, 4.0, processes=3)["tail"] == 4.0
+    assert summarise_utilisation([], 0.0, 4.0, processes=2) == {}
+
+
+def test__load_timing_history(tmpdir):
+    """Test that persisted timings can be read back as history."""
+    path = "test/fixtures/linter/comma_errors.sql"
+    result = Linter(dialect="ansi").lint_paths((path,))
+    timing_file = str(tmpdir.join("timings.csv"))
+    result.persist_timing_records(timing_file)
+    history = load_timing_history(timing_file)
+    assert list(history) == [os.path.normpath(path)]
+    assert history[os.path.normpath(path)] > 0
+
+
+def test__parallel_runner_scheduling_stats():
+    """Test that a parallel run reports its scheduling statistics."""
+    lntr = Linter(dialect="ansi")
+    paths = [
+        "test/fixtures/linter/comma_errors.sql",
+        "test/fixtures/linter/whitespace_errors.sql",
+        "test/fixtures/linter/indentation_errors.sql",
+    ]
+    thread_runner = runner.MultiThreadRunner(
+        lntr,
+        lntr.config,
+        processes=2,
+        # Make the smallest file look the most expensive.
+        timing_history={paths[0]: 10.0},
+    )
+    # Dispatch each file on its own.
+    thread_runner.max_batch_size = 1
+    linted_files = list(thread_runner.run(paths, fix=False))
+    assert sorted(linted_file.path for linted_file in linted_files) == sorted(paths)
+    stats = thread_runner.scheduling_stats()
+    assert stats["wall time"] > 0
+    assert 0 <= stats["mean util"] <= 1
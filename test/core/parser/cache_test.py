@@ -0,0 +1,64 @@
+"""Tests for the parse cache."""
+
+from sqlfluff.core import Linter
+from sqlfluff.core.parser.cache import ParseCache
+from sqlfluff.core.parser.match_result import MatchResult
+from sqlfluff.core.parser.segments import KeywordSegment
+
+
+def _loc_key(line_no: int, line_pos: int):
+    return ("a", (line_no, line_pos), "raw", 1)
+
+
+def _match():
+    return MatchResult.from_matched((KeywordSegment("a"),))
+
+
+def test__parser__parse_cache_hits_and_misses():
+    """Test that hits and misses are counted."""
+    cache = ParseCache()
+    match = _match()
+    assert cache.get(_loc_key(1, 1), "foo") is None
+    cache.put(_loc_key(1, 1), "foo", match)
+    assert len(cache) == 1
+    assert cache.get(_loc_key(1, 1), "foo") is match
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "peak size": 1}
+
+
+def test__parser__parse_cache_skips_failed_matches():
+    """Test that failed matches don't take up room in the cache."""
+    cache = ParseCache(max_entries=1)
+    match = _match()
+    cache.put(_loc_key(1, 1), "foo", match)
+    cache.put(_loc_key(2, 1), "bar", MatchResult.from_unmatched(()))
+    assert len(cache) == 1
+    assert cache.get(_loc_key(2, 1), "bar") is None
+    # The earlier match wasn't evicted to make room.
+    assert cache.get(_loc_key(1, 1), "foo") is match
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "peak size": 1}
+
+
+def test__parser__parse_cache_evicts_earliest():
+    """Test that a bounded cache evicts the earliest locations first."""
+    cache = ParseCache(max_entries=3)
+    match = _match()
+    for loc_key in (_loc_key(2, 1), _loc_key(1, 5)):
+        for matcher_key in ("foo", "bar"):
+            cache.put(loc_key, matcher_key, match)
+    # Both entries at 1:5 were evicted before those at 2:1.
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 2
+    assert cache.stats()["peak size"] == 3
+    cache.put(_loc_key(3, 1), "foo", match)
+    cache.put(_loc_key(3, 1), "bar", match)
+    # Now the entries at 2:1 are evicted.
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 4
+
+
+def test__parser__parse_cache_stats_in_parse_stats():
+    """Test that the cache statistics are reported in the parse stats."""
+    parsed = Linter(dialect="ansi").parse_string("select a, b from c where d = 1\n")
+    assert parsed.parse_stats["parse_cache_misses"] > 0
+    assert parsed.parse_stats["parse_cache_evictions"] == 0
+    assert parsed.parse_stats["parse_cache_peak_size"] > 0
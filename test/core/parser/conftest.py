@@ -33,3 +33,25 @@ def bracket_segments(generate_test_segments):
     return generate_test_segments(
         ["bar", " \t ", "(", "foo", "    ", ")", "baar", " \t ", "foo"]
     )
+
+
+@pytest.fixture(scope="module")
+def tree_tuples():
+    """Summarise a tree as the type, raw and position of each segment.
+
+    This is a factory function so that it works as a fixture, but when
+    actually used, this will return the inner function.
+    """
+
+    def tree_tuples_func(tree):
+        return [
+            (
+                seg.get_type(),
+                seg.raw,
+                seg.pos_marker.source_slice,
+                seg.pos_marker.working_loc,
+            )
+            for seg in tree.recursive_crawl_all()
+        ]
+
+    return tree_tuples_func
@@ -7,7 +7,12 @@ import pytest
 
 from sqlfluff.core import FluffConfig, SQLLexError
 from sqlfluff.core.parser import CodeSegment, Lexer, NewlineSegment
-from sqlfluff.core.parser.lexer import LexMatch, RegexLexer, StringLexer
+from sqlfluff.core.parser.lexer import (
+    CompiledLexerMatchers,
+    LexMatch,
+    RegexLexer,
+    StringLexer,
+)
 from sqlfluff.core.parser.segments.meta import TemplateSegment
 from sqlfluff.core.templaters import JinjaTemplater, RawFileSlice, TemplatedFile
 from sqlfluff.core.templaters.base import TemplatedFileSlice
@@ -123,6 +128,50 @@ def test__parser__lexer_lex_match(caplog):
         assert res.elements[2].raw == "#..#"
 
 
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "..#..#..#",
+        "$a$..$b$..$a$.#.#",
+        "'quoted''string'...",
+    ],
+)
+def test__parser__lexer_compiled_matchers(raw):
+    """Test the compiled matchers match the same way as lex_match."""
+    matchers = [
+        StringLexer("dot", ".", CodeSegment),
+        # Scoped into the combined regex.
+        RegexLexer("quote", r"(?s)'([^']|'')*'", CodeSegment),
+        # Back references can't be combined, so this is matched alone.
+        RegexLexer("dollar", r"\$(\w*)\$.*?\$\1\$", CodeSegment),
+        # A zero length match, which should be skipped.
+        RegexLexer("empty", r"x*", CodeSegment),
+        RegexLexer("test", r"#[^#]*#", CodeSegment),
+    ]
+    compiled = CompiledLexerMatchers(matchers)
+    assert [matchers for _, matchers in compiled._chunks] == [
+        matchers[:2],
+        matchers[2:3],
+        matchers[3:],
+    ]
+    expected = Lexer.lex_match(raw, matchers)
+    elements, pos = compiled.scan(raw)
+    assert elements == expected.elements
+    assert raw[pos:] == expected.forward_string
+
+
+def test__parser__lexer_match_from_pos():
+    """Test matchers can match from a position without slicing."""
+    string_lexer = StringLexer("dot", ".", CodeSegment)
+    regex_lexer = RegexLexer("test", r"#[^#]*#", CodeSegment)
+    assert string_lexer._match("#..#.", 1).raw == "."
+    assert string_lexer._match("#..#.", 3) is None
+    assert string_lexer.search("#..#.", 3) == (4, 5)
+    assert regex_lexer._match("..#..#..#", 2).raw == "#..#"
+    assert regex_lexer._match("..#..#..#", 1) is None
+    assert regex_lexer.search("..#..#..#", 3) == (5, 9)
+
+
 def test__parser__lexer_fail():
     """Test the how the lexer fails and reports errors."""
     lex = Lexer(config=FluffConfig(overrides={"dialect": "ansi"}))
@@ -1,5 +1,7 @@
 """Tests for PositionMarker."""
 
+import pickle
+
 import pytest
 
 from sqlfluff.core.parser.markers import PositionMarker
@@ -70,3 +72,18 @@ def test_markers__comparison():
     assert all(a_pos <= p for p in all_pos)
     # Check greater than or equal
     assert all(c_pos >= p for p in all_pos)
+
+
+def test_markers__immutable_and_pickle_safe():
+    """Test markers can't be changed, but can be pickled."""
+    templ = TemplatedFile.from_string("foo\nbar")
+    pos = PositionMarker(slice(4, 7), slice(4, 7), templ)
+    with pytest.raises(AttributeError):
+        pos.working_line_no = 3
+    assert pos.source_slice == slice(4, 7)
+    assert pos.templated_slice == slice(4, 7)
+    result = pickle.loads(pickle.dumps(pos))
+    assert result.source_slice == pos.source_slice
+    assert result.templated_slice == pos.templated_slice
+    assert result.working_loc == pos.working_loc == (2, 1)
+    assert result.templated_file.source_str == "foo\nbar"
@@ -6,11 +6,13 @@ NOTE: All of these tests depend somewhat on the KeywordSegment working as planne
 import pytest
 
 from sqlfluff.core.errors import SQLParseError
-from sqlfluff.core.parser import KeywordSegment, StringParser
+from sqlfluff.core.parser import Anything, KeywordSegment, StringParser, TypedParser
 from sqlfluff.core.parser.context import ParseContext
 from sqlfluff.core.parser.match_algorithms import (
+    FirstTokenIndex,
     bracket_sensitive_look_ahead_match,
     look_ahead_match,
+    prune_options,
 )
 
 # NB: All of these tests depend somewhat on the KeywordSegment working as planned
@@ -190,3 +192,22 @@ def test__parser__algorithms__bracket_fail_with_unexpected_end_bracket(
     # Check the trailing foo hasn't been mutated
     assert segs[5].raw == "foo"
     assert not isinstance(segs[5], KeywordSegment)
+
+
+@pytest.mark.parametrize("start", [0, 1, 2, 3, 4])
+def test__parser__algorithms__first_token_index(start, test_segments):
+    """Test that the FirstTokenIndex prunes the same way as prune_options."""
+    options = [
+        StringParser("foo", KeywordSegment),
+        Anything(),
+        StringParser("bar", KeywordSegment),
+        TypedParser("whitespace", KeywordSegment),
+        StringParser("foo", KeywordSegment, type="other"),
+    ]
+    ctx = ParseContext(dialect=None)
+    index = FirstTokenIndex(options, ctx)
+    segments = test_segments[start:]
+    expected = prune_options(options, segments, ctx)
+    assert index.prune(segments) == expected
+    # A second lookup (from the cache) should give the same result.
+    assert index.prune(segments) == expected
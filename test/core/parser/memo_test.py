@@ -0,0 +1,105 @@
+"""Tests for the cross-file statement memo."""
+
+import gc
+import weakref
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.parser import memo
+from sqlfluff.core.parser.memo import StatementMemo, get_statement_memo
+
+
+@pytest.fixture
+def fresh_memo(monkeypatch):
+    """Make sure each test starts with an empty memo."""
+    monkeypatch.setattr(memo, "_statement_memo", None)
+
+
+def _memo_linter(size: int = 100) -> Linter:
+    return Linter(
+        config=FluffConfig(overrides={"dialect": "ansi", "statement_memo_size": size})
+    )
+
+
+def test__parser__statement_memo_disabled_by_default(fresh_memo):
+    """The memo should only be used when configured."""
+    Linter(dialect="ansi").parse_string("select 1;\n")
+    assert memo._statement_memo is None
+    assert get_statement_memo(0) is None
+
+
+def test__parser__statement_memo_reuse(fresh_memo, tree_tuples):
+    """Test that memoised statements match freshly parsed ones."""
+    first = "create table foo (\n    id int not null\n);\ngrant select on foo to bar;\n"
+    # The same statements, at different positions and with different
+    # whitespace and comments.
+    second = (
+        "select 1;\n\n"
+        "grant   select on foo to bar; -- comment\n"
+        "create table foo (\n  id int not null\n);\n"
+    )
+    lntr = _memo_linter()
+    lntr.parse_string(first)
+    parsed = lntr.parse_string(second)
+    assert memo._statement_memo.stats() == {
+        "hits": 2,
+        "misses": 3,
+        "evictions": 0,
+        "size": 3,
+        "hit ratio": 0.4,
+    }
+    expected = Linter(dialect="ansi").parse_string(second)
+    assert tree_tuples(parsed.tree) == tree_tuples(expected.tree)
+    # The rebuilt statements should refer to the new file.
+    templated_file = parsed.tree.pos_marker.templated_file
+    assert all(
+        seg.pos_marker.templated_file is templated_file
+        for seg in parsed.tree.recursive_crawl_all()
+    )
+    # ...and linting should be unaffected.
+    assert (
+        lntr.lint_string(second).check_tuples()
+        == Linter(dialect="ansi").lint_string(second).check_tuples()
+    )
+
+
+def test__parser__statement_memo_releases_files(fresh_memo):
+    """The memo shouldn't keep parsed files in memory."""
+    lntr = _memo_linter()
+    parsed = lntr.parse_string("select a from b;\nselect c from d;\n")
+    templated_file = weakref.ref(parsed.templated_file)
+    tree = weakref.ref(parsed.tree)
+    assert len(memo._statement_memo) == 2
+    assert all(
+        seg.pos_marker is None
+        for statement in memo._statement_memo._memo.values()
+        for seg in statement.recursive_crawl_all()
+    )
+    del parsed
+    gc.collect()
+    assert templated_file() is None
+    assert tree() is None
+    # The memo is still used by later files.
+    lntr.parse_string("select a from b;\n")
+    assert memo._statement_memo.stats()["hits"] == 1
+
+
+def test__parser__statement_memo_templated(fresh_memo):
+    """Statements containing templated sections aren't memoised."""
+    lntr = _memo_linter()
+    lntr.parse_string("select\n{% if true %}1{% endif %};\n")
+    assert memo._statement_memo.stats()["misses"] == 0
+    assert len(memo._statement_memo) == 0
+
+
+def test__parser__statement_memo_eviction(fresh_memo):
+    """Test that the memo is bounded."""
+    lntr = _memo_linter(size=2)
+    lntr.parse_string("select 1;\nselect 2;\nselect 3;\n")
+    stats = memo._statement_memo.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    # Shrinking the memo evicts the least recently used statements.
+    assert len(get_statement_memo(1)) == 1
+    assert isinstance(memo._statement_memo, StatementMemo)
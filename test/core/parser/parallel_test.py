@@ -0,0 +1,209 @@
+"""Tests for parsing large files in parallel."""
+
+import multiprocessing.dummy
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.parser import Lexer, Parser
+from sqlfluff.core.parser.context import ParseContext
+from sqlfluff.core.parser.parallel import (
+    find_split_points,
+    group_chunks,
+    parse_in_parallel,
+)
+from sqlfluff.core.templaters import JinjaTemplater
+
+
+def _lex(sql, dialect="ansi", templater=None):
+    config = FluffConfig(overrides={"dialect": dialect})
+    templated_file, _ = (templater or JinjaTemplater()).process(
+        in_str=sql, fname="<string>", config=config
+    )
+    tokens, _ = Lexer(config=config).lex(templated_file)
+    return config, tuple(tokens)
+
+
+def _chunks(sql, dialect="ansi"):
+    """Split a string into the raw of each chunk which could be parsed."""
+    config, tokens = _lex(sql, dialect)
+    split_points = find_split_points(
+        tokens, config.get("dialect_obj").sets("batch_separators")
+    )
+    return [
+        "".join(seg.raw for seg in tokens[start:stop])
+        for start, stop in zip([0] + split_points, split_points + [len(tokens)])
+    ]
+
+
+@pytest.mark.parametrize(
+    "sql,dialect,chunks",
+    [
+        (
+            "select 1;\nselect 2;\n",
+            "ansi",
+            ["select 1;", "\nselect 2;", "\n"],
+        ),
+        # Runs of delimiters stay together.
+        (";select 1;;\nselect 2", "ansi", [";select 1;;", "\nselect 2"]),
+        # Delimiters within brackets, blocks or CASE aren't top level.
+        (
+            "select (';'); begin select 1; end; select case when a then b end;",
+            "ansi",
+            [
+                "select (';');",
+                " begin select 1; end;",
+                " select case when a then b end;",
+                "",
+            ],
+        ),
+        (
+            "begin transaction; begin if a then b; end if; end; commit;",
+            "ansi",
+            ["begin transaction;", " begin if a then b; end if; end;", " commit;", ""],
+        ),
+        # Nor are those within templated blocks.
+        (
+            "select 1;\n{% for i in [1, 2] %}select {{ i }};\n{% endfor %}select 3;",
+            "ansi",
+            [
+                "select 1;",
+                "\nselect 1;\nselect 2;\nselect 3;",
+                "",
+            ],
+        ),
+        # T-SQL is split into batches.
+        (
+            "select 1;\nselect 2;\nGO\nselect go;\ngo\n",
+            "tsql",
+            ["select 1;\nselect 2;\nGO", "\nselect go;\ngo", "\n"],
+        ),
+    ],
+)
+def test__parser__parallel_split_points(sql, dialect, chunks):
+    """Test splitting files at top level delimiters."""
+    assert _chunks(sql, dialect) == chunks
+
+
+def test__parser__parallel_group_chunks():
+    """Test grouping split points into even chunks."""
+    assert group_chunks([2, 4, 6, 8], 10, 2) == [(0, 6), (6, 10)]
+    assert group_chunks([2, 4, 6, 8], 10, 5) == [
+        (0, 2),
+        (2, 4),
+        (4, 6),
+        (6, 8),
+        (8, 10),
+    ]
+    assert group_chunks([], 10, 5) == [(0, 10)]
+
+
+@pytest.mark.parametrize(
+    "sql,dialect",
+    [
+        (
+            "select a from b;\n\n-- comment\nselect (1 + 2) as c;;\n"
+            "create table d (e int);\nselect f from g\n",
+            "ansi",
+        ),
+        (
+            "select a from b\nGO\ncreate table d (e int);\nselect 1;\nGO\n"
+            "select f from g;\n",
+            "tsql",
+        ),
+    ],
+)
+def test__parser__parallel_parse(sql, dialect, tree_tuples):
+    """Test parsing in chunks gives the same result as a full parse."""
+    config, tokens = _lex(sql, dialect)
+    root_segment = config.get("dialect_obj").get_root_segment()
+    ctx = ParseContext.from_config(config)
+    parsed = parse_in_parallel(
+        root_segment,
+        config,
+        tokens,
+        2,
+        ctx,
+        pool_type=multiprocessing.dummy.Pool,
+    )
+    assert parsed is not None
+    full = root_segment.root_parse(tokens, ParseContext.from_config(config))
+    assert tree_tuples(parsed) == tree_tuples(full)
+    assert ctx.parse_stats["parse_cache_misses"] > 0
+
+
+def test__parser__parallel_parse_trace():
+    """Test the traces of the chunks are added to that of the file."""
+    _, tokens = _lex("select a from b;\nselect c from d;\n")
+    config = FluffConfig(overrides={"dialect": "ansi", "parse_trace": True})
+    root_segment = config.get("dialect_obj").get_root_segment()
+    ctx = ParseContext.from_config(config)
+    assert ctx.trace is not None
+    parsed = parse_in_parallel(
+        root_segment,
+        config,
+        tokens,
+        2,
+        ctx,
+        pool_type=multiprocessing.dummy.Pool,
+    )
+    assert parsed is not None
+    names = [event[3] for event in ctx.trace.events if event[0] == "B"]
+    assert names.count("<Ref: 'StatementSegment'>") == 2
+
+
+def test__parser__parallel_parse_fallback():
+    """Test files which don't parse cleanly in chunks are left alone."""
+    config, tokens = _lex("select 1;\nselect from;\nselect 2;\n")
+    root_segment = config.get("dialect_obj").get_root_segment()
+    ctx = ParseContext.from_config(config)
+    assert (
+        parse_in_parallel(
+            root_segment,
+            config,
+            tokens,
+            2,
+            ctx,
+            pool_type=multiprocessing.dummy.Pool,
+        )
+        is None
+    )
+    # The stats of the chunks which did parse aren't kept, as the file
+    # will be parsed again in one go.
+    assert "parse_cache_misses" not in ctx.parse_stats
+
+
+def test__parser__parallel_parse_processes(tree_tuples):
+    """Test parsing a file in a process pool through the linter."""
+    sql = "select a from b;\ncreate table c (d int);\n" * 20
+    config = FluffConfig(
+        overrides={
+            "dialect": "ansi",
+            "parse_processes": 2,
+            "parallel_parse_min_chars": 100,
+        }
+    )
+    parsed = Linter(config=config).parse_string(sql)
+    full = Linter(dialect="ansi").parse_string(sql)
+    assert not parsed.violations
+    assert tree_tuples(parsed.tree) == tree_tuples(full.tree)
+    assert all(
+        seg.pos_marker.templated_file is parsed.templated_file
+        for seg in parsed.tree.recursive_crawl_all()
+    )
+
+
+def test__parser__parallel_parse_cache_stats():
+    """Test the cache stats of a parallel parse are those of the chunks."""
+    sql = "select a from b;\ncreate table c (d int);\n" * 20
+    config = FluffConfig(
+        overrides={
+            "dialect": "ansi",
+            "parse_processes": 2,
+            "parallel_parse_min_chars": 100,
+        }
+    )
+    _, tokens = _lex(sql)
+    ctx = ParseContext.from_config(config)
+    assert Parser(config=config).parse(tokens, parse_context=ctx) is not None
+    assert ctx.parse_stats["parse_cache_misses"] > 0
@@ -1,11 +1,12 @@
 """Test the BaseSegment class."""
 
+import multiprocessing
 import pickle
 
 import pytest
 
 from sqlfluff.core.parser import BaseSegment, PositionMarker, RawSegment
-from sqlfluff.core.parser.segments.base import PathStep
+from sqlfluff.core.parser.segments.base import PathStep, new_segment_id
 from sqlfluff.core.rules.base import LintFix
 from sqlfluff.core.templaters import TemplatedFile
 
@@ -306,6 +307,32 @@ def test__parser__base_segments_pickle_safe(raw_segments):
     assert result_seg.segments[0].get_parent() is result_seg
 
 
+def test__parser__base_segments_ids(raw_segments):
+    """Test segments get distinct ids, which are kept by copies."""
+    test_seg = BaseSegment(raw_segments)
+    ids = [seg.uuid for seg in (test_seg, *raw_segments)]
+    assert all(isinstance(seg_id, int) for seg_id in ids)
+    assert len(set(ids)) == len(ids)
+    assert test_seg.copy().uuid == test_seg.uuid
+    assert pickle.loads(pickle.dumps(test_seg)).uuid == test_seg.uuid
+    # Edited segments are new segments.
+    assert raw_segments[0].edit("b").uuid not in ids
+    # Unless told otherwise.
+    assert BaseSegment(raw_segments, uuid=test_seg.uuid).uuid == test_seg.uuid
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="Forking is not available.",
+)
+def test__parser__base_segments_ids_forked():
+    """Test forked processes don't carry on from the ids of their parent."""
+    with multiprocessing.get_context("fork").Pool(2) as pool:
+        child_ids = pool.starmap(new_segment_id, [()] * 4)
+    own_ids = [new_segment_id() for _ in range(4)]
+    assert not set(child_ids).intersection(own_ids)
+
+
 def test__parser__base_segments_copy_isolation(DummySegment, raw_segments):
     """Test copy isolation in BaseSegment.
 
@@ -1,5 +1,16 @@
 """Test the RawSegment class."""
 
+import pickle
+from uuid import uuid4
+
+import pytest
+
+from sqlfluff.core.parser.segments import (
+    CodeSegment,
+    Indent,
+    KeywordSegment,
+    TemplateSegment,
+)
 from sqlfluff.core.parser.segments.base import PathStep
 
 
@@ -28,3 +39,31 @@ def test__parser__raw_segments_with_ancestors(
         ),
         (raw_segments[1], [PathStep(test_seg, 1, 2, (0, 1))]),
     ]
+
+
+def test__parser__raw_segments_compact(raw_segments):
+    """Test raw segments keep their attributes in slots, and share types."""
+    seg = raw_segments[0]
+    assert not seg.__dict__
+    assert repr(seg) == seg.representation
+    other = CodeSegment("b", pos_marker=seg.pos_marker, type="foo")
+    assert CodeSegment("c", type="foo").instance_types is other.instance_types
+    # Upper case raws are shared.
+    assert KeywordSegment("SELECT").raw_upper is KeywordSegment("SELECT").raw
+
+
+@pytest.mark.parametrize(
+    "seg",
+    [
+        CodeSegment("foo", type="bar", trim_chars=("f",)),
+        Indent(is_template=True, block_uuid=uuid4()),
+        TemplateSegment(source_str="{{ a }}", block_type="templated"),
+    ],
+)
+def test__parser__raw_segments_copy_and_pickle(seg):
+    """Test raw segments keep all their attributes when copied or pickled."""
+    for other in (seg.copy(), pickle.loads(pickle.dumps(seg))):
+        assert other is not seg
+        assert other.__class__ is seg.__class__
+        assert other.uuid == seg.uuid
+        assert other.__getstate__() == seg.__getstate__()
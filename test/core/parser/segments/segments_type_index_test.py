@@ -0,0 +1,156 @@
+"""Tests for the type index of a tree of segments."""
+
+import pickle
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.rules.context import RuleContext
+from sqlfluff.core.rules.crawlers import ParentOfSegmentCrawler, SegmentSeekerCrawler
+
+SQL = """select a, b.c, (select d from e where f = 1) as g
+from h
+join i on h.x = i.x and (h.y = 1 or i.z = (select 2))
+where j in (select k from l);
+select case when m then n end from o;
+select from where;
+"""
+
+QUERIES = [
+    ("select_statement",),
+    ("column_reference", "identifier"),
+    ("expression",),
+    ("keyword", "bracketed"),
+    ("file",),
+    ("unparsable", "raw"),
+    ("not_a_type",),
+]
+
+
+@pytest.fixture(scope="module")
+def trees():
+    """An indexed tree, and an unindexed copy of it."""
+    tree = Linter(dialect="ansi").parse_string(SQL).tree
+    unindexed = tree.copy()
+    tree.build_type_index()
+    return tree, unindexed
+
+
+def _uuids(segments):
+    return [seg.uuid for seg in segments]
+
+
+@pytest.mark.parametrize("seg_type", QUERIES)
+@pytest.mark.parametrize("recurse_into", [True, False])
+@pytest.mark.parametrize("no_recursive_seg_type", [None, "select_statement"])
+@pytest.mark.parametrize("allow_self", [True, False])
+def test__parser__type_index_recursive_crawl(
+    trees, seg_type, recurse_into, no_recursive_seg_type, allow_self
+):
+    """Test looking up segments in the index matches searching the tree."""
+    tree, unindexed = trees
+    assert tree.get_type_index()
+    assert not unindexed.get_type_index()
+    kwargs = dict(
+        recurse_into=recurse_into,
+        no_recursive_seg_type=no_recursive_seg_type,
+        allow_self=allow_self,
+    )
+    for seg, unindexed_seg in zip(
+        tree.recursive_crawl_all(), unindexed.recursive_crawl_all()
+    ):
+        assert _uuids(seg.recursive_crawl(*seg_type, **kwargs)) == _uuids(
+            unindexed_seg.recursive_crawl(*seg_type, **kwargs)
+        )
+
+
+def test__parser__type_index_contains(trees):
+    """Test checking for types within a segment."""
+    tree, _ = trees
+    for seg in tree.recursive_crawl_all():
+        index, pos = seg.get_type_index()
+        for seg_type in QUERIES:
+            assert index.contains(pos, seg_type) == bool(
+                seg.descendant_type_set.intersection(seg_type)
+            )
+
+
+def test__parser__type_index_unskipped_positions(trees):
+    """Test positions within excluded or earlier matches are skipped."""
+    tree, _ = trees
+    index, pos = tree.get_type_index()
+    selects = index.positions_within(("select_statement",), pos, index.ends[pos])
+    brackets = index.positions_within(("bracketed",), pos, index.ends[pos])
+    outer = [
+        select
+        for select in selects
+        if not any(select in range(other + 1, index.ends[other]) for other in selects)
+    ]
+    assert len(outer) < len(selects)
+    assert list(index.unskipped_positions(selects)) == selects
+    assert list(index.unskipped_positions(selects, recurse_into=False)) == outer
+    # The subqueries are all in brackets, so skipping those leaves the rest.
+    assert list(index.unskipped_positions(selects, brackets)) == outer
+
+
+@pytest.mark.parametrize(
+    "crawler",
+    [
+        SegmentSeekerCrawler({"column_reference", "select_statement"}),
+        SegmentSeekerCrawler({"select_statement"}, allow_recurse=False),
+        SegmentSeekerCrawler({"keyword"}, works_on_unparsable=True),
+        ParentOfSegmentCrawler({"keyword", "bracketed"}),
+        ParentOfSegmentCrawler({"raw"}, works_on_unparsable=True),
+    ],
+)
+def test__parser__type_index_crawlers(trees, crawler):
+    """Test crawling with the index gives the same contexts."""
+    results = []
+    for root in trees:
+        context = RuleContext(
+            dialect=None,
+            fix=False,
+            templated_file=None,
+            path=None,
+            config=FluffConfig(overrides={"dialect": "ansi"}),
+            segment=root,
+        )
+        results.append(
+            [
+                (ctx.segment.uuid, _uuids(ctx.parent_stack), ctx.segment_idx)
+                for ctx in crawler.crawl(context)
+            ]
+        )
+    assert results[0]
+    assert results[0] == results[1]
+
+
+def test__parser__type_index_invalidation():
+    """Test the index isn't used for copies or once the tree is changed."""
+    tree = Linter(dialect="ansi").parse_string("select a from b\n").tree
+    tree.build_type_index()
+    index, _ = tree.get_type_index()
+    statement = next(tree.recursive_crawl("select_statement"))
+    # Within the file and the statement.
+    assert statement.get_type_index() == (index, 2)
+    # Copies (and unpickled trees) are not in the index.
+    assert not statement.copy().get_type_index()
+    assert not pickle.loads(pickle.dumps(tree)).get_type_index()
+    assert tree.get_type_index()
+    # Changing any segment in the tree makes the whole index out of date.
+    clause = next(tree.recursive_crawl("from_clause"))
+    clause.segments = clause.segments[:1]
+    assert index.stale
+    assert not tree.get_type_index()
+    assert not statement.get_type_index()
+    # Which means the tree is searched instead.
+    assert not list(tree.recursive_crawl("table_reference"))
+
+
+def test__parser__type_index_fixes():
+    """Test fixed trees are indexed by the linter."""
+    linted = Linter(dialect="ansi").lint_string("SELECT a from b\n", fix=True)
+    assert linted.tree.raw == "SELECT a FROM b\n"
+    index, pos = linted.tree.get_type_index()
+    assert pos == 0
+    assert len(index) == linted.tree.count_segments()
@@ -0,0 +1,73 @@
+"""Tests for tracing the matching done while parsing."""
+
+import json
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.parser.trace import ParseTrace, as_chrome_trace, write_chrome_trace
+
+
+def _parse_trace(sql: str) -> ParseTrace:
+    config = FluffConfig(overrides={"dialect": "ansi", "parse_trace": True})
+    parsed = Linter(config=config).parse_string(sql)
+    assert parsed.parse_trace
+    return parsed.parse_trace
+
+
+def test__parser__trace_disabled():
+    """Test nothing is traced unless tracing is enabled."""
+    assert Linter(dialect="ansi").parse_string("select 1\n").parse_trace is None
+
+
+def test__parser__trace_events():
+    """Test the matching is traced, with positions and cache hits."""
+    trace = _parse_trace("select a from b;\nselect (a + 1) from c\n")
+    # Every event which begins also ends, in order.
+    depth = 0
+    for event in trace.events:
+        depth += 1 if event[0] == "B" else -1
+        assert depth >= 0
+    assert depth == 0
+
+    begins = [event for event in trace.events if event[0] == "B"]
+    assert {event[4] for event in begins} == {
+        "deeper_match",
+        "longest_trimmed_match",
+        "Sequence",
+    }
+    ltm_events = [event for event in begins if event[4] == "longest_trimmed_match"]
+    assert any(event[3] == "<Ref: 'StatementSegment'>" for event in ltm_events)
+    # The options tried have a position and a cache hit flag.
+    assert all(event[5] for event in ltm_events)
+    assert {event[6] for event in ltm_events} == {True, False}
+    assert (2, 1) in {event[5] for event in ltm_events}
+    # Deeper matches are positioned at the segments they match.
+    deeper_events = [event for event in begins if event[4] == "deeper_match"]
+    assert all(event[5] for event in deeper_events)
+    assert any(
+        event[3] == "SelectStatementSegment" and event[5] == (2, 1)
+        for event in deeper_events
+    )
+
+
+def test__parser__trace_chrome(tmp_path):
+    """Test traces of several files are written in the Chrome format."""
+    traces = [("a.sql", _parse_trace("select 1\n")), ("b.sql", ParseTrace())]
+    trace_events = as_chrome_trace(traces)["traceEvents"]
+    assert trace_events[0] == {
+        "name": "thread_name",
+        "ph": "M",
+        "pid": traces[0][1].events[0][2],
+        "tid": 1,
+        "args": {"name": "a.sql"},
+    }
+    assert trace_events[1]["ts"] == 0
+    assert {event["ph"] for event in trace_events[1:]} == {"B", "E"}
+    ltm_event = next(
+        event for event in trace_events if event.get("cat") == "longest_trimmed_match"
+    )
+    assert ltm_event["args"] == {"line_no": 1, "line_pos": 1, "cache_hit": False}
+
+    filename = str(tmp_path / "trace.json")
+    write_chrome_trace(traces, filename)
+    with open(filename) as f:
+        assert json.load(f)["traceEvents"] == trace_events
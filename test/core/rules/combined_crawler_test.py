@@ -0,0 +1,157 @@
+"""Tests for crawling a tree once for several rules."""
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.rules import BaseRule, LintResult
+from sqlfluff.core.rules.combined_crawler import CombinedCrawler
+from sqlfluff.core.rules.crawlers import (
+    ParentOfSegmentCrawler,
+    RootOnlyCrawler,
+    SegmentSeekerCrawler,
+)
+
+SQL = (
+    "select a, (select b + 1 from c) as d\n"
+    "from e\n"
+    "where f in (select g from h);\n"
+    "select 1 + + from;\n"
+)
+
+
+class Rule_T100(BaseRule):
+    """A rule which records the context of each evaluation."""
+
+    groups = ("all",)
+    crawl_behaviour = SegmentSeekerCrawler({"select_statement", "numeric_literal"})
+
+    def _eval(self, context):
+        count = context.memory.get("count", 0) + 1 if context.memory else 1
+        return LintResult(
+            anchor=context.segment,
+            description=(
+                f"{count}: {context.segment.raw!r} "
+                f"{[seg.get_type() for seg in context.parent_stack]} "
+                f"{context.segment_idx}"
+            ),
+            memory={"count": count},
+        )
+
+
+class Rule_T101(Rule_T100):
+    """A rule which doesn't recurse into matching segments."""
+
+    crawl_behaviour = SegmentSeekerCrawler({"select_statement"}, allow_recurse=False)
+
+
+class Rule_T102(Rule_T100):
+    """A rule which looks for parents of literals, including in unparsables."""
+
+    crawl_behaviour = ParentOfSegmentCrawler(
+        {"numeric_literal", "raw"}, works_on_unparsable=True
+    )
+
+
+class Rule_T103(Rule_T100):
+    """A rule which only looks at the root."""
+
+    crawl_behaviour = RootOnlyCrawler()
+
+
+class Rule_T104(Rule_T100):
+    """A rule which fails part way through."""
+
+    def _eval(self, context):
+        if context.segment.is_type("numeric_literal"):
+            raise ValueError("Not a number.")
+        return super()._eval(context)
+
+
+class Rule_T105(Rule_T100):
+    """A rule which needs a raw stack."""
+
+    crawl_behaviour = SegmentSeekerCrawler({"keyword"}, provide_raw_stack=True)
+
+
+def _summarise(vs, fixes):
+    return [(v.desc(), v.line_no, v.line_pos) for v in vs], fixes
+
+
+def _compare_crawls(rules, sql):
+    """Check the combined crawl gives the same results as each rule's crawl."""
+    config = FluffConfig(overrides={"dialect": "ansi"})
+    parsed = Linter(config=config).parse_string(sql)
+    kwargs = dict(
+        dialect=config.get("dialect_obj"),
+        fix=False,
+        templated_file=parsed.templated_file,
+        ignore_mask=None,
+        fname=None,
+        config=config,
+    )
+    combined = CombinedCrawler(rules).crawl(parsed.tree, **kwargs)
+    assert list(combined) == [rule.code for rule in rules]
+    for rule in rules:
+        vs, _, fixes, _ = rule.crawl(parsed.tree, **kwargs)
+        assert _summarise(vs, fixes) == _summarise(
+            combined[rule.code].violations, combined[rule.code].fixes
+        )
+    return combined
+
+
+def test__rules__combined_crawler__contexts():
+    """Test each rule sees the same contexts as with its own crawler."""
+    rules = [
+        rule_cls(code=rule_cls.__name__[5:], description="")
+        for rule_cls in (Rule_T100, Rule_T101, Rule_T102, Rule_T103, Rule_T104)
+    ]
+    combined = _compare_crawls(rules, SQL)
+    # Check a few of them to make sure we're testing something.
+    assert [v.desc() for v in combined["T101"].violations] == [
+        "1: 'select a, (select b + 1 from c) as d\\nfrom e\\nwhere f in "
+        "(select g from h)' ['file', 'statement'] 0",
+        "2: 'select 1 + + from' ['file', 'statement'] 0",
+    ]
+    assert [v.desc() for v in combined["T104"].violations][-1].startswith(
+        "Unexpected exception: Not a number."
+    )
+
+
+def test__rules__combined_crawler__standard_rules():
+    """Test the standard rules give the same results when crawled together."""
+    linter = Linter(config=FluffConfig(overrides={"dialect": "ansi"}))
+    rules = [
+        rule
+        for rule in linter.get_rulepack().rules
+        if CombinedCrawler.can_combine(rule)
+    ]
+    _compare_crawls(rules, SQL)
+
+
+@pytest.mark.parametrize(
+    "rule_cls,can_combine",
+    [(Rule_T100, True), (Rule_T103, True), (Rule_T105, False)],
+)
+def test__rules__combined_crawler__can_combine(rule_cls, can_combine):
+    """Test which rules can be crawled together."""
+    rule = rule_cls(code="T100", description="")
+    assert CombinedCrawler.can_combine(rule) is can_combine
+
+
+def test__rules__combined_crawler__linter():
+    """Test linting with a mix of combined and individual crawls."""
+    rules = [Rule_T100, Rule_T105, Rule_T101]
+    linter = Linter(
+        config=FluffConfig(overrides={"dialect": "ansi", "rules": "T100,T101,T105"}),
+        user_rules=rules,
+    )
+    result = linter.lint_string(SQL)
+    # Violations are grouped by rule, in the order of the rule pack.
+    codes = [v.rule_code() for v in result.violations if v.rule_code() != "PRS"]
+    assert codes == sorted(codes)
+    assert set(codes) == {"T100", "T101", "T105"}
+    assert {code for code, _, _ in result.timings.rule_timings} == {
+        "T100",
+        "T101",
+        "T105",
+    }
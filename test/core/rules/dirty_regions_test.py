@@ -0,0 +1,164 @@
+"""Tests for only re-running rules on the changed parts of a file."""
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.parser import WhitespaceSegment
+from sqlfluff.core.rules import BaseRule, LintFix, LintResult
+from sqlfluff.core.rules.crawlers import RootOnlyCrawler, SegmentSeekerCrawler
+from sqlfluff.core.rules.dirty_regions import DirtyRegionTracker
+
+SQL = "select 1;\nselect  2;\nselect 3;\n"
+
+
+class Rule_T200(BaseRule):
+    """A rule which records which segments it's evaluated on."""
+
+    groups = ("all",)
+    crawl_behaviour = SegmentSeekerCrawler({"numeric_literal"})
+
+    def __init__(self, *args, **kwargs):
+        self.evaluated = []
+        super().__init__(*args, **kwargs)
+
+    def _eval(self, context):
+        self.evaluated.append(context.segment.raw)
+        if context.segment.raw == "2":
+            return LintResult(anchor=context.segment)
+        return None
+
+
+class Rule_T201(Rule_T200):
+    """A rule which carries memory between evaluations."""
+
+    def _eval(self, context):
+        super()._eval(context)
+        return LintResult(memory={"seen": True})
+
+
+class Rule_T203(Rule_T200):
+    """A rule which flags literals repeating the one before, using memory."""
+
+    def _eval(self, context):
+        self.evaluated.append(context.segment.raw)
+        value = int(context.segment.raw)
+        if context.memory == value:
+            return LintResult(anchor=context.segment, memory=value)
+        return LintResult(memory=value)
+
+
+class Rule_T202(Rule_T200):
+    """A rule which only looks at the root."""
+
+    crawl_behaviour = RootOnlyCrawler()
+
+
+def _parse(sql=SQL):
+    config = FluffConfig(overrides={"dialect": "ansi"})
+    return config, Linter(config=config).parse_string(sql)
+
+
+def _crawl(tracker, rule, tree, config):
+    return tracker.crawl(
+        rule,
+        tree,
+        dialect=config.get("dialect_obj"),
+        fix=True,
+        templated_file=None,
+        ignore_mask=None,
+        fname=None,
+        config=config,
+    )
+
+
+def _fix_whitespace(tree, config):
+    """Replace the double space in the second statement."""
+    whitespace = next(
+        seg for seg in tree.recursive_crawl("whitespace") if seg.raw == "  "
+    )
+    fixes = [LintFix.replace(whitespace, [WhitespaceSegment(" ")])]
+    new_tree, _, _, valid = tree.apply_fixes(
+        config.get("dialect_obj"), "T200", tree.compute_anchor_edit_info(fixes)
+    )
+    assert valid
+    return new_tree
+
+
+def test__rules__dirty_regions__apply_fixes_keeps_unchanged():
+    """Test only the segments containing fixes are replaced."""
+    config, parsed = _parse()
+    new_tree = _fix_whitespace(parsed.tree, config)
+    assert new_tree.raw == "select 1;\nselect 2;\nselect 3;\n"
+    assert [
+        old.uuid == new.uuid
+        for old, new in zip(parsed.tree.segments, new_tree.segments)
+        if old.is_code
+    ] == [True, True, False, True, True, True]
+    # Applying no fixes leaves the tree as it is.
+    assert parsed.tree.apply_fixes(config.get("dialect_obj"), "T200", {}) == (
+        parsed.tree,
+        [],
+        [],
+        True,
+    )
+
+
+def test__rules__dirty_regions__rerun_changed():
+    """Test rules are only re-run on the statements which have changed."""
+    config, parsed = _parse()
+    rule = Rule_T200(code="T200", description="")
+    tracker = DirtyRegionTracker()
+    vs, fixes = _crawl(tracker, rule, parsed.tree, config)
+    assert rule.evaluated == ["1", "2", "3"]
+    assert [v.segment.raw for v in vs] == ["2"]
+    # Nothing has changed, so only the statement with a problem is re-run.
+    rule.evaluated = []
+    vs, _ = _crawl(tracker, rule, parsed.tree, config)
+    assert rule.evaluated == ["2"]
+    assert [v.segment.raw for v in vs] == ["2"]
+    # Fixing that statement doesn't change the others.
+    new_tree = _fix_whitespace(parsed.tree, config)
+    rule.evaluated = []
+    _crawl(tracker, rule, new_tree, config)
+    assert rule.evaluated == ["2"]
+    # But a statement which moves is re-run.
+    config, parsed = _parse("select  2; select 1;\n")
+    new_tree = _fix_whitespace(parsed.tree, config)
+    _crawl(tracker, rule, parsed.tree, config)
+    rule.evaluated = []
+    _crawl(tracker, rule, new_tree, config)
+    assert rule.evaluated == ["2", "1"]
+
+
+def test__rules__dirty_regions__whole_file():
+    """Test rules which can't be tracked are always run on the whole file."""
+    config, parsed = _parse()
+    tracker = DirtyRegionTracker()
+    memory_rule = Rule_T201(code="T201", description="")
+    root_rule = Rule_T202(code="T202", description="")
+    assert DirtyRegionTracker.can_track(memory_rule)
+    assert not DirtyRegionTracker.can_track(root_rule)
+    # The first crawl starts again once the rule is found to use memory.
+    _crawl(tracker, memory_rule, parsed.tree, config)
+    assert memory_rule.evaluated == ["1", "1", "2", "3"]
+    for _ in range(2):
+        memory_rule.evaluated = []
+        root_rule.evaluated = []
+        _crawl(tracker, memory_rule, parsed.tree, config)
+        _crawl(tracker, root_rule, parsed.tree, config)
+        assert memory_rule.evaluated == ["1", "2", "3"]
+        assert root_rule.evaluated == [SQL]
+
+
+def test__rules__dirty_regions__memory_across_statements():
+    """Test rules carrying (falsy) memory across statements see all of them."""
+    config, parsed = _parse("select 0;\nselect  0;\n")
+    rule = Rule_T203(code="T203", description="")
+    tracker = DirtyRegionTracker()
+    vs, _ = _crawl(tracker, rule, parsed.tree, config)
+    assert [v.segment.pos_marker.working_line_no for v in vs] == [2]
+    # The first statement is unchanged, but the result in the second
+    # depends on it, so it's evaluated again.
+    new_tree = _fix_whitespace(parsed.tree, config)
+    rule.evaluated = []
+    vs, _ = _crawl(tracker, rule, new_tree, config)
+    assert rule.evaluated == ["0", "0"]
+    assert [v.segment.pos_marker.working_line_no for v in vs] == [2]
@@ -0,0 +1,128 @@
+"""Tests for profiling the evaluation of rules."""
+
+import pytest
+
+from sqlfluff.core import FluffConfig, Linter
+from sqlfluff.core.rules.profiler import RuleProfile, RuleStats
+
+
+def _lint_profile(
+    sql: str, fix: bool = False, rules: str = "CP01,LT01", events: bool = True
+):
+    config = FluffConfig(
+        overrides={
+            "dialect": "ansi",
+            "rules": rules,
+            "profile_rules": True,
+            "profile_rule_events": events,
+        }
+    )
+    linted = Linter(config=config).lint_string(sql, fix=fix)
+    return linted.timings.rule_profile
+
+
+def test__rules__profiler_records_evals():
+    """Test the evaluations of each rule are recorded by segment type."""
+    profile = _lint_profile("SELECT a from b\n")
+    assert profile.files == 1
+    assert profile.segments > 0
+    # CP01 is evaluated on each keyword, and finds one to fix.
+    cp01 = profile.rules["CP01"]
+    assert cp01.evals == 2
+    assert cp01.segment_types["keyword"] == [2, pytest.approx(cp01.time)]
+    assert cp01.violations == 1
+    assert cp01.fixes == 1
+    assert any("CP01.py" in label for label in cp01.functions)
+    # LT01 is only evaluated on the whole file.
+    assert profile.rules["LT01"].evals == 1
+    assert list(profile.rules["LT01"].segment_types) == ["file"]
+    assert len(profile.events) == 3
+
+
+def test__rules__profiler_records_fix_loops():
+    """Test the evaluations in every loop are recorded when fixing."""
+    profile = _lint_profile("SELECT a from b\n", fix=True)
+    assert profile.rules["CP01"].fixes == 1
+    # After fixing CP01, another loop checks nothing else needs fixing.
+    assert profile.rules["LT01"].evals == 2
+
+
+def test__rules__profiler_unprofiled():
+    """Test nothing is recorded unless profiling is enabled."""
+    linted = Linter(dialect="ansi").lint_string("select a from b\n")
+    assert linted.timings.rule_profile is None
+
+
+def test__rules__profiler_without_events():
+    """Test evaluations are only kept as events for a trace if asked."""
+    profile = _lint_profile("SELECT a from b\n", events=False)
+    assert profile.rules["CP01"].evals == 2
+    assert profile.events == []
+
+
+def test__rules__profile_merge():
+    """Test profiles from several files are combined."""
+    profile = RuleProfile()
+    profile.merge(_lint_profile("SELECT a from b\n", rules="CP01"))
+    profile.merge(_lint_profile("SELECT a FROM b; select c\n", rules="CP01"))
+    assert profile.files == 2
+    assert profile.rules["CP01"].evals == 5
+    assert profile.rules["CP01"].violations == 2
+    assert profile.rules["CP01"].segment_types["keyword"][0] == 5
+    assert len(profile.events) == 5
+
+
+def test__rules__profile_output():
+    """Test the summary and trace outputs of a profile."""
+    profile = RuleProfile(
+        files=1,
+        segments=10,
+        rules={
+            "A": RuleStats(
+                evals=1,
+                time=0.5,
+                segment_types={"keyword": [1, 0.5]},
+                functions={"f": [1, 0.1, 0.5], "g": [2, 0.3, 0.3]},
+            ),
+            "B": RuleStats(evals=1, time=1.0, segment_types={"file": [1, 1.0]}),
+        },
+        events=[
+            ("A", "keyword", "a.sql", 1, 2000, 500),
+            ("B", "file", "a.sql", 1, 1000, 1000),
+        ],
+    )
+    summary = profile.as_dict()
+    # The slowest rules and functions come first.
+    assert list(summary["rules"]) == ["B", "A"]
+    assert [path["function"] for path in summary["rules"]["A"]["hot_paths"]] == [
+        "f",
+        "g",
+    ]
+    assert summary["rules"]["A"]["segment_types"] == {
+        "keyword": {"evals": 1, "time": 0.5}
+    }
+    trace = profile.as_chrome_trace()["traceEvents"]
+    assert trace == [
+        {"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "A"}},
+        {"name": "thread_name", "ph": "M", "pid": 1, "tid": 2, "args": {"name": "B"}},
+        {
+            "name": "keyword",
+            "cat": "A",
+            "ph": "X",
+            "ts": 1.0,
+            "dur": 0.5,
+            "pid": 1,
+            "tid": 1,
+            "args": {"file": "a.sql"},
+        },
+        {
+            "name": "file",
+            "cat": "B",
+            "ph": "X",
+            "ts": 0.0,
+            "dur": 1.0,
+            "pid": 1,
+            "tid": 2,
+            "args": {"file": "a.sql"},
+        },
+    ]
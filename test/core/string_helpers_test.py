@@ -2,7 +2,7 @@
 
 import pytest
 
-from sqlfluff.core.string_helpers import findall
+from sqlfluff.core.string_helpers import findall, findall_substrings
 
 
 @pytest.mark.parametrize(
@@ -17,3 +17,20 @@ from sqlfluff.core.string_helpers import findall
 def test__parser__helper_findall(mainstr, substr, positions):
     """Test _findall."""
     assert list(findall(substr, mainstr)) == positions
+
+
+@pytest.mark.parametrize(
+    "mainstr,substrs",
+    [
+        ("", ["", "a"]),
+        ("foobar", ["o", "oo", "b", "x"]),
+        ("bar bar bar bar", ["bar", "ar b", "r", "bar bar"]),
+        ("aaaa", ["a", "aa", "aaa", "aaaaa"]),
+        ("abcabd", ["abd", "bc", "cab", "c"]),
+    ],
+)
+def test__parser__helper_findall_substrings(mainstr, substrs):
+    """Test findall_substrings matches findall for each substring."""
+    assert findall_substrings(substrs, mainstr) == {
+        substr: list(findall(substr, mainstr)) for substr in substrs
+    }
@@ -173,6 +173,22 @@ def test__templated_file_get_line_pos_of_char_pos(
         (20, True, SIMPLE_FILE_KWARGS, 2, 3),
         # Check inclusivity
         (13, False, COMPLEX_FILE_KWARGS, 0, 1),
+        # At the start of the file.
+        (0, True, SIMPLE_FILE_KWARGS, 0, 1),
+        (0, False, SIMPLE_FILE_KWARGS, 0, 0),
+        # Where one slice stops and the next starts.
+        (10, True, SIMPLE_FILE_KWARGS, 0, 2),
+        (10, False, SIMPLE_FILE_KWARGS, 0, 1),
+        # Either side of zero length slices.
+        (28, False, COMPLEX_FILE_KWARGS, 2, 3),
+        (175, True, COMPLEX_FILE_KWARGS, 16, 19),
+        (175, False, COMPLEX_FILE_KWARGS, 16, 17),
+        (186, True, COMPLEX_FILE_KWARGS, 18, 21),
+        (246, True, COMPLEX_FILE_KWARGS, 28, 31),
+        # At the end of the file.
+        (20, False, SIMPLE_FILE_KWARGS, 2, 3),
+        (261, True, COMPLEX_FILE_KWARGS, 30, 31),
+        (261, False, COMPLEX_FILE_KWARGS, 30, 31),
     ],
 )
 def test__templated_file_find_slice_indices_of_templated_pos(
@@ -378,3 +394,35 @@ def test__templated_file_templated_slice_to_source_slice(
 def test__templated_file_source_only_slices(file, expected_result):
     """Test TemplatedFile.source_only_slices."""
     assert file.source_only_slices() == expected_result
+
+
+@pytest.mark.parametrize(
+    "source_slice,expected_starts,is_literal",
+    [
+        # Zero length slices, at the start of a raw slice.
+        (slice(0, 0), [0], True),
+        (slice(13, 13), [13], True),
+        (slice(68, 68), [68], True),
+        # Slices matching a raw slice exactly.
+        (slice(0, 13), [0], True),
+        (slice(13, 29), [13], False),
+        (slice(44, 68), [44], False),
+        # A slice spanning the boundary between two raw slices.
+        (slice(12, 14), [0, 13], False),
+        # Slices up to the end of the file.
+        (slice(215, 230), [215], True),
+        (slice(225, 230), [215], True),
+        # A slice at the end of the file.
+        (slice(230, 230), [], True),
+    ],
+)
+def test__templated_file_raw_slices_spanning_source_slice(
+    source_slice, expected_starts, is_literal
+):
+    """Test the raw slices spanning a source slice, at slice boundaries."""
+    file = TemplatedFile(**COMPLEX_FILE_KWARGS)
+    assert [
+        raw_slice.source_idx
+        for raw_slice in file.raw_slices_spanning_source_slice(source_slice)
+    ] == expected_starts
+    assert file.is_source_slice_literal(source_slice) is is_literal
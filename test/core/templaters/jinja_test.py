@@ -16,7 +16,8 @@ from jinja2.exceptions import UndefinedError
 from sqlfluff.core.errors import SQLFluffSkipFile, SQLTemplaterError
 from sqlfluff.core.templaters import JinjaTemplater
 from sqlfluff.core.templaters.base import RawFileSlice, TemplatedFile
-from sqlfluff.core.templaters.jinja import DummyUndefined, JinjaAnalyzer
+from sqlfluff.core.templaters.jinja import DummyUndefined, jinja_environment_cache
+from sqlfluff.core.templaters.slicers.tracer import JinjaAnalyzer, jinja_analysis_cache
 from sqlfluff.core import Linter, FluffConfig
 
 
@@ -622,6 +623,55 @@ def test__templater_jinja_error_macro_path_does_not_exist():
     assert str(e.value).startswith("Path does not exist")
 
 
+def test__templater_jinja_environment_cache(tmp_path):
+    """Test environments are shared between files and reloaded on changes."""
+    macro_file = tmp_path / "macros.sql"
+    macro_file.write_text("{% macro greet() %}hello {{ name }}{% endmacro %}")
+
+    def _config(**context):
+        return FluffConfig(
+            configs={
+                "templater": {
+                    "jinja": {
+                        "load_macros_from_path": str(tmp_path),
+                        "context": context,
+                    }
+                }
+            },
+            overrides={"dialect": "ansi"},
+        )
+
+    jinja_environment_cache.clear()
+    stats = jinja_environment_cache.stats()
+    t = JinjaTemplater()
+    # The context isn't part of the key, but the macros use the context of
+    # each file.
+    for name in ("a", "b"):
+        outstr, vs = t.process(
+            in_str="{{ greet() }}", fname="test", config=_config(name=name)
+        )
+        assert str(outstr) == f"hello {name}"
+        assert not vs
+    # Undefined variables are still recorded for each file.
+    outstr, vs = t.process(
+        in_str="{{ greet() }}{{ name }}", fname="test", config=_config()
+    )
+    assert str(outstr) == "hello "
+    assert [v.rule_code() for v in vs] == ["TMP"]
+    assert jinja_environment_cache.hits == stats["hits"] + 2
+    assert jinja_environment_cache.misses == stats["misses"] + 1
+    assert len(jinja_environment_cache) == 1
+
+    # Changing a macro file loads the environment again.
+    macro_file.write_text("{% macro greet() %}goodbye {{ name }}{% endmacro %}")
+    outstr, _ = t.process(
+        in_str="{{ greet() }}", fname="test", config=_config(name="c")
+    )
+    assert str(outstr) == "goodbye c"
+    assert jinja_environment_cache.invalidations == stats["invalidations"] + 1
+    assert jinja_environment_cache.misses == stats["misses"] + 2
+
+
 def test__templater_jinja_lint_empty():
     """Check that parsing a file which renders to an empty string.
 
@@ -1464,6 +1514,52 @@ def test__templater_jinja_slice_file(raw_file, override_context, result, caplog)
     assert actual == result
 
 
+@pytest.mark.parametrize(
+    "raw_file,reconstructed",
+    [
+        # Loops and whitespace control are reconstructed from the trace.
+        (
+            "select\n{%- for i in range(3) %}\n    {{ i }} as c{{ i }},{% endfor %}\n",
+            True,
+        ),
+        # Filters transform the literals, so the template is rendered again.
+        ("{% filter upper %}select 1{% endfilter %}\n", False),
+    ],
+)
+def test__templater_jinja_trace_single_render(raw_file, reconstructed):
+    """Test the output is reconstructed from the traced render if possible."""
+    env = JinjaTemplater._get_jinja_env(JinjaTemplater())
+    renders = []
+
+    def render_func(in_str):
+        renders.append(in_str)
+        return env.from_string(in_str).render()
+
+    trace = JinjaAnalyzer(raw_file, env).analyze(render_func).trace(single_render=True)
+    assert trace.templated_str == env.from_string(raw_file).render()
+    assert len(renders) == (1 if reconstructed else 2)
+
+
+def test__templater_jinja_analysis_cache():
+    """Test the analysis of a template is shared between renders."""
+    raw_file = "select {{ a }} from {% if b %}b{% else %}c{% endif %}\n"
+    jinja_analysis_cache.clear()
+    stats = jinja_analysis_cache.stats()
+    results = []
+    for context in ({"a": 1, "b": True}, {"a": 2, "b": False}):
+        templater = JinjaTemplater(override_context=context)
+        templated_file, violations = templater.process(
+            in_str=raw_file,
+            fname="test",
+            config=FluffConfig(overrides=dict(dialect="ansi")),
+        )
+        assert not violations
+        results.append(templated_file.templated_str)
+    assert results == ["select 1 from b\n", "select 2 from c\n"]
+    assert jinja_analysis_cache.hits == stats["hits"] + 1
+    assert jinja_analysis_cache.misses == stats["misses"] + 1
+
+
 def test__templater_jinja_large_file_check():
     """Test large file skipping.
 
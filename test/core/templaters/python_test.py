@@ -478,6 +478,24 @@ def test__templater_python_slice_file(raw_file, templated_file, unwrap_wrapped,
     assert resp == result
 
 
+def test__templater_python_slice_file_many_placeholders():
+    """Test slicing with an index of the literals matches searching for each."""
+    raw_file = "SELECT\n" + "".join(
+        f"    {{tbl}}.col_{idx} + {{v{idx}}} AS c{idx},\n" for idx in range(50)
+    )
+    context = {f"v{idx}": idx * 7 for idx in range(50)}
+    templated_file = raw_file.format(tbl="foo", **context)
+    results = []
+    for min_substrings_to_index in (0, 1000):
+        templater = PythonTemplater()
+        templater.min_substrings_to_index = min_substrings_to_index
+        results.append(
+            templater.slice_file(raw_file, (lambda x: templated_file), config=None)
+        )
+    assert results[0] == results[1]
+    assert results[0][2] == templated_file
+
+
 def test__templater_python_large_file_check():
     """Test large file skipping.
 
@@ -218,6 +218,54 @@ def test_reflow_sequence_from_around_target_non_raw(default_config, caplog):
     )
 
 
+def test_reflow_sequence_shared_analysis(default_config):
+    """Test sequences from an indexed tree share the analysis of the tree."""
+    sql = "select a,b from c\n"
+    root = parse_ansi_string(sql, default_config)
+    comma = next(root.recursive_crawl("comma"))
+    # Without an index, each sequence works out its own depth map.
+    unindexed = [
+        ReflowSequence.from_root(root, default_config),
+        ReflowSequence.from_around_target(comma, root, config=default_config),
+    ]
+    assert unindexed[0].depth_map is not unindexed[1].depth_map
+
+    root.build_type_index()
+    sequences = [
+        ReflowSequence.from_root(root, default_config),
+        ReflowSequence.from_root(root, default_config),
+        ReflowSequence.from_around_target(comma, root, config=default_config),
+    ]
+    assert sequences[0].depth_map is sequences[1].depth_map
+    assert sequences[0].depth_map is sequences[2].depth_map
+    assert sequences[0].reflow_config is sequences[2].reflow_config
+    # The results are the same either way.
+    for before, after in zip(unindexed, sequences[1:]):
+        assert [elem.segments for elem in before.elements] == [
+            elem.segments for elem in after.elements
+        ]
+        assert [
+            elem.depth_info for elem in before.elements if isinstance(elem, ReflowBlock)
+        ] == [
+            elem.depth_info for elem in after.elements if isinstance(elem, ReflowBlock)
+        ]
+
+    # Once the tree changes, the analysis is worked out again.
+    root.segments = root.segments[:-1]
+    root.build_type_index()
+    assert (
+        ReflowSequence.from_root(root, default_config).depth_map
+        is not sequences[0].depth_map
+    )
+
+
+def test_reflow_sequence_analysis_dropped_after_linting():
+    """Test the linter doesn't keep the analysis of the linted tree."""
+    linted = Linter(dialect="ansi").lint_string("select a,b from c\n")
+    index, _ = linted.tree.get_type_index()
+    assert not index.cache
+
+
 @pytest.mark.parametrize(
     "raw_sql,filter,delete_indices,edit_indices",
     [